@@ -10,6 +10,8 @@ from config import Config
 from models.database import TemplateDB
 from utils.advanced_template_analyzer import analyze_template
 from utils.advanced_resume_parser import parse_resume
+from utils.parse_cache import parse_cache_stats, parse_upload
+from utils.candidate_document import release_candidate_document
 
 # Import routes
 from routes.onlyoffice_routes import onlyoffice_bp
@@ -114,7 +116,14 @@ def save_cai_contact():
 
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'ok'})
+    """Liveness plus model readiness; ?ready=1 answers 503 until the warm-up finished"""
+    from utils.model_cache import readiness
+    from utils.heading_memo import heading_memo_stats
+    models = readiness()
+    if request.args.get('ready') and not models['ready']:
+        return jsonify({'status': 'warming_up', 'models': models}), 503
+    return jsonify({'status': 'ok', 'models': models, 'heading_memo': heading_memo_stats(),
+                    'parse_cache': parse_cache_stats()})
 
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
@@ -191,6 +200,20 @@ def format_resumes():
         template_analysis['template_path'] = template_file_path
         template_analysis['template_type'] = template['file_type']
         
+        # Load the template's precomputed section embeddings once for the whole batch
+        try:
+            from utils.template_section_index import load_template_section_index
+            load_template_section_index(template_analysis)
+        except Exception as e:
+            print(f"⚠️  Template section index unavailable: {e}")
+        
+        # Parse the template once; each resume gets a clone from the pool
+        try:
+            from utils.template_cache import prefetch_template
+            prefetch_template(template_file_path)
+        except Exception as e:
+            print(f"⚠️  Template cache unavailable: {e}")
+        
         print(f"\n{'='*70}")
         print(f"🎯 FORMATTING SESSION")
         print(f"{'='*70}")
@@ -235,23 +258,26 @@ def format_resumes():
             if file.filename == '' or not allowed_file(file.filename):
                 return None
             
-            # Save resume
             filename = secure_filename(file.filename)
             file_type = filename.rsplit('.', 1)[1].lower()
             resume_id = str(uuid.uuid4())
             saved_filename = f"{resume_id}_{filename}"
             file_path = os.path.join(Config.RESUME_FOLDER, saved_filename)
-            file.save(file_path)
+            content = file.read()
             
             print(f"\n{'─'*70}")
             print(f"📄 Processing Resume {idx}/{total}: {filename}")
             print(f"{'─'*70}")
             
-            # Parse resume with advanced parser (with timing)
+            # Parse resume with advanced parser (with timing); an upload parsed before
+            # (e.g. formatted against another template) comes from the parse cache
             parse_start = time.time()
-            resume_data = parse_resume(file_path, file_type)
+            resume_data, cache_status = parse_upload(content, filename, file_type, file_path, parse_resume)
             parse_time = time.time() - parse_start
-            print(f"  ⏱️  Parsing took: {parse_time:.2f}s")
+            if cache_status == 'hit':
+                print(f"  ♻️  Parse cache hit - parsing skipped ({parse_time:.2f}s)")
+            else:
+                print(f"  ⏱️  Parsing took: {parse_time:.2f}s")
             
             # Add CAI contact data if provided (multiple contacts preferred)
             if cai_contacts:
@@ -278,11 +304,13 @@ def format_resumes():
                             'filename': docx_filename,
                             'original': filename,
                             'name': resume_data['name'],
-                            'template_name': template.get('name', 'resume')
+                            'template_name': template.get('name', 'resume'),
+                            'parse_cache': cache_status
                         }
                         print(f"✅ Successfully formatted: {filename} → {docx_filename}\n")
                         
                         # Cleanup
+                        release_candidate_document(file_path)
                         try:
                             os.remove(file_path)
                         except:
@@ -297,6 +325,7 @@ def format_resumes():
                 print(f"❌ Failed to parse resume: {filename}\n")
             
             # Cleanup on failure
+            release_candidate_document(file_path)
             try:
                 os.remove(file_path)
             except:
@@ -538,6 +567,21 @@ def delete_template(template_id):
             file_path = os.path.join(Config.TEMPLATE_FOLDER, template['filename'])
             if os.path.exists(file_path):
                 os.remove(file_path)
+            try:
+                from utils.template_section_index import delete_template_section_index
+                delete_template_section_index(file_path)
+            except Exception:
+                pass
+            try:
+                from utils.fill_plan import delete_template_fill_plan
+                delete_template_fill_plan(file_path)
+            except Exception:
+                pass
+            try:
+                from utils.template_cache import evict_template
+                evict_template(file_path)
+            except Exception:
+                pass
             db.delete_template(template_id)
         return jsonify({'success': True})
     except Exception as e:
@@ -23,10 +23,71 @@ class Config:
     # ML Model Optimization
     CACHE_ML_MODELS = True  # Cache ML models in memory (faster but uses more RAM)
     USE_LIGHTWEIGHT_MODEL = True  # Use faster, smaller ML model
-    BATCH_ENCODE = True  # Encode multiple texts at once (faster)
+    BATCH_ENCODE = True  # Encode multiple texts at once (faster) - merges concurrent encode calls
+    ENCODE_MAX_BATCH = 64  # Max texts per merged model call
+    ENCODE_MAX_WAIT_MS = 3  # How long a call waits for other threads to join its batch
     MAX_TEXT_LENGTH = 512  # Limit text length for ML processing (faster)
     ENABLE_GPU = False  # Use GPU if available (set to True if you have CUDA)
     
+    # Fast heading classifier (char n-grams + linear model, no torch): tried before the
+    # transformer; retrain after editing synonym tables: python -m utils.heading_classifier
+    USE_FAST_HEADING_CLASSIFIER = True
+    HEADING_CLASSIFIER_THRESHOLD = 0.7  # Below this confidence the transformer decides
+    
+    # spaCy entity signals (DATE/ORG) for unheaded content: one nlp.pipe per resume, cached
+    ENTITY_CACHE_ENTRIES = 2048  # Per-worker LRU keyed by content hash
+    
+    # Heading memo: heading → section matches shared across requests, scoped per template,
+    # model and threshold; optionally persisted so workers start warm
+    HEADING_MEMO_ENTRIES = 20000
+    PERSIST_HEADING_MEMO = False  # Save to HEADING_MEMO_PATH (and load on start)
+    HEADING_MEMO_PATH = os.path.join(BASE_DIR, 'cache', 'heading_memo.json')
+    
+    # PDF text extraction: 'pdfplumber' (original extractor), 'pymupdf' (fast, same lines
+    # as pdfplumber on generated PDFs) or 'pymupdf-layout' (reads two-column regions column
+    # by column). PyMuPDF is opt-in per deployment until parity has been recorded on a real
+    # resume corpus: python -m utils.pdf_text compare <folder>
+    PDF_TEXT_ENGINE = 'pdfplumber'
+    PDF_PARALLEL_MIN_PAGES = 12  # Longer PDFs are split into page ranges across a process pool
+    PDF_EXTRACT_WORKERS = 4  # Pool size (1 = always extract in-process)
+    
+    # Parse cache: parse_resume results keyed by SHA-256 of the upload + parser version,
+    # so formatting the same resume against another template skips parsing
+    USE_PARSE_CACHE = True
+    PARSE_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'parse_cache.db')
+    PARSE_CACHE_MAX_ENTRIES = 2000
+    PARSE_CACHE_MAX_MB = 200
+    PARSE_CACHE_TTL_HOURS = 72
+    
+    # Template fill plans: discovery (anchors, section order, skills tables, CAI CONTACT
+    # block) compiled once per template and stored next to it as <template>.plan.json
+    USE_TEMPLATE_FILL_PLAN = True
+    
+    # Parsed templates kept in memory; each resume edits a clone of the main document
+    # (styles, numbering, theme and media are shared). Budget in uncompressed package MB,
+    # plus ready clones per template refilled in the background
+    USE_TEMPLATE_CACHE = True
+    TEMPLATE_CACHE_MB = 64
+    TEMPLATE_CLONE_POOL = 2
+    
+    # Sentence encoder backend: 'torch' (FP32), 'int8' (dynamic quantization),
+    # 'onnx' or 'onnx-int8' (export first: python -m utils.encoder_backends export)
+    ENCODER_BACKEND = 'torch'
+    ONNX_MODEL_DIR = os.path.join(BASE_DIR, 'cache', 'onnx')
+    
+    # Shared embedding server: one model process serves every gunicorn worker
+    # (startup.sh starts it; workers fall back to a local model if it is down)
+    USE_EMBEDDING_SERVER = False
+    EMBEDDING_SERVER_SOCKET = os.path.join(BASE_DIR, 'cache', 'embedding.sock')
+    EMBEDDING_SERVER_MAX_BATCH = 64  # Max texts per model call
+    EMBEDDING_SERVER_MAX_WAIT_MS = 5  # Wait this long to merge concurrent requests
+    
+    # Embedding cache (shared by all workers, survives restarts)
+    PERSIST_EMBEDDINGS = True  # Keep encoded headings on disk
+    EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, 'cache', 'embeddings')
+    EMBEDDING_CACHE_MEMORY_ENTRIES = 5000  # In-memory LRU size per worker
+    EMBEDDING_CACHE_DISK_ENTRIES = 50000  # Max rows per model on disk (~75MB for MiniLM)
+    
     @staticmethod
     def init_app(app):
         for folder in [Config.TEMPLATE_FOLDER, Config.RESUME_FOLDER, Config.OUTPUT_FOLDER]:
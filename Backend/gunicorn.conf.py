@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for the Resume Formatter backend
+    gunicorn -c gunicorn.conf.py app:app   (startup.sh)
+
+Every worker warms its ML models in a background thread as soon as the app is
+imported, so it accepts requests immediately. Until the warm-up finishes,
+resumes go through the rule-based tiers; /api/health reports the state.
+Models are never loaded in the master (forking a process with live torch
+thread pools can deadlock the workers).
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+timeout = 600
+accesslog = '-'
+errorlog = '-'
+
+# GUNICORN_PRELOAD=1 imports the app once in the master (faster worker boot)
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+
+
+def _start_warmup(worker):
+    try:
+        from utils.model_cache import start_background_prewarm
+        start_background_prewarm()
+    except Exception as e:
+        worker.log.warning(f"Model warm-up not started: {e}")
+
+
+def post_fork(server, worker):
+    # App already imported in the master: warm up right away
+    if server.cfg.preload_app:
+        _start_warmup(worker)
+
+
+def post_worker_init(worker):
+    # App imported by the worker itself: warm up once the import is done
+    if not worker.cfg.preload_app:
+        _start_warmup(worker)
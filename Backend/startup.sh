@@ -13,12 +13,22 @@ echo "=========================================="
 echo "📦 Checking spaCy language model..."
 python -m spacy download en_core_web_sm --quiet 2>/dev/null || echo "✅ spaCy model already installed"
 
+# Shared embedding server (Config.USE_EMBEDDING_SERVER): one model for all workers
+if python -c "from config import Config; exit(0 if Config.USE_EMBEDDING_SERVER else 1)" 2>/dev/null; then
+    echo "🧠 Starting shared embedding server..."
+    python -m utils.embedding_server &
+    python -m utils.embedding_server --wait 180 || echo "⚠️  Workers will load their own models"
+fi
+
+WORKERS=${GUNICORN_WORKERS:-2}
+
 # Start Gunicorn server
 echo "🌐 Starting Gunicorn server..."
 echo "   - Binding to: 0.0.0.0:8000"
-echo "   - Workers: 2"
+echo "   - Workers: $WORKERS"
 echo "   - Timeout: 600 seconds"
+echo "   - Models: warmed in the background (rule-based parsing until ready)"
 echo "=========================================="
 
-# Start the application with Gunicorn
-gunicorn --bind=0.0.0.0:8000 --timeout 600 --workers 2 --access-logfile '-' --error-logfile '-' app:app
+# Start the application with Gunicorn (gunicorn.conf.py warms models in each worker)
+GUNICORN_WORKERS=$WORKERS gunicorn -c gunicorn.conf.py app:app
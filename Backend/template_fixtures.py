@@ -0,0 +1,75 @@
+"""
+Shared fixtures for the template formatting tests
+One sample resume and one builder for small CAI-style templates, used by
+test_body_index.py, test_fill_plan.py and test_template_cache.py
+"""
+
+import copy
+from typing import Optional, Sequence, Tuple
+
+from docx import Document
+
+RESUME = {
+    'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '(555) 111-2222',
+    'summary': 'Engineer with ten years of experience.',
+    'experience': [{'company': 'Acme Corp', 'role': 'Senior Engineer', 'duration': '2018-Present',
+                    'details': ['Led migration of legacy systems to AWS']}],
+    'education': [{'degree': 'B.S. Computer Science', 'institution': 'Georgia Tech', 'year': '2012'}],
+    'skills': ['Python', 'SQL'], 'sections': {},
+    'cai_contacts': [{'name': 'Rita Recruiter', 'phone': '555-0000', 'email': 'rita@example.com'}],
+}
+
+SECTIONS = (('PROFESSIONAL SUMMARY', '<Summary text here>'),
+            ('EMPLOYMENT HISTORY', '• sample bullet'),
+            ('EDUCATION', '<Degree>, <School>, <Year>'))
+
+
+def make_resume(**overrides) -> dict:
+    """Fresh copy of RESUME with top-level fields replaced"""
+    resume = copy.deepcopy(RESUME)
+    resume.update(overrides)
+    return resume
+
+
+def instruction_lines(count: int, blank_every_other: bool = False) -> list:
+    """Template instruction text; optionally every other line left empty"""
+    return ['' if blank_every_other and i % 2 else f'Instruction line {i}' for i in range(count)]
+
+
+def make_template(path: str, sections: Sequence[Tuple[str, str]] = SECTIONS,
+                  filler: Sequence[str] = (), cai_lines: Sequence[str] = ('Old Recruiter',),
+                  contact_gap: int = 0, name_placeholder: str = '<CANDIDATE NAME>',
+                  header: Optional[str] = None, skills_table: bool = False):
+    """
+    Save a template: bold CAI CONTACT block, candidate name, then one bold heading,
+    one placeholder line and the filler lines per section.
+
+    Args:
+        path: Where to save the .docx
+        sections: (heading, placeholder line) pairs
+        filler: Lines added after every section's placeholder line
+        cai_lines: Recruiter lines under CAI CONTACT (replaced when formatting)
+        contact_gap: Empty paragraphs between the CAI block and the candidate name
+        name_placeholder: Candidate name paragraph
+        header: Text of the first page header
+        skills_table: Append a Skill / Years Used / Last Used table
+    """
+    doc = Document()
+    if header is not None:
+        doc.sections[0].header.paragraphs[0].text = header
+    doc.add_paragraph('CAI CONTACT').runs[0].bold = True
+    for line in cai_lines:
+        doc.add_paragraph(line)
+    for _ in range(contact_gap):
+        doc.add_paragraph('')
+    doc.add_paragraph(name_placeholder)
+    for heading, line in sections:
+        doc.add_paragraph(heading).runs[0].bold = True
+        doc.add_paragraph(line)
+        for text in filler:
+            doc.add_paragraph(text)
+    if skills_table:
+        table = doc.add_table(rows=2, cols=3)
+        for cell, text in zip(table.rows[0].cells, ['Skill', 'Years Used', 'Last Used']):
+            cell.text = text
+    doc.save(path)
@@ -0,0 +1,139 @@
+"""
+Test the batched classification path of EnhancedSectionClassifier
+The batch engine must map every section exactly like the one-at-a-time path.
+Uses a deterministic fake encoder so the semantic tier runs without ML libraries.
+"""
+
+import sys
+import os
+import glob
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embedding_cache import EmbeddingCache
+import utils.embedding_cache as embedding_cache
+import utils.template_section_index as template_section_index
+from utils.enhanced_section_classifier import EnhancedSectionClassifier
+from utils.heading_memo import get_heading_memo
+from utils.enhanced_formatter_integration import build_sections_to_classify
+from utils.advanced_resume_parser import parse_resume
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Resume formatter samples")
+
+TEMPLATE_SECTIONS = ['SUMMARY', 'EMPLOYMENT HISTORY', 'EDUCATION', 'SKILLS', 'CERTIFICATIONS']
+
+# Headings that get past the exact/normalize/fuzzy tiers and reach the semantic tier
+ODD_SECTIONS = [
+    {'heading': 'Where I Have Worked', 'content': 'Managed a team of engineers. 2019 - 2023', 'position': 0},
+    {'heading': 'Toolbox', 'content': 'Python, Java, SQL, AWS, Azure, React', 'position': 1},
+    {'heading': 'Schooling', 'content': 'Bachelor of Science, State University, 2015', 'position': 2},
+    {'heading': 'Toolbox', 'content': 'Proficient in Jira and Rally', 'position': 3},
+    {'heading': None, 'content': 'Certified Scrum Master certification from Scrum Alliance', 'position': 4},
+    {'heading': 'Misc', 'content': 'short', 'position': 5},
+]
+
+
+class FakeEncoder:
+    """Counts encode calls and returns a stable unit vector per text"""
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        rows = []
+        for text in texts:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(' '.join(text.lower().split())))
+            vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            rows.append(vec / np.linalg.norm(vec))
+        return np.stack(rows)
+
+
+def _classifier(model):
+    embedding_cache._cache_instance = EmbeddingCache(directory=None)
+    template_section_index._indexes.clear()
+    get_heading_memo().clear()
+    classifier = EnhancedSectionClassifier(confidence_threshold=0.3)
+    EnhancedSectionClassifier._sentence_model = model
+    return classifier
+
+
+def _sequential_results(classifier, sections, template_sections):
+    """Reference: the original one-section-at-a-time path"""
+    return [classifier.classify_section(s.get('heading'), s.get('content', ''),
+                                        s.get('position', i), template_sections)
+            for i, s in enumerate(sections)]
+
+
+def _assert_same_results(actual, expected, name):
+    """Identical decisions; scores may differ in the last bit (batched vs single matmul)"""
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        for key in ('matched_section', 'method', 'uncertain'):
+            assert got[key] == want[key], f"{name}: {got} != {want}"
+        assert np.isclose(got['confidence'], want['confidence'], atol=1e-6), f"{name}: {got} != {want}"
+
+
+def _sample_section_lists():
+    section_lists = [('synthetic', ODD_SECTIONS)]
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.docx"))):
+        resume_data = parse_resume(path, 'docx')
+        section_lists.append((os.path.basename(path), build_sections_to_classify(resume_data)))
+    return section_lists
+
+
+def test_batch_matches_sequential():
+    """Same result per section and same mapping as classify_section in a loop"""
+    print("\n" + "="*70)
+    print("TEST 1: Batch / sequential parity over sample resumes")
+    print("="*70)
+
+    original_model = EnhancedSectionClassifier._sentence_model
+    try:
+        for name, sections in _sample_section_lists():
+            for model in (FakeEncoder(), None):
+                classifier = _classifier(model)
+                expected = _sequential_results(classifier, sections, TEMPLATE_SECTIONS)
+                classifier = _classifier(model)
+                actual = classifier.classify_sections(sections, TEMPLATE_SECTIONS)
+                _assert_same_results(actual, expected, name)
+
+                mapped = classifier.batch_classify(sections, TEMPLATE_SECTIONS)
+                expected_mapped = {r['matched_section']: s.get('content', '')
+                                   for s, r in zip(sections, expected) if r['matched_section']}
+                assert {k: v for k, v in mapped.items() if k != '_uncertain'} == expected_mapped
+            print(f"  ✓ {name}: {len(sections)} sections identical")
+    finally:
+        EnhancedSectionClassifier._sentence_model = original_model
+
+
+def test_one_encode_call_per_batch():
+    """All unresolved headings go to the encoder together"""
+    print("\n" + "="*70)
+    print("TEST 2: One encode call for unresolved headings")
+    print("="*70)
+
+    original_model = EnhancedSectionClassifier._sentence_model
+    try:
+        model = FakeEncoder()
+        classifier = _classifier(model)
+        classifier.classify_sections(ODD_SECTIONS, TEMPLATE_SECTIONS)
+        print(f"  Encode calls: {model.calls} (template matrix + headings)")
+        assert model.calls == 2
+
+        sequential_model = FakeEncoder()
+        classifier = _classifier(sequential_model)
+        _sequential_results(classifier, ODD_SECTIONS, TEMPLATE_SECTIONS)
+        print(f"  Sequential encode calls: {sequential_model.calls}")
+        assert sequential_model.calls > model.calls
+    finally:
+        EnhancedSectionClassifier._sentence_model = original_model
+
+
+if __name__ == "__main__":
+    test_batch_matches_sequential()
+    test_one_encode_call_per_batch()
+    print("\n🎉 All batch classification tests passed!")
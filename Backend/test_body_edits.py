@@ -0,0 +1,124 @@
+"""
+Test deferred body edits
+Passes record deletes, inserts and text edits; commit applies them in one walk,
+detects conflicts and rebuilds the body index once
+"""
+
+import sys
+import os
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+from docx.oxml import OxmlElement
+
+from utils.body_edits import BodyEdits, EditConflict
+from utils.body_index import BodyIndex
+from utils.word_formatter import WordFormatter
+
+
+def _texts(doc):
+    return [p.text for p in doc.paragraphs]
+
+
+def test_edits_apply_on_commit():
+    """Nothing changes while recording; commit applies every edit in document order"""
+    print("\n" + "="*70)
+    print("TEST 1: Record then commit")
+    print("="*70)
+
+    doc = Document()
+    for i in range(8):
+        doc.add_paragraph(f'line {i}')
+    index = BodyIndex(doc)
+    paragraphs = index.paragraphs
+    new_p = OxmlElement('w:p')
+
+    with BodyEdits(index) as edits:
+        edits.delete_range(paragraphs[1], paragraphs[3])
+        edits.delete(paragraphs[1])  # twice is fine
+        edits.replace_text(paragraphs[5], 'rewritten')
+        edits.insert_after(paragraphs[6], new_p)
+        assert edits.next_sibling(paragraphs[0]) is paragraphs[4]._p
+        assert edits.is_deleted(paragraphs[2]) and not edits.is_deleted(paragraphs[4])
+        assert _texts(doc) == [f'line {i}' for i in range(8)]  # scans still see the original tree
+
+    assert _texts(doc) == ['line 0', 'line 4', 'rewritten', 'line 6', '', 'line 7']
+    assert index.rebuilds == 1 and [p._p for p in index.paragraphs] == [p._p for p in doc.paragraphs]
+    assert index.rebuilds == 2  # one rebuild for the whole batch
+    print(f"  ✓ {_texts(doc)}")
+
+
+def test_conflicts():
+    """Text edits under a deletion are dropped; inserts after a deletion abort the batch"""
+    print("\n" + "="*70)
+    print("TEST 2: Conflict detection")
+    print("="*70)
+
+    doc = Document()
+    first = doc.add_paragraph('keep')
+    gone = doc.add_paragraph('gone')
+    table = doc.add_table(rows=1, cols=1)
+    table.cell(0, 0).text = 'cell text'
+
+    edits = BodyEdits()
+    edits.delete(gone)
+    edits.delete(table)
+    edits.replace_text(gone, 'lost')
+    edits.replace_text(table.cell(0, 0).paragraphs[0], 'also lost')
+    edits.replace_text(first, 'kept')
+    counts = edits.commit()
+    assert counts == {'deleted': 2, 'inserted': 0, 'replaced': 1, 'conflicts': 2}
+    assert _texts(doc) == ['kept'] and not doc.tables and len(edits.conflicts) == 2
+
+    second = doc.add_paragraph('second')
+    edits = BodyEdits()
+    edits.delete(second)
+    edits.insert_after(second, OxmlElement('w:p'))
+    try:
+        edits.commit()
+        raise AssertionError("expected EditConflict")
+    except EditConflict:
+        pass
+    assert _texts(doc) == ['kept', 'second']  # nothing applied
+    print(f"  ✓ {counts}")
+
+
+def test_formatter_section_removal_is_one_batch():
+    """Removing a section (content, trailing tables, heading) and the empty-paragraph
+    cleanup each rebuild the formatter's body index once"""
+    print("\n" + "="*70)
+    print("TEST 3: Formatter passes")
+    print("="*70)
+
+    doc = Document()
+    doc.add_paragraph('SUMMARY')
+    heading = doc.add_paragraph('SKILLS')
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = 'old skills'
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = 'more old skills'
+    doc.add_paragraph('EDUCATION')
+    for _ in range(30):
+        doc.add_paragraph('')
+    doc.add_paragraph('END')
+
+    formatter = WordFormatter.__new__(WordFormatter)
+    index = formatter._index(doc)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        formatter._clear_section(heading, max_scan=50, remove_heading=True)
+    assert _texts(doc)[:2] == ['SUMMARY', 'EDUCATION'] and not doc.tables
+    assert [p._p for p in index.paragraphs] == [p._p for p in doc.paragraphs] and index.rebuilds == 2
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        formatter._cleanup_empty_paragraphs(doc)
+    assert _texts(doc) == ['SUMMARY', 'EDUCATION', 'END']
+    assert [p._p for p in index.paragraphs] == [p._p for p in doc.paragraphs] and index.rebuilds == 3
+    print(f"  ✓ {_texts(doc)}, {index.rebuilds} index builds")
+
+
+if __name__ == "__main__":
+    test_edits_apply_on_commit()
+    test_conflicts()
+    test_formatter_section_removal_is_one_batch()
+    print("\n🎉 All body edit tests passed!")
@@ -0,0 +1,120 @@
+"""
+Test the WordFormatter body index
+The cached paragraph list must always match doc.paragraphs, and stay linear in size
+"""
+
+import sys
+import os
+import contextlib
+import io
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from utils.body_index import BodyIndex, benchmark_scaling
+from utils.word_formatter import WordFormatter
+from template_fixtures import RESUME, SECTIONS, instruction_lines, make_template
+
+
+def _elements(paragraphs):
+    return [p._p for p in paragraphs]
+
+
+def _make_template(path):
+    make_template(path, sections=SECTIONS + (('SKILLS', '<skill list>'),),
+                  filler=instruction_lines(6, blank_every_other=True))
+
+
+def test_incremental_updates_match_document():
+    """Inserts and deletes through the formatter helpers keep the index exact"""
+    print("\n" + "="*70)
+    print("TEST 1: Incremental updates")
+    print("="*70)
+
+    doc = Document()
+    for i in range(20):
+        doc.add_paragraph(f'SECTION {i}' if i % 5 == 0 else f'line {i}')
+    table = doc.add_table(rows=1, cols=1)
+    formatter = WordFormatter.__new__(WordFormatter)
+    index = formatter._index(doc)
+    snapshot = index.paragraphs
+
+    inserted = formatter._insert_paragraph_after(index.paragraphs[4], 'inserted')
+    formatter._delete_paragraph(index.paragraphs[10])
+    formatter._insert_paragraph_after(table.cell(0, 0).paragraphs[0], 'in a cell')
+    formatter._delete_paragraph(index.paragraphs[0])
+
+    assert _elements(index.paragraphs) == _elements(doc.paragraphs)
+    assert index.rebuilds == 1
+    assert index.position(inserted) == 4 and index.position(doc.paragraphs[7]._p) == 7
+    assert len(snapshot) == 20  # a loop over the old list is not disturbed
+    assert index.blocks == [child for child in doc.element.body if child.tag.endswith(('}p', '}tbl'))]
+    later = [p.text for p in doc.paragraphs].index('SECTION 10')
+    assert index.heading_positions({'FIRST': ['SECTION 5'], 'LATER': ['SECTION']}) == {'FIRST': 5, 'LATER': later}
+    print(f"  ✓ {len(index)} paragraphs in sync, {index.rebuilds} build")
+
+
+def test_direct_edits_trigger_rebuild():
+    """Edits that bypass the helpers are noticed on the next access"""
+    print("\n" + "="*70)
+    print("TEST 2: Stale detection")
+    print("="*70)
+
+    doc = Document()
+    for i in range(10):
+        doc.add_paragraph(f'line {i}')
+    index = BodyIndex(doc)
+    doc.add_paragraph('appended')
+    first = doc.paragraphs[0]._element
+    first.getparent().remove(first)
+    assert _elements(index.paragraphs) == _elements(doc.paragraphs) and index.rebuilds == 2
+
+    # Same element count after the edit: callers invalidate explicitly
+    doc.paragraphs[0]._p.addnext(doc.paragraphs[-1]._p)
+    index.invalidate()
+    assert _elements(index.paragraphs) == _elements(doc.paragraphs)
+    print(f"  ✓ {index.rebuilds} builds")
+
+
+def test_formatter_output_and_index_agree():
+    """After a full format run the index still mirrors the document"""
+    print("\n" + "="*70)
+    print("TEST 3: Full format run")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        output = os.path.join(tmp, 'output.docx')
+        _make_template(template)
+        formatter = WordFormatter(RESUME, {'template_path': template, 'template_type': 'docx'}, output)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert formatter.format()
+        text = '\n'.join(p.text for p in Document(output).paragraphs)
+
+    index = formatter._body
+    assert _elements(index.paragraphs) == _elements(index.doc.paragraphs)
+    assert 'Rita Recruiter' in text and 'Old Recruiter' not in text
+    print(f"  ✓ {len(index)} paragraphs, {index.rebuilds} builds")
+
+
+def test_scaling_benchmark():
+    """Indexed lookups grow linearly where rescans grow quadratically"""
+    print("\n" + "="*70)
+    print("TEST 4: Scaling 50 → 1000 paragraphs")
+    print("="*70)
+
+    rows = benchmark_scaling(sizes=(50, 250, 1000))
+    for row in rows:
+        print(f"  {row}")
+    assert rows[-1]['index_ms'] < rows[-1]['rescan_ms'] / 3
+    assert rows[-1]['speedup'] > rows[0]['speedup']
+
+
+if __name__ == "__main__":
+    test_incremental_updates_match_document()
+    test_direct_edits_trigger_rebuild()
+    test_formatter_output_and_index_agree()
+    test_scaling_benchmark()
+    print("\n🎉 All body index tests passed!")
@@ -0,0 +1,115 @@
+"""
+Test the offline bulk parse command
+Folders and zips parse into JSONL, and an interrupted run picks up where it stopped
+"""
+
+import sys
+import os
+import json
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from utils.bulk_parse import bulk_parse, completed_files, iter_resume_files
+
+
+def _write_resume(path, name):
+    doc = Document()
+    doc.add_paragraph(name)
+    doc.add_paragraph(f"{name.split()[0].lower()}@example.com | (555) 111-2222")
+    doc.add_heading('PROFESSIONAL EXPERIENCE', level=1)
+    doc.add_paragraph('Senior Engineer, Acme Corp 2018 - Present')
+    doc.add_heading('SKILLS', level=1)
+    doc.add_paragraph('Python, SQL, AWS')
+    doc.save(path)
+
+
+def _make_folder(tmp):
+    folder = os.path.join(tmp, 'resumes')
+    os.makedirs(os.path.join(folder, 'batch2'))
+    _write_resume(os.path.join(folder, 'jane.docx'), 'Jane Smith')
+    _write_resume(os.path.join(folder, 'batch2', 'bob.docx'), 'Bob Jones')
+    with open(os.path.join(folder, 'batch2', 'broken.pdf'), 'wb') as f:
+        f.write(b'not a pdf')
+    with open(os.path.join(folder, 'notes.txt'), 'w') as f:
+        f.write('ignored')
+    return folder
+
+
+def _records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_folder_to_jsonl():
+    """Every resume gets one record; failures are recorded, not fatal"""
+    print("\n" + "="*70)
+    print("TEST 1: Folder → JSONL")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = _make_folder(tmp)
+        output = os.path.join(tmp, 'parsed.jsonl')
+        summary = bulk_parse(folder, output, workers=2, use_ml=False)
+        records = {r['file']: r for r in _records(output)}
+
+    print(f"  {summary}")
+    assert sorted(records) == [os.path.join('batch2', 'bob.docx'), os.path.join('batch2', 'broken.pdf'), 'jane.docx']
+    assert records['jane.docx']['status'] == 'ok'
+    assert records['jane.docx']['result']['name'] == 'Jane Smith'
+    assert records[os.path.join('batch2', 'broken.pdf')]['status'] == 'error'
+    assert summary['parsed'] == 2 and summary['failed'] == 1 and summary['files_per_sec'] > 0
+
+
+def test_resume_after_interruption():
+    """A rerun skips parsed files, retries failures and drops a half-written line"""
+    print("\n" + "="*70)
+    print("TEST 2: Checkpoint and resume")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = _make_folder(tmp)
+        output = os.path.join(tmp, 'parsed.jsonl')
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'file': 'jane.docx', 'status': 'ok', 'seconds': 0.1, 'result': {'name': 'Jane'}}) + '\n')
+            f.write('{"file": "batch2/bob.docx", "status": "o')  # killed mid-write
+
+        assert completed_files(output) == {'jane.docx'}
+        summary = bulk_parse(folder, output, workers=1, use_ml=False)
+        records = _records(output)
+
+    print(f"  {summary}")
+    assert summary['skipped'] == 1 and summary['parsed'] == 1 and summary['failed'] == 1
+    assert [r['file'] for r in records].count('jane.docx') == 1
+    assert len(records) == 3
+
+
+def test_zip_source():
+    """Zip members are parsed without unpacking the archive"""
+    print("\n" + "="*70)
+    print("TEST 3: Zip input")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = _make_folder(tmp)
+        archive = os.path.join(tmp, 'export.zip')
+        with zipfile.ZipFile(archive, 'w') as z:
+            for name in iter_resume_files(folder):
+                z.write(os.path.join(folder, name), name.replace(os.sep, '/'))
+        output = os.path.join(tmp, 'parsed.jsonl')
+        summary = bulk_parse(archive, output, workers=2, use_ml=False)
+        ok = sorted(r['result']['name'] for r in _records(output) if r['status'] == 'ok')
+
+    assert ok == ['Bob Jones', 'Jane Smith']
+    assert summary['failed'] == 1
+    print(f"  ✓ {ok}")
+
+
+if __name__ == "__main__":
+    test_folder_to_jsonl()
+    test_resume_after_interruption()
+    test_zip_source()
+    print("\n🎉 All bulk parse tests passed!")
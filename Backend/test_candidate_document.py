@@ -0,0 +1,138 @@
+"""
+Test the shared candidate document handle
+Every pipeline stage reads the same parsed DOCX instead of reopening the file
+"""
+
+import sys
+import os
+import tempfile
+import zipfile
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from utils import candidate_document, docx_stream
+from utils.advanced_resume_parser import ResumeParser
+from utils.candidate_document import (load_candidate_document, open_candidate_documents,
+                                      release_candidate_document)
+from utils.docx_stream import extract_docx_text
+from utils.intelligent_resume_parser import IntelligentResumeParser
+from utils.resume_section_integration import ResumeFormatter
+
+
+def _write_resume(path):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = 'Jane Smith | jane@example.com'
+    doc.add_heading('PROFESSIONAL SUMMARY', level=1)
+    doc.add_paragraph('Engineer with ten years of experience.')
+    doc.add_heading('TECHNICAL SKILLS', level=1)
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Python'
+    table.cell(0, 1).text = '8 years'
+    merged = table.cell(1, 0).merge(table.cell(1, 1))
+    merged.text = 'AWS, Azure'
+    heading = doc.add_paragraph()
+    heading.add_run('Employment History').bold = True
+    doc.add_paragraph('Senior Engineer, Acme Corp')
+    doc.save(path)
+
+
+def test_document_exposes_paragraphs_tables_and_text():
+    """One load gives paragraphs with heading cues, tables and the parser's raw text"""
+    print("\n" + "="*70)
+    print("TEST 1: Document handle contents")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.docx')
+        _write_resume(path)
+        document = load_candidate_document(path)
+        text = extract_docx_text(path)
+        release_candidate_document(path)
+
+    assert document.text == text
+    assert document.tables == [[['Python', '8 years'], ['AWS, Azure']]]
+    assert [p.text for p in document.headings] == ['PROFESSIONAL SUMMARY', 'TECHNICAL SKILLS', 'Employment History']
+    assert document.paragraphs[0].part == 'header'
+    assert all(p.part == 'body' for p in document.body_paragraphs)
+    print(f"  ✓ {len(document.paragraphs)} paragraphs, {len(document.tables)} table")
+
+
+def test_stages_share_one_parse():
+    """ResumeParser, IntelligentResumeParser and ResumeFormatter unzip the upload once"""
+    print("\n" + "="*70)
+    print("TEST 2: One unzip per upload")
+    print("="*70)
+
+    already_open = open_candidate_documents()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.docx')
+        _write_resume(path)
+        with mock.patch.object(docx_stream.zipfile, 'ZipFile', wraps=zipfile.ZipFile) as opened:
+            parser = ResumeParser(path, 'docx')
+            raw_text = parser._extract_docx_text()
+            intelligent = IntelligentResumeParser.__new__(IntelligentResumeParser)  # section extraction needs no models
+            sections = intelligent._extract_candidate_sections(path)
+            formatter_sections = ResumeFormatter.__new__(ResumeFormatter).extract_sections_from_docx(path)
+        assert opened.call_count == 1
+        assert parser.document is load_candidate_document(path)
+
+        release_candidate_document(path)
+        assert open_candidate_documents() == already_open
+
+    assert 'Jane Smith | jane@example.com' in raw_text
+    by_heading = {s['heading']: s['content'] for s in sections}
+    assert by_heading['TECHNICAL SKILLS'] == 'Python\n8 years\nAWS, Azure'
+    assert [s['heading'] for s in formatter_sections] == list(by_heading)
+    print(f"  ✓ 3 stages, 1 unzip: {list(by_heading)}")
+
+
+def test_replaced_file_is_reloaded():
+    """A new file at the same path never gets the old handle"""
+    print("\n" + "="*70)
+    print("TEST 3: Stale handles")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.docx')
+        _write_resume(path)
+        first = load_candidate_document(path)
+        doc = Document()
+        doc.add_paragraph('Bob Jones, a different candidate')
+        doc.save(path)
+        os.utime(path, ns=(0, 0))
+        second = load_candidate_document(path)
+        release_candidate_document(path)
+
+    assert second is not first and second.text == 'Bob Jones, a different candidate'
+    print("  ✓ Reloaded after the file changed")
+
+
+def test_open_handles_bounded_by_size():
+    """Older handles are evicted once their paragraphs pass the byte budget"""
+    print("\n" + "="*70)
+    print("TEST 4: Byte-bounded handle cache")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(candidate_document, '_documents', candidate_document.OrderedDict()):
+        paths = [os.path.join(tmp, f'resume{i}.docx') for i in range(3)]
+        for path in paths:
+            _write_resume(path)
+        first = load_candidate_document(paths[0])
+        with mock.patch.object(candidate_document, '_MAX_OPEN_BYTES', first.nbytes * 2):
+            for path in paths[1:]:
+                load_candidate_document(path)
+            assert open_candidate_documents() == 2
+            assert load_candidate_document(paths[0]) is not first
+    print(f"  ✓ {first.nbytes} bytes per handle, oldest evicted over budget")
+
+
+if __name__ == "__main__":
+    test_document_exposes_paragraphs_tables_and_text()
+    test_stages_share_one_parse()
+    test_replaced_file_is_reloaded()
+    test_open_handles_bounded_by_size()
+    print("\n🎉 All candidate document tests passed!")
@@ -0,0 +1,101 @@
+"""
+Test the tiered embedding cache
+Uses a deterministic fake encoder so no ML libraries are needed
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embedding_cache import EmbeddingCache
+
+
+class FakeEncoder:
+    """Counts encode calls and returns a stable vector per text"""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        rows = []
+        for text in texts:
+            rng = np.random.default_rng(abs(hash(' '.join(text.lower().split()))) % (2**32))
+            rows.append(rng.standard_normal(self.dim).astype(np.float32))
+        return np.stack(rows)
+
+
+def test_memory_hits_and_batching():
+    """Repeated headings are served from memory; misses go out in one batch"""
+    print("\n" + "="*70)
+    print("TEST 1: Memory tier")
+    print("="*70)
+
+    cache = EmbeddingCache(directory=None)
+    model = FakeEncoder()
+
+    first = cache.encode(model, ["PROFESSIONAL EXPERIENCE", "Education", "education"], 'fake')
+    assert first.shape == (3, model.dim)
+    assert len(model.encoded) == 2  # 'Education' and 'education' share one key
+    assert np.allclose(first[1], first[2])
+
+    again = cache.encode(model, ["professional   experience"], 'fake')
+    assert len(model.encoded) == 2
+    assert np.allclose(again[0], first[0])
+
+    stats = cache.stats()
+    print(f"  Stats: {stats}")
+    assert stats['memory_hits'] >= 1
+    assert stats['encoded'] == 2
+
+
+def test_disk_tier_survives_restart():
+    """A fresh cache instance (new worker / restart) reads rows from disk"""
+    print("\n" + "="*70)
+    print("TEST 2: Disk tier")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = FakeEncoder()
+        writer = EmbeddingCache(directory=tmp)
+        original = writer.encode(model, ["Skills", "Certifications"], 'fake')
+
+        reader = EmbeddingCache(directory=tmp)
+        model2 = FakeEncoder()
+        restored = reader.encode(model2, ["Skills", "Certifications"], 'fake')
+        print(f"  Reader encoded: {model2.encoded}, stats: {reader.stats()}")
+        assert model2.encoded == []
+        assert np.allclose(original, restored)
+        assert reader.stats()['disk_hits'] == 2
+
+        # Rows appended by another worker are picked up without restarting
+        writer.encode(model, ["Projects"], 'fake')
+        assert reader.get('fake', "Projects") is not None
+
+        warmed = EmbeddingCache(directory=tmp)
+        assert warmed.warm('fake') == 3
+
+
+def test_memory_tier_is_bounded():
+    """The in-memory LRU never exceeds its size limit"""
+    print("\n" + "="*70)
+    print("TEST 3: Bounded LRU")
+    print("="*70)
+
+    cache = EmbeddingCache(directory=None, max_memory_entries=4)
+    model = FakeEncoder()
+    cache.encode(model, [f"heading {i}" for i in range(10)], 'fake')
+    assert cache.stats()['memory_entries'] == 4
+    print("  ✓ Memory tier capped at 4 entries")
+
+
+if __name__ == "__main__":
+    test_memory_hits_and_batching()
+    test_disk_tier_survives_restart()
+    test_memory_tier_is_bounded()
+    print("\n🎉 All embedding cache tests passed!")
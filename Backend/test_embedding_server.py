@@ -0,0 +1,117 @@
+"""
+Test the shared embedding server
+Runs the server in-process on a temporary Unix socket with a fake encoder
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embedding_server import EmbeddingServer, RemoteEncoder, connect_remote_encoder
+
+
+class FakeEncoder:
+    """Records each model call and returns a stable vector per text"""
+
+    cache_name = 'fake-model@onnx'
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def encode(self, texts, **kwargs):
+        with self.lock:
+            self.calls.append(list(texts))
+        rows = []
+        for text in texts:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(text))
+            rows.append(np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32))
+        return np.stack(rows)
+
+
+def _start_server(tmp, model, **kwargs):
+    path = os.path.join(tmp, 'emb.sock')
+    server = EmbeddingServer(path, model, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, path
+
+
+def test_remote_encode_matches_local():
+    """Rows from the server are identical to calling the model directly"""
+    print("\n" + "="*70)
+    print("TEST 1: Remote encode parity")
+    print("="*70)
+
+    model = FakeEncoder()
+    with tempfile.TemporaryDirectory() as tmp:
+        server, path = _start_server(tmp, model)
+        try:
+            remote = RemoteEncoder(path)
+            assert remote.cache_name == 'fake-model@onnx'
+            assert remote.dim == model.dim
+
+            texts = ["Work Experience", "Education", "Technical Skills"]
+            assert np.allclose(remote.encode(texts), model.encode(texts))
+            assert np.allclose(remote.encode("Education"), model.encode(["Education"])[0])
+            assert remote.encode([]).shape == (0, model.dim)
+            print("  ✓ Same rows, identity and dimension as the local model")
+        finally:
+            server.shutdown()
+        assert not os.path.exists(path)
+
+
+def test_concurrent_requests_are_micro_batched():
+    """Requests from many workers within the wait window share model calls"""
+    print("\n" + "="*70)
+    print("TEST 2: Micro-batching across clients")
+    print("="*70)
+
+    model = FakeEncoder()
+    with tempfile.TemporaryDirectory() as tmp:
+        server, path = _start_server(tmp, model, max_batch=64, max_wait_ms=50)
+        try:
+            model.calls.clear()
+            barrier = threading.Barrier(8)
+            results = {}
+
+            def worker(i):
+                remote = RemoteEncoder(path)
+                barrier.wait()
+                results[i] = remote.encode([f"heading {i}", f"content {i}"])
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            print(f"  16 texts from 8 clients → {len(model.calls)} model call(s)")
+            assert len(model.calls) < 8
+            for i in range(8):
+                assert np.allclose(results[i], model.encode([f"heading {i}", f"content {i}"]))
+        finally:
+            server.shutdown()
+
+
+def test_unreachable_server_returns_none():
+    """Workers fall back to a local model when no server is listening"""
+    print("\n" + "="*70)
+    print("TEST 3: Missing server")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert connect_remote_encoder(os.path.join(tmp, 'missing.sock')) is None
+    print("  ✓ No server → None")
+
+
+if __name__ == "__main__":
+    test_remote_encode_matches_local()
+    test_concurrent_requests_are_micro_batched()
+    test_unreachable_server_returns_none()
+    print("\n🎉 All embedding server tests passed!")
@@ -0,0 +1,110 @@
+"""
+Test the micro-batching encode scheduler
+Concurrent callers must share model calls and still get exactly their own rows
+"""
+
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.encode_scheduler import EncodeScheduler
+
+
+class FakeEncoder:
+    """Records each model call and returns a stable vector per text"""
+
+    def __init__(self, dim=8, fail=False):
+        self.dim = dim
+        self.fail = fail
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        rows = []
+        for text in texts:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(text))
+            rows.append(np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32))
+        return np.stack(rows)
+
+
+def test_concurrent_calls_share_batches():
+    """Requests from parallel resume threads are merged into few model calls"""
+    print("\n" + "="*70)
+    print("TEST 1: Concurrent calls are batched")
+    print("="*70)
+
+    model = FakeEncoder()
+    scheduler = EncodeScheduler(model, max_batch=64, max_wait_ms=50)
+    barrier = threading.Barrier(8)
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = scheduler.encode([f"heading {i}", f"line {i}", f"skill {i}"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.stop()
+
+    stats = scheduler.stats()
+    print(f"  24 texts from 8 threads → {len(model.calls)} model call(s); stats: {stats}")
+    assert len(model.calls) < 8
+    for i in range(8):
+        assert np.allclose(results[i], FakeEncoder().encode([f"heading {i}", f"line {i}", f"skill {i}"]))
+    assert stats['requests'] == 8
+    assert stats['texts'] == 24
+    assert stats['avg_requests_per_batch'] > 1
+
+
+def test_bulk_request_skips_wait():
+    """A request that fills a batch on its own is dispatched immediately"""
+    print("\n" + "="*70)
+    print("TEST 2: Bulk requests")
+    print("="*70)
+
+    model = FakeEncoder()
+    scheduler = EncodeScheduler(model, max_batch=16, max_wait_ms=2000)
+    start = time.time()
+    vectors = scheduler.encode([f"bullet {i}" for i in range(100)])
+    elapsed = time.time() - start
+    scheduler.stop()
+
+    print(f"  100 texts in {elapsed*1000:.1f}ms")
+    assert vectors.shape == (100, model.dim)
+    assert elapsed < 1.0
+    assert scheduler.stats()['bulk_requests'] == 1
+
+
+def test_errors_reach_every_caller():
+    """A failing model call raises in the caller instead of hanging"""
+    print("\n" + "="*70)
+    print("TEST 3: Error propagation")
+    print("="*70)
+
+    scheduler = EncodeScheduler(FakeEncoder(fail=True), max_batch=8, max_wait_ms=1)
+    try:
+        scheduler.encode(["anything"])
+        assert False, "expected the model error"
+    except RuntimeError as e:
+        assert "model crashed" in str(e)
+    finally:
+        scheduler.stop()
+    assert scheduler.stats()['errors'] == 1
+    print("  ✓ Model error raised in caller")
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_batches()
+    test_bulk_request_skips_wait()
+    test_errors_reach_every_caller()
+    print("\n🎉 All encode scheduler tests passed!")
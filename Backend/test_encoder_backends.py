@@ -0,0 +1,139 @@
+"""
+Test the pluggable sentence encoder backends
+Covers backend identities, cache separation and the parity report math
+using deterministic fake encoders (no torch / onnxruntime needed)
+"""
+
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embedding_cache import EmbeddingCache
+import utils.embedding_cache as embedding_cache
+import utils.model_registry as model_registry
+import utils.template_section_index as template_section_index
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, model_identity, sentence_model_identity
+from utils.template_section_index import get_section_index, load_template_section_index
+from utils.encoder_backends import compare_encoders, labelled_headings
+
+
+class FakeEncoder:
+    """Stable unit vector per text, optionally perturbed like a quantized model"""
+
+    def __init__(self, cache_name=None, noise=0.0, dim=32):
+        if cache_name:
+            self.cache_name = cache_name
+        self.noise = noise
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        rows = []
+        for text in texts:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(' '.join(text.lower().split())))
+            rng = np.random.default_rng(seed)
+            vec = rng.standard_normal(self.dim).astype(np.float32)
+            vec += self.noise * rng.standard_normal(self.dim).astype(np.float32)
+            rows.append(vec / np.linalg.norm(vec))
+        return np.stack(rows)
+
+
+def test_backend_identities():
+    """FP32 torch keeps the plain model name; other backends get their own identity"""
+    print("\n" + "="*70)
+    print("TEST 1: Backend identities")
+    print("="*70)
+
+    assert sentence_model_identity(DEFAULT_SENTENCE_MODEL, 'torch') == DEFAULT_SENTENCE_MODEL
+    assert sentence_model_identity(DEFAULT_SENTENCE_MODEL, 'onnx-int8') == f"{DEFAULT_SENTENCE_MODEL}@onnx-int8"
+    assert model_identity(object()) == DEFAULT_SENTENCE_MODEL
+    assert model_identity(FakeEncoder('m@int8')) == 'm@int8'
+    print("  ✓ Identities resolved")
+
+
+def test_backends_never_share_embeddings():
+    """Cache rows and template matrices are kept apart per backend"""
+    print("\n" + "="*70)
+    print("TEST 2: Cache separation between backends")
+    print("="*70)
+    embedding_cache._cache_instance = EmbeddingCache(directory=None)
+
+    fp32 = FakeEncoder(DEFAULT_SENTENCE_MODEL)
+    int8 = FakeEncoder(f"{DEFAULT_SENTENCE_MODEL}@int8", noise=0.1)
+
+    embedding_cache.encode_cached(fp32, ["Work History"])
+    embedding_cache.encode_cached(int8, ["Work History"])
+    assert fp32.encoded == ["Work History"]
+    assert int8.encoded == ["Work History"]
+
+    sections = ["SUMMARY", "EDUCATION", "SKILLS"]
+    assert get_section_index(sections, fp32) is not get_section_index(sections, int8)
+    print("  ✓ Each backend encodes and indexes its own rows")
+
+
+def test_parity_report():
+    """Agreement, accuracy and cosine figures from the labelled heading set"""
+    print("\n" + "="*70)
+    print("TEST 3: Parity report")
+    print("="*70)
+
+    pairs = labelled_headings()
+    headings = [h for h, _ in pairs]
+    labels = [l for _, l in pairs]
+    assert 'qualifications' not in headings  # listed under education and certifications
+    assert ('technical skills', 'skills') in pairs
+
+    same = compare_encoders(FakeEncoder(), FakeEncoder(), headings, labels)
+    print(f"  Identical encoders: agreement={same['agreement']}, cosine={same['min_cosine']}")
+    assert same['agreement'] == 1.0
+    assert same['disagreements'] == []
+    assert same['min_cosine'] > 0.999
+
+    noisy = compare_encoders(FakeEncoder(), FakeEncoder(noise=0.5), headings, labels)
+    print(f"  Noisy encoder: agreement={noisy['agreement']}, cosine={noisy['mean_cosine']}")
+    assert noisy['headings'] == len(headings)
+    assert noisy['mean_cosine'] < 1.0
+    assert len(noisy['disagreements']) == round((1 - noisy['agreement']) * len(headings))
+
+
+def test_fallback_backend_reuses_template_index():
+    """A configured ONNX backend that fell back to torch still hits the built index"""
+    print("\n" + "="*70)
+    print("TEST 4: Template index under backend fallback")
+    print("="*70)
+    embedding_cache._cache_instance = EmbeddingCache(directory=None)
+
+    fallback = FakeEncoder(DEFAULT_SENTENCE_MODEL)  # load_sentence_encoder names the real backend
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(model_registry, 'sentence_backend', return_value='onnx'), \
+            mock.patch.object(template_section_index, '_shared_sentence_model', return_value=fallback), \
+            mock.patch.object(template_section_index, '_indexes', template_section_index.OrderedDict()):
+        template_path = os.path.join(tmp, 'template.docx')
+        analysis = {'template_path': template_path,
+                    'sections': [{'heading': 'SUMMARY'}, {'heading': 'EDUCATION'}]}
+        first = load_template_section_index(analysis)
+        sidecar_mtime = os.stat(template_section_index.sidecar_path(template_path)).st_mtime_ns
+        encoded = len(fallback.encoded)
+
+        for _ in range(3):
+            assert load_template_section_index(analysis) is first
+        template_section_index._indexes.clear()  # next worker: loads the sidecar instead
+        assert load_template_section_index(analysis).fingerprint == first.fingerprint
+
+        assert len(fallback.encoded) == encoded
+        assert os.stat(template_section_index.sidecar_path(template_path)).st_mtime_ns == sidecar_mtime
+    print(f"  ✓ Built once as {first.model_name}, reused from memory and from the sidecar")
+
+
+if __name__ == "__main__":
+    test_backend_identities()
+    test_backends_never_share_embeddings()
+    test_parity_report()
+    test_fallback_backend_reuses_template_index()
+    print("\n🎉 All encoder backend tests passed!")
@@ -0,0 +1,108 @@
+"""
+Test the batched entity-signal detector
+Uses a fake spaCy pipeline that records every pipe() call
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.entity_signals import EntitySignalDetector, EntitySignals, regex_signals
+
+
+class FakeEntity:
+    def __init__(self, label):
+        self.label_ = label
+
+
+class FakeDoc:
+    def __init__(self, text):
+        self.ents = []
+        if 'Acme' in text:
+            self.ents.append(FakeEntity('ORG'))
+        if '2019' in text or 'years' in text:
+            self.ents.append(FakeEntity('DATE'))
+
+
+class FakeNLP:
+    """Tags 'Acme' as ORG and '2019'/'years' as DATE; records each pipe() batch"""
+
+    def __init__(self):
+        self.batches = []
+
+    def pipe(self, texts, batch_size=32):
+        texts = list(texts)
+        self.batches.append(texts)
+        return [FakeDoc(t) for t in texts]
+
+
+def test_regex_short_circuit():
+    """Obvious cases are settled without spaCy"""
+    print("\n" + "="*70)
+    print("TEST 1: Regex short-circuit")
+    print("="*70)
+
+    assert regex_signals("Python, Java, SQL, Docker, Kubernetes") == EntitySignals(False, False)
+    assert regex_signals("Software Engineer, Initech Solutions Inc.\nJan 2018 - Present") == EntitySignals(True, True)
+    assert regex_signals("Worked at Acme in 2019") is None
+    print("  ✓ Skills list and obvious job entry skip spaCy")
+
+
+def test_one_pipe_call_per_resume():
+    """All sections needing NER share one nlp.pipe() call; results keep input order"""
+    print("\n" + "="*70)
+    print("TEST 2: Batched NER")
+    print("="*70)
+
+    nlp = FakeNLP()
+    detector = EntitySignalDetector(nlp)
+    sections = [
+        "Developer at Acme since 2019",
+        "Python, Java, SQL",
+        "Volunteer at Acme for two years",
+        "Software Engineer, Initech Solutions Inc.\nJan 2018 - Present",
+        "Developer at Acme since 2019",
+    ]
+    signals = detector.signals_many(sections)
+
+    print(f"  {len(sections)} sections → {len(nlp.batches)} pipe call, {len(nlp.batches[0])} docs")
+    assert len(nlp.batches) == 1
+    assert nlp.batches[0] == ["Developer at Acme since 2019", "Volunteer at Acme for two years"]
+    assert signals == [EntitySignals(True, True), EntitySignals(False, False), EntitySignals(True, True),
+                       EntitySignals(True, True), EntitySignals(True, True)]
+
+
+def test_cache_by_content_hash():
+    """Repeated content is answered from the bounded cache"""
+    print("\n" + "="*70)
+    print("TEST 3: Content-hash cache")
+    print("="*70)
+
+    nlp = FakeNLP()
+    detector = EntitySignalDetector(nlp, max_entries=2)
+    detector.prefetch(["Worked at Acme in 2019"])
+    assert detector.signals("Worked at Acme in 2019") == EntitySignals(True, True)
+    assert len(nlp.batches) == 1
+    assert detector.stats()['hits'] == 1
+
+    detector.signals_many(["Consultant at Acme 2019", "Intern at Acme 2019"])
+    stats = detector.stats()
+    print(f"  stats: {stats}")
+    assert stats['entries'] == 2
+    detector.signals("Worked at Acme in 2019")  # evicted → NER again
+    assert len(nlp.batches) == 3
+
+
+def test_without_spacy():
+    """No pipeline: undecided text reports no entities"""
+    detector = EntitySignalDetector(None)
+    assert detector.signals("Worked at Acme in 2019") == EntitySignals(False, False)
+
+
+if __name__ == "__main__":
+    test_regex_short_circuit()
+    test_one_pipe_call_per_resume()
+    test_cache_by_content_hash()
+    test_without_spacy()
+    print("\n🎉 All entity signal tests passed!")
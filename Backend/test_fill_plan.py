@@ -0,0 +1,106 @@
+"""
+Test template fill plans
+Discovery runs once per template, and formatting from the plan gives the same document
+"""
+
+import sys
+import os
+import contextlib
+import io
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from config import Config
+from utils import fill_plan
+from utils.fill_plan import build_template_fill_plan, fill_plan_stats, load_fill_plan, sidecar_path
+from utils.word_formatter import WordFormatter
+from template_fixtures import make_resume, make_template
+
+RESUME = make_resume(sections={'languages': ['Spanish']})
+
+
+def _make_template(path):
+    # 'Old Recruiter Profile' is removed with the CAI block
+    make_template(path, filler=[''], cai_lines=['Old Recruiter Profile', 'Phone: 555'],
+                  contact_gap=8, name_placeholder='<Candidate Name>', skills_table=True)
+
+
+def _format(template, output):
+    formatter = WordFormatter(RESUME, {'template_path': template, 'template_type': 'docx'}, output)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert formatter.format()
+    return zipfile.ZipFile(output).read('word/document.xml')
+
+
+def test_plan_contents_and_sidecar():
+    """The plan records anchors, tables, CAI layout and placeholders, and reloads from disk"""
+    print("\n" + "="*70)
+    print("TEST 1: Compile and reload")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        _make_template(template)
+        with contextlib.redirect_stdout(io.StringIO()):
+            meta = build_template_fill_plan(template)
+        assert meta['file'] == os.path.basename(sidecar_path(template))
+
+        fill_plan._plans.clear()
+        before = fill_plan_stats()
+        plan = load_fill_plan(template)
+        after = fill_plan_stats()
+
+        assert after['sidecar_loads'] == before['sidecar_loads'] + 1 and after['compiled'] == before['compiled']
+        assert plan.section_order == ['SUMMARY', 'EMPLOYMENT', 'EDUCATION']
+        assert plan.section_candidates['SUMMARY'] == [1, 12, 13]  # 'Recruiter Profile', heading, placeholder
+        assert plan.table_roles == ['skills']
+        assert plan.cai_in_header_area and plan.cai_heading == 0
+        assert plan.name_placeholders == [11]
+        assert plan.placeholders[11] == ['<Candidate Name>']
+
+        # Editing the template invalidates the plan
+        doc = Document(template)
+        doc.add_paragraph('SKILLS')
+        doc.save(template)
+        with contextlib.redirect_stdout(io.StringIO()):
+            changed = load_fill_plan(template)
+        assert fill_plan_stats()['compiled'] == after['compiled'] + 1
+        assert changed.paragraph_count == plan.paragraph_count + 1
+    print(f"  ✓ {plan.section_order}, tables {plan.table_roles}")
+
+
+def test_batch_discovers_once_with_identical_output():
+    """Twenty resumes on one template compile one plan; output matches plain discovery"""
+    print("\n" + "="*70)
+    print("TEST 2: Batch formatting")
+    print("="*70)
+
+    saved = Config.USE_TEMPLATE_FILL_PLAN
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        _make_template(template)
+        try:
+            Config.USE_TEMPLATE_FILL_PLAN = False
+            expected = _format(template, os.path.join(tmp, 'plain.docx'))
+            assert not os.path.exists(sidecar_path(template))
+
+            Config.USE_TEMPLATE_FILL_PLAN = True
+            before = fill_plan_stats()['compiled']
+            outputs = {_format(template, os.path.join(tmp, f'out{i}.docx')) for i in range(20)}
+        finally:
+            Config.USE_TEMPLATE_FILL_PLAN = saved
+
+    assert fill_plan_stats()['compiled'] == before + 1
+    assert outputs == {expected}
+    assert b'Rita Recruiter' in expected and b'Old Recruiter' not in expected
+    print("  ✓ 20 resumes, 1 compile, identical output")
+
+
+if __name__ == "__main__":
+    test_plan_contents_and_sidecar()
+    test_batch_discovers_once_with_identical_output()
+    print("\n🎉 All fill plan tests passed!")
@@ -0,0 +1,97 @@
+"""
+Test the torch-free fast heading classifier
+Checks the shipped artifact, accuracy on the synonym tables and template matching
+"""
+
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import heading_classifier
+from utils.heading_classifier import (
+    ARTIFACT_PATH, HeadingClassifier, OTHER_LABEL, get_heading_classifier,
+    match_heading, training_examples, training_fingerprint
+)
+
+TEMPLATE_SECTIONS = ['SUMMARY', 'EMPLOYMENT HISTORY', 'EDUCATION', 'SKILLS', 'CERTIFICATIONS']
+
+
+def test_artifact_matches_synonym_tables():
+    """The shipped model was trained on the current synonym tables"""
+    print("\n" + "="*70)
+    print("TEST 1: Shipped artifact is up to date")
+    print("="*70)
+
+    examples = training_examples()
+    shipped = HeadingClassifier.load(ARTIFACT_PATH)
+    print(f"  {len(examples)} training headings, artifact {os.path.getsize(ARTIFACT_PATH) // 1024} KB")
+    assert shipped.fingerprint == training_fingerprint(examples), \
+        "Synonym tables changed - run: python -m utils.heading_classifier"
+
+    predictions = shipped.predict_many([h for h, _ in examples])
+    correct = sum(1 for (label, _), (_, truth) in zip(predictions, examples)
+                  if (label or OTHER_LABEL) == truth)
+    print(f"  Training-table accuracy: {correct / len(examples):.2%}")
+    assert correct / len(examples) >= 0.95
+
+
+def test_headings_and_body_lines():
+    """Unseen heading variants are recognised; body lines are not headings"""
+    print("\n" + "="*70)
+    print("TEST 2: Headings vs body lines")
+    print("="*70)
+
+    classifier = get_heading_classifier()
+    for heading, expected in [("PROFESSIONAL EXPERIENCE:", 'employment history'),
+                              ("Technical Skills & Tools", 'skills'),
+                              ("Certifications & Licenses", 'certifications'),
+                              ("Academic Background", 'education')]:
+        label, confidence = classifier.predict(heading)
+        print(f"  '{heading}' → {label} ({confidence:.2f})")
+        assert label == expected
+
+    for line in ["Managed a team of 5 engineers", "Microsoft | Atlanta, GA", "Jan 2020 - Present"]:
+        assert classifier.predict(line)[0] is None
+
+
+def test_match_heading_to_template():
+    """Template section is picked by label; long lines are never headings"""
+    print("\n" + "="*70)
+    print("TEST 3: Template matching")
+    print("="*70)
+
+    assert match_heading("Work Experience", TEMPLATE_SECTIONS)[0] == 'EMPLOYMENT HISTORY'
+    assert match_heading("Core Competencies", TEMPLATE_SECTIONS)[0] == 'SKILLS'
+    assert match_heading("Academic Background", ['experience', 'education background'])[0] == 'education background'
+    assert match_heading("Managed skills training for a team of engineers", TEMPLATE_SECTIONS)[0] is None
+
+    assert heading_classifier._section_label.cache_info().currsize > 0
+    HeadingClassifier.load(ARTIFACT_PATH)
+    assert heading_classifier._section_label.cache_info().currsize == 0  # No labels from a replaced model
+    print("  ✓ Headings mapped to template sections")
+
+
+def test_no_torch_import():
+    """Fast mode parsing path never imports torch"""
+    print("\n" + "="*70)
+    print("TEST 4: Zero torch import")
+    print("="*70)
+
+    code = ("import sys; from utils.advanced_resume_parser import ResumeParser; "
+            "from utils.heading_classifier import match_heading; "
+            "match_heading('Work History', ['EMPLOYMENT HISTORY']); "
+            "print('TORCH' if 'torch' in sys.modules else 'NO-TORCH')")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip().endswith('NO-TORCH'), result.stdout + result.stderr
+    print("  ✓ torch not imported")
+
+
+if __name__ == "__main__":
+    test_artifact_matches_synonym_tables()
+    test_headings_and_body_lines()
+    test_match_heading_to_template()
+    test_no_torch_import()
+    print("\n🎉 All heading classifier tests passed!")
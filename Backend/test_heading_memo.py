@@ -0,0 +1,137 @@
+"""
+Test the cross-request heading memo
+Repeated headings are answered from the memo, scoped per template section list
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.heading_memo import HeadingMemo, get_heading_memo, memo_scope
+from utils.intelligent_resume_parser import IntelligentResumeParser
+
+TEMPLATE = ['PROFESSIONAL SUMMARY', 'EMPLOYMENT HISTORY', 'EDUCATION', 'SKILLS']
+
+
+def test_lru_eviction_and_counters():
+    """Bounded size, LRU order and hit/miss counters"""
+    print("\n" + "="*70)
+    print("TEST 1: LRU eviction and counters")
+    print("="*70)
+
+    memo = HeadingMemo(max_entries=2)
+    scope = memo_scope('parser', TEMPLATE)
+    memo.put(scope, 'Education', (2, 'exact', 1.0))
+    memo.put(scope, 'Skills', (3, 'exact', 1.0))
+    assert memo.get(scope, '  EDUCATION ') == (2, 'exact', 1.0)  # normalized key, refreshes LRU
+    memo.put(scope, 'Hobbies', (None, 'none', 0.0))
+
+    assert memo.get(scope, 'skills', memo.MISSING) is memo.MISSING  # evicted
+    assert memo.get(scope, 'hobbies', memo.MISSING) == (None, 'none', 0.0)  # cached "no match"
+
+    stats = memo.stats()
+    print(f"  {stats}")
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    assert stats['matchers']['parser']['hit_rate'] == round(2 / 3, 4)
+
+
+def test_scope_depends_on_sections_and_context():
+    """A changed template or model never reuses an old result"""
+    print("\n" + "="*70)
+    print("TEST 2: Scope keying")
+    print("="*70)
+
+    base = memo_scope('classifier', TEMPLATE, 'model-a')
+    assert base == memo_scope('classifier', list(TEMPLATE), 'model-a')
+    assert base != memo_scope('classifier', TEMPLATE[::-1], 'model-a')
+    assert base != memo_scope('classifier', TEMPLATE + ['PROJECTS'], 'model-a')
+    assert base != memo_scope('classifier', TEMPLATE, 'model-b')
+    assert base != memo_scope('parser', TEMPLATE, 'model-a')
+    print("  ✓ Sections, order, context and matcher all change the scope")
+
+
+def test_persistence_round_trip():
+    """Saved memo is loaded by the next process"""
+    print("\n" + "="*70)
+    print("TEST 3: Persistence")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'memo', 'heading_memo.json')
+        scope = memo_scope('parser', TEMPLATE)
+        memo = HeadingMemo(path=path)
+        memo.put(scope, 'Work Experience', (1, 'fast_classifier', 0.93))
+        memo.save()
+
+        reloaded = HeadingMemo(path=path)
+        assert reloaded.get(scope, 'work experience') == (1, 'fast_classifier', 0.93)
+    print("  ✓ Entries survive a restart")
+
+
+def test_concurrent_puts():
+    """Parallel request threads can share one memo"""
+    print("\n" + "="*70)
+    print("TEST 4: Thread safety")
+    print("="*70)
+
+    memo = HeadingMemo(max_entries=500)
+    scope = memo_scope('parser', TEMPLATE)
+
+    def worker(n):
+        for i in range(200):
+            memo.lookup(scope, f"heading {n} {i}", lambda: (i % 4, 'exact', 1.0))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = memo.stats()
+    print(f"  {stats['entries']} entries, {stats['evictions']} evictions")
+    assert stats['entries'] == 500
+    assert stats['entries'] + stats['evictions'] == 1600
+
+
+def test_parser_reuses_matches():
+    """Second resume with the same headings skips the matching tiers"""
+    print("\n" + "="*70)
+    print("TEST 5: Parser integration")
+    print("="*70)
+
+    parser = IntelligentResumeParser.__new__(IntelligentResumeParser)  # matching needs no models
+    parser.section_mappings = {'EDUCATION': ['academic background']}
+    get_heading_memo().clear()
+
+    calls = []
+    uncached = parser._match_heading_uncached
+
+    def counting(heading, sections):
+        calls.append(heading)
+        return uncached(heading, sections)
+
+    parser._match_heading_uncached = counting
+    headings = ['EDUCATION', 'Employment Histroy', 'Academic Background', 'Favourite Films']
+    first = [parser._match_heading(h, TEMPLATE) for h in headings]
+    second = [parser._match_heading(h.upper(), TEMPLATE) for h in headings]
+
+    print(f"  {dict(zip(headings, first))}")
+    assert first == second
+    assert first[0] == 'EDUCATION'
+    assert first[2] == 'EDUCATION'
+    assert len(calls) == len(headings)
+    assert get_heading_memo().stats()['matchers']['parser']['hits'] == len(headings)
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_counters()
+    test_scope_depends_on_sections_and_context()
+    test_persistence_round_trip()
+    test_concurrent_puts()
+    test_parser_reuses_matches()
+    print("\n🎉 All heading memo tests passed!")
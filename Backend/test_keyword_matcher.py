@@ -0,0 +1,175 @@
+"""
+Test the shared keyword matcher
+One compiled scan must score exactly like the per-keyword substring loops it replaces
+"""
+
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import AHOCORASICK_AVAILABLE, KeywordMatcher, keyword_matcher
+from utils.enhanced_formatter_integration import validate_section_by_content
+from utils.optimized_section_mapper import OptimizedSectionMapper
+from utils.section_content_validator import SectionContentValidator
+from utils.section_detector import SectionDetector
+from utils.word_formatter import SKILL_SYNONYMS, TABLE_TYPE_INDICATORS
+
+FRAGMENTS = ['skill', 'skills', 'last', 'last used', 'used', 'worked', 'managed', 'university', 'degree',
+             'gpa', 'python', 'java', 'javascript', 'scrum master', 'certified', 'safe', 'led', 'role',
+             'years of experience', 'school', 'tools', 'network', 'lan', 'fiber', 'optic', '2019 - 2021',
+             'acme corp', 'responsible', 'bachelor', 'technical', ',', '.', '\n']
+
+
+def _random_texts(seed, count=1500):
+    """Texts made of keyword fragments, partial words and noise characters"""
+    rng = random.Random(seed)
+    texts = ['', ' ', 'x']
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 25)):
+            fragment = rng.choice(FRAGMENTS)
+            roll = rng.random()
+            if roll < 0.15:
+                fragment = fragment[:rng.randint(1, len(fragment))]
+            elif roll < 0.25:
+                fragment = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(rng.randint(1, 6)))
+            parts.append(fragment)
+        texts.append(rng.choice(['', ' ']).join(parts))
+    return texts
+
+
+def _legacy_counts(table, text):
+    return {category: sum(1 for kw in keywords if kw in text) for category, keywords in table.items()}
+
+
+def test_scan_matches_substring_counts():
+    """Counts equal sum(1 for kw in keywords if kw in text), duplicates and overlaps included"""
+    print("\n" + "="*70)
+    print("TEST 1: Scan parity with substring counting")
+    print("="*70)
+
+    table = {
+        'a': ['skill', 'skills', 'last', 'last used', 'skill'],  # duplicate within a category
+        'b': ['last used', 'used', 'python', ''],                 # shared with 'a', empty keyword
+        'c': ['java', 'javascript', 'script'],
+        'd': [],
+    }
+    matchers = [KeywordMatcher(table, use_automaton=False)]
+    if AHOCORASICK_AVAILABLE:
+        matchers.append(KeywordMatcher(table))
+    texts = _random_texts(11) + ['skills last used javascript', 'lastused', 'pythonjava']
+    for matcher in matchers:
+        for text in texts:
+            hits = matcher.scan(text)
+            assert hits.counts == _legacy_counts(table, text), text
+            assert list(hits.counts) == list(table)  # category order kept for max() tie-breaks
+            for keyword in matcher.keywords:
+                assert (keyword in hits) == (keyword in text)
+    print(f"  ✓ {len(texts)} texts, automaton={'yes' if AHOCORASICK_AVAILABLE else 'not installed'}")
+
+
+def test_runtime_tables_are_cached():
+    """keyword_matcher compiles a runtime table once"""
+    print("\n" + "="*70)
+    print("TEST 2: Runtime table cache")
+    print("="*70)
+
+    first = keyword_matcher([(0, ['router', 'routing']), (1, ['fiber'])])
+    assert keyword_matcher(((0, ('router', 'routing')), (1, ['fiber']))) is first
+    assert first.scan('fiber routing').counts == {0: 1, 1: 1}
+    print("  ✓ Same table returns the compiled matcher")
+
+
+def test_content_heuristics_unchanged():
+    """Call sites classify exactly as their old keyword loops did"""
+    print("\n" + "="*70)
+    print("TEST 3: Content heuristics parity")
+    print("="*70)
+
+    texts = _random_texts(23, count=800)
+    texts += [t.title() for t in texts[:200]]
+
+    mapper = object.__new__(OptimizedSectionMapper)
+    fast_table = {
+        'EMPLOYMENT': ['worked', 'managed', 'developed', 'led', 'responsible',
+                       'duties', 'role', 'company', 'position', 'employed'],
+        'EDUCATION': ['university', 'college', 'degree', 'graduated', 'gpa',
+                      'major', 'bachelor', 'master', 'phd', 'school'],
+        'SKILLS': ['proficient', 'skilled', 'expertise', 'technologies',
+                   'programming', 'python', 'java', 'javascript', 'tools'],
+        'SUMMARY': ['seeking', 'professional', 'experienced', 'motivated',
+                    'passionate', 'dedicated', 'years of experience'],
+    }
+    detector = SectionDetector(use_ml=False)
+    validator = SectionContentValidator()
+    education = ["university", "degree", "bachelor", "master", "b.tech", "m.tech",
+                 "school", "college", "graduated", "gpa", "phd", "doctorate"]
+    certs = ["certified", "certificate", "certification", "license", "credential",
+             "pmp", "safe", "scrum master", "aws certified", "cisco"]
+
+    for text in texts:
+        lower = text.lower()
+
+        # OptimizedSectionMapper.classify_content_fast
+        expected = None
+        if len(text.strip()) >= 10:
+            scores = _legacy_counts(fast_table, lower)
+            expected = max(scores, key=scores.get) if max(scores.values()) >= 2 else None
+        assert mapper.classify_content_fast(text) == expected, text
+
+        # SectionDetector.guess_section_by_keywords
+        scores = _legacy_counts(SectionDetector.CONTENT_KEYWORDS, lower)
+        best = max(scores, key=scores.get)
+        assert detector.guess_section_by_keywords(text) == (best if scores[best] > 0 else 'unknown'), text
+
+        # validate_section_by_content (education / certification branches)
+        result = validate_section_by_content(text)
+        if text and sum(1 for kw in education if kw in lower) >= 2:
+            assert result == 'education', text
+        elif text and any(kw in lower for kw in certs) and len(text) < 500 \
+                and 'worked' not in lower and 'managed' not in lower:
+            assert result == 'certifications', text
+
+        # SectionContentValidator keyword scores
+        for section, indicators in validator.SECTION_INDICATORS.items():
+            hits = validator._KEYWORD_MATCHERS[section].scan(lower)
+            assert hits.count('strong') == sum(1 for kw in indicators.get('strong_keywords', []) if kw in lower)
+            assert hits.count('anti') == sum(1 for kw in indicators.get('anti_keywords', []) if kw in lower)
+    print(f"  ✓ {len(texts)} texts classified identically")
+
+
+def test_formatter_keyword_checks_unchanged():
+    """Table type scoring and skill/synonym matching keep their results"""
+    print("\n" + "="*70)
+    print("TEST 4: Word formatter keyword checks")
+    print("="*70)
+
+    skills = ['skill', 'technology', 'competency', 'expertise', 'proficiency',
+              'years used', 'last used', 'technical']
+    for text in _random_texts(5, count=500):
+        assert TABLE_TYPE_INDICATORS.scan(text).count('skills') == sum(1 for ind in skills if ind in text)
+
+    rng = random.Random(3)
+    vocabulary = list(SKILL_SYNONYMS) + ['Python', 'Fiber', 'LAN', 'cabling']
+    for text in _random_texts(9, count=500):
+        skill_keywords = rng.sample(vocabulary, rng.randint(1, 4))
+        legacy = []
+        for keyword in skill_keywords:
+            keyword_lower = keyword.lower()
+            if keyword_lower in text or any(syn in text for syn in SKILL_SYNONYMS.get(keyword_lower, [])):
+                legacy.append(keyword)
+        matcher = keyword_matcher((i, [keyword.lower()] + SKILL_SYNONYMS.get(keyword.lower(), []))
+                                  for i, keyword in enumerate(skill_keywords))
+        hits = matcher.scan(text)
+        assert [keyword for i, keyword in enumerate(skill_keywords) if hits.any(i)] == legacy, text
+    print("  ✓ Table indicators and skill synonyms agree with the old loops")
+
+
+if __name__ == "__main__":
+    test_scan_matches_substring_counts()
+    test_runtime_tables_are_cached()
+    test_content_heuristics_unchanged()
+    test_formatter_keyword_checks_unchanged()
+    print("\n🎉 All keyword matcher tests passed!")
@@ -0,0 +1,88 @@
+"""
+Test the shared model registry
+Verifies one-time loading under concurrency, clearing and status reporting
+"""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_registry import ModelRegistry
+
+
+def test_single_load_under_concurrency():
+    """Concurrent first requests must load the model exactly once"""
+    print("\n" + "="*70)
+    print("TEST 1: One-time load under concurrency")
+    print("="*70)
+
+    registry = ModelRegistry()
+    load_calls = []
+
+    def loader():
+        load_calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.acquire('m', loader)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"  Loader calls: {len(load_calls)}, distinct models: {len(set(map(id, results)))}")
+    assert len(load_calls) == 1
+    assert len(set(map(id, results))) == 1
+    assert registry.status()['m']['loaded']
+
+
+def test_clear_unloads_and_reloads():
+    """Models stay loaded across acquires until the registry is cleared"""
+    print("\n" + "="*70)
+    print("TEST 2: Clearing and reloading")
+    print("="*70)
+
+    registry = ModelRegistry()
+    first = registry.acquire('m', lambda: object())
+    assert registry.acquire('m', lambda: object()) is first
+    registry.clear('m')
+    assert not registry.is_loaded('m')
+    assert registry.acquire('m', lambda: object()) is not first
+    print("  ✓ Model unloaded by clear() and rebuilt on next acquire")
+
+
+def test_failed_load_is_not_retried():
+    """A failing loader is recorded once and reported in status"""
+    print("\n" + "="*70)
+    print("TEST 3: Failed load reporting")
+    print("="*70)
+
+    registry = ModelRegistry()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise RuntimeError("no weights")
+
+    assert registry.acquire('broken', broken) is None
+    assert registry.acquire('broken', broken) is None
+    status = registry.status()['broken']
+    print(f"  Status: {status}")
+    assert len(calls) == 1
+    assert not status['loaded']
+    assert status['error'] == "no weights"
+
+    registry.clear('broken')
+    assert 'broken' not in registry.status()
+
+
+if __name__ == "__main__":
+    test_single_load_under_concurrency()
+    test_clear_unloads_and_reloads()
+    test_failed_load_is_not_retried()
+    print("\n🎉 All model registry tests passed!")
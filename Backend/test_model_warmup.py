@@ -0,0 +1,102 @@
+"""
+Test background model warm-up, the init barrier and the rule-based fallback
+Runs without real models: the warm-up is held open with an event
+"""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils.model_cache as model_cache
+import utils.intelligent_resume_parser as intelligent_resume_parser
+from utils.section_detector import SectionDetector
+from utils.advanced_resume_parser import ResumeParser
+
+
+def test_requests_use_rules_while_warming():
+    """While the background warm-up runs, ML consumers don't block on model loads"""
+    print("\n" + "="*70)
+    print("TEST 1: Rule-based fallback during warm-up")
+    print("="*70)
+
+    gate = threading.Event()
+    original = model_cache._prewarm_models
+
+    def held_prewarm():
+        gate.wait(10)
+        original()
+
+    model_cache.clear_model_cache()
+    model_cache._prewarm_models = held_prewarm
+    try:
+        assert model_cache.start_background_prewarm()
+        assert not model_cache.start_background_prewarm()  # Already loading
+        assert model_cache.models_loading()
+        state = model_cache.readiness()
+        print(f"  readiness while loading: {state}")
+        assert state['state'] == 'loading' and state['serving'] == 'rules'
+        assert not model_cache.wait_until_ready(timeout=0.05)
+
+        assert SectionDetector(use_ml=True).use_ml is False
+        assert ResumeParser('resume.docx', 'docx').intelligent_parser is None
+
+        gate.set()
+        assert model_cache.wait_until_ready(timeout=10)
+        state = model_cache.readiness()
+        print(f"  readiness after warm-up: {state}")
+        assert state['ready'] and not model_cache.models_loading()
+    finally:
+        gate.set()
+        model_cache._prewarm_models = original
+        model_cache.clear_model_cache()
+
+
+def test_concurrent_first_requests_load_once():
+    """Parallel first calls to get_intelligent_parser load models exactly once"""
+    print("\n" + "="*70)
+    print("TEST 2: Init barrier")
+    print("="*70)
+
+    cls = intelligent_resume_parser.IntelligentResumeParser
+    original = cls._load_models
+    calls = []
+
+    def slow_load(self):
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+
+    cls._instance = None
+    cls._models_loaded = False
+    intelligent_resume_parser._parser_instance = None
+    cls._load_models = slow_load
+    try:
+        barrier = threading.Barrier(8)
+        parsers = []
+
+        def worker():
+            barrier.wait()
+            parsers.append(intelligent_resume_parser.get_intelligent_parser())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        print(f"  8 concurrent first requests → {len(calls)} model load(s)")
+        assert len(calls) == 1
+        assert all(p is parsers[0] for p in parsers)
+    finally:
+        cls._load_models = original
+        cls._instance = None
+        cls._models_loaded = False
+        intelligent_resume_parser._parser_instance = None
+
+
+if __name__ == "__main__":
+    test_requests_use_rules_while_warming()
+    test_concurrent_first_requests_load_once()
+    print("\n🎉 All warm-up tests passed!")
@@ -0,0 +1,119 @@
+"""
+Test the content-hash parse cache
+A resume formatted a second time (e.g. with another template) is not parsed again
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from utils import parse_cache
+from utils.parse_cache import ParseCache, content_key, parse_upload, parser_version
+
+RESUME = {'name': 'Jane Smith', 'email': 'jane@example.com', 'experience': [{'company': 'Acme', 'details': ['Led']}],
+          'skills': ['Python'], 'sections': {'SKILLS': ['Python']}, 'raw_text': 'Jane Smith\nSKILLS\nPython'}
+
+
+def test_round_trip_and_versioning():
+    """Results come back as fresh copies, only for the same key and parser version"""
+    print("\n" + "="*70)
+    print("TEST 1: Round trip and version stamp")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(os.path.join(tmp, 'parse.db'))
+        key = content_key(b'%PDF-1.4 resume bytes', 'jane.pdf', 'pdf')
+        version = parser_version('fast')
+        assert cache.get(key, version) is None
+        assert cache.put(key, version, RESUME)
+
+        first = cache.get(key, version)
+        assert first == RESUME
+        first['cai_contacts'] = ['mutated by the request']
+        assert cache.get(key, version) == RESUME
+
+        assert cache.get(key, parser_version('ml')) is None
+        assert cache.get(content_key(b'%PDF-1.4 resume bytes', 'bob.pdf', 'pdf'), version) is None
+        assert cache.get(content_key(b'%PDF-1.4 other bytes', 'jane.pdf', 'pdf'), version) is None
+
+        # A second process (another gunicorn worker) sees the same entries
+        assert ParseCache(os.path.join(tmp, 'parse.db')).get(key, version) == RESUME
+        print(f"  ✓ {cache.stats()}")
+
+
+def test_ttl_and_lru_eviction():
+    """Expired entries disappear; beyond the limits the least recently used go first"""
+    print("\n" + "="*70)
+    print("TEST 2: Eviction")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(os.path.join(tmp, 'parse.db'), max_entries=3)
+        for i in range(3):
+            cache.put(f"k{i}", 'v', dict(RESUME, name=f"Candidate {i}"))
+            time.sleep(0.01)
+        cache.get('k0', 'v')  # k1 is now the least recently used
+        cache.put('k3', 'v', RESUME)
+        assert cache.get('k1', 'v') is None
+        assert all(cache.get(k, 'v') is not None for k in ('k0', 'k2', 'k3'))
+
+        sized = ParseCache(os.path.join(tmp, 'sized.db'), max_bytes=1)
+        sized.put('a', 'v', RESUME)
+        sized.put('b', 'v', RESUME)
+        assert sized.stats()['entries'] == 1 and sized.get('b', 'v') == RESUME
+
+        expiring = ParseCache(os.path.join(tmp, 'ttl.db'), ttl_seconds=0.05)
+        expiring.put('k', 'v', RESUME)
+        time.sleep(0.1)
+        assert expiring.get('k', 'v') is None
+    print("  ✓ LRU by entries and bytes, TTL expiry")
+
+
+def test_second_format_skips_parsing():
+    """format_resumes' upload path: one parse, then a cache hit with nothing saved"""
+    print("\n" + "="*70)
+    print("TEST 3: Upload parsing through the cache")
+    print("="*70)
+
+    calls = []
+
+    def fake_parse(file_path, file_type):
+        calls.append(file_path)
+        with open(file_path, 'rb') as f:
+            assert f.read() == b'PK resume bytes'
+        return dict(RESUME)
+
+    saved = (Config.PARSE_CACHE_PATH, Config.USE_PARSE_CACHE)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            Config.PARSE_CACHE_PATH = os.path.join(tmp, 'parse.db')
+            parse_cache._cache_instance = None
+            results = []
+            for upload in ('first', 'second'):  # Same file formatted against two templates
+                path = os.path.join(tmp, f"{upload}_Jane_Smith.docx")
+                results.append(parse_upload(b'PK resume bytes', 'Jane_Smith.docx', 'docx', path, fake_parse))
+            saved_files = sorted(f for f in os.listdir(tmp) if f.endswith('.docx'))
+
+            Config.USE_PARSE_CACHE = False
+            disabled = parse_upload(b'PK resume bytes', 'Jane_Smith.docx', 'docx',
+                                    os.path.join(tmp, 'third.docx'), fake_parse)
+        finally:
+            Config.PARSE_CACHE_PATH, Config.USE_PARSE_CACHE = saved
+            parse_cache._cache_instance = None
+
+    print(f"  Statuses: {[status for _, status in results]}, parses: {len(calls)}")
+    assert [status for _, status in results] == ['miss', 'hit']
+    assert results[0][0] == results[1][0] == RESUME
+    assert len(calls) == 2 and saved_files == ['first_Jane_Smith.docx']
+    assert disabled == (RESUME, 'disabled')
+
+
+if __name__ == "__main__":
+    test_round_trip_and_versioning()
+    test_ttl_and_lru_eviction()
+    test_second_format_skips_parsing()
+    print("\n🎉 All parse cache tests passed!")
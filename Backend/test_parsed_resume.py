@@ -0,0 +1,111 @@
+"""
+Test the compact ParsedResume model
+Dict consumers must see exactly the parser's dict; the model must be much smaller
+"""
+
+import sys
+import os
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from utils.advanced_resume_parser import parse_resume
+from utils.parsed_resume import ExperienceEntry, ParsedResume, Skill, measure_batch
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Resume formatter samples',
+                      'Comolyn Weeks_State of GA_Original.docx')
+
+RESUME = {
+    'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '(555) 111-2222', 'address': '', 'linkedin': '',
+    'dob': '', 'summary': 'Engineer with ten years of experience.',
+    'experience': [{'company': 'Acme Corp', 'role': 'Senior Engineer', 'title': 'Senior Engineer - Acme Corp',
+                    'duration': '2018-Present', 'details': ['Led migration of legacy systems to AWS']}],
+    'education': [{'degree': 'B.S. Computer Science', 'institution': 'Georgia Tech', 'year': '2012', 'details': []}],
+    'skills': ['Python', 'SQL'], 'projects': [], 'certifications': ['PMP'], 'awards': [], 'languages': [],
+    'sections': {'professional experience': ['Senior Engineer, Acme Corp 2018 - Present',
+                                             'Led migration of legacy systems to AWS']},
+    'raw_text': 'Jane Smith\nPROFESSIONAL EXPERIENCE\nSenior Engineer, Acme Corp 2018 - Present',
+}
+
+
+def _parse_sample():
+    saved = Config.USE_ML_PARSER
+    Config.USE_ML_PARSER = False
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return parse_resume(SAMPLE, 'docx')
+    finally:
+        Config.USE_ML_PARSER = saved
+
+
+def test_dict_adapter_round_trip():
+    """to_dict() gives back the parser's dict: keys, order, values, extra keys"""
+    print("\n" + "="*70)
+    print("TEST 1: Dict adapter")
+    print("="*70)
+
+    parsed = _parse_sample()
+    for data in (RESUME, parsed, dict(RESUME, cai_contacts=[{'name': 'Recruiter'}])):
+        model = ParsedResume.from_dict(data)
+        assert model.to_dict() == data and list(model.to_dict()) == list(data)
+
+    model = ParsedResume.from_dict(RESUME)
+    assert model.experience == (ExperienceEntry('Acme Corp', 'Senior Engineer', 'Senior Engineer - Acme Corp',
+                                                '2018-Present', ('Led migration of legacy systems to AWS',)),)
+    assert model.skills == (Skill('Python'), Skill('SQL'))
+    assert model.experience[0].details[0] is model.sections['professional experience'][1]  # stored once
+    assert 'raw_text' not in model.to_dict(include_raw_text=False)
+    assert not hasattr(model, '__dict__') and not hasattr(model.experience[0], '__dict__')
+
+    # Hand-built entries with other keys are carried over untouched
+    partial = {'name': 'Jane', 'experience': [{'company': 'Acme', 'details': ['Led']}], 'skills': ['Python']}
+    assert ParsedResume.from_dict(partial).to_dict() == partial
+
+    # to_dict returns fresh containers
+    first = model.to_dict()
+    first['skills'].append('mutated')
+    first['sections']['professional experience'].clear()
+    assert model.to_dict() == RESUME
+    print(f"  ✓ {len(parsed['raw_text'])} chars of raw text, {len(parsed['skills'])} skills round-trip")
+
+
+def test_binary_serialization():
+    """to_bytes / from_bytes with and without compression; raw_text stays compressed"""
+    print("\n" + "="*70)
+    print("TEST 2: Binary serialization")
+    print("="*70)
+
+    parsed = _parse_sample()
+    model = ParsedResume.from_dict(parsed)
+    for compress in (True, False):
+        blob = model.to_bytes(compress)
+        loaded = ParsedResume.from_bytes(blob)
+        assert loaded == model and loaded.to_dict() == parsed
+        print(f"  compress={compress}: {len(blob)} bytes")
+    assert loaded.raw_text == parsed['raw_text']
+
+    try:
+        ParsedResume.from_bytes(b'{"name": "json"}')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_batch_memory():
+    """A batch held as models takes a fraction of the dicts' memory"""
+    print("\n" + "="*70)
+    print("TEST 3: Batch memory")
+    print("="*70)
+
+    row = measure_batch([_parse_sample(), RESUME], count=200)
+    print(f"  {row}")
+    assert row['model_mb'] < row['dict_mb'] * 0.5
+
+
+if __name__ == "__main__":
+    test_dict_adapter_round_trip()
+    test_binary_serialization()
+    test_batch_memory()
+    print("\n🎉 All parsed resume tests passed!")
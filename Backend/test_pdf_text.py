@@ -0,0 +1,118 @@
+"""
+Test the PDF text extraction engines
+PyMuPDF must give the parser the same lines as pdfplumber; layout mode reads columns
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import pdf_text
+from utils.pdf_text import PYMUPDF_AVAILABLE, compare, extract_pdf_pages, extract_pdf_text, resolve_engine
+
+
+def _write_resume(path, pages=1):
+    """Resume-like PDF: contact line, bullets with right-aligned dates, SKILLS | EDUCATION side by side"""
+    doc = pdf_text.fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        y = 60
+        page.insert_text((72, y), "JANE SMITH", fontsize=16); y += 24
+        page.insert_text((72, y), "jane@example.com | (555) 111-2222", fontsize=10)
+        page.insert_text((400, y), "Atlanta, GA", fontsize=10); y += 30
+        page.insert_text((72, y), "PROFESSIONAL EXPERIENCE", fontsize=12); y += 18
+        for i in range(6):
+            page.insert_text((72, y), f"Led migration {p}.{i} of legacy systems to AWS", fontsize=10)
+            page.insert_text((450, y), "2019 - 2023", fontsize=10); y += 14
+        y += 10
+        page.insert_text((72, y), "SKILLS", fontsize=12)
+        page.insert_text((320, y), "EDUCATION", fontsize=12); y += 16
+        for i in range(4):
+            page.insert_text((72, y), f"Python, SQL, Tool{i}", fontsize=10)
+            page.insert_text((320, y), f"B.S. Computer Science {i}", fontsize=10); y += 13
+    doc.save(path)
+    doc.close()
+
+
+def test_pymupdf_matches_pdfplumber():
+    """Default fast engine extracts the pdfplumber lines"""
+    print("\n" + "="*70)
+    print("TEST 1: PyMuPDF / pdfplumber parity")
+    print("="*70)
+
+    if not PYMUPDF_AVAILABLE:
+        assert resolve_engine('pymupdf') == 'pdfplumber'
+        print("  ⚠️  PyMuPDF not installed - engine falls back to pdfplumber")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.pdf')
+        _write_resume(path, pages=2)
+        result = compare(path, 'pymupdf')
+        print(f"  {result['baseline_lines']} lines, ratio {result['ratio']}")
+        assert result['identical'], result['diff']
+        assert 'Led migration 0.0 of legacy systems to AWS 2019 - 2023' in extract_pdf_text(path, 'pymupdf')
+
+
+def test_layout_mode_reads_columns():
+    """Side-by-side sections come out one after the other; right-aligned dates stay on their line"""
+    print("\n" + "="*70)
+    print("TEST 2: Column-aware layout mode")
+    print("="*70)
+
+    if not PYMUPDF_AVAILABLE:
+        print("  ⚠️  PyMuPDF not installed - skipped")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.pdf')
+        _write_resume(path)
+        lines = extract_pdf_text(path, 'pymupdf-layout').split('\n')
+
+    skills, education = lines.index('SKILLS'), lines.index('EDUCATION')
+    assert lines[skills + 1:skills + 5] == [f"Python, SQL, Tool{i}" for i in range(4)]
+    assert lines[education + 1:education + 5] == [f"B.S. Computer Science {i}" for i in range(4)]
+    assert 'Led migration 0.3 of legacy systems to AWS 2019 - 2023' in lines
+    print(f"  ✓ SKILLS at line {skills}, EDUCATION at line {education}")
+
+
+def test_parallel_pages_in_order():
+    """Long documents split across the pool keep their page order"""
+    print("\n" + "="*70)
+    print("TEST 3: Parallel page extraction")
+    print("="*70)
+
+    if not PYMUPDF_AVAILABLE:
+        print("  ⚠️  PyMuPDF not installed - skipped")
+        return
+
+    _, min_pages, _ = pdf_text._settings()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'long.pdf')
+        _write_resume(path, pages=min_pages + 1)
+        serial = extract_pdf_pages(path, 'pymupdf', workers=1)
+        parallel = extract_pdf_pages(path, 'pymupdf', workers=2)
+    assert len(serial) == min_pages + 1
+    assert parallel == serial
+    print(f"  ✓ {len(parallel)} pages identical to serial extraction")
+
+
+def test_unknown_engine_falls_back():
+    """A typo in Config never breaks parsing"""
+    print("\n" + "="*70)
+    print("TEST 4: Engine resolution")
+    print("="*70)
+
+    assert resolve_engine('pdfminer') == 'pdfplumber'
+    assert resolve_engine('PDFPlumber') == 'pdfplumber'
+    print(f"  ✓ Configured engine resolves to '{resolve_engine()}'")
+
+
+if __name__ == "__main__":
+    test_pymupdf_matches_pdfplumber()
+    test_layout_mode_reads_columns()
+    test_parallel_pages_in_order()
+    test_unknown_engine_falls_back()
+    print("\n🎉 All PDF text tests passed!")
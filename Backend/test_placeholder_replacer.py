@@ -0,0 +1,125 @@
+"""
+Test the single-pass placeholder replacer
+Placeholders split across runs are replaced without touching the other runs'
+formatting, and the scan cost does not grow with the replacement map
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+from docx.enum.text import WD_COLOR_INDEX
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from utils import regex_bank
+from utils.placeholder_replacer import PlaceholderReplacer, benchmark_key_scaling
+
+REPLACEMENTS = {
+    '[NAME]': '<Jane Smith>', '<Candidate Name>': '<Jane Smith>', 'CANDIDATE NAME': '<Jane Smith>',
+    '[EMAIL]': 'jane@example.com', '[Email]': 'jane@example.com', '<Phone>': '(555) 111-2222',
+}
+
+
+def _paragraph(*parts):
+    """Paragraph with one run per (text, bold, italic) part"""
+    paragraph = Document().add_paragraph()
+    for text, bold, italic in parts:
+        run = paragraph.add_run(text)
+        run.bold, run.italic = bold, italic
+        run.font.highlight_color = WD_COLOR_INDEX.YELLOW
+    return paragraph
+
+
+def test_split_placeholder_keeps_formatting():
+    """A placeholder over three runs lands in the first; the rest keep their text and style"""
+    print("\n" + "="*70)
+    print("TEST 1: Placeholder split across runs")
+    print("="*70)
+
+    paragraph = _paragraph(('Name: <Candi', True, False), ('date', False, False),
+                           (' Name> | ', False, True), ('Phone: <PHONE>', False, False))
+    replacer = PlaceholderReplacer(REPLACEMENTS)
+    hits = replacer.replace_in_paragraph(paragraph)
+
+    runs = paragraph.runs
+    assert hits == {'<Candidate Name>': 1, '<Phone>': 1}
+    assert [r.text for r in runs] == ['Name: <Jane Smith>', '', ' | ', 'Phone: (555) 111-2222']
+    assert runs[0].bold and runs[2].italic and not runs[3].bold
+    assert runs[0].font.highlight_color is None and runs[3].font.highlight_color is None
+    assert runs[2].font.highlight_color == WD_COLOR_INDEX.YELLOW  # not a receiving run
+    print(f"  ✓ {[r.text for r in runs]}")
+
+
+def test_case_insensitive_longest_match_and_hits():
+    """Keys match in any case, the longest key wins and hits add up across paragraphs"""
+    print("\n" + "="*70)
+    print("TEST 2: Matching rules and hit counts")
+    print("="*70)
+
+    replacer = PlaceholderReplacer(REPLACEMENTS)
+    assert len(replacer) == 5  # [EMAIL] and [Email] are one placeholder
+
+    first = _paragraph(('<candidate name> / [name] / [email]', False, False))
+    second = _paragraph(('Candidate Name: [EMAIL]', False, False), ('no placeholder', True, False))
+    replacer.replace_in_paragraph(first)
+    replacer.replace_in_paragraph(second)
+    untouched = _paragraph(('Plain text only', False, False))
+    assert replacer.replace_in_paragraph(untouched) == {}
+
+    assert first.text == '<Jane Smith> / <Jane Smith> / jane@example.com'
+    assert second.text == '<Jane Smith>: jane@example.comno placeholder'
+    assert untouched.runs[0].font.highlight_color == WD_COLOR_INDEX.YELLOW
+    assert dict(replacer.hits) == {'<Candidate Name>': 1, '[NAME]': 1, '[EMAIL]': 2, 'CANDIDATE NAME': 1}
+
+    pattern = regex_bank.literal_trie(('<name>', '<name> surname', 'name'))
+    assert pattern.search('x <NAME> Surname y').group(0) == '<NAME> Surname'
+    assert pattern.search('x <name> y').group(0) == '<name>'
+    print(f"  ✓ {dict(replacer.hits)}")
+
+
+def test_placeholder_inside_hyperlink():
+    """Runs nested in w:hyperlink are scanned along with the paragraph's direct runs"""
+    print("\n" + "="*70)
+    print("TEST 3: Placeholder inside a hyperlink")
+    print("="*70)
+
+    paragraph = _paragraph(('Email: ', True, False))
+    paragraph._p.append(parse_xml(
+        f'<w:hyperlink {nsdecls("w", "r")} r:id="rId9">'
+        '<w:r><w:t>[EM</w:t></w:r><w:r><w:t>AIL]</w:t></w:r></w:hyperlink>'
+    ))
+    paragraph.add_run(' | <Phone>')
+    replacer = PlaceholderReplacer(REPLACEMENTS)
+    hits = replacer.replace_in_paragraph(paragraph)
+
+    assert hits == {'[EMAIL]': 1, '<Phone>': 1}
+    link_text = ''.join(paragraph._p.xpath('./w:hyperlink//w:t/text()'))
+    assert link_text == 'jane@example.com'
+    assert [r.text for r in paragraph.runs] == ['Email: ', ' | (555) 111-2222']
+    print(f"  ✓ Hyperlink text: {link_text}")
+
+
+def test_scan_cost_independent_of_key_count():
+    """Growing the map 40x barely changes the single scan; the per-key loop grows with it"""
+    print("\n" + "="*70)
+    print("TEST 4: Key count scaling")
+    print("="*70)
+
+    rows = benchmark_key_scaling(key_counts=(10, 400), paragraphs=100)
+    for row in rows:
+        print(f"  {row}")
+    small, large = rows
+    assert large['per_key_ms'] > small['per_key_ms'] * 10
+    assert large['single_pass_ms'] < small['single_pass_ms'] * 5
+    assert large['single_pass_ms'] < large['per_key_ms'] / 10
+
+
+if __name__ == "__main__":
+    test_split_placeholder_keeps_formatting()
+    test_case_insensitive_longest_match_and_hits()
+    test_placeholder_inside_hyperlink()
+    test_scan_cost_independent_of_key_count()
+    print("\n🎉 All placeholder replacer tests passed!")
@@ -0,0 +1,116 @@
+"""
+Test the precompiled regex bank
+Merged and precompiled patterns must give the same answers as the on-the-fly code they replace
+"""
+
+import sys
+import os
+import re
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import regex_bank
+from utils.advanced_resume_parser import ResumeParser
+from utils.section_content_validator import SectionContentValidator
+
+BULLETS = [
+    'Tracked key performance indicators (KPIs) as well as QuickBooks reports in order to ship',
+    'Reported key performance indicators (quickbooks accuracy, as well as LMS usage)',
+    'Owned KEY PERFORMANCE INDICATORS for QA and lms rollout',
+    'Shipped orders with UMS Worldship and ups worldship',
+    'as well asking in order tofu quickbooksy',
+    'Key performance indicators () left alone',
+]
+
+
+def _legacy_rewrite(text):
+    for pattern, repl_to in [(r'\bas well as\b', 'and'), (r'\bin order to\b', 'to'),
+                             (r'\bkey performance indicators\s*\(([^\)]+)\)', r'\1'),
+                             (r'\bkey performance indicators\b', 'KPIs'),
+                             (r'\bquickbooks\b', 'QuickBooks'), (r'\bums?\s*worldship\b', 'UPS WorldShip')]:
+        text = re.sub(pattern, repl_to, text, flags=re.IGNORECASE)
+    return text
+
+
+def test_detail_rewrite_matches_chain():
+    """One merged pass rewrites bullets exactly like the six re.sub calls"""
+    print("\n" + "="*70)
+    print("TEST 1: Bullet rewrite parity")
+    print("="*70)
+
+    words = ['as', 'well', 'in', 'order', 'to', 'key', 'performance', 'indicators', '(sales)', '(',
+             ')', 'quickbooks', 'ums', 'ups', 'worldship', 'KPI', 'lms', 'qa', 'team', ',']
+    rng = random.Random(7)
+    samples = BULLETS + [' '.join(rng.choice(words) for _ in range(rng.randint(1, 14))) for _ in range(2000)]
+    for text in samples:
+        assert regex_bank.rewrite_detail(text) == _legacy_rewrite(text), text
+    print(f"  ✓ {len(samples)} bullets identical, e.g. '{regex_bank.rewrite_detail(BULLETS[0])}'")
+
+
+def test_merged_keyword_pattern():
+    """Merged alternation finds a line iff some single keyword pattern does"""
+    print("\n" + "="*70)
+    print("TEST 2: Keyword alternation")
+    print("="*70)
+
+    keywords = ('experience', 'work experience', 'skills', 'technical skills', 'c++', 'a.i.', 'r&d')
+    merged = regex_bank.keyword_alternation(keywords)
+    lines = ['work experience', 'experienced engineer', 'skills:', 'soft-skills', 'c++ developer',
+             'a.i. research', 'r&d lab', 'nonexperience', 'summary', '']
+    for line in lines:
+        expected = any(re.search(rf'\b{re.escape(k)}\b', line) for k in keywords)
+        assert bool(merged.search(line)) == expected, line
+    assert regex_bank.keyword_alternation(keywords) is merged  # cached
+    print(f"  ✓ {len(lines)} lines agree with per-keyword search")
+
+
+def test_contact_and_date_patterns():
+    """Merged phone / date-range patterns agree with the old pattern lists"""
+    print("\n" + "="*70)
+    print("TEST 3: Merged contact and date patterns")
+    print("="*70)
+
+    phone_patterns = [r'(?:\+?\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',
+                      r'(?:\+?91[-\s]?)?\d{10}', r'\+?\d{1,3}[-\s]?\d{2,5}[-\s]?\d{5,10}']
+    date_patterns = [r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b',
+                     r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+\d{4}', r'\d{1,2}/\d{4}']
+    lines = ['(555) 111-2222', '+91 9876543210', '+44 20 79460958', 'jane@example.com', 'Jan 2020 - Present',
+             '2015 – 2019', '05/2021', 'sept 2011', 'Room 12', 'Since 2019']
+    for line in lines:
+        assert bool(regex_bank.PHONE_LINE.search(line)) == any(re.search(p, line) for p in phone_patterns), line
+        assert bool(regex_bank.DATE_RANGE.search(line)) == any(re.search(p, line, re.IGNORECASE)
+                                                            for p in date_patterns), line
+    print("  ✓ Phone and date-range checks unchanged")
+
+
+def test_parser_and_validator_outputs():
+    """Call sites keep their results"""
+    print("\n" + "="*70)
+    print("TEST 4: Parser helpers and validator")
+    print("="*70)
+
+    parser = ResumeParser.__new__(ResumeParser)
+    assert parser._clean_years('Jan 2018 to Present') == 'Jan 2018-Present'
+    assert parser._clean_years('September, 2011 – Oct 2015') == 'Sept 2011-Oct 2015'
+    assert parser._clean_years('2012 - 2016') == '2012-2016'
+    assert parser._extract_role_from_dated_line('• Senior Engineer Jan 2018 - Present') == 'Senior Engineer'
+    assert parser._parse_degree_institution_line('B.S. Computer Science - University of Georgia, Athens, USA') \
+        == ('B.S. Computer Science', 'University of Georgia, Athens')
+
+    validator = SectionContentValidator()
+    content = 'Senior Engineer, Acme Corp Inc. 2018 - 2023. Managed a team of engineers.'
+    for section, indicators in validator.SECTION_INDICATORS.items():
+        expected = sum(1 for p in indicators['patterns'] if re.search(p, content.lower(), re.IGNORECASE))
+        assert sum(1 for p in validator._patterns(section) if p.search(content.lower())) == expected
+    is_valid, confidence, _ = validator.validate_content(content, 'employment')
+    print(f"  ✓ Employment content valid={is_valid} confidence={confidence:.2f}")
+    assert confidence > 0  # date range, role and company patterns all fire
+
+
+if __name__ == "__main__":
+    test_detail_rewrite_matches_chain()
+    test_merged_keyword_pattern()
+    test_contact_and_date_patterns()
+    test_parser_and_validator_outputs()
+    print("\n🎉 All regex bank tests passed!")
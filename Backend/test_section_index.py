@@ -0,0 +1,93 @@
+"""
+Test the one-pass section segmentation index in ResumeParser
+Every _extract_* method reads the same index instead of rescanning the lines
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils.advanced_resume_parser as advanced_resume_parser
+from utils.advanced_resume_parser import ResumeParser
+
+RESUME = """Jane Smith
+jane@example.com | (555) 111-2222
+PROFESSIONAL SUMMARY
+Experienced engineer with 10 years of expertise in cloud systems.
+TECHNICAL SKILLS
+Python, Java, SQL
+WORK EXPERIENCE
+Senior Engineer, Acme Corp Jan 2018 - Present
+Led migration to AWS
+EDUCATION
+Bachelor of Science in Computer Science, MIT 2013
+CERTIFICATIONS
+AWS Certified Solutions Architect
+LANGUAGES
+English, Spanish"""
+
+
+def _fast_parser():
+    parser = ResumeParser('resume.docx', 'docx')
+    parser.intelligent_parser = None  # fast mode
+    parser.lines = [l.strip() for l in RESUME.split('\n') if l.strip()]
+    return parser
+
+
+def test_each_line_classified_once():
+    """All extractors share one segmentation pass"""
+    print("\n" + "="*70)
+    print("TEST 1: One segmentation pass per parse")
+    print("="*70)
+
+    parser = _fast_parser()
+    classified = []
+    original = advanced_resume_parser.classify_heading
+
+    def counting(line, *args, **kwargs):
+        classified.append(line)
+        return original(line, *args, **kwargs)
+
+    advanced_resume_parser.classify_heading = counting
+    try:
+        for name in ['experience', 'education', 'skills', 'projects', 'certifications', 'awards', 'languages']:
+            getattr(parser, f'_extract_{name}')()
+    finally:
+        advanced_resume_parser.classify_heading = original
+
+    print(f"  {len(parser.lines)} lines, {len(classified)} heading classifications")
+    assert len(classified) == len(set(classified))
+    assert len(classified) <= len(parser.lines)
+
+
+def test_section_ranges():
+    """Ranges stop at the next major header; repeated lookups come from the index"""
+    print("\n" + "="*70)
+    print("TEST 2: Section ranges")
+    print("="*70)
+
+    parser = _fast_parser()
+    experience = parser._find_section(['experience', 'work history', 'employment',
+                                       'professional experience', 'work experience', 'career history'])
+    assert experience == ['Senior Engineer, Acme Corp Jan 2018 - Present', 'Led migration to AWS']
+
+    languages = parser._find_section(['languages', 'language proficiency'])
+    languages.append('mutated by caller')
+    assert parser._find_section(['languages', 'language proficiency']) == ['English, Spanish']
+
+    # Groups outside SECTION_QUERIES are segmented on demand (and run through their own headers)
+    assert parser._find_section(['education', 'certifications', 'education/ certifications']) == \
+        ['Bachelor of Science in Computer Science, MIT 2013', 'CERTIFICATIONS', 'AWS Certified Solutions Architect']
+    assert parser._find_section(['projects', 'key projects', 'project work']) == []
+
+    # New text invalidates the index
+    parser.lines = ['Skills', 'Go, Rust']
+    assert parser._find_section(['skills', 'technical skills', 'competencies', 'expertise']) == ['Go, Rust']
+    print("  ✓ Ranges, cache and invalidation")
+
+
+if __name__ == "__main__":
+    test_each_line_classified_once()
+    test_section_ranges()
+    print("\n🎉 All section index tests passed!")
@@ -0,0 +1,159 @@
+"""
+Test the template cache
+Clones are independent of each other and of the cached template, share the
+read-only parts, and format to the same document as Document(template_path)
+"""
+
+import sys
+import os
+import contextlib
+import io
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from config import Config
+from utils.template_cache import TemplateCache, benchmark_template_load
+from utils.word_formatter import WordFormatter
+from template_fixtures import RESUME, instruction_lines, make_template
+
+def _make_template(path, filler=5):
+    make_template(path, filler=instruction_lines(filler), header='<Candidate Name> - Confidential')
+
+
+def _wait(cache, pooled, timeout=5.0):
+    deadline = time.time() + timeout
+    while cache.info()['pooled'] < pooled and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_clones_are_isolated():
+    """Editing a clone changes neither other clones nor the cached template"""
+    print("\n" + "="*70)
+    print("TEST 1: Clone isolation")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        _make_template(template)
+        cache = TemplateCache(pool_size=0)
+        first, second = cache.checkout(template), cache.checkout(template)
+
+        first.paragraphs[0].text = 'EDITED'
+        first.add_paragraph('appended')
+        first.sections[0].header.paragraphs[0].text = 'Jane Smith'
+        third = cache.checkout(template)
+
+        for doc in (second, third):
+            assert doc.paragraphs[0].text == 'CAI CONTACT'
+            assert doc.sections[0].header.paragraphs[0].text == '<Candidate Name> - Confidential'
+            assert len(doc.paragraphs) == len(first.paragraphs) - 1
+        assert first.element is not second.element
+        assert first.styles.element is second.styles.element  # shared, not copied
+
+        output = os.path.join(tmp, 'first.docx')
+        first.save(output)
+        saved = Document(output)
+        assert saved.paragraphs[0].text == 'EDITED' and saved.sections[0].header.paragraphs[0].text == 'Jane Smith'
+        assert cache.stats['loads'] == 1
+    print(f"  ✓ {cache.info()}")
+
+
+def test_reload_eviction_and_pool():
+    """A changed file is parsed again, the byte budget evicts LRU, the pool refills"""
+    print("\n" + "="*70)
+    print("TEST 2: Reload, eviction and pool")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f't{i}.docx') for i in range(3)]
+        for path in paths:
+            _make_template(path)
+
+        cache = TemplateCache(pool_size=2)
+        cache.prefetch(paths[0])
+        _wait(cache, 2)
+        assert cache.info()['pooled'] == 2
+        cache.checkout(paths[0])
+        assert cache.stats['pool_hits'] == 1
+
+        # Re-saved template: the old version is replaced, not served
+        doc = Document(paths[0])
+        doc.add_paragraph('NEW LINE')
+        doc.save(paths[0])
+        os.utime(paths[0], ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert cache.checkout(paths[0]).paragraphs[-1].text == 'NEW LINE'
+        assert cache.info()['templates'] == 1
+
+        # Budget for two templates: loading a third evicts the least recently used
+        cache.wait_for_refills()
+        one = cache.info()['cached_mb'] * 1e6
+        small = TemplateCache(max_bytes=int(one * 2.5), pool_size=2)
+        for path in paths:
+            small.checkout(path)
+        small.checkout(paths[1])
+        small.checkout(paths[2])
+        small.wait_for_refills()
+        assert small.info()['templates'] == 2 and small.stats['evictions'] == 1
+        assert small.checkout(paths[0]) is not None and small.stats['loads'] == 4
+
+        tiny = TemplateCache(max_bytes=1000)
+        assert tiny.checkout(paths[1]).paragraphs[0].text == 'CAI CONTACT'
+        assert tiny.stats['uncached'] == 1 and tiny.info()['templates'] == 0
+    print(f"  ✓ {small.info()}")
+
+
+def test_formatter_output_unchanged():
+    """WordFormatter produces the same document with and without the cache"""
+    print("\n" + "="*70)
+    print("TEST 3: Formatter parity")
+    print("="*70)
+
+    saved = Config.USE_TEMPLATE_CACHE
+    outputs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        _make_template(template, filler=20)
+        try:
+            for enabled in (False, True, True):
+                Config.USE_TEMPLATE_CACHE = enabled
+                output = os.path.join(tmp, f'out{len(outputs)}.docx')
+                formatter = WordFormatter(RESUME, {'template_path': template, 'template_type': 'docx'}, output)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    assert formatter.format()
+                with zipfile.ZipFile(output) as z:
+                    outputs[output] = {name: z.read(name) for name in ('word/document.xml', 'word/header1.xml')}
+        finally:
+            Config.USE_TEMPLATE_CACHE = saved
+
+    plain, *cached = outputs.values()
+    assert all(result == plain for result in cached)
+    assert b'Rita Recruiter' in plain['word/document.xml']
+    print(f"  ✓ {len(cached)} cached runs identical to Document() run")
+
+
+def test_load_benchmark():
+    """Pooled clones make the per-resume load cost negligible"""
+    print("\n" + "="*70)
+    print("TEST 4: Load benchmark")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.docx')
+        _make_template(template, filler=100)
+        row = benchmark_template_load(template, count=20)
+    print(f"  {row}")
+    assert row['clone_ms'] < row['parse_ms']
+    assert row['pooled_ms'] < row['parse_ms'] / 10 and row['pool_hits'] == 20
+
+
+if __name__ == "__main__":
+    test_clones_are_isolated()
+    test_reload_eviction_and_pool()
+    test_formatter_output_unchanged()
+    test_load_benchmark()
+    print("\n🎉 All template cache tests passed!")
@@ -0,0 +1,141 @@
+"""
+Test precomputed template-section embedding matrices
+Uses a deterministic fake encoder so no ML libraries are needed
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embedding_cache import EmbeddingCache
+import utils.embedding_cache as embedding_cache
+from utils.template_section_index import (
+    TemplateSectionIndex, get_section_index, load_template_section_index, sidecar_path
+)
+
+
+class FakeEncoder:
+    """Counts encoded texts and returns a stable unit vector per text"""
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        rows = []
+        for text in texts:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(' '.join(text.lower().split())))
+            vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            rows.append(vec / np.linalg.norm(vec))
+        return np.stack(rows)
+
+
+def _isolated_cache():
+    embedding_cache._cache_instance = EmbeddingCache(directory=None)
+
+
+def test_index_matches_raw_dot_product():
+    """best_match picks the same section as the old encode-everything path"""
+    print("\n" + "="*70)
+    print("TEST 1: Matrix-vector match parity")
+    print("="*70)
+    _isolated_cache()
+
+    model = FakeEncoder()
+    sections = ["SUMMARY", "EMPLOYMENT HISTORY", "EDUCATION", "SKILLS"]
+    index = TemplateSectionIndex.build(sections, model)
+
+    for heading in ["work experience", "education", "technical skills", "profile"]:
+        query = model.encode([heading])
+        raw = np.dot(query, model.encode([s.lower() for s in sections]).T)[0]
+        best_idx, best_score = index.best_match(query[0])
+        assert best_idx == int(np.argmax(raw))
+        assert abs(best_score - float(raw[best_idx])) < 1e-5
+    print("  ✓ Same best section and score as raw dot product")
+
+
+def test_sections_encoded_once_per_template():
+    """Repeated lookups against one template never re-encode its sections"""
+    print("\n" + "="*70)
+    print("TEST 2: One build per template")
+    print("="*70)
+    _isolated_cache()
+
+    model = FakeEncoder()
+    sections = ["PROFESSIONAL SUMMARY", "WORK HISTORY", "CERTIFICATIONS"]
+    first = get_section_index(sections, model)
+    encoded_after_build = len(model.encoded)
+    for _ in range(5):
+        assert get_section_index(list(sections), model) is first
+    assert len(model.encoded) == encoded_after_build
+    print(f"  ✓ {encoded_after_build} encodes for 6 lookups")
+
+
+def test_sidecar_roundtrip():
+    """Upload-time sidecar loads back with the same matrix and fingerprint"""
+    print("\n" + "="*70)
+    print("TEST 3: Sidecar persistence")
+    print("="*70)
+    _isolated_cache()
+
+    model = FakeEncoder()
+    with tempfile.TemporaryDirectory() as tmp:
+        template_path = os.path.join(tmp, "template.docx")
+        index = TemplateSectionIndex.build(["EDUCATION", "SKILLS"], model)
+        index.save(sidecar_path(template_path))
+
+        analysis = {
+            'template_path': template_path,
+            'sections': [{'heading': 'EDUCATION'}, {'heading': 'SKILLS'}],
+            'section_index': {
+                'file': os.path.basename(sidecar_path(template_path)),
+                'fingerprint': index.fingerprint,
+                'model': index.model_name,
+            },
+        }
+        loaded = load_template_section_index(analysis)
+        assert loaded is not None
+        assert loaded.fingerprint == index.fingerprint
+        assert np.allclose(loaded.matrix, index.matrix)
+    print("  ✓ Sidecar matrix restored")
+
+
+def test_sidecar_rejects_pickles_and_bad_shapes():
+    """Sidecars are read without unpickling and must fit their section list"""
+    print("\n" + "="*70)
+    print("TEST 4: Sidecar validation")
+    print("="*70)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "template.docx.sections.npz")
+
+        np.savez(path, matrix=np.eye(2, dtype=np.float32),
+                 sections=np.array(["EDUCATION", "SKILLS"], dtype=object),
+                 model_name=np.array("fake"))
+        try:
+            TemplateSectionIndex.load(path)
+            assert False, "object arrays must not be unpickled"
+        except ValueError:
+            pass
+
+        np.savez(path, matrix=np.eye(3, dtype=np.float32),
+                 sections=np.array(["EDUCATION", "SKILLS"], dtype=str),
+                 model_name=np.array("fake", dtype=str))
+        try:
+            TemplateSectionIndex.load(path)
+            assert False, "matrix rows must match the section count"
+        except ValueError:
+            pass
+    print("  ✓ Pickled and mis-shaped sidecars rejected")
+
+
+if __name__ == "__main__":
+    test_index_matches_raw_dot_product()
+    test_sections_encoded_once_per_template()
+    test_sidecar_roundtrip()
+    test_sidecar_rejects_pickles_and_bad_shapes()
+    print("\n🎉 All template section index tests passed!")
@@ -8,14 +8,15 @@ Extracts comprehensive information from resumes:
 - Projects, Certifications, Awards
 """
 
-import pdfplumber
-from docx import Document
-import re
 from datetime import datetime
 from collections import defaultdict
 import os
 from functools import lru_cache
 
+from utils import regex_bank
+from utils.candidate_document import load_candidate_document
+from utils.pdf_text import extract_pdf_text
+
 # Import intelligent parser for smart section mapping
 try:
     from utils.intelligent_resume_parser import get_intelligent_parser
@@ -24,6 +25,25 @@ except ImportError:
     INTELLIGENT_PARSER_AVAILABLE = False
     print("⚠️  Intelligent parser not available, using basic matching")
 
+# Torch-free heading classifier (used in fast mode)
+try:
+    from utils.heading_classifier import classify_heading, section_for_label
+    HEADING_CLASSIFIER_AVAILABLE = True
+except ImportError:
+    HEADING_CLASSIFIER_AVAILABLE = False
+
+def parser_mode():
+    """'ml' if a ResumeParser created now uses the intelligent section mapper, else 'fast'"""
+    try:
+        from config import Config
+        use_ml = Config.USE_ML_PARSER
+    except:
+        use_ml = False
+    if not (use_ml and INTELLIGENT_PARSER_AVAILABLE):
+        return 'fast'
+    from utils.model_cache import models_loading
+    return 'fast' if models_loading() else 'ml'
+
 class ResumeParser:
     """Comprehensive resume parsing"""
     
@@ -32,6 +52,13 @@ class ResumeParser:
         self.file_type = file_type
         self.raw_text = ""
         self.lines = []
+        self.document = None  # Shared CandidateDocument (DOCX uploads)
+        
+        # Section index built once per parse by _segment_sections
+        self._section_lines = None
+        self._section_starts = {}
+        self._section_keywords = {}
+        self._section_ranges = {}
         
         # Initialize intelligent parser if available and enabled
         self.intelligent_parser = None
@@ -41,7 +68,12 @@ class ResumeParser:
         except:
             use_ml = False
         
-        if use_ml and INTELLIGENT_PARSER_AVAILABLE:
+        from utils.model_cache import models_loading
+        
+        if use_ml and INTELLIGENT_PARSER_AVAILABLE and models_loading():
+            # Don't wait for the background warm-up: the rule-based tiers serve this resume
+            print("⏳ ML models still warming up - using fast parser for this resume")
+        elif use_ml and INTELLIGENT_PARSER_AVAILABLE:
             try:
                 self.intelligent_parser = get_intelligent_parser()
                 print("✅ Using intelligent section mapper (ML enabled)")
@@ -89,47 +121,18 @@ class ResumeParser:
         return resume_data
     
     def _extract_pdf_text(self):
-        """Extract text from PDF"""
+        """Extract text from PDF (engine from Config.PDF_TEXT_ENGINE)"""
         try:
-            with pdfplumber.open(self.file_path) as pdf:
-                return '\n'.join([page.extract_text() or '' for page in pdf.pages])
+            return extract_pdf_text(self.file_path)
         except Exception as e:
             print(f"❌ Error extracting PDF text: {e}")
             return ""
     
     def _extract_docx_text(self):
-        """Extract text from DOCX (paragraphs, tables, headers/footers)"""
+        """Extract text from DOCX (headers, body with tables and text boxes in document order, footers)"""
         try:
-            doc = Document(self.file_path)
-            texts = []
-
-            # Main body paragraphs
-            for para in doc.paragraphs:
-                if para.text is not None:
-                    texts.append(para.text)
-
-            # Tables content
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            if p.text is not None:
-                                texts.append(p.text)
-
-            # Headers and footers
-            try:
-                for section in doc.sections:
-                    for p in section.header.paragraphs:
-                        if p.text is not None:
-                            texts.append(p.text)
-                    for p in section.footer.paragraphs:
-                        if p.text is not None:
-                            texts.append(p.text)
-            except Exception:
-                pass
-
-            # Join and normalize lines
-            return '\n'.join([t for t in texts if t and t.strip()])
+            self.document = load_candidate_document(self.file_path)
+            return self.document.text
         except Exception as e:
             print(f"❌ Error extracting DOCX text: {e}")
             return ""
@@ -140,18 +143,10 @@ class ResumeParser:
 
         # Helper: find first line index that contains email or phone
         email_idx = phone_idx = None
-        email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
-        phone_patterns = [
-            r'(?:\+?\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',  # US formats
-            r'(?:\+?91[-\s]?)?\d{10}',  # India +91XXXXXXXXXX or 10 digits
-            r'\+?\d{1,3}[-\s]?\d{2,5}[-\s]?\d{5,10}',  # Intl generic
-        ]
-        phone_regexes = [re.compile(p) for p in phone_patterns]
-
         for idx, line in enumerate(lines[:30]):
-            if email_idx is None and email_pattern.search(line):
+            if email_idx is None and regex_bank.EMAIL_STRICT.search(line):
                 email_idx = idx
-            if phone_idx is None and any(r.search(line) for r in phone_regexes):
+            if phone_idx is None and regex_bank.PHONE_LINE.search(line):
                 phone_idx = idx
             if email_idx is not None and phone_idx is not None:
                 break
@@ -174,7 +169,7 @@ class ResumeParser:
                 continue
             if len(line) < 3 or len(line) > 60:
                 continue
-            if re.match(r'^[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z\-\.]+){1,3}$', line.strip()):
+            if regex_bank.NAME_LINE.match(line.strip()):
                 return line.strip()
 
         # Fallback 2: derive from file name
@@ -189,7 +184,7 @@ class ResumeParser:
                 print(f"  🔄 Removed UUID prefix: '{stem}'")
             
             # Remove common words and separators
-            tokens = re.split(r'[\W_]+', stem)
+            tokens = regex_bank.FILENAME_SEPARATORS.split(stem)
             blacklist = {"resume", "cv", "profile", "updated", "final", "copy", "doc", "docx", "pdf", "state", "of", "va", "original"}
             tokens = [t for t in tokens if t and t.lower() not in blacklist]
             print(f"  🔍 Name tokens after filtering: {tokens}")
@@ -208,20 +203,13 @@ class ResumeParser:
     
     def _extract_email(self):
         """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, self.raw_text)
+        match = regex_bank.EMAIL.search(self.raw_text)
         return match.group(0) if match else ""
     
     def _extract_phone(self):
         """Extract phone number (supports international formats)"""
-        phone_patterns = [
-            r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US formats
-            r'(?:\+?91[-.\s]?)?\d{10}',  # India
-            r'\+?\d{1,3}[-.\s]?\d{2,5}[-.\s]?\d{5,10}',  # Intl generic
-        ]
-
-        for pattern in phone_patterns:
-            match = re.search(pattern, self.raw_text)
+        for pattern in regex_bank.PHONE_PATTERNS:
+            match = pattern.search(self.raw_text)
             if match:
                 return match.group(0)
         return ""
@@ -237,19 +225,13 @@ class ResumeParser:
     
     def _extract_linkedin(self):
         """Extract LinkedIn profile"""
-        linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+'
-        match = re.search(linkedin_pattern, self.raw_text, re.IGNORECASE)
+        match = regex_bank.LINKEDIN.search(self.raw_text)
         return match.group(0) if match else ""
     
     def _extract_dob(self):
         """Extract date of birth"""
-        dob_patterns = [
-            r'(?:DOB|Date of Birth|Birth Date)[\s:]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-            r'(?:DOB|Date of Birth|Birth Date)[\s:]+(\w+ \d{1,2},? \d{4})',
-        ]
-        
-        for pattern in dob_patterns:
-            match = re.search(pattern, self.raw_text, re.IGNORECASE)
+        for pattern in regex_bank.DOB_PATTERNS:
+            match = pattern.search(self.raw_text)
             if match:
                 return match.group(1)
         return ""
@@ -671,7 +653,7 @@ class ResumeParser:
         
         if ' - ' in line or ' – ' in line:
             # Split by dash
-            parts = re.split(r'\s+[-–]\s+', line, maxsplit=1)
+            parts = regex_bank.DASH_SPLIT.split(line, maxsplit=1)
             if len(parts) == 2:
                 # Usually "Company - Role" or "Role - Company"
                 # Heuristic: if first part has common company indicators, it's company
@@ -683,7 +665,7 @@ class ResumeParser:
         
         elif ' at ' in line.lower():
             # "Role at Company"
-            parts = re.split(r'\s+at\s+', line, flags=re.IGNORECASE, maxsplit=1)
+            parts = regex_bank.AT_SPLIT.split(line, maxsplit=1)
             if len(parts) == 2:
                 return parts[1].strip(), parts[0].strip()
         
@@ -787,9 +769,9 @@ class ResumeParser:
 
                 # Clean year tokens and generic suffixes from degree text
                 if degree:
-                    degree = re.sub(r'\b(?:19|20)\d{2}\b', '', degree)
-                    degree = re.sub(r'\b(class of|graduation|graduated|passed out)\b', '', degree, flags=re.IGNORECASE)
-                    degree = re.sub(r'\s+', ' ', degree).strip(' ,.;:-')
+                    degree = regex_bank.YEAR.sub('', degree)
+                    degree = regex_bank.GRADUATION_WORDS.sub('', degree)
+                    degree = regex_bank.WHITESPACE_RUN.sub(' ', degree).strip(' ,.;:-')
                 
                 # If institution is empty, check next line
                 if not institution and i + 1 < len(lines):
@@ -895,7 +877,7 @@ class ResumeParser:
             if any(k in low for k in degree_keywords + institution_keywords):
                 degree, institution = self._parse_degree_institution_line(line)
                 year = self._clean_years(line)
-                degree = re.sub(r'\b(?:19|20)\d{2}\b', '', degree or '').strip(' ,.;:-')
+                degree = regex_bank.YEAR.sub('', degree or '').strip(' ,.;:-')
                 if not (degree or institution):
                     continue
                 key = (degree.lower(), institution.lower(), year)
@@ -916,7 +898,7 @@ class ResumeParser:
         # Prefer most recent entries: sort by year descending when available
         def year_key(e):
             y = e.get('year') or ''
-            m = re.search(r'((?:19|20)\d{2})$', y)
+            m = regex_bank.TRAILING_YEAR.search(y)
             return int(m.group(1)) if m else -1
         results.sort(key=year_key, reverse=True)
         # Limit to 5
@@ -934,14 +916,14 @@ class ResumeParser:
         # Normalize quotes and apostrophes
         s = s.replace(''', "'").replace(''', "'").replace('"', '"').replace('"', '"')
         # Collapse multiple spaces
-        s = re.sub(r'\s+', ' ', s).strip()
+        s = regex_bank.WHITESPACE_RUN.sub(' ', s).strip()
         return s
 
     def _strip_location(self, s):
         if not s:
             return s
         # Remove trailing city/state fragments after comma
-        s = re.sub(r',[^,]*\b(?:city|state|india|usa|uk)\b.*$', '', s, flags=re.IGNORECASE)
+        s = regex_bank.TRAILING_LOCATION.sub('', s)
         return s.strip()
 
     def _clean_years(self, s):
@@ -951,10 +933,10 @@ class ResumeParser:
         if not s:
             return ''
         s = self._normalize_text(s)
-        s = re.sub(r'[–—]', '-', s)
-        s = re.sub(r'\s*(to|–|—|-)\s*', '-', s, flags=re.IGNORECASE)
+        s = regex_bank.DASHES.sub('-', s)
+        s = regex_bank.RANGE_CONNECTOR.sub('-', s)
 
-        present = bool(re.search(r'\b(current|present)\b', s, re.IGNORECASE))
+        present = bool(regex_bank.CURRENT_OR_PRESENT.search(s))
 
         month_map = {
             'january': 'Jan', 'jan': 'Jan',
@@ -973,7 +955,7 @@ class ResumeParser:
         def abbr(m):
             return month_map.get(m.lower(), m[:3].title())
 
-        my = [m.groups() for m in re.finditer(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s*(?:,\s*)?((?:19|20)\d{2})\b', s, flags=re.IGNORECASE)]
+        my = [m.groups() for m in regex_bank.MONTH_YEAR.finditer(s)]
         if my:
             sm, sy = my[0]
             sm = abbr(sm)
@@ -983,12 +965,12 @@ class ResumeParser:
                 return f"{sm} {sy}-{em} {ey}"
             if present:
                 return f"{sm} {sy}-Present"
-            yrs = re.findall(r'\b((?:19|20)\d{2})\b', s)
+            yrs = regex_bank.YEAR.findall(s)
             if len(yrs) >= 2:
                 return f"{sm} {yrs[0]}-{yrs[-1]}"
             return f"{sm} {sy}"
 
-        years = re.findall(r'\b(?:19|20)\d{2}\b', s)
+        years = regex_bank.YEAR.findall(s)
         if len(years) >= 2:
             return f"{years[0]}-{years[-1]}"
         elif len(years) == 1:
@@ -1004,7 +986,7 @@ class ResumeParser:
         s = self._normalize_text(line)
         s = self._strip_bullet(s)
         # Prefer splitting at an institution keyword boundary
-        m = re.search(r'(university|college|school|institute|academy)\b.*', s, flags=re.IGNORECASE)
+        m = regex_bank.INSTITUTION_TAIL.search(s)
         if m:
             degree = s[:m.start()].strip(' ,;:-')
             institution = s[m.start():].strip()
@@ -1019,7 +1001,7 @@ class ResumeParser:
             return parts[0].strip() if parts else '', ''
         
         elif ' - ' in s or ' – ' in s:
-            parts = re.split(r'\s+[-–]\s+', s, maxsplit=1)
+            parts = regex_bank.DASH_SPLIT.split(s, maxsplit=1)
             if len(parts) == 2:
                 return parts[0].strip(), parts[1].strip()
         
@@ -1029,7 +1011,7 @@ class ResumeParser:
                 return parts[0].strip(), parts[1].strip()
         
         elif ' from ' in s.lower():
-            parts = re.split(r'\s+from\s+', s, flags=re.IGNORECASE, maxsplit=1)
+            parts = regex_bank.FROM_SPLIT.split(s, maxsplit=1)
             if len(parts) == 2:
                 return parts[0].strip(), parts[1].strip()
         
@@ -1039,7 +1021,7 @@ class ResumeParser:
     def _strip_bullet(self, s):
         if not s:
             return s
-        return re.sub(r'^[\s•\-–—*●]+', '', s)
+        return regex_bank.LEADING_BULLET.sub('', s)
 
     def _extract_role_from_dated_line(self, s):
         """Remove date expressions from a dated line to recover the job title/role text."""
@@ -1047,13 +1029,13 @@ class ResumeParser:
             return ''
         t = self._strip_bullet(self._normalize_text(s))
         # Remove month names + year e.g., 'Aug 2007', 'July 2025'
-        t = re.sub(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-zA-Z]*\s+(?:19|20)\d{2}\b', '', t, flags=re.IGNORECASE)
+        t = regex_bank.MONTH_YEAR_SPACED.sub('', t)
         # Remove standalone years and connectors
-        t = re.sub(r'\b(?:19|20)\d{2}\b', '', t)
-        t = re.sub(r'\b(to|–|—|-)\b', '', t, flags=re.IGNORECASE)
-        t = re.sub(r'\b(current|present)\b', '', t, flags=re.IGNORECASE)
+        t = regex_bank.YEAR.sub('', t)
+        t = regex_bank.WORD_CONNECTOR.sub('', t)
+        t = regex_bank.CURRENT_OR_PRESENT.sub('', t)
         # Collapse spaces and trim
-        t = re.sub(r'\s+', ' ', t).strip(' ,;:- ')
+        t = regex_bank.WHITESPACE_RUN.sub(' ', t).strip(' ,;:- ')
         return t
     
     def _extract_skills(self):
@@ -1225,8 +1207,8 @@ class ResumeParser:
         for skill in individual_skills:
             skill = skill.strip()
             # Remove common prefixes/suffixes
-            skill = re.sub(r'^[-•*\s]+', '', skill)  # Remove bullets
-            skill = re.sub(r'\s*[-•*\s]+$', '', skill)  # Remove trailing bullets
+            skill = regex_bank.SKILL_LEADING_BULLET.sub('', skill)  # Remove bullets
+            skill = regex_bank.SKILL_TRAILING_BULLET.sub('', skill)  # Remove trailing bullets
             skill = skill.strip()
             
             if skill and len(skill) > 1:
@@ -1325,13 +1307,20 @@ class ResumeParser:
         
         return dict(sections)
     
-    def _find_section(self, keywords):
-        """Find section by keywords - with INTELLIGENT semantic matching"""
-        section_lines = []
-        in_section = False
-        section_start_idx = -1
-        
-        # ENHANCEMENT: Expand keywords with common synonyms
+    # Keyword groups the _extract_* methods look up; their section starts are found
+    # together in one pass over the lines (other groups are segmented on demand)
+    SECTION_QUERIES = (
+        ('experience', 'work history', 'employment', 'professional experience', 'work experience', 'career history'),
+        ('education', 'academic', 'qualification', 'academics'),
+        ('skills', 'technical skills', 'competencies', 'expertise'),
+        ('projects', 'key projects', 'project work'),
+        ('certifications', 'certificates', 'licenses'),
+        ('awards', 'achievements', 'honors', 'recognition'),
+        ('languages', 'language proficiency'),
+    )
+    
+    def _expand_section_keywords(self, keywords):
+        """Keywords plus common synonyms of the primary keyword"""
         expanded_keywords = list(keywords)
         
         # Add synonyms based on primary keyword
@@ -1362,56 +1351,121 @@ class ResumeParser:
                 'executive summary', 'career overview', 'about me'
             ])
         
-        print(f"  🔍 Searching for section with keywords: {keywords[0]}")
-        print(f"     Expanded to {len(expanded_keywords)} variants")
+        return expanded_keywords
+    
+    def _match_section_start(self, line, line_lower, expanded_keywords, fast_label, fast_confidence,
+                             prefilter=None):
+        """
+        How a line opens a section for these keywords (None if it doesn't)
         
-        # First pass: find the section start
+        Args:
+            prefilter: Optional (lowercased keyword set, merged keyword pattern); lines that
+                match no keyword are ruled out with one search before the per-keyword loop
+        """
+        # METHOD 1: Try intelligent matching if available
+        if self.intelligent_parser and len(line) < 50:
+            try:
+                matched = self.intelligent_parser._match_heading(line, expanded_keywords)
+                if matched:
+                    return f"AI match → '{matched}'"
+            except Exception as e:
+                print(f"  ⚠️  AI matching failed: {e}")
+        
+        # METHOD 1b: Fast mode - torch-free heading classifier (line classified once)
+        elif HEADING_CLASSIFIER_AVAILABLE and len(line) < 50:
+            matched = section_for_label(fast_label, expanded_keywords)
+            if matched:
+                return f"fast classifier → '{matched}', {fast_confidence:.2f}"
+        
+        # METHOD 2: Exact and partial string matching (fallback)
+        if prefilter:
+            keyword_set, keyword_pattern = prefilter
+            if line_lower not in keyword_set and not (len(line_lower) < 50 and keyword_pattern.search(line_lower)):
+                return None
+        
+        for keyword in expanded_keywords:
+            keyword_lower = keyword.lower()
+            
+            # Exact match
+            if keyword_lower == line_lower:
+                return "exact match"
+            
+            # Partial match (for short headers)
+            if len(line_lower) < 50 and keyword_lower in line_lower:
+                # Ensure it's not part of a larger word
+                if regex_bank.keyword_pattern(keyword_lower).search(line_lower):
+                    return "partial match"
+        
+        return None
+    
+    def _segment_sections(self, queries):
+        """
+        Segmentation stage: one pass over the lines finds where each keyword
+        group's section starts. Every candidate header line is classified once
+        and checked against all groups that are still unresolved.
+        """
+        if self._section_lines is not self.lines:
+            # New text: drop the index built for the previous lines
+            self._section_lines = self.lines
+            self._section_starts = {}
+            self._section_keywords = {}
+            self._section_ranges = {}
+        
+        pending = [q for q in queries if q not in self._section_starts]
+        for query in pending:
+            self._section_keywords[query] = self._expand_section_keywords(query)
+            self._section_starts[query] = -1
+        
+        # One merged whole-word pattern per group rules out most lines in a single search
+        prefilters = {}
+        for query in pending:
+            keywords_lower = tuple(k.lower() for k in self._section_keywords[query])
+            prefilters[query] = (frozenset(keywords_lower), regex_bank.keyword_alternation(keywords_lower))
+        
+        fast_mode = not self.intelligent_parser and HEADING_CLASSIFIER_AVAILABLE
         for idx, line in enumerate(self.lines):
-            line_lower = line.lower().strip()
+            if not pending:
+                break
             
             # Skip very long lines (not section headers)
             if len(line) > 100:
                 continue
             
-            # METHOD 1: Try intelligent matching if available
-            if self.intelligent_parser and len(line) < 50:
-                try:
-                    matched = self.intelligent_parser._match_heading(
-                        line,
-                        expanded_keywords
-                    )
-                    if matched:
-                        in_section = True
-                        section_start_idx = idx
-                        print(f"  ✅ Found '{keywords[0]}' at line {idx}: '{line[:50]}' (AI match → '{matched}')")
-                        break
-                except Exception as e:
-                    print(f"  ⚠️  AI matching failed: {e}")
-            
-            # METHOD 2: Exact and partial string matching (fallback)
-            for keyword in expanded_keywords:
-                keyword_lower = keyword.lower()
-                
-                # Exact match
-                if keyword_lower == line_lower:
-                    in_section = True
-                    section_start_idx = idx
-                    print(f"  ✅ Found '{keywords[0]}' at line {idx}: '{line[:50]}' (exact match)")
-                    break
-                
-                # Partial match (for short headers)
-                if len(line_lower) < 50 and keyword_lower in line_lower:
-                    # Ensure it's not part of a larger word
-                    if re.search(rf'\b{re.escape(keyword_lower)}\b', line_lower):
-                        in_section = True
-                        section_start_idx = idx
-                        print(f"  ✅ Found '{keywords[0]}' at line {idx}: '{line[:50]}' (partial match)")
-                        break
+            line_lower = line.lower().strip()
+            fast_label, fast_confidence = (classify_heading(line) if fast_mode and len(line) < 50
+                                           else (None, 0.0))
             
-            if in_section:
-                break
+            for query in list(pending):
+                how = self._match_section_start(line, line_lower, self._section_keywords[query],
+                                                fast_label, fast_confidence, prefilters[query])
+                if how:
+                    self._section_starts[query] = idx
+                    pending.remove(query)
+                    print(f"  ✅ Found '{query[0]}' at line {idx}: '{line[:50]}' ({how})")
+    
+    def _find_section(self, keywords):
+        """Find section by keywords - with INTELLIGENT semantic matching"""
+        query = tuple(keywords)
+        if self._section_lines is not self.lines:
+            print(f"  🧭 Segmenting {len(self.lines)} lines for {len(self.SECTION_QUERIES)} sections in one pass")
+            self._segment_sections(self.SECTION_QUERIES)
+        if query not in self._section_starts:
+            self._segment_sections([query])
+        
+        if query in self._section_ranges:
+            return list(self._section_ranges[query])
+        
+        section_lines = self._collect_section(self._section_starts[query], keywords,
+                                              self._section_keywords[query])
+        self._section_ranges[query] = section_lines
+        return list(section_lines)
+    
+    def _collect_section(self, section_start_idx, keywords, expanded_keywords):
+        """Lines from a section start until the next major section header"""
+        section_lines = []
+        primary = keywords[0].lower()
         
-        if not in_section:
+        if section_start_idx < 0:
             print(f"  ❌ Section '{keywords[0]}' not found")
             return section_lines
         
@@ -1549,7 +1603,7 @@ class ResumeParser:
     
     def _has_contact_info(self, text):
         """Check if text contains contact information"""
-        return bool(re.search(r'@|http|linkedin|\d{3}[-.\s]\d{3}', text, re.IGNORECASE))
+        return bool(regex_bank.CONTACT_HINT.search(text))
     
     def _looks_like_company_or_role(self, line):
         """Check if line looks like company name or job title"""
@@ -1574,7 +1628,7 @@ class ResumeParser:
                 return False  # Likely a name, not company
         
         # CRITICAL: Reject contact info
-        if '@' in line_clean or re.search(r'\d{3}[-.]?\d{3}[-.]?\d{4}', line_clean):
+        if '@' in line_clean or regex_bank.PHONE_DIGITS.search(line_clean):
             return False
         
         # CRITICAL: Reject goal/summary statements
@@ -1624,12 +1678,7 @@ class ResumeParser:
     
     def _contains_date_range(self, line):
         """Check if line contains date range"""
-        date_patterns = [
-            r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b',  # 2020 - 2023
-            r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+\d{4}',  # Jan 2020
-            r'\d{1,2}/\d{4}',  # 01/2020
-        ]
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in date_patterns)
+        return bool(regex_bank.DATE_RANGE.search(line))  # 2020 - 2023, Jan 2020, 01/2020
 
     def _should_merge_fragment(self, prev, curr):
         """Heuristic to decide if 'curr' is a continuation of 'prev' (fragment stitching).
@@ -1684,3 +1733,9 @@ def parse_resume(file_path, file_type):
     """Main function to parse resume"""
     parser = ResumeParser(file_path, file_type)
     return parser.parse()
+
+
+def parse_resume_model(file_path, file_type):
+    """parse_resume as a compact ParsedResume (to_dict() gives the parse_resume dict)"""
+    from utils.parsed_resume import ParsedResume
+    return ParsedResume.from_dict(parse_resume(file_path, file_type))
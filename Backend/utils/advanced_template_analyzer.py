@@ -508,4 +508,24 @@ class TemplateAnalyzer:
 def analyze_template(template_path):
     """Main function to analyze template"""
     analyzer = TemplateAnalyzer(template_path)
-    return analyzer.analyze()
+    analysis = analyzer.analyze()
+    
+    # Precompute the section-embedding matrix once, at upload time
+    try:
+        from utils.template_section_index import build_template_section_index
+        section_index = build_template_section_index(analysis, template_path)
+        if section_index:
+            analysis['section_index'] = section_index
+    except Exception as e:
+        print(f"⚠️  Section embedding precompute skipped: {e}")
+    
+    # Compile the template's fill plan (discovery the formatter would redo per resume)
+    try:
+        from utils.fill_plan import build_template_fill_plan
+        fill_plan = build_template_fill_plan(template_path)
+        if fill_plan:
+            analysis['fill_plan'] = fill_plan
+    except Exception as e:
+        print(f"⚠️  Fill plan compile skipped: {e}")
+    
+    return analysis
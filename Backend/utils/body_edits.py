@@ -0,0 +1,183 @@
+"""
+Body Edits - Deferred structural edits for formatter passes
+Formatter passes used to delete paragraphs and tables while they were still
+scanning the body, then re-derive indices from a tree that had just changed
+under them. Every deletion also patched (or invalidated) the BodyIndex, and
+a scan that ran past an element it had already removed was how sections
+disappeared.
+
+A pass now records what it wants and applies it in one step:
+
+    with BodyEdits(self._body) as edits:
+        for paragraph in ...:                 # scans see the untouched tree
+            edits.delete(paragraph)
+            edits.replace_text(other, '')
+            edits.insert_after(anchor, new_p)
+    # committed here, in one ordered walk of the tree
+
+- delete(): paragraph, table or element (deleting twice is a no-op)
+- delete_range(): consecutive siblings from first through last
+- insert_after(): fragment (elements / Paragraphs / Tables) after an anchor
+- replace_text(): first run gets the text, the other runs are emptied
+- is_deleted() / next_sibling(): let a scan skip what it already removed
+
+commit() checks the whole batch before touching the tree: a text edit on a
+paragraph that is being deleted (or sits inside a deleted table) is dropped
+and listed in conflicts; an insert after a deleted anchor would lose the
+inserted content, so it raises EditConflict and nothing is applied. The body
+index is invalidated once per commit instead of updated once per edit.
+"""
+
+from typing import Dict, List
+
+from docx.oxml.ns import qn
+
+_BLOCK_TAGS = (qn('w:p'), qn('w:tbl'))
+
+
+class EditConflict(ValueError):
+    """Edits in one batch contradict each other"""
+
+
+def _element(item):
+    return getattr(item, '_element', item)
+
+
+class BodyEdits:
+    """Pending deletes, inserts and text replacements for one pass"""
+
+    def __init__(self, index=None):
+        """
+        Args:
+            index: BodyIndex to invalidate after commit (optional)
+        """
+        self.index = index
+        self._deletes: Dict = {}
+        self._inserts: Dict = {}
+        self._texts: Dict = {}
+        self.conflicts: List[str] = []
+        self.committed = False
+
+    def __enter__(self) -> 'BodyEdits':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def __len__(self) -> int:
+        return len(self._deletes) + sum(len(v) for v in self._inserts.values()) + len(self._texts)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def delete(self, item):
+        """Delete a paragraph, table or element on commit"""
+        self._deletes[_element(item)] = None
+
+    def delete_range(self, first, last):
+        """Delete first, last and every sibling between them"""
+        node, last = _element(first), _element(last)
+        while node is not None:
+            self._deletes[node] = None
+            if node is last:
+                return
+            node = node.getnext()
+        raise EditConflict("delete_range: last is not a following sibling of first")
+
+    def insert_after(self, anchor, *fragment):
+        """Insert elements (or Paragraphs / Tables) directly after anchor, in the given order"""
+        self._inserts.setdefault(_element(anchor), []).extend(_element(item) for item in fragment)
+
+    def replace_text(self, paragraph, text: str):
+        """Set a paragraph's text on commit, keeping its first run's formatting"""
+        self._texts[_element(paragraph)] = (paragraph, text)
+
+    def is_deleted(self, item) -> bool:
+        return _element(item) in self._deletes
+
+    def next_sibling(self, item):
+        """Next sibling element that is not pending deletion (None at the end)"""
+        node = _element(item).getnext()
+        while node is not None and node in self._deletes:
+            node = node.getnext()
+        return node
+
+    # ------------------------------------------------------------------
+    # Commit
+    # ------------------------------------------------------------------
+
+    def _inside_deleted(self, element) -> bool:
+        return element in self._deletes or any(a in self._deletes for a in element.iterancestors())
+
+    def commit(self) -> Dict[str, int]:
+        """
+        Apply every recorded edit.
+
+        Returns:
+            Counts: {'deleted', 'inserted', 'replaced', 'conflicts'}
+
+        Raises:
+            EditConflict: An insert is anchored on a deleted element (nothing is applied)
+        """
+        if self.committed:
+            return {'deleted': 0, 'inserted': 0, 'replaced': 0, 'conflicts': 0}
+
+        # Check the batch first, so a conflict leaves the tree untouched
+        for anchor in self._inserts:
+            if self._inside_deleted(anchor):
+                raise EditConflict("insert after an element that is being deleted")
+        texts = {}
+        for element, edit in self._texts.items():
+            if self._inside_deleted(element):
+                self.conflicts.append(f"text edit dropped, paragraph deleted: {edit[1][:40]!r}")
+            else:
+                texts[element] = edit
+
+        # One walk in document order over every tree the edits touch
+        targets = set(self._deletes) | set(self._inserts) | set(texts)
+        ordered, seen = [], set()
+        for element in targets:
+            root = element.getroottree().getroot()
+            if id(root) in seen:
+                continue
+            seen.add(id(root))
+            ordered.extend(el for el in root.iter(*_BLOCK_TAGS) if el in targets)
+        # Elements not under a block tag (or detached) last, in recording order
+        placed = set(ordered)
+        ordered.extend(el for el in list(texts) + list(self._inserts) + list(self._deletes) if el not in placed)
+
+        counts = {'deleted': 0, 'inserted': 0, 'replaced': 0, 'conflicts': len(self.conflicts)}
+        for element in ordered:
+            if element in texts:
+                self._set_text(*texts.pop(element))
+                counts['replaced'] += 1
+            if element in self._inserts:
+                anchor = element
+                for new in self._inserts.pop(element):
+                    anchor.addnext(new)
+                    anchor = new
+                    counts['inserted'] += 1
+            if element in self._deletes:
+                del self._deletes[element]
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
+                    counts['deleted'] += 1
+
+        self.committed = True
+        if self.index is not None and (counts['deleted'] or counts['inserted']):
+            self.index.invalidate()
+        return counts
+
+    @staticmethod
+    def _set_text(paragraph, text: str):
+        runs = paragraph.runs
+        for run in runs:
+            run.text = ''
+        if runs:
+            runs[0].text = text
+        elif text:
+            paragraph.add_run(text)
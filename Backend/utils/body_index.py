@@ -0,0 +1,264 @@
+"""
+Body Index - Cached paragraph and block positions for a python-docx Document
+python-docx builds a fresh list of Paragraph proxies on every doc.paragraphs
+access, so formatter code that indexes doc.paragraphs[i] inside a loop is
+quadratic in the template length. BodyIndex builds the list once and keeps it
+current:
+
+- paragraphs: what doc.paragraphs returns (top-level body paragraphs, in order)
+- blocks: top-level body elements (paragraphs and tables, in order)
+- position(): paragraph / element -> index, from a map built on first use
+- headings(): positions of short non-empty paragraphs (read from live text,
+  since the formatter rewrites text in place)
+
+Inserts and deletes reported through inserted_after() / removed() are applied
+incrementally. Any other change to the number of body elements, or to the last
+block (doc.add_paragraph / add_table append there), is noticed on the next
+access and the index is rebuilt; edits that keep both must call invalidate().
+The lists are replaced, never edited
+in place, so a loop over index.paragraphs keeps the snapshot it started with -
+the same semantics as looping over doc.paragraphs.
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+_BLOCK_TAGS = (qn('w:p'), qn('w:tbl'))
+_SECT_PR = qn('w:sectPr')
+
+
+class BodyIndex:
+    """Paragraph list, block list and element positions of a document body"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._body = doc.element.body
+        self.rebuilds = 0
+        self._build()
+
+    def _build(self):
+        self._paragraphs = self.doc.paragraphs
+        self._positions = None
+        self._blocks = None
+        self._fingerprint = self._current()
+        self.rebuilds += 1
+
+    def _current(self) -> Tuple[int, object]:
+        # Element count and last block: changes made without going through
+        # inserted_after() / removed() show up as a mismatch
+        body = self._body
+        length = len(body)
+        last = body[length - 1] if length else None
+        if last is not None and last.tag == _SECT_PR:
+            last = body[length - 2] if length > 1 else None
+        return length, last
+
+    def _sync(self):
+        if self._current() != self._fingerprint:
+            self._build()
+
+    def invalidate(self):
+        """Force a rebuild on next access (after edits the fingerprint cannot see)"""
+        self._fingerprint = (-1, None)
+
+    @property
+    def paragraphs(self) -> List[Paragraph]:
+        """Body paragraphs in document order (do not modify the list)"""
+        self._sync()
+        return self._paragraphs
+
+    def __len__(self) -> int:
+        return len(self.paragraphs)
+
+    @property
+    def blocks(self) -> list:
+        """Top-level w:p and w:tbl elements in document order"""
+        self._sync()
+        if self._blocks is None:
+            self._blocks = [child for child in self._body.iterchildren() if child.tag in _BLOCK_TAGS]
+        return self._blocks
+
+    def _lookup(self, element) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {p._p: i for i, p in enumerate(self._paragraphs)}
+        return self._positions.get(element)
+
+    def position(self, item) -> Optional[int]:
+        """
+        Index of a body paragraph.
+
+        Args:
+            item: Paragraph or its w:p element
+
+        Returns:
+            Position in paragraphs, or None (not a top-level body paragraph)
+        """
+        self._sync()
+        return self._lookup(getattr(item, '_element', item))
+
+    def find(self, predicate: Callable[[Paragraph], bool], start: int = 0,
+             stop: Optional[int] = None) -> Optional[int]:
+        """First index in [start, stop) whose paragraph matches predicate"""
+        paragraphs = self.paragraphs
+        for idx in range(max(0, start), min(len(paragraphs), len(paragraphs) if stop is None else stop)):
+            if predicate(paragraphs[idx]):
+                return idx
+        return None
+
+    def headings(self, max_len: int = 50, start: int = 0) -> Iterator[Tuple[int, str]]:
+        """
+        Heading candidates: (position, upper-cased stripped text) of every
+        non-empty paragraph shorter than max_len, from start on.
+        """
+        paragraphs = self.paragraphs
+        for idx in range(start, len(paragraphs)):
+            text = (paragraphs[idx].text or '').strip().upper()
+            if text and len(text) < max_len:
+                yield idx, text
+
+    def heading_positions(self, keywords: Dict[str, List[str]], max_len: int = 50) -> Dict[str, int]:
+        """
+        First position of each section.
+
+        Args:
+            keywords: Section name -> keywords; a heading belongs to the first
+                section with a keyword contained in its text
+            max_len: Longest text still treated as a heading
+
+        Returns:
+            Section name -> paragraph position, in document order
+        """
+        found = {}
+        for idx, text in self.headings(max_len):
+            for section, words in keywords.items():
+                if any(word in text for word in words):
+                    found.setdefault(section, idx)
+                    break
+        return found
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def inserted_after(self, anchor, paragraph: Paragraph):
+        """
+        Record a paragraph that was just inserted directly after anchor.
+
+        Args:
+            anchor: Paragraph (or element) the new paragraph follows
+            paragraph: The inserted paragraph
+        """
+        element = paragraph._p
+        if element.getparent() is not self._body:
+            return  # Inside a table cell: not part of the body paragraph list
+        anchor_element = getattr(anchor, '_element', anchor)
+        pos = self._lookup(anchor_element) if len(self._body) == self._fingerprint[0] + 1 else None
+        if pos is None or element.getprevious() is not anchor_element:
+            self.invalidate()
+            return
+        self._paragraphs = self._paragraphs[:pos + 1] + [paragraph] + self._paragraphs[pos + 1:]
+        self._changed()
+
+    def removed(self, item):
+        """
+        Record a paragraph or table that was just removed from the body.
+
+        Args:
+            item: Paragraph, Table or the removed element
+        """
+        element = getattr(item, '_element', item)
+        pos = self._lookup(element)
+        delta = self._fingerprint[0] - len(self._body)
+        if pos is None and delta == 0:
+            return  # Removed from a table cell
+        if delta != 1 or element.getparent() is not None:
+            self.invalidate()
+            return
+        if pos is not None:
+            self._paragraphs = self._paragraphs[:pos] + self._paragraphs[pos + 1:]
+        self._changed()
+
+    def _changed(self):
+        self._fingerprint = self._current()
+        self._positions = None
+        self._blocks = None
+
+
+def benchmark_scaling(sizes=(50, 200, 500, 1000, 2000), section_every: int = 25) -> List[Dict]:
+    """
+    Time a formatter-style workload with and without the index.
+
+    The workload finds every section heading by element (as the cleanup helpers
+    do), scans the paragraphs after it by position and inserts one paragraph
+    under it.
+
+    Args:
+        sizes: Paragraph counts to measure
+        section_every: Paragraphs per section (heading count grows with the size)
+
+    Returns:
+        One row per size: {'paragraphs', 'rescan_ms', 'index_ms', 'speedup'}
+    """
+    import time
+    from docx import Document
+
+    def build(size):
+        doc = Document()
+        for i in range(size):
+            if i % section_every == 0:
+                doc.add_paragraph(f'SECTION {i}')
+            else:
+                doc.add_paragraph(f'• Detail line {i} with some words in it')
+        return doc
+
+    def insert_after(paragraph, text):
+        from docx.oxml import OxmlElement
+        new_p = OxmlElement('w:p')
+        paragraph._p.addnext(new_p)
+        new_para = Paragraph(new_p, paragraph._parent)
+        new_para.add_run(text)
+        return new_para
+
+    def rescan(doc):
+        headings = [p for p in doc.paragraphs if p.text.startswith('SECTION')]
+        for heading in headings:
+            idx = next(i for i, p in enumerate(doc.paragraphs) if p._element is heading._element)
+            for j in range(idx + 1, min(idx + 30, len(doc.paragraphs))):
+                if doc.paragraphs[j].text.startswith('SECTION'):
+                    break
+            insert_after(heading, 'Inserted')
+
+    def indexed(doc):
+        index = BodyIndex(doc)
+        headings = [p for p in index.paragraphs if p.text.startswith('SECTION')]
+        for heading in headings:
+            idx = index.position(heading)
+            for j in range(idx + 1, min(idx + 30, len(index.paragraphs))):
+                if index.paragraphs[j].text.startswith('SECTION'):
+                    break
+            index.inserted_after(heading, insert_after(heading, 'Inserted'))
+        return index
+
+    rows = []
+    for size in sizes:
+        timings = []
+        for workload in (rescan, indexed):
+            doc = build(size)
+            start = time.perf_counter()
+            workload(doc)
+            timings.append((time.perf_counter() - start) * 1000)
+        rows.append({
+            'paragraphs': size,
+            'rescan_ms': round(timings[0], 2),
+            'index_ms': round(timings[1], 2),
+            'speedup': round(timings[0] / timings[1], 1) if timings[1] else 0.0,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'paragraphs':>10} {'rescan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for row in benchmark_scaling():
+        print(f"{row['paragraphs']:>10} {row['rescan_ms']:>10} {row['index_ms']:>10} {row['speedup']:>7}x")
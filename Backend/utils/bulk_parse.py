@@ -0,0 +1,357 @@
+"""
+Bulk Parse - Offline parse_resume over a folder or zip of resumes
+Backfilling a candidate database used to mean posting thousands of files to
+/api/format. This runs the same parser across a process pool and streams one JSON
+line per resume:
+
+    python -m utils.bulk_parse resumes/ -o parsed.jsonl
+    python -m utils.bulk_parse export.zip -o parsed.jsonl --workers 8 --fast
+
+- Pool sized to the CPU count; each worker loads the ML models once (initializer)
+  and parses with PDF page extraction in-process (the pool already uses every core)
+- Files are handed out lazily with a bounded number in flight and each record is
+  written and flushed as soon as it is done, so memory stays flat for any input size
+- The output file is the checkpoint: rerunning the same command skips every file
+  already parsed (failed ones are retried) and appends to it
+- Progress and a final throughput / failure summary go to stdout
+
+Records: {"file", "status": "ok" | "error", "seconds", "result" | "error"}; when a
+file was retried, its last record wins.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import traceback
+import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from utils.parsed_resume import ParsedResume
+
+# Files in flight per worker (keeps workers busy without queueing the whole input)
+_IN_FLIGHT_PER_WORKER = 4
+
+_EXTENSIONS = ('pdf', 'doc', 'docx')
+
+
+def _extensions() -> Tuple[str, ...]:
+    try:
+        from config import Config
+        return tuple(sorted(Config.ALLOWED_EXTENSIONS))
+    except Exception:
+        return _EXTENSIONS
+
+
+def _file_type(name: str) -> Optional[str]:
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    return ext if ext in _extensions() else None
+
+
+def iter_resume_files(source: str) -> Iterator[str]:
+    """
+    Resume files in a folder (recursively) or zip, in a stable order.
+
+    Yields:
+        Paths relative to the folder, or zip member names
+    """
+    if zipfile.is_zipfile(source) and not os.path.isdir(source):
+        with zipfile.ZipFile(source) as archive:
+            names = sorted(info.filename for info in archive.infolist() if not info.is_dir())
+        for name in names:
+            if _file_type(name) and not os.path.basename(name).startswith(('.', '~$')):
+                yield name
+        return
+
+    for root, dirs, names in os.walk(source):
+        dirs.sort()
+        for name in sorted(names):
+            if _file_type(name) and not name.startswith(('.', '~$')):
+                yield os.path.relpath(os.path.join(root, name), source)
+
+
+def completed_files(output: str) -> Set[str]:
+    """
+    Files with an 'ok' record in an existing output file.
+
+    A partial last line (the run was killed mid-write) is cut off so appended
+    records start on a fresh line.
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    valid_bytes = 0
+    with open(output, 'rb') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            valid_bytes += len(line)
+            if record.get('status') == 'ok':
+                done.add(record['file'])
+            else:
+                done.discard(record['file'])
+    if valid_bytes != os.path.getsize(output):
+        with open(output, 'r+b') as f:
+            f.truncate(valid_bytes)
+    return done
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+_worker = {'verbose': False, 'archives': {}}
+
+
+def _init_worker(use_ml: bool, verbose: bool):
+    """Pool initializer: configure the parser and load the models once per process"""
+    from config import Config
+
+    Config.USE_ML_PARSER = use_ml
+    Config.USE_PARSE_CACHE = False
+    Config.PDF_EXTRACT_WORKERS = 1
+    _worker['verbose'] = verbose
+    with _quiet(verbose):
+        # Warm-up: import the parser stack (compiling the regex bank) and load the heading
+        # classifier here, so the first resume of every worker doesn't pay for it
+        importlib.import_module('utils.advanced_resume_parser')
+        from utils.heading_classifier import get_heading_classifier
+        get_heading_classifier()
+        if use_ml:
+            from utils.model_cache import prewarm_models
+            prewarm_models()
+
+
+@contextlib.contextmanager
+def _quiet(verbose: bool):
+    """The parser prints a report per resume; keep it out of the progress output"""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _archive(path: str) -> zipfile.ZipFile:
+    """Open zip per worker (reading the central directory once, not once per file)"""
+    archive = _worker['archives'].get(path)
+    if archive is None:
+        archive = _worker['archives'][path] = zipfile.ZipFile(path)
+    return archive
+
+
+def parse_file(source: str, name: str) -> Dict:
+    """
+    Parse one resume of a folder or zip (runs in a pool worker).
+
+    Args:
+        source: Folder or zip given on the command line
+        name: Relative path or zip member name
+
+    Returns:
+        Output record for the file
+    """
+    from utils.advanced_resume_parser import parse_resume_model
+    from utils.candidate_document import release_candidate_document
+
+    start = time.perf_counter()
+    record = {'file': name}
+    path, temp_path = None, None
+    try:
+        if os.path.isdir(source):
+            path = os.path.join(source, name)
+        else:
+            fd, temp_path = tempfile.mkstemp(suffix='_' + os.path.basename(name))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_archive(source).read(name))
+            path = temp_path
+        with _quiet(_worker['verbose']):
+            result = parse_resume_model(path, _file_type(name))
+        if not result.raw_text.strip():
+            raise ValueError("no text extracted (scanned, encrypted or corrupt file)")
+        # Sent back as a ParsedResume blob: far smaller to pickle than the dict
+        record.update(status='ok', result=result.to_bytes(compress=False))
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+        if _worker['verbose']:
+            traceback.print_exc()
+    finally:
+        if path:
+            release_candidate_document(path)
+        if temp_path:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+    record['seconds'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _pool_context():
+    """forkserver (workers start with the parser modules imported) or spawn on Windows"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['utils.advanced_resume_parser'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class BulkStats:
+    """Throughput and failure counters for one run"""
+
+    def __init__(self, skipped: int = 0):
+        self.started = time.perf_counter()
+        self.skipped = skipped
+        self.ok = 0
+        self.failed = 0
+        self.parse_seconds = 0.0
+        self.errors = Counter()
+
+    def add(self, record: Dict):
+        self.parse_seconds += record.get('seconds', 0.0)
+        if record['status'] == 'ok':
+            self.ok += 1
+        else:
+            self.failed += 1
+            self.errors[record['error'].split(':', 1)[0]] += 1
+
+    @property
+    def done(self) -> int:
+        return self.ok + self.failed
+
+    def summary(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            'parsed': self.ok,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'seconds': round(elapsed, 2),
+            'files_per_sec': round(self.done / elapsed, 2) if elapsed else 0.0,
+            'avg_parse_seconds': round(self.parse_seconds / self.done, 3) if self.done else 0.0,
+            'failure_rate': round(self.failed / self.done, 4) if self.done else 0.0,
+            'errors': dict(self.errors.most_common()),
+        }
+
+
+def bulk_parse(source: str, output: str, workers: Optional[int] = None, use_ml: Optional[bool] = None,
+               restart: bool = False, verbose: bool = False, progress_every: int = 50) -> Dict:
+    """
+    Parse every resume of a folder or zip into a JSONL file.
+
+    Args:
+        source: Folder or zip of resumes
+        output: JSONL file (appended to; files already parsed there are skipped)
+        workers: Pool size (default: CPU count)
+        use_ml: ML section mapping (default Config.USE_ML_PARSER)
+        restart: Ignore and overwrite an existing output file
+        verbose: Show the parser's own output
+        progress_every: Print a progress line every this many files
+
+    Returns:
+        Run summary (BulkStats.summary)
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    if use_ml is None:
+        from config import Config
+        use_ml = Config.USE_ML_PARSER
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    if restart and os.path.exists(output):
+        os.remove(output)
+    done = completed_files(output)
+    pending = (name for name in iter_resume_files(source) if name not in done)
+    stats = BulkStats(skipped=len(done))
+    if done:
+        print(f"↩️  Resuming: {len(done)} files already in {output}")
+    print(f"🚀 Parsing {source} with {workers} workers ({'ML' if use_ml else 'fast'} parser)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    max_in_flight = workers * _IN_FLIGHT_PER_WORKER
+    with open(output, 'a', encoding='utf-8') as out:
+        def write(record: Dict):
+            if isinstance(record.get('result'), bytes):
+                record['result'] = ParsedResume.from_bytes(record['result']).to_dict()
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            out.flush()
+            stats.add(record)
+            if stats.done % progress_every == 0:
+                summary = stats.summary()
+                print(f"  … {stats.done} files ({summary['files_per_sec']}/s, {stats.failed} failed)")
+
+        exhausted = False
+        while not exhausted:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                       initializer=_init_worker, initargs=(use_ml, verbose))
+            in_flight = {}
+            try:
+                while True:
+                    while len(in_flight) < max_in_flight:
+                        name = next(pending, None)
+                        if name is None:
+                            break
+                        in_flight[pool.submit(parse_file, source, name)] = name
+                    if not in_flight:
+                        exhausted = True
+                        break
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(future.result())
+                        del in_flight[future]
+            except BrokenProcessPool:
+                # A worker died (out of memory, crash in a native library): the files it
+                # may have been parsing are recorded as failed and a new pool takes over
+                print("⚠️  Worker process died - restarting the pool")
+                for future, name in in_flight.items():
+                    write({'file': name, 'status': 'error', 'seconds': 0.0,
+                           'error': 'BrokenProcessPool: worker process died'})
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    summary = stats.summary()
+    print(f"\n✅ Parsed {summary['parsed']} files, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped in {summary['seconds']}s "
+          f"({summary['files_per_sec']} files/s, {summary['avg_parse_seconds']}s per file)")
+    for error, count in summary['errors'].items():
+        print(f"   ❌ {error}: {count}")
+    return summary
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse a folder or zip of resumes into JSONL")
+    parser.add_argument('source', help="Folder (searched recursively) or zip of PDF / DOCX resumes")
+    parser.add_argument('-o', '--output', required=True, help="JSONL output (also the resume checkpoint)")
+    parser.add_argument('--workers', type=int, default=None, help="Pool size (default: CPU count)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--ml', dest='use_ml', action='store_true', default=None, help="ML section mapping")
+    mode.add_argument('--fast', dest='use_ml', action='store_false', help="Rule-based parser only")
+    parser.add_argument('--restart', action='store_true', help="Overwrite the output instead of resuming")
+    parser.add_argument('--verbose', action='store_true', help="Show the parser's output")
+    parser.add_argument('--progress-every', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    try:
+        summary = bulk_parse(args.source, args.output, args.workers, args.use_ml,
+                             args.restart, args.verbose, args.progress_every)
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted - rerun the same command to continue from {args.output}")
+        return 130
+    return 1 if summary['failed'] and not summary['parsed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
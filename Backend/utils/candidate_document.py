@@ -0,0 +1,127 @@
+"""
+Candidate Document - One parsed handle per uploaded resume
+ResumeParser, IntelligentResumeParser and ResumeFormatter each used to open the
+candidate DOCX themselves (unzip + XML parse every time). load_candidate_document()
+reads it once with the streaming extractor and hands every stage the same object:
+
+    document = load_candidate_document(path)
+    document.paragraphs        # DocxParagraph: text, style_name, bold, part, in_table, cell
+    document.body_paragraphs   # body only (section extraction)
+    document.tables            # [table][row][column] -> cell text
+    document.text              # raw text for the rule-based parser
+
+Handles are kept in a small LRU keyed by path, modification time and size (a
+replaced file is never served from an old handle) and bounded by the estimated
+size of their paragraph lists, so a worker holds a few MB of candidate text at
+most; the upload flow releases its handle once the resume is done.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+from utils.docx_stream import DocxParagraph, iter_docx_paragraphs
+
+_MAX_OPEN_BYTES = 8 * 1024 * 1024  # The most recent handle is always kept, whatever its size
+
+
+class CandidateDocument:
+    """Paragraphs, tables and text of one DOCX, read in a single pass"""
+
+    def __init__(self, path: str, paragraphs: List[DocxParagraph]):
+        self.path = path
+        self.paragraphs = paragraphs
+        self.nbytes = sum(sys.getsizeof(p) + sys.getsizeof(p.text) for p in paragraphs)
+        self._text = None
+        self._tables = None
+
+    @classmethod
+    def load(cls, path: str) -> 'CandidateDocument':
+        return cls(path, list(iter_docx_paragraphs(path)))
+
+    @property
+    def body_paragraphs(self) -> List[DocxParagraph]:
+        return [p for p in self.paragraphs if p.part == 'body']
+
+    @property
+    def headings(self) -> List[DocxParagraph]:
+        """Non-empty paragraphs with a heading layout cue (style, bold or ALL CAPS)"""
+        return [p for p in self.paragraphs if p.text.strip() and p.looks_like_heading]
+
+    @property
+    def text(self) -> str:
+        """Non-empty paragraph texts joined by newlines (headers, body, footers)"""
+        if self._text is None:
+            self._text = '\n'.join(p.text for p in self.paragraphs if p.text and p.text.strip())
+        return self._text
+
+    @property
+    def tables(self) -> List[List[List[str]]]:
+        """Outermost tables as rows of cell texts (paragraphs of a cell joined by newlines)"""
+        if self._tables is None:
+            cells: Dict[int, Dict[Tuple[int, int], List[str]]] = {}
+            for p in self.paragraphs:
+                if p.cell is not None:
+                    table, row, column = p.cell
+                    cells.setdefault(table, {}).setdefault((row, column), []).append(p.text)
+            tables = []
+            for table in sorted(cells):
+                rows: Dict[int, List[str]] = {}
+                for (row, column), texts in sorted(cells[table].items()):
+                    rows.setdefault(row, []).append('\n'.join(texts))
+                tables.append([rows[row] for row in sorted(rows)])
+            self._tables = tables
+        return self._tables
+
+
+# Open handles, most recently used last
+_documents: "OrderedDict[Tuple[str, int, int], CandidateDocument]" = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def _document_key(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def load_candidate_document(source: Union[str, CandidateDocument]) -> CandidateDocument:
+    """
+    Shared handle for a candidate DOCX.
+
+    Args:
+        source: DOCX path, or a CandidateDocument (returned as is)
+
+    Returns:
+        CandidateDocument read at most once while the file is unchanged
+    """
+    if isinstance(source, CandidateDocument):
+        return source
+    key = _document_key(source)
+    with _documents_lock:
+        document = _documents.get(key)
+        if document is not None:
+            _documents.move_to_end(key)
+            return document
+
+    document = CandidateDocument.load(source)
+    with _documents_lock:
+        _documents[key] = document
+        total = sum(d.nbytes for d in _documents.values())
+        while total > _MAX_OPEN_BYTES and len(_documents) > 1:
+            total -= _documents.popitem(last=False)[1].nbytes
+    return document
+
+
+def release_candidate_document(path: str):
+    """Drop every handle for a path (called when the upload is finished)"""
+    path = os.path.abspath(path)
+    with _documents_lock:
+        for key in [key for key in _documents if key[0] == path]:
+            del _documents[key]
+
+
+def open_candidate_documents() -> int:
+    with _documents_lock:
+        return len(_documents)
@@ -0,0 +1,227 @@
+"""
+DOCX Stream - Streaming OOXML text extraction for resumes
+python-docx builds the whole object model and a proxy object per paragraph, run
+and cell before anything is read, and doc.paragraphs / doc.tables lose the order in
+which tables and paragraphs are interleaved. Parsing only needs text, so this reads
+the package parts directly with one lxml iterparse pass each:
+
+- headers, then word/document.xml, then footers
+- paragraphs, table cells (each merged cell once) and text boxes (w:txbxContent)
+  in document order; a text box comes right before the paragraph anchoring it
+- the mc:Fallback copy of a text box is skipped (Word writes every box twice)
+
+Finished top-level blocks are cleared as soon as they are yielded, so memory stays
+flat however long the document is.
+
+    for para in iter_docx_paragraphs(path):
+        para.text, para.style_name, para.bold, para.part, para.in_table, para.cell
+
+utils.candidate_document keeps the paragraphs of one upload for every stage.
+"""
+
+import posixpath
+import re
+import zipfile
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from lxml import etree
+from docx.oxml.ns import qn
+from docx.styles import BabelFish
+
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+_W_P = qn('w:p')
+_W_TBL = qn('w:tbl')
+_W_TR = qn('w:tr')
+_W_TC = qn('w:tc')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_BR = qn('w:br')
+_W_TYPE = qn('w:type')
+_W_VAL = qn('w:val')
+_TEXT_CHARS = {qn('w:tab'): '\t', qn('w:ptab'): '\t', qn('w:cr'): '\n', qn('w:noBreakHyphen'): '-'}
+# Never visible in the paragraph's own text: properties, deletions, nested
+# (text box) paragraphs and the fallback copy of drawings
+_SKIP = {qn('w:pPr'), qn('w:rPr'), qn('w:del'), qn('w:txbxContent'), _W_P, _MC_FALLBACK}
+# Parts whose root holds the top-level blocks (cleared once yielded)
+_BLOCK_CONTAINERS = {qn('w:body'), qn('w:hdr'), qn('w:ftr')}
+_FALSE = {'0', 'false', 'off'}
+
+
+class DocxParagraph(NamedTuple):
+    """One paragraph as the parsers see it"""
+    text: str
+    style_name: str              # UI name, as python-docx's paragraph.style.name
+    bold: Optional[bool]         # First run's direct bold (python-docx paragraph.runs[0].bold)
+    part: str                    # 'header', 'body' or 'footer'
+    in_table: bool
+    cell: Optional[Tuple[int, int, int]] = None  # (table, row, column) of the outermost table
+
+    @property
+    def looks_like_heading(self) -> bool:
+        """Layout cue every section extractor starts from: a Heading style, a bold
+        first run on a short line, or a short ALL CAPS line"""
+        text = self.text.strip()
+        if self.style_name.startswith('Heading'):
+            return True
+        if self.bold and len(text.split()) <= 5:
+            return True
+        return text.isupper() and len(text.split()) <= 4
+
+
+def _collect_text(elem, out: List[str]):
+    for child in elem:
+        tag = child.tag
+        if tag == _W_T:
+            out.append(child.text or '')
+        elif tag in _TEXT_CHARS:
+            out.append(_TEXT_CHARS[tag])
+        elif tag == _W_BR:
+            # Page and column breaks have no text equivalent
+            if child.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                out.append('\n')
+        elif tag not in _SKIP:
+            _collect_text(child, out)
+
+
+def _paragraph_text(p) -> str:
+    out = []
+    _collect_text(p, out)
+    return ''.join(out)
+
+
+def _first_run_bold(p) -> Optional[bool]:
+    run = p.find(_W_R)
+    if run is None:
+        return None
+    b = run.find(f"{qn('w:rPr')}/{qn('w:b')}")
+    if b is None:
+        return None
+    return b.get(_W_VAL, 'true').lower() not in _FALSE
+
+
+def _style_id(p) -> Optional[str]:
+    style = p.find(f"{qn('w:pPr')}/{qn('w:pStyle')}")
+    return style.get(_W_VAL) if style is not None else None
+
+
+def _read_styles(package: zipfile.ZipFile, document: str) -> Tuple[Dict[str, str], str]:
+    """Paragraph styleId → UI name, and the default paragraph style name"""
+    names, default = {}, 'Normal'
+    path = posixpath.join(posixpath.dirname(document), 'styles.xml')
+    if path not in package.namelist():
+        return names, default
+    with package.open(path) as stream:
+        root = etree.parse(stream).getroot()
+    for style in root.iter(qn('w:style')):
+        if style.get(qn('w:type')) != 'paragraph':
+            continue
+        name = style.find(qn('w:name'))
+        ui_name = BabelFish.internal2ui(name.get(_W_VAL)) if name is not None else style.get(qn('w:styleId'))
+        names[style.get(qn('w:styleId'))] = ui_name
+        if style.get(qn('w:default')) in ('1', 'true', 'on'):
+            default = ui_name
+    return names, default
+
+
+def _natural_key(path: str):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path)]
+
+
+def _package_parts(package: zipfile.ZipFile) -> Tuple[str, List[str], List[str]]:
+    """Main document part and its header / footer parts"""
+    document = 'word/document.xml'
+    try:
+        with package.open('_rels/.rels') as stream:
+            for rel in etree.parse(stream).getroot().iter(_REL_NS):
+                if rel.get('Type') == _OFFICE_DOCUMENT:
+                    document = rel.get('Target').lstrip('/')
+    except KeyError:
+        pass
+
+    headers, footers = [], []
+    rels_path = posixpath.join(posixpath.dirname(document), '_rels', posixpath.basename(document) + '.rels')
+    if rels_path in package.namelist():
+        with package.open(rels_path) as stream:
+            for rel in etree.parse(stream).getroot().iter(_REL_NS):
+                kind = rel.get('Type', '').rsplit('/', 1)[-1]
+                if kind in ('header', 'footer') and rel.get('TargetMode') != 'External':
+                    target = rel.get('Target')
+                    path = target.lstrip('/') if target.startswith('/') else \
+                        posixpath.normpath(posixpath.join(posixpath.dirname(document), target))
+                    (headers if kind == 'header' else footers).append(path)
+    names = set(package.namelist())
+    return (document,
+            sorted({p for p in headers if p in names}, key=_natural_key),
+            sorted({p for p in footers if p in names}, key=_natural_key))
+
+
+def _iter_part(stream, part: str, styles: Dict[str, str], default_style: str,
+               table_count: List[int]) -> Iterator[DocxParagraph]:
+    fallback = tables = 0
+    table = row = column = -1
+    for event, elem in etree.iterparse(stream, events=('start', 'end'), huge_tree=True):
+        tag = elem.tag
+        if event == 'start':
+            if tag == _MC_FALLBACK:
+                fallback += 1
+            elif tag == _W_TBL:
+                tables += 1
+                if tables == 1:
+                    # Numbered across parts so a document's tables have unique indexes
+                    table, row = table_count[0], -1
+                    table_count[0] += 1
+            elif tables == 1 and tag == _W_TR:
+                row, column = row + 1, -1
+            elif tables == 1 and tag == _W_TC:
+                column += 1
+            continue
+
+        if tag == _MC_FALLBACK:
+            fallback -= 1
+        elif tag == _W_TBL:
+            tables -= 1
+        elif tag == _W_P and not fallback:
+            style_id = _style_id(elem)
+            yield DocxParagraph(_paragraph_text(elem),
+                                styles.get(style_id, default_style) if style_id else default_style,
+                                _first_run_bold(elem), part, tables > 0,
+                                (table, row, column) if tables else None)
+
+        # Drop finished top-level blocks (and the ones before them) to keep memory flat
+        parent = elem.getparent()
+        if parent is not None and parent.tag in _BLOCK_CONTAINERS:
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def iter_docx_paragraphs(path: str, parts: Sequence[str] = ('header', 'body', 'footer')) -> Iterator[DocxParagraph]:
+    """
+    Stream the paragraphs of a DOCX in document order.
+
+    Args:
+        path: DOCX file
+        parts: Which of 'header', 'body', 'footer' to read (in that order)
+
+    Yields:
+        DocxParagraph for every paragraph, empty ones included
+    """
+    with zipfile.ZipFile(path) as package:
+        document, headers, footers = _package_parts(package)
+        styles, default_style = _read_styles(package, document)
+        sources = {'header': headers, 'body': [document], 'footer': footers}
+        table_count = [0]
+        for part in ('header', 'body', 'footer'):
+            if part not in parts:
+                continue
+            for name in sources[part]:
+                with package.open(name) as stream:
+                    yield from _iter_part(stream, part, styles, default_style, table_count)
+
+
+def extract_docx_text(path: str) -> str:
+    """Non-empty paragraph texts of a DOCX joined by newlines (headers, body, footers)"""
+    return '\n'.join(p.text for p in iter_docx_paragraphs(path) if p.text and p.text.strip())
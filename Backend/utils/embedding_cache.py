@@ -0,0 +1,360 @@
+"""
+Embedding Cache - Tiered, content-addressed cache for sentence embeddings
+Heading strings like "PROFESSIONAL EXPERIENCE" recur in nearly every resume,
+so almost every encode becomes a lookup instead of a transformer call.
+
+Tiers:
+1. Bounded in-memory LRU (per process)
+2. On-disk store shared by all gunicorn workers and kept across restarts:
+   - <model>.f32  raw float32 matrix, memory-mapped for reads
+   - <model>.idx  fixed-width key index (row N = line N)
+   Keys are SHA-1 of model name + normalized text.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from utils.encode_scheduler import scheduled_encode
+from utils.model_registry import model_identity, sentence_model_identity
+
+_KEY_LINE_BYTES = 41  # 40 hex chars + newline
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys: case-folded, whitespace-collapsed.
+    all-MiniLM-L6-v2 uses an uncased tokenizer, so this never changes the embedding.
+    """
+    return ' '.join(str(text).lower().split())
+
+
+def make_key(model_name: str, text: str) -> str:
+    """Content address for one (model, text) pair"""
+    payload = f"{model_name}\0{normalize_text(text)}".encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+
+class _DiskStore:
+    """
+    Append-only embedding matrix for one model, shared between processes.
+    Writers take an exclusive flock; readers pick up rows other workers appended
+    by re-reading the tail of the index file.
+    """
+
+    def __init__(self, directory: str, model_name: str, max_rows: int):
+        safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in model_name)
+        self.data_path = os.path.join(directory, f"{safe_name}.f32")
+        self.index_path = os.path.join(directory, f"{safe_name}.idx")
+        self.meta_path = os.path.join(directory, f"{safe_name}.meta.json")
+        self.lock_path = os.path.join(directory, f"{safe_name}.lock")
+        self.max_rows = max_rows
+        self.dim = None
+        self.rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix = None
+        self._matrix_rows = 0
+        self._full_reported = False
+        os.makedirs(directory, exist_ok=True)
+        self._load_meta()
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self.dim = int(json.load(f)['dim'])
+        except Exception:
+            self.dim = None
+
+    def _lock(self):
+        handle = open(self.lock_path, 'a')
+        if FCNTL_AVAILABLE:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _unlock(self, handle):
+        if FCNTL_AVAILABLE:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    def sync(self):
+        """Read index lines appended since the last sync (by any worker)"""
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return
+        if size <= self._index_offset:
+            return
+        if self.dim is None:
+            self._load_meta()
+            if self.dim is None:
+                return
+        usable = (size // _KEY_LINE_BYTES) * _KEY_LINE_BYTES
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_offset)
+            chunk = f.read(usable - self._index_offset)
+        row = self._index_offset // _KEY_LINE_BYTES
+        for pos in range(0, len(chunk), _KEY_LINE_BYTES):
+            key = chunk[pos:pos + 40].decode('ascii')
+            self.rows.setdefault(key, row)
+            row += 1
+        self._index_offset = usable
+
+    def _matrix_view(self):
+        total_rows = self._index_offset // _KEY_LINE_BYTES
+        if self._matrix is None or self._matrix_rows != total_rows:
+            self._matrix = np.memmap(self.data_path, dtype=np.float32, mode='r',
+                                     shape=(total_rows, self.dim)) if total_rows else None
+            self._matrix_rows = total_rows
+        return self._matrix
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None:
+            self.sync()
+            row = self.rows.get(key)
+            if row is None:
+                return None
+        matrix = self._matrix_view()
+        if matrix is None or row >= matrix.shape[0]:
+            return None
+        return np.array(matrix[row])
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        """Append new rows; silently stops once max_rows is reached"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        handle = self._lock()
+        try:
+            if self.dim is None:
+                self._load_meta()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self.meta_path, 'w', encoding='utf-8') as f:
+                    json.dump({'dim': self.dim}, f)
+            if vectors.shape[1] != self.dim:
+                return
+
+            self.sync()
+            new_keys, new_rows = [], []
+            for key, vec in zip(keys, vectors):
+                if key not in self.rows and key not in new_keys:
+                    new_keys.append(key)
+                    new_rows.append(vec)
+
+            start_row = self._index_offset // _KEY_LINE_BYTES
+            room = self.max_rows - start_row
+            if room <= 0:
+                if not self._full_reported:
+                    print(f"⚠️  Embedding disk cache full ({self.max_rows} rows) - new entries stay in memory only")
+                    self._full_reported = True
+                return
+            new_keys, new_rows = new_keys[:room], new_rows[:room]
+            if not new_keys:
+                return
+
+            # Row N lives at byte N*dim*4; writing at the indexed offset (not appending)
+            # discards any tail left behind by a worker that died mid-write
+            mode = 'r+b' if os.path.exists(self.data_path) else 'wb'
+            with open(self.data_path, mode) as f:
+                f.seek(start_row * self.dim * 4)
+                f.write(np.stack(new_rows).astype(np.float32).tobytes())
+                f.truncate()
+            with open(self.index_path, 'ab') as f:
+                f.write(''.join(f"{k}\n" for k in new_keys).encode('ascii'))
+            self.sync()
+        finally:
+            self._unlock(handle)
+
+    def iter_recent(self, limit: int):
+        """Yield (key, vector) for up to `limit` most recently appended rows"""
+        self.sync()
+        matrix = self._matrix_view()
+        if matrix is None:
+            return
+        by_row = sorted(self.rows.items(), key=lambda kv: kv[1])[-limit:]
+        for key, row in by_row:
+            if row < matrix.shape[0]:
+                yield key, np.array(matrix[row])
+
+    def __len__(self):
+        return self._index_offset // _KEY_LINE_BYTES
+
+
+class EmbeddingCache:
+    """
+    Tiered embedding cache with hit/miss statistics.
+    Use get_embedding_cache() instead of constructing this directly.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_memory_entries: int = 5000,
+                 max_disk_entries: int = 50000, persist: bool = True):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.persist = persist and directory is not None
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._stores: Dict[str, _DiskStore] = {}
+        self._lock = threading.RLock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'encoded': 0}
+
+    def _store(self, model_name: str) -> Optional[_DiskStore]:
+        if not self.persist:
+            return None
+        store = self._stores.get(model_name)
+        if store is None:
+            try:
+                store = _DiskStore(self.directory, model_name, self.max_disk_entries)
+            except Exception as e:
+                print(f"⚠️  Embedding disk cache unavailable: {e}")
+                self.persist = False
+                return None
+            self._stores[model_name] = store
+        return store
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """Look up one embedding (memory first, then disk)"""
+        key = make_key(model_name, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return vector
+            store = self._store(model_name)
+            if store is not None:
+                try:
+                    vector = store.get(key)
+                except Exception as e:
+                    print(f"⚠️  Embedding disk cache read failed: {e}")
+                    vector = None
+                if vector is not None:
+                    self._remember(key, vector)
+                    self._stats['disk_hits'] += 1
+                    return vector
+            self._stats['misses'] += 1
+            return None
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: np.ndarray):
+        keys = [make_key(model_name, t) for t in texts]
+        with self._lock:
+            for key, vec in zip(keys, vectors):
+                self._remember(key, np.asarray(vec, dtype=np.float32))
+            store = self._store(model_name)
+            if store is not None:
+                try:
+                    store.put_many(keys, np.asarray(vectors))
+                except Exception as e:
+                    print(f"⚠️  Embedding disk cache write failed: {e}")
+
+    def encode(self, model, texts: Sequence[str],
+               model_name: Optional[str] = None) -> np.ndarray:
+        """
+        Encode texts through the cache: cached rows are looked up, all misses are
+        sent to the model in a single batch (merged with other threads' misses by
+        the encode scheduler).
+
+        Args:
+            model: Object with a sentence-transformers style encode()
+            texts: Texts to encode
+            model_name: Model identity used in cache keys (default: the model's own identity)
+
+        Returns:
+            np.ndarray of shape (len(texts), dim), same rows model.encode(texts) returns
+        """
+        model_name = model_name or model_identity(model)
+        texts = [str(t) for t in texts]
+        results: List[Optional[np.ndarray]] = [self.get(model_name, t) for t in texts]
+
+        missing = {}
+        for idx, vec in enumerate(results):
+            if vec is None:
+                missing.setdefault(normalize_text(texts[idx]), []).append(idx)
+
+        if missing:
+            to_encode = [texts[idxs[0]] for idxs in missing.values()]
+            encoded = scheduled_encode(model, to_encode)
+            with self._lock:
+                self._stats['encoded'] += len(to_encode)
+            self.put_many(model_name, to_encode, encoded)
+            for vec, idxs in zip(encoded, missing.values()):
+                for idx in idxs:
+                    results[idx] = vec
+
+        if not results:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(results)
+
+    def warm(self, model_name: Optional[str] = None) -> int:
+        """Load the most recent disk rows into memory (call at boot); returns rows loaded"""
+        store = self._store(model_name or sentence_model_identity())
+        if store is None:
+            return 0
+        loaded = 0
+        with self._lock:
+            try:
+                for key, vector in store.iter_recent(self.max_memory_entries):
+                    self._remember(key, vector)
+                    loaded += 1
+            except Exception as e:
+                print(f"⚠️  Embedding cache warm-up failed: {e}")
+        return loaded
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['lookups'] = lookups
+            stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = {name: len(store) for name, store in self._stores.items()}
+            return stats
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide embedding cache (configured from Config)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                try:
+                    from config import Config
+                    _cache_instance = EmbeddingCache(
+                        directory=Config.EMBEDDING_CACHE_DIR,
+                        max_memory_entries=Config.EMBEDDING_CACHE_MEMORY_ENTRIES,
+                        max_disk_entries=Config.EMBEDDING_CACHE_DISK_ENTRIES,
+                        persist=Config.PERSIST_EMBEDDINGS,
+                    )
+                except Exception:
+                    _cache_instance = EmbeddingCache(directory=None)
+    return _cache_instance
+
+
+def encode_cached(model, texts: Sequence[str], model_name: Optional[str] = None) -> np.ndarray:
+    """Shortcut for get_embedding_cache().encode(...)"""
+    return get_embedding_cache().encode(model, texts, model_name)
@@ -0,0 +1,274 @@
+"""
+Embedding Server - One sentence encoder shared by every gunicorn worker
+A small local process owns the only model instance and serves encode requests
+over a Unix socket. Requests that arrive within a short window are merged into
+one model call (micro-batching), so N web workers cost one copy of torch.
+
+Enable with Config.USE_EMBEDDING_SERVER; the model registry then hands every
+classifier/mapper a RemoteEncoder instead of loading the model in the worker.
+
+Run:
+    python -m utils.embedding_server              # serve (startup.sh does this)
+    python -m utils.embedding_server --wait 120   # block until the server answers
+
+Wire format: every message is a 4-byte big-endian length followed by the payload.
+Requests are JSON; an encode response is a JSON header followed by raw float32 rows.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.encode_scheduler import EncodeScheduler
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, model_identity
+
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+_HEADER = struct.Struct('>I')
+
+
+def _send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """Next frame payload, or None when the peer closed the connection"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"frame of {size} bytes exceeds limit")
+    return _recv_exact(sock, size) if size else b''
+
+
+def _server_settings() -> Dict:
+    try:
+        from config import Config
+        return {
+            'socket_path': Config.EMBEDDING_SERVER_SOCKET,
+            'max_batch': Config.EMBEDDING_SERVER_MAX_BATCH,
+            'max_wait_ms': Config.EMBEDDING_SERVER_MAX_WAIT_MS,
+        }
+    except Exception:
+        return {'socket_path': None, 'max_batch': 64, 'max_wait_ms': 5}
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """One persistent client connection; serves requests until the worker disconnects"""
+
+    def handle(self):
+        server: 'EmbeddingServer' = self.server.owner
+        while True:
+            try:
+                frame = _recv_frame(self.request)
+                if frame is None:
+                    return
+                message = json.loads(frame.decode('utf-8'))
+                op = message.get('op')
+                if op == 'info':
+                    _send_frame(self.request, json.dumps({'ok': True, **server.info()}).encode('utf-8'))
+                elif op == 'stats':
+                    _send_frame(self.request, json.dumps({'ok': True, **server.batcher.stats()}).encode('utf-8'))
+                elif op == 'encode':
+                    vectors = server.batcher.encode(message.get('texts', []))
+                    header = {'ok': True, 'shape': list(vectors.shape)}
+                    _send_frame(self.request, json.dumps(header).encode('utf-8'))
+                    _send_frame(self.request, np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+                else:
+                    _send_frame(self.request, json.dumps({'ok': False, 'error': f"unknown op {op!r}"}).encode('utf-8'))
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                try:
+                    _send_frame(self.request, json.dumps({'ok': False, 'error': str(e)}).encode('utf-8'))
+                except OSError:
+                    return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class EmbeddingServer:
+    """Serves encode requests for one shared model over a Unix socket"""
+
+    def __init__(self, socket_path: str, model, max_batch: int = 64, max_wait_ms: float = 5):
+        """
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            model: Encoder with a sentence-transformers style encode()
+            max_batch: Maximum texts per model call
+            max_wait_ms: How long to wait for more requests before encoding
+        """
+        self.socket_path = socket_path
+        self.model = model
+        self.dim = self._encode(['warm up']).shape[-1]  # first call also warms the model
+        self.batcher = EncodeScheduler(model, max_batch, max_wait_ms)
+
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # stale socket from a previous run
+        self._server = _UnixServer(socket_path, _RequestHandler)
+        self._server.owner = self
+        os.chmod(socket_path, 0o600)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True),
+                          dtype=np.float32)
+
+    def info(self) -> Dict:
+        return {'model': model_identity(self.model), 'dim': self.dim, 'pid': os.getpid()}
+
+    def serve_forever(self):
+        print(f"🧠 Embedding server listening on {self.socket_path} ({model_identity(self.model)})")
+        self._server.serve_forever()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self.batcher.stop()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+
+class RemoteEncoder:
+    """
+    Drop-in for SentenceTransformer.encode() backed by the embedding server.
+    Each thread keeps its own persistent connection.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        info, _ = self._request({'op': 'info'})
+        if not info.get('ok'):
+            raise ConnectionError(info.get('error', 'embedding server error'))
+        self.cache_name = info.get('model', DEFAULT_SENTENCE_MODEL)
+        self.dim = info.get('dim')
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _request(self, message: Dict) -> Tuple[Dict, Optional[bytes]]:
+        payload = json.dumps(message).encode('utf-8')
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                _send_frame(sock, payload)
+                frame = _recv_frame(sock)
+                if frame is None:
+                    raise ConnectionError("embedding server closed the connection")
+                header = json.loads(frame.decode('utf-8'))
+                body = _recv_frame(sock) if header.get('ok') and 'shape' in header else None
+                return header, body
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    raise
+        raise ConnectionError("unreachable")
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, **kwargs):
+        """Same call shape as SentenceTransformer.encode (always returns numpy)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else [str(s) for s in sentences]
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+
+        header, body = self._request({'op': 'encode', 'texts': texts})
+        if not header.get('ok'):
+            raise RuntimeError(f"embedding server: {header.get('error')}")
+        vectors = np.frombuffer(body, dtype=np.float32).reshape(header['shape'])
+        return vectors[0] if single else vectors
+
+
+def connect_remote_encoder(socket_path: Optional[str] = None) -> Optional[RemoteEncoder]:
+    """RemoteEncoder for the configured server, or None if it is not reachable"""
+    socket_path = socket_path or _server_settings()['socket_path']
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    try:
+        return RemoteEncoder(socket_path)
+    except Exception as e:
+        print(f"⚠️  Embedding server not reachable at {socket_path}: {e}")
+        return None
+
+
+def wait_for_server(socket_path: Optional[str] = None, timeout: float = 120.0) -> bool:
+    """Block until the server answers (used by startup.sh before starting gunicorn)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if connect_remote_encoder(socket_path) is not None:
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def main():
+    import argparse
+    import signal
+
+    settings = _server_settings()
+    parser = argparse.ArgumentParser(description="Shared sentence-embedding server")
+    parser.add_argument('--socket', default=settings['socket_path'])
+    parser.add_argument('--wait', type=float, metavar='SECONDS',
+                        help="Don't serve; wait until a running server answers")
+    args = parser.parse_args()
+
+    if args.wait is not None:
+        ok = wait_for_server(args.socket, args.wait)
+        print("✅ Embedding server ready" if ok else "❌ Embedding server did not start")
+        raise SystemExit(0 if ok else 1)
+
+    from utils.encoder_backends import load_sentence_encoder
+    from utils.model_registry import sentence_backend, _model_device
+    model = load_sentence_encoder(DEFAULT_SENTENCE_MODEL, sentence_backend(), _model_device())
+    server = EmbeddingServer(args.socket, model, settings['max_batch'], settings['max_wait_ms'])
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
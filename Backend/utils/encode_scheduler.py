@@ -0,0 +1,213 @@
+"""
+Encode Scheduler - Micro-batching for concurrent encode calls
+format_resumes processes several resumes in parallel threads, and each thread
+makes its own small encode() calls. Instead of contending for torch threads,
+calls are queued, merged for up to max_wait, and run as one model call by a
+single scheduler thread per model; every caller gets back its own rows.
+
+A request that already fills a batch (bulk uploads) is dispatched without waiting.
+Settings: Config.BATCH_ENCODE, Config.ENCODE_MAX_BATCH, Config.ENCODE_MAX_WAIT_MS
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WAIT_SAMPLES = 1000
+
+
+class _PendingRequest:
+    __slots__ = ('texts', 'event', 'result', 'error', 'queued_at')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.queued_at = time.monotonic()
+
+
+class EncodeScheduler:
+    """Merges concurrent encode requests for one model into batched model calls"""
+
+    def __init__(self, model, max_batch: int = 64, max_wait_ms: float = 5):
+        """
+        Args:
+            model: Encoder with a sentence-transformers style encode()
+            max_batch: Texts per model call before dispatching without waiting
+            max_wait_ms: How long the first request waits for others to join
+        """
+        self.model = model
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._waits = deque(maxlen=_WAIT_SAMPLES)
+        self._stats = {'batches': 0, 'requests': 0, 'texts': 0, 'max_batch_size': 0,
+                       'bulk_requests': 0, 'errors': 0}
+
+    def _ensure_running(self):
+        # Threads do not survive fork: a scheduler created before a gunicorn fork restarts
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='encode-scheduler', daemon=True)
+                self._thread.start()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Encode texts as part of the next batch.
+
+        Returns:
+            np.ndarray of shape (len(texts), dim), same rows model.encode(texts) returns
+        """
+        texts = [str(t) for t in texts]
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        self._ensure_running()
+        pending = _PendingRequest(texts)
+        self._queue.put(pending)
+        pending.event.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _collect(self, first: _PendingRequest) -> Tuple[List[_PendingRequest], bool]:
+        """Gather requests until max_batch texts or max_wait; returns (batch, stop_requested)"""
+        batch = [first]
+        count = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            count += len(item.texts)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            started = time.monotonic()
+            texts = [text for item in batch for text in item.texts]
+            try:
+                vectors = np.asarray(
+                    self.model.encode(texts, batch_size=self.max_batch, show_progress_bar=False,
+                                      convert_to_numpy=True),
+                    dtype=np.float32)
+                offset = 0
+                for item in batch:
+                    item.result = vectors[offset:offset + len(item.texts)]
+                    offset += len(item.texts)
+            except Exception as e:
+                for item in batch:
+                    item.error = e
+            self._record(batch, len(texts), started)
+            for item in batch:
+                item.event.set()
+
+    def _record(self, batch: List[_PendingRequest], size: int, started: float):
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['requests'] += len(batch)
+            self._stats['texts'] += size
+            self._stats['max_batch_size'] = max(self._stats['max_batch_size'], size)
+            self._stats['bulk_requests'] += sum(1 for item in batch if len(item.texts) >= self.max_batch)
+            self._stats['errors'] += sum(1 for item in batch if item.error is not None)
+            self._waits.extend(started - item.queued_at for item in batch)
+
+    def stats(self) -> Dict:
+        """Batch-size and queue-wait metrics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            waits = sorted(self._waits)
+        batches = stats['batches']
+        stats['avg_batch_size'] = round(stats['texts'] / batches, 2) if batches else 0.0
+        stats['avg_requests_per_batch'] = round(stats['requests'] / batches, 2) if batches else 0.0
+        stats['avg_queue_wait_ms'] = round(1000 * sum(waits) / len(waits), 2) if waits else 0.0
+        stats['p95_queue_wait_ms'] = round(1000 * waits[int(0.95 * (len(waits) - 1))], 2) if waits else 0.0
+        stats['max_queue_wait_ms'] = round(1000 * waits[-1], 2) if waits else 0.0
+        stats['queue_depth'] = self._queue.qsize()
+        stats['max_batch'] = self.max_batch
+        stats['max_wait_ms'] = round(self.max_wait * 1000, 2)
+        return stats
+
+
+# One scheduler per model object
+_schedulers: Dict[int, EncodeScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _scheduler_settings() -> Tuple[bool, int, float]:
+    try:
+        from config import Config
+        return Config.BATCH_ENCODE, Config.ENCODE_MAX_BATCH, Config.ENCODE_MAX_WAIT_MS
+    except Exception:
+        return True, 64, 5
+
+
+def get_encode_scheduler(model) -> EncodeScheduler:
+    """Get or create the scheduler for a model (configured from Config)"""
+    scheduler = _schedulers.get(id(model))
+    if scheduler is None or scheduler.model is not model:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(id(model))
+            if scheduler is None or scheduler.model is not model:
+                _, max_batch, max_wait_ms = _scheduler_settings()
+                scheduler = EncodeScheduler(model, max_batch, max_wait_ms)
+                _schedulers[id(model)] = scheduler
+    return scheduler
+
+
+def scheduled_encode(model, texts: Sequence[str]) -> np.ndarray:
+    """Encode through the model's scheduler, or directly when Config.BATCH_ENCODE is off"""
+    enabled, _, _ = _scheduler_settings()
+    if not enabled:
+        return np.asarray(model.encode(list(texts), show_progress_bar=False, convert_to_numpy=True),
+                          dtype=np.float32)
+    return get_encode_scheduler(model).encode(texts)
+
+
+def scheduler_stats(model) -> Optional[Dict]:
+    """Metrics for a model's scheduler (None if it never scheduled anything)"""
+    scheduler = _schedulers.get(id(model))
+    if scheduler is None or scheduler.model is not model:
+        return None
+    return scheduler.stats()
+
+
+def clear_schedulers():
+    """Stop all scheduler threads and forget them (used by clear_model_cache)"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+        _schedulers.clear()
+    for scheduler in schedulers:
+        scheduler.stop()
@@ -0,0 +1,315 @@
+"""
+Encoder Backends - Pluggable CPU inference backends for the sentence encoder
+Selected with Config.ENCODER_BACKEND and loaded through the model registry:
+- 'torch':     full-precision SentenceTransformer (default)
+- 'int8':      same model with dynamic int8 quantization of every Linear layer
+- 'onnx':      ONNX export of the transformer run by onnxruntime
+- 'onnx-int8': the ONNX export with int8 weights (smallest and fastest on CPU)
+
+Every backend exposes the sentence-transformers encode() signature and a
+cache_name, so embeddings from different backends never share cache rows
+or template section matrices.
+
+Convert once, then check accuracy before switching backends:
+    python -m utils.encoder_backends export
+    python -m utils.encoder_backends report --backend onnx-int8
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, sentence_model_identity
+
+BACKENDS = ('torch', 'int8', 'onnx', 'onnx-int8')
+
+ONNX_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model.int8.onnx'
+ONNX_META_FILE = 'encoder.json'
+
+
+def onnx_model_dir(model_name: str = DEFAULT_SENTENCE_MODEL) -> str:
+    """Directory holding the ONNX export (and tokenizer) for a model"""
+    try:
+        from config import Config
+        base = Config.ONNX_MODEL_DIR
+    except Exception:
+        base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'onnx')
+    safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in model_name)
+    return os.path.join(base, safe_name)
+
+
+class OnnxSentenceEncoder:
+    """
+    onnxruntime replacement for SentenceTransformer.encode()
+    Runs the exported transformer, then applies the same pooling and
+    normalization as the original sentence-transformers pipeline.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, cache_name: Optional[str] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, ONNX_META_FILE), 'r') as f:
+            self.meta = json.load(f)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model_file = os.path.join(model_dir, ONNX_INT8_FILE if quantized else ONNX_FILE)
+        self.session = ort.InferenceSession(model_file, options, providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.max_seq_length = self.meta.get('max_seq_length', 256)
+        self.pooling = self.meta.get('pooling', 'mean')
+        self.normalize = self.meta.get('normalize', True)
+        self.cache_name = cache_name or self.meta.get('model_name', DEFAULT_SENTENCE_MODEL)
+
+    def _pool(self, token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        if self.pooling == 'cls':
+            return token_embeddings[:, 0]
+        mask = attention_mask[..., None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs):
+        """Same call shape as SentenceTransformer.encode (always returns numpy)"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            batch = list(sentences[start:start + batch_size])
+            features = self.tokenizer(batch, padding=True, truncation=True,
+                                      max_length=self.max_seq_length, return_tensors='np')
+            inputs = {name: features[name].astype(np.int64) for name in self.input_names if name in features}
+            token_embeddings = self.session.run(None, inputs)[0]
+            pooled = self._pool(token_embeddings, features['attention_mask'])
+            if self.normalize or normalize_embeddings:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def load_torch_encoder(model_name: str = DEFAULT_SENTENCE_MODEL, device: str = 'cpu'):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device=device)
+
+
+def load_int8_encoder(model_name: str = DEFAULT_SENTENCE_MODEL):
+    """SentenceTransformer with int8 dynamically-quantized Linear layers (CPU only)"""
+    import torch
+    model = load_torch_encoder(model_name, 'cpu')
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def load_onnx_encoder(model_name: str = DEFAULT_SENTENCE_MODEL, quantized: bool = False) -> OnnxSentenceEncoder:
+    model_dir = onnx_model_dir(model_name)
+    model_file = os.path.join(model_dir, ONNX_INT8_FILE if quantized else ONNX_FILE)
+    if not os.path.exists(model_file):
+        raise FileNotFoundError(f"{model_file} not found - run: python -m utils.encoder_backends export")
+    return OnnxSentenceEncoder(model_dir, quantized=quantized)
+
+
+def load_sentence_encoder(model_name: str = DEFAULT_SENTENCE_MODEL, backend: str = 'torch',
+                          device: str = 'cpu'):
+    """
+    Build the sentence encoder for a backend, falling back to FP32 torch if the
+    backend cannot be loaded (missing export, onnxruntime not installed, ...).
+
+    Returns:
+        Encoder with encode() and a cache_name identifying model + backend
+    """
+    if backend not in BACKENDS:
+        print(f"⚠️  Unknown encoder backend '{backend}' - using torch")
+        backend = 'torch'
+
+    encoder = None
+    if backend != 'torch':
+        try:
+            if backend == 'int8':
+                encoder = load_int8_encoder(model_name)
+            else:
+                encoder = load_onnx_encoder(model_name, quantized=(backend == 'onnx-int8'))
+            print(f"⚡ Sentence encoder backend: {backend} (CPU)")
+        except Exception as e:
+            print(f"⚠️  {backend} encoder unavailable ({e}) - falling back to torch")
+            backend = 'torch'
+
+    if encoder is None:
+        encoder = load_torch_encoder(model_name, device)
+    encoder.cache_name = sentence_model_identity(model_name, backend)
+    return encoder
+
+
+def export_onnx(model_name: str = DEFAULT_SENTENCE_MODEL, output_dir: Optional[str] = None,
+                quantize: bool = True, opset: int = 14) -> str:
+    """
+    Conversion step: export the transformer to ONNX (and an int8 copy).
+
+    Args:
+        model_name: sentence-transformers model to export
+        output_dir: Target directory (default: onnx_model_dir(model_name))
+        quantize: Also write the int8 dynamically-quantized ONNX model
+        opset: ONNX opset version
+
+    Returns:
+        The output directory
+    """
+    import torch
+
+    output_dir = output_dir or onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = load_torch_encoder(model_name, 'cpu')
+    transformer = model[0].auto_model.eval()
+    pooling = model[1].get_pooling_mode_str() if len(model) > 1 else 'mean'
+    if pooling not in ('mean', 'cls'):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling}")
+    normalize = any(type(module).__name__ == 'Normalize' for module in model)
+
+    sample = model.tokenizer(['professional experience'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, *inputs):
+            return self.wrapped(**dict(zip(input_names, inputs)))[0]
+
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['token_embeddings'] = {0: 'batch', 1: 'sequence'}
+    onnx_path = os.path.join(output_dir, ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(_TokenEmbeddings(transformer), tuple(sample[name] for name in input_names),
+                          onnx_path, input_names=input_names, output_names=['token_embeddings'],
+                          dynamic_axes=dynamic_axes, opset_version=opset)
+    model.tokenizer.save_pretrained(output_dir)
+
+    with open(os.path.join(output_dir, ONNX_META_FILE), 'w') as f:
+        json.dump({
+            'model_name': model_name,
+            'pooling': pooling,
+            'normalize': normalize,
+            'max_seq_length': model.max_seq_length,
+        }, f, indent=2)
+    print(f"✅ Exported {model_name} → {onnx_path}")
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        int8_path = os.path.join(output_dir, ONNX_INT8_FILE)
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"✅ Quantized → {int8_path}")
+
+    return output_dir
+
+
+def labelled_headings() -> List[Tuple[str, str]]:
+    """
+    (heading, section) pairs from the classifier's synonym table.
+    Synonyms listed under more than one section are skipped.
+    """
+    from utils.enhanced_section_classifier import EnhancedSectionClassifier
+
+    labels: Dict[str, set] = {}
+    for section, synonyms in EnhancedSectionClassifier.SECTION_MAPPING.items():
+        for heading in [section] + list(synonyms):
+            labels.setdefault(heading.lower(), set()).add(section)
+    return [(heading, sections.pop()) for heading, sections in labels.items() if len(sections) == 1]
+
+
+def compare_encoders(reference, candidate, headings: Sequence[str], labels: Sequence[str]) -> Dict:
+    """
+    Heading→section agreement between two encoders (no caching involved).
+
+    Returns:
+        Dict with agreement, per-encoder accuracy, embedding cosine and timings
+    """
+    from utils.template_section_index import TemplateSectionIndex
+
+    sections = sorted(set(labels))
+    predictions = {}
+    embeddings = {}
+    timings = {}
+    for name, encoder in (('reference', reference), ('candidate', candidate)):
+        index = TemplateSectionIndex(sections, np.asarray(encoder.encode(sections, show_progress_bar=False)))
+        start = time.time()
+        vectors = np.asarray(encoder.encode(list(headings), show_progress_bar=False), dtype=np.float32)
+        timings[name] = (time.time() - start) * 1000
+        embeddings[name] = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        predictions[name] = [sections[i] for i in np.argmax(index.scores(vectors), axis=1)]
+
+    cosine = np.sum(embeddings['reference'] * embeddings['candidate'], axis=1)
+    total = len(headings)
+    return {
+        'headings': total,
+        'agreement': round(sum(a == b for a, b in zip(predictions['reference'], predictions['candidate'])) / total, 4),
+        'reference_accuracy': round(sum(p == l for p, l in zip(predictions['reference'], labels)) / total, 4),
+        'accuracy': round(sum(p == l for p, l in zip(predictions['candidate'], labels)) / total, 4),
+        'mean_cosine': round(float(np.mean(cosine)), 4),
+        'min_cosine': round(float(np.min(cosine)), 4),
+        'reference_ms': round(timings['reference'], 1),
+        'candidate_ms': round(timings['candidate'], 1),
+        'disagreements': [
+            (heading, ref, cand)
+            for heading, ref, cand in zip(headings, predictions['reference'], predictions['candidate'])
+            if ref != cand
+        ],
+    }
+
+
+def parity_report(backend: str, model_name: str = DEFAULT_SENTENCE_MODEL) -> Dict:
+    """Accuracy-parity report for a backend against the FP32 torch model"""
+    pairs = labelled_headings()
+    headings = [h for h, _ in pairs]
+    labels = [l for _, l in pairs]
+
+    reference = load_torch_encoder(model_name, 'cpu')
+    candidate = load_sentence_encoder(model_name, backend, 'cpu')
+    report = compare_encoders(reference, candidate, headings, labels)
+    report['backend'] = backend
+    report['model'] = model_name
+
+    print(f"\n{'='*70}")
+    print(f"📊 ENCODER PARITY: {backend} vs torch FP32 ({model_name})")
+    print(f"{'='*70}")
+    print(f"  Headings:            {report['headings']}")
+    print(f"  Section agreement:   {report['agreement']:.2%}")
+    print(f"  Accuracy (FP32):     {report['reference_accuracy']:.2%}")
+    print(f"  Accuracy ({backend}): {report['accuracy']:.2%}")
+    print(f"  Cosine mean / min:   {report['mean_cosine']:.4f} / {report['min_cosine']:.4f}")
+    print(f"  Encode time:         {report['reference_ms']:.1f}ms → {report['candidate_ms']:.1f}ms")
+    for heading, ref, cand in report['disagreements']:
+        print(f"    ⚠️  '{heading}': {ref} → {cand}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sentence encoder backend tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_cmd = sub.add_parser('export', help="Export the model to ONNX (+ int8)")
+    export_cmd.add_argument('--model', default=DEFAULT_SENTENCE_MODEL)
+    export_cmd.add_argument('--no-quantize', action='store_true')
+    report_cmd = sub.add_parser('report', help="Heading→section parity against FP32")
+    report_cmd.add_argument('--model', default=DEFAULT_SENTENCE_MODEL)
+    report_cmd.add_argument('--backend', default='onnx-int8', choices=BACKENDS)
+    report_cmd.add_argument('--json', help="Also write the report to this file")
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_onnx(args.model, quantize=not args.no_quantize)
+    else:
+        result = parity_report(args.backend, args.model)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(result, f, indent=2)
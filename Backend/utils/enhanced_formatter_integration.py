@@ -6,6 +6,8 @@ Integrates the enhanced section classifier with the existing formatting pipeline
 import os
 from typing import Dict, Optional, List
 
+from utils.keyword_matcher import KeywordMatcher
+
 # Comprehensive section synonym mapping for normalization
 SECTION_SYNONYMS = {
     "summary": ["professional summary", "profile", "profile summary", "career objective", 
@@ -48,6 +50,25 @@ def normalize_heading(heading: str) -> str:
     return h
 
 
+# Content indicators for validate_section_by_content, scanned in one pass
+CONTENT_INDICATORS = KeywordMatcher({
+    # Education indicators (highest priority - very specific)
+    'education': ["university", "degree", "bachelor", "master", "b.tech", "m.tech",
+                  "school", "college", "graduated", "gpa", "phd", "doctorate"],
+    # Certification indicators (specific patterns)
+    'certifications': ["certified", "certificate", "certification", "license", "credential",
+                       "pmp", "safe", "scrum master", "aws certified", "cisco"],
+    'certification_phrases': ["project management professional", "certified safe", "scrum master"],
+    # Employment history indicators (job descriptions)
+    'employment': ["worked", "managed", "led", "developed", "responsible",
+                   "collaborated", "provided", "established", "coordinated",
+                   "implemented", "demonstrated"],
+    # Skills indicators (tools and technologies)
+    'skills': ["python", "java", "javascript", "react", "sql", "aws", "azure",
+               "jira", "agile", "scrum", "tools", "technologies", "proficient"],
+})
+
+
 def validate_section_by_content(content: str) -> Optional[str]:
     """
     Validate and correct section classification using keyword-based content analysis
@@ -61,39 +82,22 @@ def validate_section_by_content(content: str) -> Optional[str]:
     if not content or not isinstance(content, str):
         return None
     
-    c_lower = content.lower()
+    hits = CONTENT_INDICATORS.scan(content.lower())
     
-    # Education indicators (highest priority - very specific)
-    education_keywords = ["university", "degree", "bachelor", "master", "b.tech", "m.tech",
-                         "school", "college", "graduated", "gpa", "phd", "doctorate"]
-    if sum(1 for kw in education_keywords if kw in c_lower) >= 2:
+    if hits.count('education') >= 2:
         return "education"
     
-    # Certification indicators (specific patterns)
-    cert_keywords = ["certified", "certificate", "certification", "license", "credential",
-                    "pmp", "safe", "scrum master", "aws certified", "cisco"]
-    cert_patterns = ["project management professional", "certified safe", "scrum master"]
-    if (sum(1 for kw in cert_keywords if kw in c_lower) >= 1 or
-        any(pattern in c_lower for pattern in cert_patterns)):
+    if hits.any('certifications') or hits.any('certification_phrases'):
         # But check it's not employment history (certifications are usually short)
-        if len(content) < 500 and "worked" not in c_lower and "managed" not in c_lower:
+        if len(content) < 500 and "worked" not in hits and "managed" not in hits:
             return "certifications"
     
-    # Employment history indicators (job descriptions)
-    employment_keywords = ["worked", "managed", "led", "developed", "responsible",
-                          "collaborated", "provided", "established", "coordinated",
-                          "implemented", "demonstrated"]
-    employment_patterns = [r"\d{4}\s*[-–]\s*\d{4}", r"\d{1,2}/\d{4}", 
-                          "project manager", "technical manager", "consultant"]
-    if sum(1 for kw in employment_keywords if kw in c_lower) >= 3:
+    if hits.count('employment') >= 3:
         return "employment history"
     
-    # Skills indicators (tools and technologies)
-    skills_keywords = ["python", "java", "javascript", "react", "sql", "aws", "azure",
-                      "jira", "agile", "scrum", "tools", "technologies", "proficient"]
-    if sum(1 for kw in skills_keywords if kw in c_lower) >= 3:
+    if hits.count('skills') >= 3:
         # But check it's not a job description mentioning these
-        if len(content) < 800 and "worked" not in c_lower:
+        if len(content) < 800 and "worked" not in hits:
             return "skills"
     
     return None
@@ -114,6 +118,128 @@ except ImportError:
     print("⚠️  Word formatter not available")
 
 
+def build_sections_to_classify(resume_data: Dict) -> List[Dict]:
+    """
+    Candidate sections (heading, content, position) for the section classifier
+    
+    Args:
+        resume_data: Parsed resume data from advanced_resume_parser
+        
+    Returns:
+        List of dicts with 'heading', 'content', 'position'
+    """
+    sections_to_classify = []
+    
+    # Get sections from resume_data (if available)
+    if 'sections' in resume_data and resume_data['sections']:
+        for section_name, section_content in resume_data['sections'].items():
+            # Handle both string and list content
+            if isinstance(section_content, list):
+                content_str = '\n'.join(str(item) for item in section_content if item)
+            else:
+                content_str = str(section_content) if section_content else ''
+            
+            if content_str and content_str.strip():
+                # Normalize heading using synonym mapping
+                normalized_heading = normalize_heading(section_name)
+                
+                sections_to_classify.append({
+                    'heading': normalized_heading,
+                    'original_heading': section_name,  # Keep original for reference
+                    'content': content_str,
+                    'position': len(sections_to_classify)
+                })
+    
+    # Also add structured data as sections
+    position = len(sections_to_classify)
+    
+    if resume_data.get('summary'):
+        sections_to_classify.append({
+            'heading': 'Summary',
+            'content': resume_data['summary'],
+            'position': position
+        })
+        position += 1
+    
+    if resume_data.get('experience'):
+        exp_content = '\n\n'.join([
+            f"{exp.get('role', '')} at {exp.get('company', '')} ({exp.get('duration', '')})\n{exp.get('responsibilities', '')}"
+            for exp in resume_data['experience']
+        ])
+        if exp_content.strip():
+            sections_to_classify.append({
+                'heading': 'Experience',
+                'content': exp_content,
+                'position': position
+            })
+            position += 1
+    
+    if resume_data.get('education'):
+        edu_content = '\n\n'.join([
+            f"{edu.get('degree', '')} from {edu.get('institution', '')} ({edu.get('year', '')})"
+            for edu in resume_data['education']
+        ])
+        if edu_content.strip():
+            sections_to_classify.append({
+                'heading': 'Education',
+                'content': edu_content,
+                'position': position
+            })
+            position += 1
+    
+    if resume_data.get('skills'):
+        if isinstance(resume_data['skills'], dict):
+            skills_content = '\n'.join([
+                f"{category}: {', '.join(skills)}"
+                for category, skills in resume_data['skills'].items()
+            ])
+        elif isinstance(resume_data['skills'], list):
+            skills_content = ', '.join(resume_data['skills'])
+        else:
+            skills_content = str(resume_data['skills'])
+        
+        if skills_content.strip():
+            sections_to_classify.append({
+                'heading': 'Skills',
+                'content': skills_content,
+                'position': position
+            })
+            position += 1
+    
+    if resume_data.get('certifications'):
+        # Handle both list and string
+        if isinstance(resume_data['certifications'], list):
+            cert_content = '\n'.join(str(c) for c in resume_data['certifications'] if c)
+        else:
+            cert_content = str(resume_data['certifications'])
+        
+        if cert_content.strip():
+            sections_to_classify.append({
+                'heading': 'Certifications',
+                'content': cert_content,
+                'position': position
+            })
+            position += 1
+    
+    if resume_data.get('projects'):
+        if isinstance(resume_data['projects'], list):
+            proj_content = '\n\n'.join([
+                f"{proj.get('name', '') if isinstance(proj, dict) else str(proj)}: {proj.get('description', '') if isinstance(proj, dict) else ''}"
+                for proj in resume_data['projects']
+            ])
+        else:
+            proj_content = str(resume_data['projects'])
+        
+        if proj_content.strip():
+            sections_to_classify.append({
+                'heading': 'Projects',
+                'content': proj_content,
+                'position': position
+            })
+    
+    return sections_to_classify
+
+
 def enhance_resume_data_with_intelligent_mapping(resume_data: Dict, template_analysis: Dict, 
                                                   confidence_threshold: float = 0.6) -> Dict:
     """
@@ -131,6 +257,11 @@ def enhance_resume_data_with_intelligent_mapping(resume_data: Dict, template_ana
         print("⚠️  Enhanced classifier not available, using original data")
         return resume_data
     
+    from utils.model_cache import models_loading
+    if models_loading():
+        print("⏳ ML models still warming up - keeping rule-based section mapping")
+        return resume_data
+    
     print(f"\n{'='*70}")
     print(f"🧠 INTELLIGENT SECTION MAPPING")
     print(f"{'='*70}\n")
@@ -138,130 +269,11 @@ def enhance_resume_data_with_intelligent_mapping(resume_data: Dict, template_ana
     try:
         classifier = get_section_classifier(confidence_threshold)
         
-        # Extract sections from resume_data
-        sections_to_classify = []
-        
-        # Get sections from resume_data (if available)
-        if 'sections' in resume_data and resume_data['sections']:
-            for section_name, section_content in resume_data['sections'].items():
-                # Handle both string and list content
-                if isinstance(section_content, list):
-                    content_str = '\n'.join(str(item) for item in section_content if item)
-                else:
-                    content_str = str(section_content) if section_content else ''
-                
-                if content_str and content_str.strip():
-                    # Normalize heading using synonym mapping
-                    normalized_heading = normalize_heading(section_name)
-                    
-                    sections_to_classify.append({
-                        'heading': normalized_heading,
-                        'original_heading': section_name,  # Keep original for reference
-                        'content': content_str,
-                        'position': len(sections_to_classify)
-                    })
-        
-        # Also add structured data as sections
-        position = len(sections_to_classify)
-        
-        if resume_data.get('summary'):
-            sections_to_classify.append({
-                'heading': 'Summary',
-                'content': resume_data['summary'],
-                'position': position
-            })
-            position += 1
-        
-        if resume_data.get('experience'):
-            exp_content = '\n\n'.join([
-                f"{exp.get('role', '')} at {exp.get('company', '')} ({exp.get('duration', '')})\n{exp.get('responsibilities', '')}"
-                for exp in resume_data['experience']
-            ])
-            if exp_content.strip():
-                sections_to_classify.append({
-                    'heading': 'Experience',
-                    'content': exp_content,
-                    'position': position
-                })
-                position += 1
-        
-        if resume_data.get('education'):
-            edu_content = '\n\n'.join([
-                f"{edu.get('degree', '')} from {edu.get('institution', '')} ({edu.get('year', '')})"
-                for edu in resume_data['education']
-            ])
-            if edu_content.strip():
-                sections_to_classify.append({
-                    'heading': 'Education',
-                    'content': edu_content,
-                    'position': position
-                })
-                position += 1
-        
-        if resume_data.get('skills'):
-            if isinstance(resume_data['skills'], dict):
-                skills_content = '\n'.join([
-                    f"{category}: {', '.join(skills)}"
-                    for category, skills in resume_data['skills'].items()
-                ])
-            elif isinstance(resume_data['skills'], list):
-                skills_content = ', '.join(resume_data['skills'])
-            else:
-                skills_content = str(resume_data['skills'])
-            
-            if skills_content.strip():
-                sections_to_classify.append({
-                    'heading': 'Skills',
-                    'content': skills_content,
-                    'position': position
-                })
-                position += 1
-        
-        if resume_data.get('certifications'):
-            # Handle both list and string
-            if isinstance(resume_data['certifications'], list):
-                cert_content = '\n'.join(str(c) for c in resume_data['certifications'] if c)
-            else:
-                cert_content = str(resume_data['certifications'])
-            
-            if cert_content.strip():
-                sections_to_classify.append({
-                    'heading': 'Certifications',
-                    'content': cert_content,
-                    'position': position
-                })
-                position += 1
-        
-        if resume_data.get('projects'):
-            if isinstance(resume_data['projects'], list):
-                proj_content = '\n\n'.join([
-                    f"{proj.get('name', '') if isinstance(proj, dict) else str(proj)}: {proj.get('description', '') if isinstance(proj, dict) else ''}"
-                    for proj in resume_data['projects']
-                ])
-            else:
-                proj_content = str(resume_data['projects'])
-            
-            if proj_content.strip():
-                sections_to_classify.append({
-                    'heading': 'Projects',
-                    'content': proj_content,
-                    'position': position
-                })
-        
-        # Get template sections
-        template_sections_raw = template_analysis.get('sections', [])
+        sections_to_classify = build_sections_to_classify(resume_data)
         
-        # Extract section names (handle both list of strings and list of dicts)
-        template_sections = []
-        if template_sections_raw:
-            for section in template_sections_raw:
-                if isinstance(section, dict):
-                    # Extract 'name' or 'heading' field from dict
-                    section_name = section.get('name') or section.get('heading') or section.get('title')
-                    if section_name:
-                        template_sections.append(section_name)
-                elif isinstance(section, str):
-                    template_sections.append(section)
+        # Get template section names (same list the precomputed section index was built from)
+        from utils.template_section_index import template_section_names
+        template_sections = template_section_names(template_analysis)
         
         if not template_sections:
             # Fallback to common sections
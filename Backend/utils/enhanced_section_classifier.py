@@ -9,6 +9,7 @@ Combines multiple strategies to accurately classify resume sections:
 """
 
 import re
+import threading
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
@@ -33,18 +34,18 @@ except ImportError:
     np = NumpyFallback()
 
 # Try importing ML libraries with graceful fallbacks
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# Availability only - importing transformers pulls in torch (zero-shot is disabled anyway)
+import importlib.util
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
+if not TRANSFORMERS_AVAILABLE:
     print("⚠️  transformers not installed. Run: pip install transformers")
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from utils.model_registry import acquire_sentence_model, sentence_encoder_available
+from utils.heading_classifier import match_heading
+from utils.heading_memo import get_heading_memo, matcher_context, memo_scope
+
+SENTENCE_TRANSFORMERS_AVAILABLE = sentence_encoder_available()
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     print("⚠️  sentence-transformers not installed. Run: pip install sentence-transformers")
 
 try:
@@ -66,6 +67,7 @@ class EnhancedSectionClassifier:
     _sentence_model = None
     _zero_shot_classifier = None
     _models_loaded = False
+    _init_lock = threading.Lock()  # Concurrent first requests load models once
     
     # Comprehensive section synonym mapping
     SECTION_MAPPING = {
@@ -140,24 +142,17 @@ class EnhancedSectionClassifier:
         
         # Only load models once
         if not EnhancedSectionClassifier._models_loaded:
-            self._load_models()
-            EnhancedSectionClassifier._models_loaded = True
+            with EnhancedSectionClassifier._init_lock:
+                if not EnhancedSectionClassifier._models_loaded:
+                    self._load_models()
+                    EnhancedSectionClassifier._models_loaded = True
     
     def _load_models(self):
         """Load ML models once and cache them"""
         # Initialize sentence transformer for semantic similarity (LIGHTWEIGHT MODEL)
+        # Resolved through the shared model registry (one copy per process)
         if SENTENCE_TRANSFORMERS_AVAILABLE and EnhancedSectionClassifier._sentence_model is None:
-            try:
-                print("⚡ Loading OPTIMIZED sentence transformer (all-MiniLM-L6-v2)...")
-                import time
-                start = time.time()
-                EnhancedSectionClassifier._sentence_model = SentenceTransformer(
-                    'all-MiniLM-L6-v2',
-                    device='cpu'  # Use CPU for compatibility
-                )
-                print(f"✅ Sentence transformer loaded in {time.time()-start:.2f}s (cached for reuse)")
-            except Exception as e:
-                print(f"⚠️  Failed to load sentence transformer: {e}")
+            EnhancedSectionClassifier._sentence_model = acquire_sentence_model()
         
         # Skip zero-shot classifier - it's VERY slow (400MB+ model)
         # Use lightweight sentence transformer instead
@@ -188,6 +183,10 @@ class EnhancedSectionClassifier:
         if not section_name:
             return None
         
+        return get_heading_memo().lookup(memo_scope('normalize'), section_name,
+                                         lambda: self._normalize_section_name(section_name))
+    
+    def _normalize_section_name(self, section_name: str) -> Optional[str]:
         section_lower = section_name.strip().lower()
         
         # Check exact match first
@@ -219,43 +218,83 @@ class EnhancedSectionClassifier:
         if not heading:
             return None, 0.0
         
+        return self._match_headings([{'heading': heading}], template_sections)[heading]
+    
+    def _memo_scope(self, template_sections: List[str]) -> str:
+        """Heading memo scope: this template, model and threshold"""
+        return memo_scope('classifier', template_sections,
+                          matcher_context(self.sentence_model, threshold=self.confidence_threshold))
+    
+    def _classify_heading_by_rules(self, heading: str,
+                                   template_sections: List[str]) -> Optional[Tuple[int, str, float]]:
+        """
+        Cheap heading tiers (exact, normalized, fuzzy, fast classifier) - no torch involved
+        
+        Returns:
+            Tuple of (template section index, method, confidence_score), or None if unresolved
+        """
         heading_clean = heading.strip().lower()
         
         # Strategy 1: Exact match
-        for template_section in template_sections:
+        for idx, template_section in enumerate(template_sections):
             if heading_clean == template_section.strip().lower():
-                return template_section, 1.0
+                return idx, 'exact', 1.0
         
         # Strategy 2: Normalize and match
         normalized = self.normalize_section_name(heading)
         if normalized:
-            for template_section in template_sections:
+            for idx, template_section in enumerate(template_sections):
                 if normalized in template_section.lower():
-                    return template_section, 0.95
+                    return idx, 'normalized', 0.95
         
         # Strategy 3: Fuzzy matching
         if FUZZYWUZZY_AVAILABLE:
             template_clean = [s.strip().lower() for s in template_sections]
             result = process.extractOne(heading_clean, template_clean, scorer=fuzz.token_sort_ratio)
             if result and result[1] > 85:
-                idx = template_clean.index(result[0])
-                return template_sections[idx], result[1] / 100.0
+                return template_clean.index(result[0]), 'fuzzy', result[1] / 100.0
         
-        # Strategy 4: Semantic similarity
-        if self.sentence_model:
-            try:
-                heading_emb = self.sentence_model.encode([heading_clean])
-                template_embs = self.sentence_model.encode([s.lower() for s in template_sections])
-                similarities = np.dot(heading_emb, template_embs.T)[0]
-                best_idx = np.argmax(similarities)
-                best_score = similarities[best_idx]
-                
+        # Strategy 4: Fast heading classifier (char n-grams); the transformer only
+        # sees headings it is not confident about
+        fast_match, fast_confidence = match_heading(heading, template_sections)
+        if fast_match:
+            return template_sections.index(fast_match), 'fast_classifier', fast_confidence
+        
+        return None
+    
+    def _classify_headings_semantic(self, headings: List[str],
+                                    template_sections: List[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        Semantic tier for many headings at once: one encode call, one similarity matrix
+        
+        Args:
+            headings: Cleaned (stripped, lowercase) headings
+            template_sections: Available template section names
+            
+        Returns:
+            One (template section index or None, method, confidence_score) tuple per heading;
+            method is 'error' if the semantic lookup failed
+        """
+        results = [(None, 'none', 0.0)] * len(headings)
+        if not headings or not self.sentence_model:
+            return results
+        
+        try:
+            from utils.embedding_cache import encode_cached
+            from utils.template_section_index import get_section_index
+            index = get_section_index(template_sections, self.sentence_model)
+            similarities = index.scores(encode_cached(self.sentence_model, headings))
+            best_indices = np.argmax(similarities, axis=1)
+            
+            for i, best_idx in enumerate(best_indices):
+                best_score = float(similarities[i, best_idx])
                 if best_score > self.confidence_threshold:
-                    return template_sections[best_idx], float(best_score)
-            except Exception as e:
-                print(f"  ⚠️  Semantic matching failed: {e}")
+                    results[i] = (int(best_idx), 'semantic', best_score)
+        except Exception as e:
+            print(f"  ⚠️  Semantic matching failed: {e}")
+            results = [(None, 'error', 0.0)] * len(headings)
         
-        return None, 0.0
+        return results
     
     def classify_by_content(self, content: str, position: int = 0) -> Tuple[Optional[str], float]:
         """
@@ -428,6 +467,32 @@ class EnhancedSectionClassifier:
             position: Position in document
             template_sections: Available template sections
             
+        Returns:
+            Dict with classification results
+        """
+        # Try heading-based classification first
+        heading_matched = None
+        heading_confidence = 0.0
+        if heading:
+            heading_matched, heading_confidence = self.classify_by_heading(heading, template_sections)
+        
+        return self._resolve_section(heading, heading_matched, heading_confidence,
+                                     content, position, template_sections)
+    
+    def _resolve_section(self, heading: Optional[str], heading_matched: Optional[str],
+                         heading_confidence: float, content: str, position: int,
+                         template_sections: List[str]) -> Dict:
+        """
+        Combine a heading match with content classification and pick the template section
+        
+        Args:
+            heading: Section heading (None if no heading)
+            heading_matched: Template section matched from the heading (None if unmatched)
+            heading_confidence: Confidence of the heading match
+            content: Section content
+            position: Position in document
+            template_sections: Available template sections
+            
         Returns:
             Dict with classification results
         """
@@ -438,12 +503,6 @@ class EnhancedSectionClassifier:
             "uncertain": False
         }
         
-        # Try heading-based classification first
-        heading_matched = None
-        heading_confidence = 0.0
-        if heading:
-            heading_matched, heading_confidence = self.classify_by_heading(heading, template_sections)
-        
         # ALWAYS check content-based classification for validation
         content_type, content_confidence = self.classify_by_content(content, position)
         
@@ -505,9 +564,69 @@ class EnhancedSectionClassifier:
         
         return result
     
+    def classify_sections(self, sections: List[Dict], template_sections: List[str]) -> List[Dict]:
+        """
+        Classify many sections at once - same results as calling classify_section on each
+        
+        Args:
+            sections: List of dicts with 'heading', 'content', 'position'
+            template_sections: Available template sections
+            
+        Returns:
+            One classification result dict per section, in input order
+        """
+        heading_matches = self._match_headings(sections, template_sections)
+        
+        results = []
+        for idx, section in enumerate(sections):
+            heading = section.get('heading')
+            heading_matched, heading_confidence = heading_matches.get(heading) or (None, 0.0)
+            results.append(self._resolve_section(heading, heading_matched, heading_confidence,
+                                                 section.get('content', ''),
+                                                 section.get('position', idx), template_sections))
+        return results
+    
+    def _match_headings(self, sections: List[Dict],
+                        template_sections: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Heading matches for all sections: memoized headings are answered from the
+        cross-request heading memo, the cheap tiers run over the rest, and the headings
+        they leave unresolved are encoded together and scored against the template
+        matrix in one go.
+        
+        Returns:
+            Dict mapping each distinct heading to (matched_section, confidence_score)
+        """
+        memo = get_heading_memo()
+        scope = self._memo_scope(template_sections)
+        matches = {}
+        unresolved = []
+        for section in sections:
+            heading = section.get('heading')
+            if not heading or heading in matches:
+                continue
+            matches[heading] = memo.get(scope, heading, memo.MISSING)
+            if matches[heading] is memo.MISSING:
+                matches[heading] = self._classify_heading_by_rules(heading, template_sections)
+                if matches[heading] is None:
+                    unresolved.append(heading)
+                else:
+                    memo.put(scope, heading, matches[heading])
+        
+        if unresolved:
+            semantic = self._classify_headings_semantic(
+                [h.strip().lower() for h in unresolved], template_sections)
+            for heading, match in zip(unresolved, semantic):
+                matches[heading] = match
+                if match[1] != 'error':  # Don't remember a failed semantic lookup
+                    memo.put(scope, heading, match)
+        
+        return {heading: (template_sections[idx] if idx is not None else None, confidence)
+                for heading, (idx, _, confidence) in matches.items()}
+    
     def batch_classify(self, sections: List[Dict], template_sections: List[str]) -> Dict[str, str]:
         """
-        Classify multiple sections in batch
+        Classify multiple sections in batch (one encode call for all unresolved headings)
         
         Args:
             sections: List of dicts with 'heading', 'content', 'position'
@@ -523,12 +642,16 @@ class EnhancedSectionClassifier:
         print(f"🔍 CLASSIFYING {len(sections)} SECTIONS")
         print(f"{'='*70}\n")
         
+        heading_matches = self._match_headings(sections, template_sections)
+        
         for idx, section in enumerate(sections):
             heading = section.get('heading')
             content = section.get('content', '')
             position = section.get('position', idx)
+            heading_matched, heading_confidence = heading_matches.get(heading) or (None, 0.0)
             
-            result = self.classify_section(heading, content, position, template_sections)
+            result = self._resolve_section(heading, heading_matched, heading_confidence,
+                                           content, position, template_sections)
             
             if result['matched_section']:
                 mapped[result['matched_section']] = content
@@ -561,12 +684,15 @@ class EnhancedSectionClassifier:
 
 # Singleton instance
 _classifier_instance = None
+_classifier_lock = threading.Lock()
 
 def get_section_classifier(confidence_threshold: float = 0.6) -> EnhancedSectionClassifier:
     """Get or create singleton classifier instance"""
     global _classifier_instance
     if _classifier_instance is None:
-        _classifier_instance = EnhancedSectionClassifier(confidence_threshold)
+        with _classifier_lock:
+            if _classifier_instance is None:
+                _classifier_instance = EnhancedSectionClassifier(confidence_threshold)
     return _classifier_instance
 
 
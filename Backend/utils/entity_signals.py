@@ -0,0 +1,292 @@
+"""
+Entity Signals - DATE / ORG detection for classifying unheaded content
+Content classification only needs to know whether a section mentions dates and
+organizations (dates + orgs → employment). Instead of running the full spaCy
+pipeline once per section, this component:
+
+- Runs one nlp.pipe() over every section of a resume that still needs NER
+- Uses a spaCy pipeline slimmed to NER (no tagger/parser/attribute_ruler/lemmatizer)
+- Answers from precompiled regexes when spaCy cannot change the outcome:
+  no date-like token at all, or an obvious date range next to an obvious company
+- Remembers results in a bounded LRU keyed by content hash
+
+Benchmark (needs spaCy):
+    python -m utils.entity_signals [resume.docx ...]
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# Components NER does not need; en_core_web_sm's ner has its own tok2vec
+EXCLUDED_PIPES = ('tagger', 'parser', 'attribute_ruler', 'lemmatizer')
+
+MAX_ENTITY_CHARS = 500  # Same prefix the classifiers always looked at
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|'
+          r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+
+# "Jan 2020", "2018 - Present", "03/2019", "2015–2017"
+OBVIOUS_DATE_PATTERN = re.compile(
+    rf'\b{_MONTH}\.?,?\s+(?:19|20)\d{{2}}\b'
+    r'|\b(?:19|20)\d{2}\s*(?:-|–|—|to)\s*(?:(?:19|20)\d{2}|present|current|now)\b'
+    r'|\b(?:0?[1-9]|1[0-2])/(?:19|20)\d{2}\b',
+    re.IGNORECASE
+)
+
+# Anything spaCy could tag as DATE: digits, month/day names or time words
+DATE_CANDIDATE_PATTERN = re.compile(
+    rf'\d|\b{_MONTH}\b'
+    r'|\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|today|yesterday|tomorrow|'
+    r'present|current(?:ly)?|recent(?:ly)?|ago|annual(?:ly)?|year|years|month|months|week|weeks|'
+    r'day|days|decade|decades|quarter|quarters|spring|summer|fall|autumn|winter|weekend)\b',
+    re.IGNORECASE
+)
+
+OBVIOUS_ORG_PATTERN = re.compile(
+    r'\b(?:inc|llc|ltd|corp|corporation|company|gmbh|plc|lp|llp|pvt|technologies|'
+    r'solutions|systems|consulting|group|bank|university|college|institute|agency|department)\b\.?',
+    re.IGNORECASE
+)
+
+
+class EntitySignals(NamedTuple):
+    has_dates: bool
+    has_orgs: bool
+
+
+def _content_key(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def regex_signals(text: str) -> Optional[EntitySignals]:
+    """
+    Signals decided without spaCy.
+
+    Returns:
+        EntitySignals when the regexes settle the dates+orgs decision, None if NER is needed
+    """
+    if not DATE_CANDIDATE_PATTERN.search(text):
+        # No DATE entity possible, so the employment rule cannot fire either way
+        return EntitySignals(False, False)
+    if OBVIOUS_DATE_PATTERN.search(text) and OBVIOUS_ORG_PATTERN.search(text):
+        return EntitySignals(True, True)
+    return None
+
+
+class EntitySignalDetector:
+    """Batched, cached DATE/ORG signals for one spaCy pipeline"""
+
+    def __init__(self, nlp, max_entries: int = 2048, batch_size: int = 32):
+        """
+        Args:
+            nlp: spaCy Language (ideally loaded with exclude=EXCLUDED_PIPES), or None
+            max_entries: LRU size (results keyed by content hash)
+            batch_size: nlp.pipe batch size
+        """
+        self.nlp = nlp
+        self.max_entries = max(1, int(max_entries))
+        self.batch_size = batch_size
+        self._cache: "OrderedDict[str, EntitySignals]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'regex': 0, 'spacy_docs': 0, 'pipe_calls': 0,
+                       'spacy_ms': 0.0}
+
+    def _remember(self, key: str, signals: EntitySignals):
+        self._cache[key] = signals
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def signals(self, text: str) -> EntitySignals:
+        """DATE/ORG signals for one section's content"""
+        return self.signals_many([text])[0]
+
+    def prefetch(self, texts: Sequence[str]):
+        """Resolve all sections of a resume in one nlp.pipe() so later lookups hit the cache"""
+        self.signals_many(texts)
+
+    def signals_many(self, texts: Sequence[str]) -> List[EntitySignals]:
+        """
+        DATE/ORG signals for many texts; only cache misses the regexes cannot settle reach spaCy.
+
+        Returns:
+            One EntitySignals per input text, in order
+        """
+        snippets = [(text or '')[:MAX_ENTITY_CHARS] for text in texts]
+        keys = [_content_key(snippet) for snippet in snippets]
+        results: List[Optional[EntitySignals]] = [None] * len(snippets)
+        pending: Dict[str, str] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._stats['hits'] += 1
+                    results[i] = cached
+                    continue
+                self._stats['misses'] += 1
+                quick = regex_signals(snippets[i])
+                if quick is not None:
+                    self._stats['regex'] += 1
+                    self._remember(key, quick)
+                    results[i] = quick
+                elif key not in pending:
+                    pending[key] = snippets[i]
+
+        if pending:
+            resolved = self._run_ner(list(pending.values()))
+            with self._lock:
+                for key, signals in zip(pending, resolved):
+                    self._remember(key, signals)
+            by_key = dict(zip(pending, resolved))
+            results = [r if r is not None else by_key[key] for r, key in zip(results, keys)]
+
+        return results
+
+    def _run_ner(self, snippets: List[str]) -> List[EntitySignals]:
+        if self.nlp is None:
+            return [EntitySignals(False, False) for _ in snippets]
+        start = time.perf_counter()
+        resolved = []
+        for doc in self.nlp.pipe(snippets, batch_size=self.batch_size):
+            labels = {ent.label_ for ent in doc.ents}
+            resolved.append(EntitySignals('DATE' in labels, 'ORG' in labels))
+        with self._lock:
+            self._stats['pipe_calls'] += 1
+            self._stats['spacy_docs'] += len(snippets)
+            self._stats['spacy_ms'] += (time.perf_counter() - start) * 1000
+        return resolved
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._cache)
+        stats['spacy_ms'] = round(stats['spacy_ms'], 1)
+        return stats
+
+
+def acquire_entity_pipeline():
+    """Shared spaCy pipeline slimmed to NER (None if spaCy is unavailable)"""
+    from utils.model_registry import acquire_spacy_model
+    try:
+        return acquire_spacy_model(exclude=EXCLUDED_PIPES)
+    except Exception as e:
+        print(f"⚠️  Could not load spaCy NER pipeline: {e}")
+        return None
+
+
+# One detector per pipeline object, so every consumer shares the cache
+_detectors: Dict[int, EntitySignalDetector] = {}
+_detectors_lock = threading.Lock()
+
+
+def _cache_size() -> int:
+    try:
+        from config import Config
+        return Config.ENTITY_CACHE_ENTRIES
+    except Exception:
+        return 2048
+
+
+def get_entity_detector(nlp) -> EntitySignalDetector:
+    """Get or create the detector for a spaCy pipeline"""
+    detector = _detectors.get(id(nlp))
+    if detector is None or detector.nlp is not nlp:
+        with _detectors_lock:
+            detector = _detectors.get(id(nlp))
+            if detector is None or detector.nlp is not nlp:
+                detector = EntitySignalDetector(nlp, _cache_size())
+                _detectors[id(nlp)] = detector
+    return detector
+
+
+def entity_detector_stats(nlp) -> Optional[Dict]:
+    """Cache / spaCy metrics for a pipeline's detector (None if it never ran)"""
+    detector = _detectors.get(id(nlp))
+    if detector is None or detector.nlp is not nlp:
+        return None
+    return detector.stats()
+
+
+def clear_entity_detectors():
+    """Forget all detectors and their caches (used by clear_model_cache)"""
+    with _detectors_lock:
+        _detectors.clear()
+
+
+def benchmark(paths: Sequence[str]) -> List[Dict]:
+    """
+    Per-resume NLP time: full pipeline once per section (before) vs this detector (after).
+
+    Returns:
+        One dict per resume with section count, before/after ms and decision agreement
+    """
+    import spacy
+    from utils.model_registry import DEFAULT_SPACY_MODEL
+    from utils.intelligent_resume_parser import IntelligentResumeParser
+
+    full = spacy.load(DEFAULT_SPACY_MODEL)
+    slim = spacy.load(DEFAULT_SPACY_MODEL, exclude=list(EXCLUDED_PIPES))
+    full('warm up')
+    slim('warm up')
+    parser = IntelligentResumeParser.__new__(IntelligentResumeParser)  # section extraction needs no models
+
+    rows = []
+    for path in paths:
+        contents = [s['content'] for s in parser._extract_candidate_sections(path)]
+
+        start = time.perf_counter()
+        before = []
+        for content in contents:
+            doc = full(content[:MAX_ENTITY_CHARS])
+            labels = {ent.label_ for ent in doc.ents}
+            before.append('DATE' in labels and 'ORG' in labels)
+        before_ms = (time.perf_counter() - start) * 1000
+
+        detector = EntitySignalDetector(slim)
+        start = time.perf_counter()
+        after = [s.has_dates and s.has_orgs for s in detector.signals_many(contents)]
+        after_ms = (time.perf_counter() - start) * 1000
+
+        rows.append({
+            'resume': path,
+            'sections': len(contents),
+            'before_ms': round(before_ms, 1),
+            'after_ms': round(after_ms, 1),
+            'agreement': round(sum(a == b for a, b in zip(before, after)) / max(len(contents), 1), 4),
+            'spacy_docs': detector.stats()['spacy_docs'],
+        })
+    return rows
+
+
+def main():
+    import argparse
+    import glob
+    import os
+
+    samples = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Resume formatter samples')
+    parser = argparse.ArgumentParser(description="Benchmark entity-signal detection per resume")
+    parser.add_argument('resumes', nargs='*', help="Resume .docx files (default: bundled samples)")
+    args = parser.parse_args()
+
+    paths = args.resumes or sorted(glob.glob(os.path.join(samples, '*.docx')))
+    if not paths:
+        raise SystemExit("No resumes to benchmark")
+
+    print(f"{'resume':<50} {'sections':>8} {'before ms':>10} {'after ms':>9} {'spaCy docs':>10} {'agree':>6}")
+    for row in benchmark(paths):
+        print(f"{os.path.basename(row['resume'])[:50]:<50} {row['sections']:>8} {row['before_ms']:>10} "
+              f"{row['after_ms']:>9} {row['spacy_docs']:>10} {row['agreement']:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
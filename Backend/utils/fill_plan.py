@@ -0,0 +1,238 @@
+"""
+Fill Plan - Template discovery compiled once per template
+Everything WordFormatter learns about a template before it touches candidate
+data (section anchors, section order, skills tables, CAI CONTACT block layout,
+placeholder locations) is the same for every resume. It is compiled at upload
+time (or lazily, the first time an older template is used), persisted in a
+sidecar .plan.json next to the template file and kept in memory, so a batch on
+one template runs discovery once and each resume only executes the plan.
+
+Plans are stamped with FILL_PLAN_VERSION, a hash of the discovery code and the
+SHA-1 of the template file; any mismatch recompiles.
+
+Positions are paragraph / table indices in the untouched template (what
+Document(template_path) gives before any edit).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+FILL_PLAN_VERSION = 1  # Bump when the plan layout changes
+SIDECAR_SUFFIX = '.plan.json'
+MAX_CACHED_PLANS = 64
+
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules whose code decides what discovery finds
+_DISCOVERY_SOURCES = ('word_formatter.py', 'fill_plan.py', 'regex_bank.py', 'keyword_matcher.py')
+
+
+@dataclass
+class FillPlan:
+    """Candidate-independent facts about one template"""
+    template_hash: str
+    paragraph_count: int
+    table_count: int
+    primary_anchors: Dict[str, Optional[int]]
+    all_anchors: Dict[str, List[int]]
+    section_order: List[str]
+    section_positions: Dict[str, int]
+    section_headings: Dict[str, str]
+    last_section_position: int
+    section_candidates: Dict[str, List[int]]
+    table_roles: List[Optional[str]]
+    cai_in_header_area: bool
+    cai_heading: Optional[int]
+    cai_structure: Optional[Dict]
+    name_placeholders: List[int]
+    placeholders: Dict[int, List[str]] = field(default_factory=dict)
+    version: str = ''
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FillPlan':
+        data = dict(data)
+        # JSON object keys are strings
+        data['placeholders'] = {int(k): v for k, v in data.get('placeholders', {}).items()}
+        return cls(**data)
+
+    def matches(self, doc) -> bool:
+        """The loaded document is the template this plan was compiled from"""
+        return len(doc.paragraphs) == self.paragraph_count and len(doc.tables) == self.table_count
+
+
+_version = None
+
+
+def plan_version() -> str:
+    """FILL_PLAN_VERSION plus a hash of the discovery code"""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256(str(FILL_PLAN_VERSION).encode('utf-8'))
+        for name in _DISCOVERY_SOURCES:
+            for path in glob.glob(os.path.join(_UTILS_DIR, name)):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        _version = f"{FILL_PLAN_VERSION}-{digest.hexdigest()[:12]}"
+    return _version
+
+
+def template_hash(template_path: str) -> str:
+    with open(template_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def sidecar_path(template_path: str) -> str:
+    return template_path + SIDECAR_SUFFIX
+
+
+def compile_fill_plan(template_path: str) -> FillPlan:
+    """
+    Run template discovery on a template file.
+
+    Args:
+        template_path: .docx template
+
+    Returns:
+        The compiled plan (not persisted; see build_template_fill_plan)
+    """
+    from docx import Document
+    from utils.word_formatter import WordFormatter
+
+    doc = Document(template_path)
+    facts = WordFormatter.discover_template(doc)
+    with _plans_lock:
+        _stats['compiled'] += 1
+    return FillPlan(template_hash=template_hash(template_path), version=plan_version(), **facts)
+
+
+# ---------------------------------------------------------------------------
+# Per-process cache + sidecar
+# ---------------------------------------------------------------------------
+
+_plans: "OrderedDict[tuple, FillPlan]" = OrderedDict()
+_plans_lock = threading.Lock()
+_stats = {'compiled': 0, 'sidecar_loads': 0, 'memory_hits': 0}
+
+
+def _cache_key(template_path: str) -> tuple:
+    stat = os.stat(template_path)
+    return os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size
+
+
+def _remember(key: tuple, plan: FillPlan):
+    with _plans_lock:
+        _plans[key] = plan
+        _plans.move_to_end(key)
+        while len(_plans) > MAX_CACHED_PLANS:
+            _plans.popitem(last=False)
+
+
+def _save(plan: FillPlan, template_path: str):
+    path = sidecar_path(template_path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(plan.to_dict(), f)
+    os.replace(temp_path, path)
+
+
+def _load_sidecar(template_path: str) -> Optional[FillPlan]:
+    path = sidecar_path(template_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            plan = FillPlan.from_dict(json.load(f))
+    except Exception as e:
+        print(f"⚠️  Could not read fill plan {os.path.basename(path)}: {e}")
+        return None
+    if plan.version != plan_version() or plan.template_hash != template_hash(template_path):
+        return None
+    with _plans_lock:
+        _stats['sidecar_loads'] += 1
+    return plan
+
+
+def build_template_fill_plan(template_path: str) -> Optional[Dict]:
+    """
+    Compile and persist a template's fill plan (upload time).
+
+    Returns:
+        Metadata to store in format_data['fill_plan'], or None for non-.docx templates
+    """
+    if not template_path.lower().endswith('.docx'):
+        return None
+    try:
+        plan = compile_fill_plan(template_path)
+        _save(plan, template_path)
+        _remember(_cache_key(template_path), plan)
+        print(f"🗺️  Compiled fill plan: {len(plan.section_order)} sections, "
+              f"{plan.table_roles.count('skills')} skills tables, {len(plan.placeholders)} placeholder paragraphs")
+        return {'file': os.path.basename(sidecar_path(template_path)), 'version': plan.version,
+                'template_hash': plan.template_hash}
+    except Exception as e:
+        print(f"⚠️  Fill plan compile failed: {e}")
+        return None
+
+
+def load_fill_plan(template_path: str) -> Optional[FillPlan]:
+    """
+    Fill plan for a template: from memory, from its sidecar, or compiled now
+    (and persisted so other workers and later sessions load it).
+
+    Returns:
+        The plan, or None (not a .docx, cannot be compiled, or Config.USE_TEMPLATE_FILL_PLAN off)
+    """
+    if not template_path or not template_path.lower().endswith('.docx'):
+        return None
+    try:
+        from config import Config
+        if not getattr(Config, 'USE_TEMPLATE_FILL_PLAN', True):
+            return None
+    except ImportError:
+        pass
+    try:
+        key = _cache_key(template_path)
+    except OSError:
+        return None
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            _stats['memory_hits'] += 1
+            return plan
+
+    plan = _load_sidecar(template_path)
+    if plan is None:
+        try:
+            plan = compile_fill_plan(template_path)
+        except Exception as e:
+            print(f"⚠️  Fill plan compile failed: {e}")
+            return None
+        try:
+            _save(plan, template_path)
+        except OSError as e:
+            print(f"⚠️  Could not write fill plan: {e}")
+    _remember(key, plan)
+    return plan
+
+
+def delete_template_fill_plan(template_path: str):
+    try:
+        path = sidecar_path(template_path)
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+
+
+def fill_plan_stats() -> Dict:
+    with _plans_lock:
+        return dict(_stats, cached=len(_plans))
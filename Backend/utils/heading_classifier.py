@@ -0,0 +1,342 @@
+"""
+Fast Heading Classifier - Torch-free first tier for section-heading matching
+Hashed character n-gram features + a linear softmax model, trained offline from
+the synonym tables already in the codebase:
+- EnhancedSectionClassifier.SECTION_MAPPING
+- OptimizedSectionMapper.section_synonyms / SmartSectionMapper.section_synonyms
+- SectionDetector.SECTION_HEADERS (and CONTENT_KEYWORDS as non-heading examples)
+- enhanced_formatter_integration.SECTION_SYNONYMS
+- learned_template_patterns.json (section_order of learned templates)
+
+The trained weights ship as heading_classifier.npz (~35KB). Prediction is a
+sparse feature hash plus one small matrix product - no torch import, so fast
+mode gets synonym-aware matching and ML mode only calls the transformer for
+headings this model is unsure about.
+
+Retrain after editing any synonym table:
+    python -m utils.heading_classifier
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'heading_classifier.npz')
+PATTERNS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'learned_template_patterns.json')
+
+N_FEATURES = 2 ** 13
+NGRAM_RANGE = (2, 4)
+OTHER_LABEL = '_other'  # Not a section heading
+MAX_HEADING_WORDS = 6  # Longer lines are never treated as headings
+DEFAULT_THRESHOLD = 0.7
+
+# Source-table labels → SECTION_MAPPING canonical names
+_LABEL_ALIASES = {
+    'employment': 'employment history',
+    'experience': 'employment history',
+    'summary': 'summary',
+    'awards': 'awards',
+}
+
+_CLEAN_RE = re.compile(r'[^a-z0-9&/+# ]+')
+
+
+def clean_heading(text: str) -> str:
+    """Lowercase, drop punctuation (keeps & / + #), collapse whitespace"""
+    return ' '.join(_CLEAN_RE.sub(' ', str(text).lower()).split())
+
+
+def _hashed_features(text: str, n_features: int = N_FEATURES) -> Dict[int, float]:
+    """L2-normalized hashed char n-gram + word counts for one text"""
+    cleaned = clean_heading(text)
+    padded = f' {cleaned} '
+    grams = [padded[i:i + n] for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1)
+             for i in range(len(padded) - n + 1)]
+    grams.extend('w:' + word for word in cleaned.split())
+
+    counts: Dict[int, float] = {}
+    for gram in grams:
+        idx = zlib.crc32(gram.encode('utf-8')) % n_features
+        counts[idx] = counts.get(idx, 0.0) + 1.0
+    norm = sum(v * v for v in counts.values()) ** 0.5 or 1.0
+    return {idx: v / norm for idx, v in counts.items()}
+
+
+def featurize(texts: Sequence[str], n_features: int = N_FEATURES) -> np.ndarray:
+    """Dense (n, n_features) float32 feature matrix"""
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for idx, value in _hashed_features(text, n_features).items():
+            matrix[row, idx] = value
+    return matrix
+
+
+def _canonical_label(label: str, known: Sequence[str]) -> Optional[str]:
+    label = label.strip().lower()
+    label = _LABEL_ALIASES.get(label, label)
+    return label if label in known else None
+
+
+def training_examples() -> List[Tuple[str, str]]:
+    """
+    (heading, label) pairs from every synonym table in the codebase.
+    Each heading gets the label most tables agree on; ties are dropped.
+    """
+    from utils.enhanced_section_classifier import EnhancedSectionClassifier
+    from utils.optimized_section_mapper import OptimizedSectionMapper
+    from utils.smart_section_mapper import SmartSectionMapper
+    from utils.section_detector import SectionDetector
+    from utils.enhanced_formatter_integration import SECTION_SYNONYMS
+
+    known = list(EnhancedSectionClassifier.SECTION_MAPPING.keys())
+    votes: Dict[str, Counter] = {}
+
+    def vote(heading: str, label: Optional[str]):
+        heading = clean_heading(heading)
+        if heading and label:
+            votes.setdefault(heading, Counter())[label] += 1
+
+    tables = [EnhancedSectionClassifier.SECTION_MAPPING, OptimizedSectionMapper.section_synonyms,
+              SmartSectionMapper.section_synonyms, SectionDetector.SECTION_HEADERS, SECTION_SYNONYMS]
+    for table in tables:
+        for section, synonyms in table.items():
+            label = _canonical_label(section, known)
+            vote(section, label)
+            for synonym in synonyms:
+                vote(synonym, label)
+
+    # Content words are what body lines look like - never headings
+    for keywords in SectionDetector.CONTENT_KEYWORDS.values():
+        for keyword in keywords:
+            if clean_heading(keyword) not in votes:
+                vote(keyword, OTHER_LABEL)
+
+    # Learned templates: known headings reinforce their label, everything else
+    # in the section order (names, contact lines, job lines) is a non-heading
+    try:
+        with open(PATTERNS_PATH, 'r', encoding='utf-8') as f:
+            patterns = json.load(f)
+        for template in patterns.values():
+            for entry in template.get('section_order', []) or []:
+                cleaned = clean_heading(entry)
+                if cleaned in votes:
+                    vote(cleaned, votes[cleaned].most_common(1)[0][0])
+                else:
+                    vote(cleaned, OTHER_LABEL)
+    except Exception as e:
+        print(f"⚠️  Could not read learned template patterns: {e}")
+
+    examples = []
+    for heading, counter in sorted(votes.items()):
+        ranked = counter.most_common(2)
+        if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+            continue  # Ambiguous across tables
+        examples.append((heading, ranked[0][0]))
+    return examples
+
+
+def training_fingerprint(examples: Sequence[Tuple[str, str]]) -> str:
+    payload = '\n'.join(f"{h}\t{l}" for h, l in examples)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class HeadingClassifier:
+    """Linear softmax model over hashed char n-grams"""
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, labels: Sequence[str],
+                 fingerprint: Optional[str] = None):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = list(labels)
+        self.fingerprint = fingerprint
+        self.n_features = self.weights.shape[0]
+        self._other = self.labels.index(OTHER_LABEL) if OTHER_LABEL in self.labels else None
+
+    @classmethod
+    def train(cls, examples: Sequence[Tuple[str, str]], epochs: int = 400,
+              learning_rate: float = 4.0, l2: float = 1e-4) -> 'HeadingClassifier':
+        """
+        Full-batch gradient descent on softmax cross-entropy.
+
+        Args:
+            examples: (heading, label) pairs
+            epochs: Gradient steps
+            learning_rate: Step size
+            l2: Weight decay
+        """
+        labels = sorted({label for _, label in examples})
+        X = featurize([h for h, _ in examples])
+        y = np.array([labels.index(label) for _, label in examples])
+        Y = np.eye(len(labels), dtype=np.float32)[y]
+
+        weights = np.zeros((X.shape[1], len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        for _ in range(epochs):
+            probs = _softmax(X @ weights + bias)
+            grad = (probs - Y) / len(X)
+            weights -= learning_rate * (X.T @ grad + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+        _section_label.cache_clear()  # Template-section labels came from the previous model
+        return cls(weights, bias, labels, training_fingerprint(examples))
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Class probabilities, shape (len(texts), len(labels))"""
+        return _softmax(featurize(texts, self.n_features) @ self.weights + self.bias)
+
+    def predict_many(self, texts: Sequence[str]) -> List[Tuple[Optional[str], float]]:
+        """(label, confidence) per text; label is None for non-headings"""
+        if not texts:
+            return []
+        probs = self.predict_proba(texts)
+        results = []
+        for row in probs:
+            best = int(np.argmax(row))
+            label = None if best == self._other else self.labels[best]
+            results.append((label, float(row[best])))
+        return results
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        return self.predict_many([text])[0]
+
+    def section_label(self, name: str) -> Optional[str]:
+        """Best section label for a template/keyword name (ignores the non-heading class)"""
+        row = self.predict_proba([name])[0]
+        if self._other is not None:
+            row[self._other] = -1.0
+        return self.labels[int(np.argmax(row))]
+
+    def save(self, path: str = ARTIFACT_PATH):
+        np.savez_compressed(path, weights=self.weights.astype(np.float16), bias=self.bias,
+                            labels=np.array(self.labels), fingerprint=np.array(self.fingerprint or ''))
+
+    @classmethod
+    def load(cls, path: str = ARTIFACT_PATH) -> 'HeadingClassifier':
+        _section_label.cache_clear()
+        with np.load(path) as data:
+            return cls(data['weights'], data['bias'], [str(l) for l in data['labels']],
+                       str(data['fingerprint']) or None)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+# Singleton instance
+_classifier_instance = None
+_classifier_lock = threading.Lock()
+
+
+def get_heading_classifier() -> Optional[HeadingClassifier]:
+    """Shipped classifier (trained in-process if the artifact is missing)"""
+    global _classifier_instance
+    if _classifier_instance is None:
+        with _classifier_lock:
+            if _classifier_instance is None:
+                try:
+                    _classifier_instance = HeadingClassifier.load(ARTIFACT_PATH)
+                except Exception as e:
+                    print(f"⚠️  Heading classifier artifact unavailable ({e}) - training in-process")
+                    try:
+                        _classifier_instance = HeadingClassifier.train(training_examples())
+                    except Exception as train_error:
+                        print(f"⚠️  Heading classifier training failed: {train_error}")
+                        return None
+    return _classifier_instance
+
+
+def _settings() -> Tuple[bool, float]:
+    try:
+        from config import Config
+        return Config.USE_FAST_HEADING_CLASSIFIER, Config.HEADING_CLASSIFIER_THRESHOLD
+    except Exception:
+        return True, DEFAULT_THRESHOLD
+
+
+@lru_cache(maxsize=2048)
+def _section_label(name: str) -> Optional[str]:
+    classifier = get_heading_classifier()
+    return classifier.section_label(name) if classifier else None
+
+
+def classify_heading(heading: str, threshold: Optional[float] = None) -> Tuple[Optional[str], float]:
+    """
+    Section label for a heading line, or None below the confidence threshold.
+    Classify a line once and pass the label to section_for_label for each section list.
+
+    Returns:
+        (label or None, classifier confidence)
+    """
+    enabled, default_threshold = _settings()
+    if not enabled or not heading or len(heading.split()) > MAX_HEADING_WORDS:
+        return None, 0.0
+    classifier = get_heading_classifier()
+    if classifier is None:
+        return None, 0.0
+
+    label, confidence = classifier.predict(heading)
+    if label is None or confidence < (default_threshold if threshold is None else threshold):
+        return None, confidence
+    return label, confidence
+
+
+def section_for_label(label: Optional[str], template_sections: Sequence[str]) -> Optional[str]:
+    """First template section (or keyword variant) whose own label is `label`"""
+    if label is None:
+        return None
+    for section in template_sections:
+        if _section_label(section) == label:
+            return section
+    return None
+
+
+def match_heading(heading: str, template_sections: Sequence[str],
+                  threshold: Optional[float] = None) -> Tuple[Optional[str], float]:
+    """
+    Map a heading to a template section with the fast classifier.
+
+    Args:
+        heading: Candidate heading (a short line)
+        template_sections: Template section names (or keyword variants)
+        threshold: Minimum confidence (default Config.HEADING_CLASSIFIER_THRESHOLD)
+
+    Returns:
+        (matched template section or None, classifier confidence)
+    """
+    label, confidence = classify_heading(heading, threshold)
+    return section_for_label(label, template_sections), confidence
+
+
+def evaluate(examples: Sequence[Tuple[str, str]], folds: int = 5) -> float:
+    """k-fold accuracy on the training tables (headings unseen by each fold's model)"""
+    examples = list(examples)
+    correct = 0
+    for fold in range(folds):
+        train = [e for i, e in enumerate(examples) if i % folds != fold]
+        test = [e for i, e in enumerate(examples) if i % folds == fold]
+        model = HeadingClassifier.train(train)
+        predictions = model.predict_many([h for h, _ in test])
+        correct += sum(1 for (label, _), (_, truth) in zip(predictions, test)
+                       if (label or OTHER_LABEL) == truth)
+    return correct / len(examples) if examples else 0.0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    examples = training_examples()
+    print(f"📚 {len(examples)} labelled headings, {len({l for _, l in examples})} labels")
+    print(f"📊 5-fold accuracy on unseen headings: {evaluate(examples):.2%}")
+    classifier = HeadingClassifier.train(examples)
+    classifier.save(ARTIFACT_PATH)
+    print(f"✅ Saved {ARTIFACT_PATH} ({os.path.getsize(ARTIFACT_PATH) / 1024:.0f} KB)")
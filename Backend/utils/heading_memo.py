@@ -0,0 +1,210 @@
+"""
+Heading Memo - Cross-request memo of heading → section matches
+The set of distinct heading lines is tiny ("WORK EXPERIENCE", "Technical Skills",
+"EDUCATION"), yet every resume used to re-run the exact / fuzzy / classifier /
+semantic tiers for each of them. Matchers look results up here first.
+
+Keys are (scope, normalized heading). A scope identifies the matcher, the exact
+template section list and everything else the result depends on (model identity,
+thresholds, heading classifier version), so a changed template or model can never
+return a stale match.
+
+- LRU eviction at Config.HEADING_MEMO_ENTRIES, thread-safe
+- Optional JSON persistence (Config.PERSIST_HEADING_MEMO) shared across restarts
+- Hit/miss counters per matcher (heading_memo_stats, reported on /api/health)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+_FORMAT_VERSION = 1
+
+
+def normalize_heading_key(heading: str) -> str:
+    """Memo key for a heading (every matcher only looks at the stripped, lowercased text)"""
+    return str(heading or '').strip().lower()
+
+
+def memo_scope(matcher: str, sections: Sequence[str] = (), context: str = '') -> str:
+    """
+    Scope for one matcher over one exact template section list.
+
+    Args:
+        matcher: Matcher name ('parser', 'classifier', ...), also used for per-matcher counters
+        sections: Template sections in order (results are stored as indexes into this list)
+        context: Anything else the result depends on (model identity, thresholds)
+    """
+    payload = context + '\0' + '\0'.join(sections)
+    return f"{matcher}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+def matcher_context(model: Any = None, **settings) -> str:
+    """Context string for memo_scope: model identity, fast-classifier version and extra settings"""
+    from utils.heading_classifier import _settings, get_heading_classifier
+    from utils.model_registry import model_identity
+
+    enabled, threshold = _settings()
+    classifier = get_heading_classifier() if enabled else None
+    parts = [model_identity(model) if model is not None else 'no-model',
+             f"fast={enabled}:{threshold}:{getattr(classifier, 'fingerprint', None)}"]
+    parts.extend(f"{key}={value}" for key, value in sorted(settings.items()))
+    return '|'.join(parts)
+
+
+class HeadingMemo:
+    """Bounded, thread-safe LRU of (scope, heading) → match result"""
+
+    MISSING = object()  # get() default that tells a miss apart from a cached None
+
+    def __init__(self, max_entries: int = 20000, path: Optional[str] = None, save_every: int = 200):
+        """
+        Args:
+            max_entries: LRU capacity
+            path: JSON file to load from and save to (None = memory only)
+            save_every: Save after this many new entries (and at exit)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.path = path
+        self.save_every = max(1, int(save_every))
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+        self._unsaved = 0
+        if path:
+            self._load()
+
+    def _count(self, scope: str, outcome: str):
+        matcher = scope.split(':', 1)[0]
+        counters = self._counters.setdefault(matcher, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def get(self, scope: str, heading: str, default: Any = None) -> Any:
+        """Cached result, or `default` on a miss (None is a valid cached result)"""
+        key = (scope, normalize_heading_key(heading))
+        with self._lock:
+            value = self._entries.get(key, self.MISSING)
+            if value is self.MISSING:
+                self._count(scope, 'misses')
+                return default
+            self._entries.move_to_end(key)
+            self._count(scope, 'hits')
+            return value
+
+    def put(self, scope: str, heading: str, value: Any):
+        key = (scope, normalize_heading_key(heading))
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            self._unsaved += 1
+            due = self.path and self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def lookup(self, scope: str, heading: str, compute: Callable[[], Any]) -> Any:
+        """Cached result for the heading, computing and storing it on a miss"""
+        value = self.get(scope, heading, self.MISSING)
+        if value is self.MISSING:
+            value = compute()
+            self.put(scope, heading, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+            self._evictions = 0
+            self._unsaved = 0
+
+    def stats(self) -> Dict:
+        """Hit-rate counters (overall and per matcher)"""
+        with self._lock:
+            matchers = {name: dict(c) for name, c in self._counters.items()}
+            entries = len(self._entries)
+            evictions = self._evictions
+        for counters in matchers.values():
+            total = counters['hits'] + counters['misses']
+            counters['hit_rate'] = round(counters['hits'] / total, 4) if total else 0.0
+        hits = sum(c['hits'] for c in matchers.values())
+        lookups = hits + sum(c['misses'] for c in matchers.values())
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'evictions': evictions,
+            'persistent': bool(self.path),
+            'matchers': matchers,
+        }
+
+    def save(self):
+        """Write the memo atomically (other workers pick it up on their next start)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [[scope, heading, value] for (scope, heading), value in self._entries.items()]
+            self._unsaved = 0
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': _FORMAT_VERSION, 'entries': entries}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️  Could not save heading memo: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable heading memo {self.path}: {e}")
+            return
+        if data.get('version') != _FORMAT_VERSION:
+            return
+        with self._lock:
+            for scope, heading, value in data.get('entries', [])[-self.max_entries:]:
+                self._entries[(scope, heading)] = tuple(value) if isinstance(value, list) else value
+        print(f"🧠 Loaded {len(self._entries)} memoized heading matches")
+
+
+# Singleton instance
+_memo_instance = None
+_memo_lock = threading.Lock()
+
+
+def _memo_settings() -> Tuple[int, Optional[str]]:
+    try:
+        from config import Config
+        path = Config.HEADING_MEMO_PATH if Config.PERSIST_HEADING_MEMO else None
+        return Config.HEADING_MEMO_ENTRIES, path
+    except Exception:
+        return 20000, None
+
+
+def get_heading_memo() -> HeadingMemo:
+    """Process-wide heading memo shared by the parser and classifiers"""
+    global _memo_instance
+    if _memo_instance is None:
+        with _memo_lock:
+            if _memo_instance is None:
+                max_entries, path = _memo_settings()
+                _memo_instance = HeadingMemo(max_entries, path)
+                if path:
+                    atexit.register(_memo_instance.save)
+    return _memo_instance
+
+
+def heading_memo_stats() -> Dict:
+    return get_heading_memo().stats()
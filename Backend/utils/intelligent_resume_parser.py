@@ -4,21 +4,27 @@ Handles varied section names, missing headings, and semantic matching
 OPTIMIZED: Prevents content mixing between sections
 """
 
+import importlib.util
 import re
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple, Union
 from docx import Document
-import numpy as np
 from .section_content_validator import get_content_validator
+from .model_registry import acquire_sentence_model, sentence_encoder_available
+from .entity_signals import acquire_entity_pipeline, get_entity_detector
+from .heading_classifier import match_heading
+from .heading_memo import get_heading_memo, matcher_context, memo_scope
+from .embedding_cache import encode_cached
+from .template_section_index import get_section_index
+from .docx_stream import DocxParagraph
+from .candidate_document import CandidateDocument, load_candidate_document
 
 # Install these if missing:
 # pip install sentence-transformers fuzzywuzzy python-Levenshtein spacy
 # python -m spacy download en_core_web_sm
 
-try:
-    from sentence_transformers import SentenceTransformer
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+TRANSFORMERS_AVAILABLE = sentence_encoder_available()
+if not TRANSFORMERS_AVAILABLE:
     print("⚠️  Run: pip install sentence-transformers")
 
 try:
@@ -28,11 +34,8 @@ except ImportError:
     FUZZY_AVAILABLE = False
     print("⚠️  Run: pip install fuzzywuzzy python-Levenshtein")
 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
+SPACY_AVAILABLE = importlib.util.find_spec('spacy') is not None
+if not SPACY_AVAILABLE:
     print("⚠️  Run: pip install spacy && python -m spacy download en_core_web_sm")
 
 
@@ -47,18 +50,23 @@ class IntelligentResumeParser:
     _model = None
     _nlp = None
     _models_loaded = False
+    _init_lock = threading.RLock()  # Concurrent first requests load models once
     
     def __new__(cls):
         """Singleton pattern - only one instance with shared models"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
         # Only load models once
         if not IntelligentResumeParser._models_loaded:
-            self._load_models()
-            IntelligentResumeParser._models_loaded = True
+            with IntelligentResumeParser._init_lock:
+                if not IntelligentResumeParser._models_loaded:
+                    self._load_models()
+                    IntelligentResumeParser._models_loaded = True
         
         # Synonym mappings for fallback
         self.section_mappings = {
@@ -82,37 +90,12 @@ class IntelligentResumeParser:
         }
     
     def _load_models(self):
-        """Load ML models once and cache them"""
+        """Resolve ML models through the shared registry (loaded once per process)"""
         if TRANSFORMERS_AVAILABLE and IntelligentResumeParser._model is None:
-            try:
-                print("⚡ Loading OPTIMIZED Sentence Transformer (all-MiniLM-L6-v2)...")
-                import time
-                start = time.time()
-                IntelligentResumeParser._model = SentenceTransformer(
-                    'all-MiniLM-L6-v2',
-                    device='cpu'
-                )
-                print(f"✅ Sentence Transformer loaded in {time.time()-start:.2f}s (cached for reuse)")
-            except Exception as e:
-                print(f"⚠️  Failed to load Sentence Transformer: {e}")
+            IntelligentResumeParser._model = acquire_sentence_model()
         
         if SPACY_AVAILABLE and IntelligentResumeParser._nlp is None:
-            try:
-                print("⚡ Loading spaCy (en_core_web_sm)...")
-                import time
-                start = time.time()
-                IntelligentResumeParser._nlp = spacy.load("en_core_web_sm")
-                print(f"✅ spaCy loaded in {time.time()-start:.2f}s (cached for reuse)")
-            except Exception as e:
-                print(f"⚠️  Failed to load spaCy: {e}")
-                try:
-                    print("📥 Downloading spaCy model...")
-                    import subprocess
-                    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=True)
-                    IntelligentResumeParser._nlp = spacy.load("en_core_web_sm")
-                    print("✅ spaCy model downloaded and loaded")
-                except Exception as e2:
-                    print(f"⚠️  Failed to download spaCy: {e2}")
+            IntelligentResumeParser._nlp = acquire_entity_pipeline()
     
     @property
     def model(self):
@@ -121,15 +104,21 @@ class IntelligentResumeParser:
     
     @property
     def nlp(self):
-        """Get cached spaCy model"""
+        """Get cached spaCy model (NER-only pipeline)"""
         return IntelligentResumeParser._nlp
     
-    def parse_resume(self, candidate_docx_path: str, template_docx_path: str) -> Dict[str, str]:
+    @property
+    def entities(self):
+        """Batched, cached DATE/ORG detector for the spaCy model (None without spaCy)"""
+        return get_entity_detector(self.nlp) if self.nlp else None
+    
+    def parse_resume(self, candidate_docx_path: Union[str, CandidateDocument],
+                     template_docx_path: str) -> Dict[str, str]:
         """
         Main function: Parse candidate resume and map to template structure
         
         Args:
-            candidate_docx_path: Path to candidate's resume DOCX
+            candidate_docx_path: Path to candidate's resume DOCX (or its CandidateDocument)
             template_docx_path: Path to template DOCX
             
         Returns:
@@ -178,14 +167,18 @@ class IntelligentResumeParser:
         
         return sections
     
-    def _extract_candidate_sections(self, candidate_path: str) -> List[Dict]:
-        """Extract sections from candidate resume with headings and content"""
-        doc = Document(candidate_path)
+    def _extract_candidate_sections(self, candidate: Union[str, CandidateDocument]) -> List[Dict]:
+        """Extract sections from candidate resume with headings and content
+        (body paragraphs, tables and text boxes in document order)
+        
+        Args:
+            candidate: DOCX path or the upload's shared CandidateDocument
+        """
         sections = []
         current_section = None
         position_index = 0
         
-        for para in doc.paragraphs:
+        for para in load_candidate_document(candidate).body_paragraphs:
             text = para.text.strip()
             if not text:
                 continue
@@ -235,22 +228,10 @@ class IntelligentResumeParser:
         
         return sections
     
-    def _is_heading(self, para) -> bool:
+    def _is_heading(self, para: DocxParagraph) -> bool:
         """Detect if paragraph is a heading"""
-        text = para.text.strip()
-        
-        # Check style
-        if para.style.name.startswith('Heading'):
-            return True
-        
-        # Check formatting
-        if para.runs:
-            first_run = para.runs[0]
-            if first_run.bold and len(text.split()) <= 5:
-                return True
-        
-        # Check ALL CAPS short phrases
-        if text.isupper() and len(text.split()) <= 4:
+        # Heading style, bold first run or ALL CAPS short phrase
+        if para.looks_like_heading:
             return True
         
         # Check common section patterns
@@ -258,7 +239,7 @@ class IntelligentResumeParser:
             r'^(employment|education|skills|experience|summary|projects|certifications)',
             r'(history|background|profile|qualifications)$'
         ]
-        text_lower = text.lower()
+        text_lower = para.text.strip().lower()
         for pattern in section_patterns:
             if re.search(pattern, text_lower):
                 return True
@@ -272,6 +253,10 @@ class IntelligentResumeParser:
         validator = get_content_validator()
         used_content = set()  # Track content already mapped to prevent duplicates
         
+        # Unheaded sections are always classified by content: run their NER in one batch
+        if self.entities:
+            self.entities.prefetch([s['content'] for s in candidate_sections if not s['has_heading']])
+        
         for section in candidate_sections:
             heading = section['heading']
             content = section['content']
@@ -352,41 +337,65 @@ class IntelligentResumeParser:
     
     def _match_heading(self, candidate_heading: str, 
                       template_sections: List[str]) -> Optional[str]:
-        """Match candidate heading to template section"""
+        """Match candidate heading to template section (memoized across requests)"""
+        memo = get_heading_memo()
+        scope = memo_scope('parser', template_sections, matcher_context(self.model))
+        match = memo.get(scope, candidate_heading, memo.MISSING)
+        if match is memo.MISSING:
+            match = self._match_heading_uncached(candidate_heading, template_sections)
+            if match[1] != 'error':  # Don't remember a failed semantic lookup
+                memo.put(scope, candidate_heading, match)
+        
+        section_idx = match[0]
+        return template_sections[section_idx] if section_idx is not None else None
+    
+    def _match_heading_uncached(self, candidate_heading: str,
+                                template_sections: List[str]) -> Tuple[Optional[int], str, float]:
+        """
+        Run the matching tiers for one heading
+        
+        Returns:
+            (index into template_sections or None, method, confidence)
+        """
         candidate_clean = candidate_heading.strip().lower()
         template_clean = [s.strip().lower() for s in template_sections]
         
         # Exact match
         if candidate_clean in template_clean:
-            return template_sections[template_clean.index(candidate_clean)]
+            return template_clean.index(candidate_clean), 'exact', 1.0
         
         # Fuzzy match (typos, minor variations)
         if FUZZY_AVAILABLE:
             result = process.extractOne(candidate_clean, template_clean, scorer=fuzz.token_sort_ratio)
             if result and result[1] > 85:
-                return template_sections[template_clean.index(result[0])]
+                return template_clean.index(result[0]), 'fuzzy', result[1] / 100.0
+        
+        # Fast heading classifier (no torch) - transformer only below its threshold
+        fast_match, fast_confidence = match_heading(candidate_heading, template_sections)
+        if fast_match:
+            return template_sections.index(fast_match), 'fast_classifier', fast_confidence
         
         # Semantic similarity (synonyms)
+        semantic_failed = False
         if self.model:
             try:
-                candidate_emb = self.model.encode([candidate_clean])
-                template_embs = self.model.encode(template_clean)
-                similarities = np.dot(candidate_emb, template_embs.T)[0]
-                best_idx = np.argmax(similarities)
+                index = get_section_index(template_sections, self.model)
+                candidate_emb = encode_cached(self.model, [candidate_clean])
+                best_idx, best_score = index.best_match(candidate_emb[0])
                 
-                if similarities[best_idx] > 0.65:
-                    return template_sections[best_idx]
+                if best_score > 0.65:
+                    return int(best_idx), 'semantic', float(best_score)
             except:
-                pass
+                semantic_failed = True
         
         # Rule-based fallback
         for template_key, synonyms in self.section_mappings.items():
             if candidate_clean in synonyms:
-                for ts in template_sections:
+                for idx, ts in enumerate(template_sections):
                     if template_key.lower() in ts.lower():
-                        return ts
+                        return idx, 'synonyms', 0.9
         
-        return None
+        return None, 'error' if semantic_failed else 'none', 0.0
     
     def _classify_content(self, content: str, position: int,
                          template_sections: List[str]) -> Optional[str]:
@@ -401,14 +410,12 @@ class IntelligentResumeParser:
                     if 'summary' in ts.lower() or 'profile' in ts.lower():
                         return ts
         
-        # Rule 2: Entity-based (spaCy)
-        if self.nlp:
+        # Rule 2: Entity-based (spaCy, batched and cached)
+        if self.entities:
             try:
-                doc = self.nlp(content[:500])
-                has_dates = any(ent.label_ == "DATE" for ent in doc.ents)
-                has_orgs = any(ent.label_ == "ORG" for ent in doc.ents)
+                signals = self.entities.signals(content)
                 
-                if has_dates and has_orgs:
+                if signals.has_dates and signals.has_orgs:
                     for ts in template_sections:
                         if any(kw in ts.lower() for kw in ['employment', 'experience', 'work']):
                             return ts
@@ -472,12 +479,15 @@ class IntelligentResumeParser:
 
 # Singleton instance for reuse
 _parser_instance = None
+_parser_lock = threading.Lock()
 
 def get_intelligent_parser() -> IntelligentResumeParser:
     """Get or create singleton parser instance"""
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = IntelligentResumeParser()
+        with _parser_lock:
+            if _parser_instance is None:
+                _parser_instance = IntelligentResumeParser()
     return _parser_instance
 
 
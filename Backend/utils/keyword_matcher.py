@@ -0,0 +1,110 @@
+"""
+Keyword Matcher - One scan scores a text against a whole keyword table
+Content heuristics score text as sum(1 for kw in keywords if kw in text) over
+several hand-written lists. Each table here is compiled once: keywords are
+deduplicated across categories, and with pyahocorasick installed the text is
+scanned a single time by an Aho-Corasick automaton that reports every keyword
+occurrence (overlaps included). Without it, every distinct keyword is checked
+once with a substring test.
+
+Scoring semantics are unchanged: a category's count is the number of its listed
+keywords that occur anywhere in the text as substrings (a keyword listed twice
+counts twice, repeated occurrences in the text count once).
+
+    matcher = KeywordMatcher({'education': ['degree', 'gpa'], 'skills': ['python']})
+    hits = matcher.scan(text.lower())
+    hits.count('education'), hits.any('skills'), 'gpa' in hits
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, Mapping, Sequence, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordHits:
+    """Result of one scan: per-category counts and the keywords that occurred"""
+
+    __slots__ = ('counts', 'keywords')
+
+    def __init__(self, counts: Dict[Hashable, int], keywords: FrozenSet[str]):
+        self.counts = counts
+        self.keywords = keywords
+
+    def count(self, category: Hashable) -> int:
+        """Number of the category's keywords found in the text"""
+        return self.counts.get(category, 0)
+
+    def any(self, category: Hashable) -> bool:
+        return self.counts.get(category, 0) > 0
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keywords
+
+    def __repr__(self):
+        return f"KeywordHits({self.counts})"
+
+
+class KeywordMatcher:
+    """Compiled keyword table (category → keywords) scored in one pass per text"""
+
+    def __init__(self, table: Mapping[Hashable, Sequence[str]], use_automaton: bool = True):
+        """
+        Args:
+            table: Keywords per category, matched as plain substrings (lowercase them
+                and pass lowercased text if matching should ignore case)
+            use_automaton: Use the pyahocorasick automaton when it is installed
+        """
+        self.categories = tuple(table)
+        owners: Dict[str, list] = {}
+        for category, keywords in table.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(category)
+        # Each distinct keyword once; owners keep list multiplicity for the counts
+        self.keywords: Tuple[str, ...] = tuple(owners)
+        self._owners = {keyword: tuple(cats) for keyword, cats in owners.items()}
+        self._always = tuple(k for k in self.keywords if not k)  # '' is in every string
+        self._automaton = None
+        if use_automaton and AHOCORASICK_AVAILABLE and any(self.keywords):
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                if keyword:
+                    automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def found(self, text: str) -> FrozenSet[str]:
+        """Distinct keywords that occur in the text"""
+        if self._automaton is not None:
+            present = {keyword for _, keyword in self._automaton.iter(text)} if text else set()
+            present.update(self._always)
+            return frozenset(present)
+        return frozenset(keyword for keyword in self.keywords if keyword in text)
+
+    def scan(self, text: str) -> KeywordHits:
+        """Per-category hit counts for the text (one pass)"""
+        present = self.found(text)
+        counts = dict.fromkeys(self.categories, 0)
+        for keyword in present:
+            for category in self._owners[keyword]:
+                counts[category] += 1
+        return KeywordHits(counts, present)
+
+
+@lru_cache(maxsize=512)
+def _cached_matcher(table: Tuple[Tuple[Hashable, Tuple[str, ...]], ...]) -> KeywordMatcher:
+    return KeywordMatcher(dict(table))
+
+
+def keyword_matcher(table: Iterable[Tuple[Hashable, Sequence[str]]]) -> KeywordMatcher:
+    """
+    Matcher for a keyword table built at runtime, compiled once and cached.
+
+    Args:
+        table: (category, keywords) pairs
+    """
+    return _cached_matcher(tuple((category, tuple(keywords)) for category, keywords in table))
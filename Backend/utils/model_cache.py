@@ -1,26 +1,52 @@
 """
 Model Cache Manager - Pre-load and cache all ML models at startup
 This ensures the first request is fast by loading models during server initialization
+
+Under gunicorn, gunicorn.conf.py starts the warm-up in a background thread of
+each worker (start_background_prewarm). Until it finishes, models_loading() is
+True and the request path uses the rule-based tiers instead of waiting for the
+models; readiness() is reported on /api/health.
 """
 
+import os
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 # Global flag to track if models are pre-warmed
 _models_prewarmed = False
 
+# Init barrier: one warm-up at a time, everyone else waits for it
+_prewarm_lock = threading.Lock()
+_state_lock = threading.Lock()
+_ready = threading.Event()
+_warmup = {'state': 'cold', 'pid': None, 'started_at': None, 'finished_at': None, 'error': None}
+
+
+def _set_warmup(**changes):
+    _warmup.update(changes, pid=os.getpid())
+
 
 def prewarm_models():
     """
     Pre-load all ML models at server startup for instant first request
-    Call this in app.py after imports
+    Call this in app.py after imports (concurrent callers wait for the first one)
     """
+    with _prewarm_lock:
+        _prewarm_models()
+
+
+def _prewarm_models():
     global _models_prewarmed
     
     if _models_prewarmed:
         print("✅ Models already pre-warmed")
+        _ready.set()
         return
     
+    if _warmup['state'] != 'loading' or _warmup['pid'] != os.getpid():
+        _set_warmup(state='loading', started_at=time.time(), finished_at=None, error=None)
+    
     print("\n" + "="*70)
     print("🔥 PRE-WARMING ML MODELS FOR INSTANT PERFORMANCE")
     print("="*70)
@@ -67,6 +93,16 @@ def prewarm_models():
     except Exception as e:
         print(f"   ⚠️  Failed to pre-warm detector: {e}")
     
+    # 5. Warm the embedding cache from the shared on-disk store
+    try:
+        print("\n5️⃣  Warming embedding cache from disk...")
+        start = time.time()
+        from utils.embedding_cache import get_embedding_cache
+        rows = get_embedding_cache().warm()
+        print(f"   ✅ {rows} cached embeddings loaded in {time.time()-start:.2f}s")
+    except Exception as e:
+        print(f"   ⚠️  Failed to warm embedding cache: {e}")
+    
     total_time = time.time() - total_start
     
     print("\n" + "="*70)
@@ -75,42 +111,118 @@ def prewarm_models():
     print("="*70 + "\n")
     
     _models_prewarmed = True
+    _set_warmup(state='ready', finished_at=time.time())
+    _ready.set()
+
+
+def start_background_prewarm() -> bool:
+    """
+    Warm models in a daemon thread (gunicorn post_worker_init hook).
+    Requests that arrive meanwhile use the rule-based tiers (see models_loading).
+    
+    Returns:
+        True if a warm-up thread was started, False if models are ready or already loading
+    """
+    with _state_lock:
+        if _models_prewarmed and _warmup['state'] == 'ready':
+            _ready.set()
+            return False
+        if _warmup['state'] == 'loading' and _warmup['pid'] == os.getpid():
+            return False
+        # Mark as loading before the thread runs so no request can race into a blocking load
+        _ready.clear()
+        _set_warmup(state='loading', started_at=time.time(), finished_at=None, error=None)
+    
+    def run():
+        try:
+            prewarm_models()
+        except Exception as e:
+            print(f"❌ Background model warm-up failed: {e}")
+            _set_warmup(state='failed', finished_at=time.time(), error=str(e))
+            _ready.set()  # Don't leave waiters hanging; lazy loading takes over
+    
+    threading.Thread(target=run, name='model-warmup', daemon=True).start()
+    print(f"🔥 Warming ML models in the background (pid {os.getpid()})")
+    return True
+
+
+def models_loading() -> bool:
+    """True while this process's background warm-up is still running"""
+    return _warmup['state'] == 'loading' and _warmup['pid'] == os.getpid()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """Block until the warm-up finished (True) or the timeout expired (False)"""
+    if not models_loading():
+        return True
+    return _ready.wait(timeout)
+
+
+def readiness() -> Dict:
+    """Warm-up state for /api/health: cold, loading, ready or failed"""
+    state = dict(_warmup)
+    if state['pid'] != os.getpid() and state['state'] == 'loading':
+        state['state'] = 'cold'  # Forked from a process that was still warming up
+    now = state['finished_at'] or time.time()
+    return {
+        'state': state['state'],
+        'ready': state['state'] == 'ready',
+        'serving': 'rules' if state['state'] == 'loading' else 'ml',
+        'warmup_seconds': round(now - state['started_at'], 2) if state['started_at'] else None,
+        'error': state['error'],
+    }
 
 
 def get_model_status():
     """
-    Get the status of all cached models
-    Returns dict with model names and their loaded status
+    Get the status of all shared models from the model registry
+    Returns dict keyed by registry key with loaded flag, load time,
+    per-model RSS (MB), the consumers currently holding that model, the
+    encode scheduler's batch-size / queue-wait metrics and, for spaCy, the
+    entity-signal cache metrics
     """
-    status = {}
+    from utils.model_registry import get_model_registry
+    
+    registry = get_model_registry()
+    status = registry.status()
     
-    # Check optimized section mapper
+    # Consumer name -> model object it currently holds
+    held = {}
     try:
         from utils.optimized_section_mapper import OptimizedSectionMapper
-        status['optimized_mapper'] = OptimizedSectionMapper._model_loaded
-    except:
-        status['optimized_mapper'] = False
+        held['optimized_mapper'] = [OptimizedSectionMapper._model]
+    except Exception:
+        pass
     
-    # Check enhanced section classifier
     try:
         from utils.enhanced_section_classifier import EnhancedSectionClassifier
-        status['section_classifier'] = EnhancedSectionClassifier._models_loaded
-    except:
-        status['section_classifier'] = False
+        held['section_classifier'] = [EnhancedSectionClassifier._sentence_model]
+    except Exception:
+        pass
     
-    # Check intelligent resume parser
     try:
         from utils.intelligent_resume_parser import IntelligentResumeParser
-        status['resume_parser'] = IntelligentResumeParser._models_loaded
-    except:
-        status['resume_parser'] = False
+        held['resume_parser'] = [IntelligentResumeParser._model, IntelligentResumeParser._nlp]
+    except Exception:
+        pass
     
-    # Check section detector
     try:
         from utils.section_detector import SectionDetector
-        status['section_detector'] = hasattr(SectionDetector, '_cached_model')
-    except:
-        status['section_detector'] = False
+        held['section_detector'] = [getattr(SectionDetector, '_cached_model', None)]
+    except Exception:
+        pass
+    
+    from utils.encode_scheduler import scheduler_stats
+    from utils.entity_signals import entity_detector_stats
+    
+    for key, model_info in status.items():
+        model = registry.get(key)
+        model_info['consumers'] = [
+            name for name, models in held.items()
+            if model is not None and any(m is model for m in models)
+        ]
+        model_info['encode_scheduler'] = scheduler_stats(model) if model is not None else None
+        model_info['entity_signals'] = entity_detector_stats(model) if model is not None else None
     
     return status
 
@@ -118,6 +230,7 @@ def get_model_status():
 def clear_model_cache():
     """
     Clear all cached models (useful for debugging or memory management)
+    Drops every model from the shared registry and resets the consumer references
     """
     global _models_prewarmed
     
@@ -127,8 +240,19 @@ def clear_model_cache():
         from utils.optimized_section_mapper import OptimizedSectionMapper
         OptimizedSectionMapper._model = None
         OptimizedSectionMapper._model_loaded = False
-        OptimizedSectionMapper._embeddings_cache.clear()
-    except:
+    except Exception:
+        pass
+    
+    try:
+        from utils.embedding_cache import get_embedding_cache
+        get_embedding_cache().clear_memory()
+    except Exception:
+        pass
+    
+    try:
+        from utils.heading_memo import get_heading_memo
+        get_heading_memo().clear()
+    except Exception:
         pass
     
     try:
@@ -136,7 +260,7 @@ def clear_model_cache():
         EnhancedSectionClassifier._sentence_model = None
         EnhancedSectionClassifier._zero_shot_classifier = None
         EnhancedSectionClassifier._models_loaded = False
-    except:
+    except Exception:
         pass
     
     try:
@@ -144,17 +268,34 @@ def clear_model_cache():
         IntelligentResumeParser._model = None
         IntelligentResumeParser._nlp = None
         IntelligentResumeParser._models_loaded = False
-    except:
+    except Exception:
         pass
     
     try:
         from utils.section_detector import SectionDetector
         if hasattr(SectionDetector, '_cached_model'):
             delattr(SectionDetector, '_cached_model')
-    except:
+    except Exception:
         pass
     
+    try:
+        from utils.encode_scheduler import clear_schedulers
+        clear_schedulers()
+    except Exception:
+        pass
+    
+    try:
+        from utils.entity_signals import clear_entity_detectors
+        clear_entity_detectors()
+    except Exception:
+        pass
+    
+    from utils.model_registry import get_model_registry
+    get_model_registry().clear()
+    
     _models_prewarmed = False
+    _set_warmup(state='cold', started_at=None, finished_at=None, error=None)
+    _ready.clear()
     print("✅ Model cache cleared")
 
 
@@ -165,6 +306,8 @@ if __name__ == "__main__":
     
     print("\nModel Status:")
     status = get_model_status()
-    for model_name, loaded in status.items():
-        status_icon = "✅" if loaded else "❌"
-        print(f"  {status_icon} {model_name}: {'Loaded' if loaded else 'Not loaded'}")
+    for model_name, info in status.items():
+        status_icon = "✅" if info['loaded'] else "❌"
+        rss = f"{info['rss_mb']} MB" if info['rss_mb'] is not None else "n/a"
+        print(f"  {status_icon} {model_name}: {'Loaded' if info['loaded'] else 'Not loaded'} "
+              f"(consumers: {', '.join(info['consumers']) or 'none'}, RSS: {rss})")
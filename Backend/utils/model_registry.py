@@ -0,0 +1,290 @@
+"""
+Model Registry - One shared copy of every ML model per process
+All classifiers, mappers and detectors resolve their models through this registry,
+so each gunicorn worker loads all-MiniLM-L6-v2 (and spaCy) exactly once.
+
+Features:
+- Thread-safe one-time initialization (per-model lock, double-checked)
+- Models live for the whole process; clear_model_cache() is the only unload path
+- Memory accounting (RSS delta at load time + parameter bytes)
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+DEFAULT_SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    """Size of a torch model's parameters and buffers in bytes (None if not a torch model)"""
+    try:
+        total = 0
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+        return total
+    except Exception:
+        return None
+
+
+class _ModelEntry:
+    """Bookkeeping for one registered model"""
+
+    __slots__ = ('key', 'model', 'lock', 'loaded', 'error',
+                 'load_time', 'rss_delta', 'param_bytes')
+
+    def __init__(self, key: str):
+        self.key = key
+        self.model = None
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.error = None
+        self.load_time = 0.0
+        self.rss_delta = None
+        self.param_bytes = None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded ML models.
+    Use get_model_registry() instead of constructing this directly.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> _ModelEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _ModelEntry(key)
+                self._entries[key] = entry
+            return entry
+
+    def acquire(self, key: str, loader: Callable[[], Any]) -> Optional[Any]:
+        """
+        Get a shared model, loading it on first use.
+
+        Args:
+            key: Registry key (e.g. 'sentence:all-MiniLM-L6-v2')
+            loader: Zero-argument callable that builds the model
+
+        Returns:
+            The shared model instance, or None if loading failed
+        """
+        entry = self._entry(key)
+
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(entry, loader)
+
+        return entry.model
+
+    def _load(self, entry: _ModelEntry, loader: Callable[[], Any]):
+        """Run the loader once and record timing/memory (caller holds entry.lock)"""
+        print(f"⚡ Loading shared model '{entry.key}'...")
+        rss_before = _current_rss_bytes()
+        start = time.time()
+        try:
+            entry.model = loader()
+            entry.error = None
+        except Exception as e:
+            print(f"⚠️  Failed to load '{entry.key}': {e}")
+            entry.model = None
+            entry.error = str(e)
+        entry.load_time = time.time() - start
+        rss_after = _current_rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            entry.rss_delta = max(0, rss_after - rss_before)
+        entry.param_bytes = _parameter_bytes(entry.model) if entry.model is not None else None
+        entry.loaded = True
+
+        if entry.model is not None:
+            print(f"✅ '{entry.key}' loaded in {entry.load_time:.2f}s (shared by all consumers)")
+
+    def _unload(self, entry: _ModelEntry):
+        entry.model = None
+        entry.loaded = False
+        entry.error = None
+        entry.rss_delta = None
+        entry.param_bytes = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return an already-loaded model without loading it"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.model if entry is not None else None
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return bool(entry is not None and entry.model is not None)
+
+    def clear(self, key: Optional[str] = None):
+        """Forget one model (or all models); consumers must drop their own references"""
+        with self._lock:
+            entries = [self._entries.get(key)] if key else list(self._entries.values())
+            if key:
+                self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+        for entry in entries:
+            if entry is not None:
+                with entry.lock:
+                    self._unload(entry)
+
+    def status(self) -> Dict[str, Dict]:
+        """Per-model status: loaded flag, load time and memory footprint"""
+        with self._lock:
+            entries = list(self._entries.values())
+
+        status = {}
+        for entry in entries:
+            status[entry.key] = {
+                'loaded': entry.model is not None,
+                'load_time_s': round(entry.load_time, 3),
+                'rss_mb': round(entry.rss_delta / (1024 * 1024), 1) if entry.rss_delta is not None else None,
+                'param_mb': round(entry.param_bytes / (1024 * 1024), 1) if entry.param_bytes is not None else None,
+                'error': entry.error,
+            }
+        return status
+
+    def total_rss_mb(self) -> float:
+        """Sum of the RSS attributed to all loaded models"""
+        return round(sum(
+            info['rss_mb'] or 0.0 for info in self.status().values() if info['loaded']
+        ), 1)
+
+
+# Singleton instance
+_registry_instance = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the process-wide model registry"""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = ModelRegistry()
+    return _registry_instance
+
+
+def embedding_server_enabled() -> bool:
+    """Workers get their sentence encoder from the shared embedding server"""
+    try:
+        from config import Config
+        return bool(getattr(Config, 'USE_EMBEDDING_SERVER', False))
+    except Exception:
+        return False
+
+
+def sentence_encoder_available() -> bool:
+    """
+    Whether a sentence encoder can be provided, without importing torch:
+    either the embedding server is enabled or sentence-transformers is installed.
+    """
+    if embedding_server_enabled():
+        return True
+    import importlib.util
+    return importlib.util.find_spec('sentence_transformers') is not None
+
+
+def sentence_backend() -> str:
+    """Configured sentence encoder backend (Config.ENCODER_BACKEND)"""
+    try:
+        from config import Config
+        return getattr(Config, 'ENCODER_BACKEND', 'torch') or 'torch'
+    except Exception:
+        return 'torch'
+
+
+def sentence_model_identity(model_name: str = DEFAULT_SENTENCE_MODEL, backend: Optional[str] = None) -> str:
+    """Model + backend name used in registry and embedding-cache keys (FP32 torch keeps the plain name)"""
+    backend = backend or sentence_backend()
+    return model_name if backend == 'torch' else f"{model_name}@{backend}"
+
+
+def model_identity(model: Any) -> str:
+    """Identity of a loaded sentence encoder (set by the backend loader)"""
+    return getattr(model, 'cache_name', None) or DEFAULT_SENTENCE_MODEL
+
+
+def sentence_model_key(model_name: str = DEFAULT_SENTENCE_MODEL) -> str:
+    return f"sentence:{sentence_model_identity(model_name)}"
+
+
+def spacy_model_key(model_name: str = DEFAULT_SPACY_MODEL, exclude: Sequence[str] = ()) -> str:
+    if exclude:
+        return f"spacy:{model_name}-{'+'.join(sorted(exclude))}"
+    return f"spacy:{model_name}"
+
+
+def _model_device() -> str:
+    try:
+        from config import Config
+        if Config.ENABLE_GPU:
+            import torch
+            if torch.cuda.is_available():
+                return 'cuda'
+    except Exception:
+        pass
+    return 'cpu'
+
+
+def acquire_sentence_model(model_name: str = DEFAULT_SENTENCE_MODEL):
+    """Shared sentence encoder for the configured backend (None if sentence-transformers is unavailable)"""
+    def loader():
+        if embedding_server_enabled():
+            from utils.embedding_server import connect_remote_encoder
+            remote = connect_remote_encoder()
+            if remote is not None:
+                print(f"🔌 Using shared embedding server ({remote.cache_name})")
+                return remote
+            print("⚠️  Embedding server unavailable - loading the model in this worker")
+        from utils.encoder_backends import load_sentence_encoder
+        return load_sentence_encoder(model_name, sentence_backend(), _model_device())
+
+    return get_model_registry().acquire(sentence_model_key(model_name), loader)
+
+
+def acquire_spacy_model(model_name: str = DEFAULT_SPACY_MODEL, exclude: Sequence[str] = ()):
+    """
+    Shared spaCy pipeline, downloading the model package if it is missing
+
+    Args:
+        model_name: spaCy model package
+        exclude: Pipeline components not to load (a slimmed pipeline is a separate registry entry)
+    """
+    def loader():
+        import spacy
+        try:
+            return spacy.load(model_name, exclude=list(exclude))
+        except OSError:
+            print(f"📥 Downloading spaCy model ({model_name})...")
+            import subprocess
+            subprocess.run([sys.executable, "-m", "spacy", "download", model_name], check=True)
+            return spacy.load(model_name, exclude=list(exclude))
+
+    return get_model_registry().acquire(spacy_model_key(model_name, exclude), loader)
@@ -6,15 +6,12 @@ Uses caching, batch processing, and lightweight models for speed
 import numpy as np
 from typing import List, Optional, Dict, Tuple
 import re
-from functools import lru_cache
+import threading
 import time
 
-# Try to import ML libraries (graceful fallback if not installed)
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from utils.model_registry import acquire_sentence_model, sentence_encoder_available
+
+SENTENCE_TRANSFORMERS_AVAILABLE = sentence_encoder_available()
 
 try:
     from fuzzywuzzy import process, fuzz
@@ -22,6 +19,11 @@ try:
 except ImportError:
     FUZZYWUZZY_AVAILABLE = False
 
+from utils.embedding_cache import encode_cached
+from utils.heading_classifier import match_heading
+from utils.keyword_matcher import KeywordMatcher
+from utils.template_section_index import get_section_index
+
 
 class OptimizedSectionMapper:
     """
@@ -29,95 +31,96 @@ class OptimizedSectionMapper:
     - Model caching (load once, reuse forever)
     - Batch encoding (process multiple texts at once)
     - Lightweight model (all-MiniLM-L6-v2 - 80MB vs 400MB+)
-    - LRU caching for repeated queries
+    - Shared embedding cache (bounded LRU + on-disk store) for repeated queries
     - Early exit strategies
     """
     
     _instance = None  # Singleton pattern
     _model = None  # Shared model across all instances
     _model_loaded = False
-    _embeddings_cache = {}  # Cache embeddings
+    _init_lock = threading.RLock()  # Concurrent first requests load the model once
+    
+    # Standard section name mappings (for rule-based fallback)
+    section_synonyms = {
+        'EMPLOYMENT': [
+            'employment history', 'work experience', 'professional experience',
+            'work history', 'career history', 'experience', 'professional background',
+            'employment', 'career experience', 'relevant employment history',
+            'work', 'jobs', 'positions'
+        ],
+        'EDUCATION': [
+            'education', 'educational background', 'academic background',
+            'academic qualifications', 'qualifications', 'education background',
+            'certificates', 'certifications', 'credentials', 'academics',
+            'education/certificates', 'education / certificates', 'academic',
+            'schooling', 'degrees'
+        ],
+        'SKILLS': [
+            'skills', 'technical skills', 'core competencies', 'key skills',
+            'professional skills', 'areas of expertise', 'competencies',
+            'technical competencies', 'skill set', 'expertise', 'abilities',
+            'technologies', 'tools'
+        ],
+        'SUMMARY': [
+            'summary', 'professional summary', 'career summary', 'profile',
+            'professional profile', 'career objective', 'objective',
+            'executive summary', 'career overview', 'professional overview',
+            'about', 'about me', 'introduction'
+        ],
+        'PROJECTS': [
+            'projects', 'key projects', 'project experience', 'notable projects',
+            'project highlights', 'relevant projects', 'portfolio'
+        ],
+        'CERTIFICATIONS': [
+            'certifications', 'certificates', 'professional certifications',
+            'licenses', 'credentials', 'professional credentials', 'licensed'
+        ],
+        'AWARDS': [
+            'awards', 'honors', 'achievements', 'recognition',
+            'awards and honors', 'honors and awards', 'accomplishments'
+        ],
+        'LANGUAGES': [
+            'languages', 'language skills', 'language proficiency', 'spoken languages'
+        ]
+    }
+    
+    # Content keywords for classify_content_fast (category order breaks score ties)
+    FAST_CONTENT_KEYWORDS = KeywordMatcher({
+        'EMPLOYMENT': ['worked', 'managed', 'developed', 'led', 'responsible',
+                       'duties', 'role', 'company', 'position', 'employed'],
+        'EDUCATION': ['university', 'college', 'degree', 'graduated', 'gpa',
+                      'major', 'bachelor', 'master', 'phd', 'school'],
+        'SKILLS': ['proficient', 'skilled', 'expertise', 'technologies',
+                   'programming', 'python', 'java', 'javascript', 'tools'],
+        'SUMMARY': ['seeking', 'professional', 'experienced', 'motivated',
+                    'passionate', 'dedicated', 'years of experience'],
+    })
     
     def __new__(cls):
         """Singleton pattern - only one instance ever created"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
         """Initialize the mapper with cached ML model"""
-        if not self._model_loaded and SENTENCE_TRANSFORMERS_AVAILABLE:
-            self._load_model()
-        
-        # Standard section name mappings (for rule-based fallback)
-        self.section_synonyms = {
-            'EMPLOYMENT': [
-                'employment history', 'work experience', 'professional experience',
-                'work history', 'career history', 'experience', 'professional background',
-                'employment', 'career experience', 'relevant employment history',
-                'work', 'jobs', 'positions'
-            ],
-            'EDUCATION': [
-                'education', 'educational background', 'academic background',
-                'academic qualifications', 'qualifications', 'education background',
-                'certificates', 'certifications', 'credentials', 'academics',
-                'education/certificates', 'education / certificates', 'academic',
-                'schooling', 'degrees'
-            ],
-            'SKILLS': [
-                'skills', 'technical skills', 'core competencies', 'key skills',
-                'professional skills', 'areas of expertise', 'competencies',
-                'technical competencies', 'skill set', 'expertise', 'abilities',
-                'technologies', 'tools'
-            ],
-            'SUMMARY': [
-                'summary', 'professional summary', 'career summary', 'profile',
-                'professional profile', 'career objective', 'objective',
-                'executive summary', 'career overview', 'professional overview',
-                'about', 'about me', 'introduction'
-            ],
-            'PROJECTS': [
-                'projects', 'key projects', 'project experience', 'notable projects',
-                'project highlights', 'relevant projects', 'portfolio'
-            ],
-            'CERTIFICATIONS': [
-                'certifications', 'certificates', 'professional certifications',
-                'licenses', 'credentials', 'professional credentials', 'licensed'
-            ],
-            'AWARDS': [
-                'awards', 'honors', 'achievements', 'recognition',
-                'awards and honors', 'honors and awards', 'accomplishments'
-            ],
-            'LANGUAGES': [
-                'languages', 'language skills', 'language proficiency', 'spoken languages'
-            ]
-        }
-        
-        # Pre-compute synonym embeddings for faster matching
-        self._precompute_embeddings()
+        with OptimizedSectionMapper._init_lock:
+            if not self._model_loaded and SENTENCE_TRANSFORMERS_AVAILABLE:
+                self._load_model()
+            
+            # Pre-compute synonym embeddings for faster matching
+            self._precompute_embeddings()
     
     def _load_model(self):
         """Load ML model once and cache it"""
         if OptimizedSectionMapper._model is not None:
             return  # Already loaded
         
-        try:
-            print("⚡ Loading OPTIMIZED sentence transformer (all-MiniLM-L6-v2)...")
-            start_time = time.time()
-            
-            # Use lightweight model - only 80MB, very fast
-            OptimizedSectionMapper._model = SentenceTransformer(
-                'all-MiniLM-L6-v2',
-                device='cpu'  # Use CPU for compatibility (GPU if available)
-            )
-            
-            load_time = time.time() - start_time
-            print(f"✅ Model loaded in {load_time:.2f}s (cached for future use)")
-            OptimizedSectionMapper._model_loaded = True
-            
-        except Exception as e:
-            print(f"⚠️  Failed to load model: {e}")
-            OptimizedSectionMapper._model = None
+        # Lightweight model (80MB) shared with every other consumer via the registry
+        OptimizedSectionMapper._model = acquire_sentence_model()
+        OptimizedSectionMapper._model_loaded = OptimizedSectionMapper._model is not None
     
     def _precompute_embeddings(self):
         """Pre-compute embeddings for common section names"""
@@ -134,16 +137,8 @@ class OptimizedSectionMapper:
             print(f"⚡ Pre-computing embeddings for {len(all_synonyms)} section names...")
             start_time = time.time()
             
-            embeddings = OptimizedSectionMapper._model.encode(
-                all_synonyms,
-                batch_size=32,  # Process 32 at a time
-                show_progress_bar=False,
-                convert_to_numpy=True
-            )
-            
-            # Cache embeddings
-            for synonym, emb in zip(all_synonyms, embeddings):
-                OptimizedSectionMapper._embeddings_cache[synonym.lower()] = emb
+            # Misses are encoded in one batch and land in the shared embedding cache
+            encode_cached(OptimizedSectionMapper._model, [s.lower() for s in all_synonyms])
             
             compute_time = time.time() - start_time
             print(f"✅ Embeddings cached in {compute_time:.2f}s")
@@ -151,25 +146,13 @@ class OptimizedSectionMapper:
         except Exception as e:
             print(f"⚠️  Failed to pre-compute embeddings: {e}")
     
-    @lru_cache(maxsize=1000)
     def _get_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Get embedding with caching"""
+        """Get embedding through the shared embedding cache"""
         text_lower = text.lower().strip()
         
-        # Check cache first
-        if text_lower in OptimizedSectionMapper._embeddings_cache:
-            return OptimizedSectionMapper._embeddings_cache[text_lower]
-        
-        # Compute and cache
         if OptimizedSectionMapper._model is not None:
             try:
-                emb = OptimizedSectionMapper._model.encode(
-                    [text_lower],
-                    show_progress_bar=False,
-                    convert_to_numpy=True
-                )[0]
-                OptimizedSectionMapper._embeddings_cache[text_lower] = emb
-                return emb
+                return encode_cached(OptimizedSectionMapper._model, [text_lower])[0]
             except Exception as e:
                 print(f"⚠️  Embedding failed: {e}")
                 return None
@@ -220,7 +203,12 @@ class OptimizedSectionMapper:
                     if template_section.lower() in ts.lower():
                         return ts
         
-        # STEP 4: Semantic similarity (only if needed, uses cached embeddings)
+        # STEP 4: Fast heading classifier (char n-grams, no torch)
+        fast_match, _ = match_heading(candidate_heading, template_sections)
+        if fast_match:
+            return fast_match
+        
+        # STEP 5: Semantic similarity (only if needed, uses cached embeddings)
         if OptimizedSectionMapper._model is not None:
             try:
                 # Get cached embedding for candidate
@@ -228,21 +216,9 @@ class OptimizedSectionMapper:
                 if candidate_emb is None:
                     return None
                 
-                # Get cached embeddings for template sections
-                template_embs = []
-                for ts in template_clean:
-                    emb = self._get_embedding(ts)
-                    if emb is not None:
-                        template_embs.append(emb)
-                    else:
-                        return None
-                
-                template_embs = np.array(template_embs)
-                
-                # Compute similarities (fast matrix operation)
-                similarities = np.dot(candidate_emb, template_embs.T)
-                best_idx = np.argmax(similarities)
-                best_score = similarities[best_idx]
+                # Precomputed template matrix - one matrix-vector product
+                index = get_section_index(template_sections, OptimizedSectionMapper._model)
+                best_idx, best_score = index.best_match(candidate_emb)
                 
                 if best_score > confidence_threshold:
                     return template_sections[best_idx]
@@ -295,29 +271,8 @@ class OptimizedSectionMapper:
         if not text or len(text.strip()) < 10:
             return None
         
-        text_lower = text.lower()
-        
-        # Fast keyword-based classification
-        employment_keywords = ['worked', 'managed', 'developed', 'led', 'responsible', 
-                              'duties', 'role', 'company', 'position', 'employed']
-        education_keywords = ['university', 'college', 'degree', 'graduated', 'gpa', 
-                             'major', 'bachelor', 'master', 'phd', 'school']
-        skills_keywords = ['proficient', 'skilled', 'expertise', 'technologies', 
-                          'programming', 'python', 'java', 'javascript', 'tools']
-        summary_keywords = ['seeking', 'professional', 'experienced', 'motivated',
-                           'passionate', 'dedicated', 'years of experience']
-        
-        employment_score = sum(1 for kw in employment_keywords if kw in text_lower)
-        education_score = sum(1 for kw in education_keywords if kw in text_lower)
-        skills_score = sum(1 for kw in skills_keywords if kw in text_lower)
-        summary_score = sum(1 for kw in summary_keywords if kw in text_lower)
-        
-        scores = {
-            'EMPLOYMENT': employment_score,
-            'EDUCATION': education_score,
-            'SKILLS': skills_score,
-            'SUMMARY': summary_score
-        }
+        # Fast keyword-based classification (all four tables in one scan)
+        scores = self.FAST_CONTENT_KEYWORDS.scan(text.lower()).counts
         
         max_score = max(scores.values())
         if max_score >= 2:  # At least 2 keywords matched
@@ -328,13 +283,16 @@ class OptimizedSectionMapper:
 
 # Singleton instance for reuse across requests
 _mapper_instance = None
+_mapper_lock = threading.Lock()
 
 def get_optimized_mapper() -> OptimizedSectionMapper:
     """Get or create the singleton optimized mapper instance"""
     global _mapper_instance
     if _mapper_instance is None:
-        print("🚀 Initializing OPTIMIZED section mapper...")
-        _mapper_instance = OptimizedSectionMapper()
+        with _mapper_lock:
+            if _mapper_instance is None:
+                print("🚀 Initializing OPTIMIZED section mapper...")
+                _mapper_instance = OptimizedSectionMapper()
     return _mapper_instance
 
 
@@ -0,0 +1,272 @@
+"""
+Parse Cache - Content-addressed cache of parse_resume results
+Recruiters format the same candidate file against two or three client templates;
+parsing (text extraction plus heading matching) does not depend on the template,
+so a second format of an already-seen upload skips it entirely.
+
+Keys:
+- SHA-256 of the uploaded bytes
+- file type and original filename (the name falls back to the filename)
+- parser version stamp: PARSE_CACHE_VERSION, a hash of the parser sources, the
+  parse-affecting settings and the parser mode ('ml' / 'fast'), so a deploy, a
+  config change or finishing the model warm-up never serves an old result
+
+Entries live in SQLite (shared by all gunicorn workers, kept across restarts) as
+ParsedResume.to_bytes() blobs, evicted by TTL and then least recently used beyond
+Config.PARSE_CACHE_MAX_ENTRIES / PARSE_CACHE_MAX_MB.
+"""
+
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.parsed_resume import ParsedResume
+
+PARSE_CACHE_VERSION = 2  # Bump when parse output changes in a way the source hash misses
+
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Settings that change what parse_resume returns
+_PARSE_SETTINGS = ('USE_ML_PARSER', 'PDF_TEXT_ENGINE', 'USE_FAST_HEADING_CLASSIFIER',
+                   'HEADING_CLASSIFIER_THRESHOLD', 'USE_LIGHTWEIGHT_MODEL', 'ENCODER_BACKEND')
+
+
+def _source_fingerprint() -> str:
+    """Hash of every parser module and the heading classifier weights"""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(_UTILS_DIR, '*.py')) +
+                       glob.glob(os.path.join(_UTILS_DIR, '*.npz'))):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+_fingerprint = None
+
+
+def parser_version(mode: Optional[str] = None) -> str:
+    """
+    Version stamp of the parse results this process produces.
+
+    Args:
+        mode: Parser mode (default: the mode a ResumeParser created now would use)
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = _source_fingerprint()
+    if mode is None:
+        from utils.advanced_resume_parser import parser_mode
+        mode = parser_mode()
+    try:
+        from config import Config
+        settings = [f"{name}={getattr(Config, name, None)}" for name in _PARSE_SETTINGS]
+    except Exception:
+        settings = []
+    return f"v{PARSE_CACHE_VERSION}:{_fingerprint}:{mode}:" + \
+        hashlib.sha1('|'.join(settings).encode('utf-8')).hexdigest()[:8]
+
+
+def content_key(data: bytes, filename: str, file_type: str) -> str:
+    """Cache key for one upload (before the version stamp)"""
+    name_hash = hashlib.sha1(f"{file_type}\0{filename}".encode('utf-8')).hexdigest()[:16]
+    return f"{hashlib.sha256(data).hexdigest()}:{name_hash}"
+
+
+class ParseCache:
+    """SQLite store of parse results with TTL and size eviction, safe across processes"""
+
+    def __init__(self, path: str, max_entries: int = 2000, max_bytes: int = 200 * 1024 * 1024,
+                 ttl_seconds: float = 72 * 3600):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept after eviction
+            max_bytes: Compressed bytes kept after eviction
+            ttl_seconds: Entries older than this are dropped
+        """
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    key TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (key, version)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)')
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per call, like TemplateDB (safe from any request thread)"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:  # commit on success
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str, version: str) -> Optional[Dict]:
+        """Cached parse result (a fresh copy the caller may modify), or None"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT data, created FROM parse_cache WHERE key = ? AND version = ?',
+                                   (key, version)).fetchone()
+                if row is not None and now - row[1] <= self.ttl_seconds:
+                    conn.execute('UPDATE parse_cache SET last_used = ? WHERE key = ? AND version = ?',
+                                 (now, key, version))
+                    result = ParsedResume.from_bytes(row[0]).to_dict()
+                    self._count('_hits')
+                    return result
+        except Exception as e:
+            print(f"⚠️  Parse cache read failed: {e}")
+        self._count('_misses')
+        return None
+
+    def put(self, key: str, version: str, result: Dict) -> bool:
+        """Store a parse result; returns False if it could not be stored"""
+        try:
+            blob = ParsedResume.from_dict(result).to_bytes()
+        except (TypeError, ValueError) as e:
+            print(f"⚠️  Parse result not cacheable: {e}")
+            return False
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute('INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?)',
+                             (key, version, now, now, len(blob), blob))
+                self._evict(conn, now, (key, version))
+        except Exception as e:
+            print(f"⚠️  Parse cache write failed: {e}")
+            return False
+        self._count('_stores')
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep: tuple):
+        """Drop expired entries, then least recently used ones beyond the size limits
+        (never the entry just stored)"""
+        conn.execute('DELETE FROM parse_cache WHERE created < ?', (now - self.ttl_seconds,))
+        count, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache').fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        victims = []
+        for rowid, entry_size in conn.execute('SELECT rowid, size FROM parse_cache WHERE NOT (key = ? AND version = ?) '
+                                              'ORDER BY last_used', keep):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            victims.append((rowid,))
+            count -= 1
+            size -= entry_size
+        conn.executemany('DELETE FROM parse_cache WHERE rowid = ?', victims)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM parse_cache')
+        with self._lock:
+            self._hits = self._misses = self._stores = 0
+
+    def stats(self) -> Dict:
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache').fetchone()
+        except Exception:
+            entries, size = None, None
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': entries,
+                'size_bytes': size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'stores': self._stores,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Process-wide parse cache, or None when Config.USE_PARSE_CACHE is off"""
+    global _cache_instance
+    try:
+        from config import Config
+        if not getattr(Config, 'USE_PARSE_CACHE', True):
+            return None
+        settings = (Config.PARSE_CACHE_PATH, Config.PARSE_CACHE_MAX_ENTRIES,
+                    Config.PARSE_CACHE_MAX_MB * 1024 * 1024, Config.PARSE_CACHE_TTL_HOURS * 3600)
+    except Exception:
+        return None
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                try:
+                    _cache_instance = ParseCache(*settings)
+                except Exception as e:
+                    print(f"⚠️  Parse cache unavailable: {e}")
+                    return None
+    return _cache_instance
+
+
+def parse_cache_stats() -> Dict:
+    cache = get_parse_cache()
+    return cache.stats() if cache else {'enabled': False}
+
+
+def parse_upload(content: bytes, filename: str, file_type: str, file_path: str,
+                 parse: Callable[[str, str], Optional[Dict]]) -> Tuple[Optional[Dict], str]:
+    """
+    Parse an uploaded resume through the cache.
+
+    Args:
+        content: Uploaded bytes
+        filename: Sanitized original filename
+        file_type: 'pdf', 'docx', ...
+        file_path: Where to save the upload on a miss
+        parse: parse_resume(file_path, file_type)
+
+    Returns:
+        (parse result or None, cache status 'hit' | 'miss' | 'disabled');
+        on a hit nothing is written to disk
+    """
+    cache = get_parse_cache()
+    if cache is not None:
+        key, version = content_key(content, filename, file_type), parser_version()
+        cached = cache.get(key, version)
+        if cached is not None:
+            return cached, 'hit'
+
+    with open(file_path, 'wb') as f:
+        f.write(content)
+    result = parse(file_path, file_type)
+    if cache is None:
+        return result, 'disabled'
+    if result:
+        cache.put(key, version, result)
+    return result, 'miss'
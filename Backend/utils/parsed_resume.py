@@ -0,0 +1,422 @@
+"""
+Parsed Resume - Compact typed model of a parse_resume result
+The parser's dict carries the whole raw_text next to a 'sections' dict-of-lists that
+repeats most of the same lines, and every copy of it (parse cache, bulk parse
+workers, batches held in memory) pays for all of that again. ParsedResume keeps:
+
+- slotted dataclasses for the entries (ExperienceEntry, EducationEntry,
+  ProjectEntry, Skill) and tuples instead of lists
+- one string object per distinct line (section lines and entry details share them)
+- raw_text zlib-compressed, decompressed only when it is read
+- to_bytes() / from_bytes(): marshal, optionally zlib-compressed (uncompressed it
+  round-trips several times faster than JSON; compressed it is about as fast and smaller)
+
+Dict consumers (enhance_resume_data_with_intelligent_mapping, WordFormatter, ...)
+keep working through the adapter:
+
+    model = ParsedResume.from_dict(resume_data)
+    resume_data = model.to_dict()       # same keys, order and values as the parser's dict
+
+from_dict / to_dict round-trip any dict: a field whose value does not have the
+parser's shape (extra keys, hand-built entries) is carried over unchanged.
+
+Memory of a batch of parsed resumes, dicts vs models vs bytes:
+    python -m utils.parsed_resume measure [files or folders...] [--count 1000]
+"""
+
+import marshal
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_FORMAT = b'PR1'
+
+# Parser dict keys in the order ResumeParser.parse builds them
+SCALAR_FIELDS = ('name', 'email', 'phone', 'address', 'linkedin', 'dob', 'summary')
+LIST_FIELDS = ('certifications', 'awards', 'languages')
+RESUME_KEYS = SCALAR_FIELDS + ('experience', 'education', 'skills', 'projects') + LIST_FIELDS + ('sections', 'raw_text')
+
+
+@dataclass(slots=True)
+class ExperienceEntry:
+    company: str = ''
+    role: str = ''
+    title: str = ''
+    duration: str = ''
+    details: Tuple[str, ...] = ()
+
+    KEYS = ('company', 'role', 'title', 'duration', 'details')
+
+    def to_dict(self) -> Dict:
+        return {'company': self.company, 'role': self.role, 'title': self.title,
+                'duration': self.duration, 'details': list(self.details)}
+
+
+@dataclass(slots=True)
+class EducationEntry:
+    degree: str = ''
+    institution: str = ''
+    year: str = ''
+    details: Tuple[str, ...] = ()
+
+    KEYS = ('degree', 'institution', 'year', 'details')
+
+    def to_dict(self) -> Dict:
+        return {'degree': self.degree, 'institution': self.institution, 'year': self.year,
+                'details': list(self.details)}
+
+
+@dataclass(slots=True)
+class ProjectEntry:
+    name: str = ''
+    details: Tuple[str, ...] = ()
+
+    KEYS = ('name', 'details')
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'details': list(self.details)}
+
+
+@dataclass(slots=True)
+class Skill:
+    name: str
+
+
+class _Strings:
+    """One string object per distinct value within a resume"""
+
+    __slots__ = ('pool',)
+
+    def __init__(self):
+        self.pool = {}
+
+    def __call__(self, s: str) -> str:
+        return self.pool.setdefault(s, s)
+
+    def many(self, values) -> Tuple[str, ...]:
+        return tuple(self.pool.setdefault(v, v) for v in values)
+
+
+def _strings(value) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _entries(value, entry_type) -> Optional[list]:
+    """Typed entries if every dict has exactly the parser's keys (in order), else None"""
+    if not isinstance(value, list):
+        return None
+    for entry in value:
+        if not (isinstance(entry, dict) and tuple(entry) == entry_type.KEYS and _strings(entry['details'])
+                and all(isinstance(entry[k], str) for k in entry_type.KEYS[:-1])):
+            return None
+    return value
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    name: str = ''
+    email: str = ''
+    phone: str = ''
+    address: str = ''
+    linkedin: str = ''
+    dob: str = ''
+    summary: str = ''
+    experience: Tuple[ExperienceEntry, ...] = ()
+    education: Tuple[EducationEntry, ...] = ()
+    skills: Tuple[Skill, ...] = ()
+    projects: Tuple[ProjectEntry, ...] = ()
+    certifications: Tuple[str, ...] = ()
+    awards: Tuple[str, ...] = ()
+    languages: Tuple[str, ...] = ()
+    sections: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    # Keys of the source dict in order, and values kept as they were (see from_dict)
+    keys: Tuple[str, ...] = RESUME_KEYS
+    extra: Dict[str, Any] = field(default_factory=dict)
+    _raw_text_z: Optional[bytes] = None
+
+    @property
+    def raw_text(self) -> str:
+        """Full extracted text (decompressed on each access; hold on to it if used repeatedly)"""
+        return zlib.decompress(self._raw_text_z).decode('utf-8') if self._raw_text_z else ''
+
+    @raw_text.setter
+    def raw_text(self, text: str):
+        self._raw_text_z = zlib.compress(text.encode('utf-8'), 1) if text else None
+
+    @property
+    def skill_names(self) -> List[str]:
+        return [s.name for s in self.skills]
+
+    # ------------------------------------------------------------------
+    # Dict adapter
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParsedResume':
+        """
+        Model of a parse_resume dict.
+
+        Args:
+            data: Dict as returned by ResumeParser.parse (possibly with extra keys)
+
+        Returns:
+            ParsedResume whose to_dict() equals data
+        """
+        s = _Strings()
+        model = cls(keys=tuple(data))
+        extra = model.extra
+
+        for key in SCALAR_FIELDS:
+            if key in data:
+                if isinstance(data[key], str):
+                    setattr(model, key, s(data[key]))
+                else:
+                    extra[key] = data[key]
+
+        # Sections first: entry details and list fields reuse their line strings
+        if 'sections' in data:
+            sections = data['sections']
+            if isinstance(sections, dict) and all(isinstance(k, str) and _strings(v) for k, v in sections.items()):
+                model.sections = {s(k): s.many(v) for k, v in sections.items()}
+            else:
+                extra['sections'] = sections
+
+        if 'experience' in data:
+            entries = _entries(data['experience'], ExperienceEntry)
+            if entries is None:
+                extra['experience'] = data['experience']
+            else:
+                model.experience = tuple(ExperienceEntry(s(e['company']), s(e['role']), s(e['title']),
+                                                         s(e['duration']), s.many(e['details'])) for e in entries)
+        if 'education' in data:
+            entries = _entries(data['education'], EducationEntry)
+            if entries is None:
+                extra['education'] = data['education']
+            else:
+                model.education = tuple(EducationEntry(s(e['degree']), s(e['institution']), s(e['year']),
+                                                       s.many(e['details'])) for e in entries)
+        if 'projects' in data:
+            entries = _entries(data['projects'], ProjectEntry)
+            if entries is None:
+                extra['projects'] = data['projects']
+            else:
+                model.projects = tuple(ProjectEntry(s(e['name']), s.many(e['details'])) for e in entries)
+
+        if 'skills' in data:
+            if _strings(data['skills']):
+                model.skills = tuple(Skill(s(name)) for name in data['skills'])
+            else:
+                extra['skills'] = data['skills']
+        for key in LIST_FIELDS:
+            if key in data:
+                if _strings(data[key]):
+                    setattr(model, key, s.many(data[key]))
+                else:
+                    extra[key] = data[key]
+
+        if 'raw_text' in data:
+            if isinstance(data['raw_text'], str):
+                model.raw_text = data['raw_text']
+            else:
+                extra['raw_text'] = data['raw_text']
+
+        for key, value in data.items():
+            if key not in RESUME_KEYS:
+                extra[key] = value
+        return model
+
+    def _field_value(self, key: str):
+        if key in SCALAR_FIELDS:
+            return getattr(self, key)
+        if key in LIST_FIELDS:
+            return list(getattr(self, key))
+        if key in ('experience', 'education', 'projects'):
+            return [entry.to_dict() for entry in getattr(self, key)]
+        if key == 'skills':
+            return self.skill_names
+        if key == 'sections':
+            return {k: list(v) for k, v in self.sections.items()}
+        return self.raw_text
+
+    def to_dict(self, include_raw_text: bool = True) -> Dict:
+        """
+        Parser-compatible dict (fresh lists and dicts the caller may modify).
+
+        Args:
+            include_raw_text: Leave out 'raw_text' when the consumer does not read it
+        """
+        result = {}
+        for key in self.keys:
+            if key == 'raw_text' and not include_raw_text:
+                continue
+            if key in self.extra:
+                result[key] = self.extra[key]
+            elif key in RESUME_KEYS:
+                result[key] = self._field_value(key)
+        return result
+
+    # ------------------------------------------------------------------
+    # Binary serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """
+        Compact serialization for caches and cross-process transfer.
+
+        Layout: header, compression flag, length of the marshal payload, the payload,
+        then the already-compressed raw_text as is (it stays compressed after loading).
+
+        Args:
+            compress: zlib the payload (about half the size; skip it for short-lived
+                      transfers, where marshal alone is ~10x faster)
+
+        Raises:
+            ValueError: extra holds values marshal cannot store (only plain data is cacheable)
+        """
+        payload = marshal.dumps((
+            self.keys,
+            tuple(getattr(self, key) for key in SCALAR_FIELDS),
+            tuple((e.company, e.role, e.title, e.duration, e.details) for e in self.experience),
+            tuple((e.degree, e.institution, e.year, e.details) for e in self.education),
+            tuple(s.name for s in self.skills),
+            tuple((p.name, p.details) for p in self.projects),
+            tuple(getattr(self, key) for key in LIST_FIELDS),
+            self.sections,
+            self.extra,
+        ))
+        if compress:
+            payload = zlib.compress(payload, 1)
+        return b''.join((_FORMAT, bytes((compress,)), len(payload).to_bytes(4, 'little'), payload,
+                         self._raw_text_z or b''))
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> 'ParsedResume':
+        if not blob.startswith(_FORMAT):
+            raise ValueError("not a ParsedResume blob (or written by an incompatible version)")
+        compressed, start = blob[len(_FORMAT)], len(_FORMAT) + 5
+        end = start + int.from_bytes(blob[start - 4:start], 'little')
+        payload = blob[start:end]
+        keys, scalars, experience, education, skills, projects, lists, sections, extra = \
+            marshal.loads(zlib.decompress(payload) if compressed else payload)
+        model = cls(keys=keys, extra=extra, sections=sections, _raw_text_z=blob[end:] or None,
+                    experience=tuple(ExperienceEntry(*e) for e in experience),
+                    education=tuple(EducationEntry(*e) for e in education),
+                    skills=tuple(Skill(name) for name in skills),
+                    projects=tuple(ProjectEntry(*p) for p in projects))
+        for key, value in zip(SCALAR_FIELDS, scalars):
+            setattr(model, key, value)
+        for key, value in zip(LIST_FIELDS, lists):
+            setattr(model, key, value)
+        return model
+
+
+# ---------------------------------------------------------------------------
+# Batch memory measurement
+# ---------------------------------------------------------------------------
+
+def _traced_size(build) -> Tuple[Any, int]:
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return built, size
+
+
+def measure_batch(resumes: List[Dict], count: int = 1000) -> Dict:
+    """
+    Memory of `count` parsed resumes held as dicts, as ParsedResume and as bytes.
+
+    Args:
+        resumes: Parse results to cycle through (each copy is independent, as in a batch)
+        count: Batch size
+
+    Returns:
+        Bytes per representation and serialization timings
+    """
+    import json
+    import time
+
+    blobs = [json.dumps(r) for r in resumes]
+    dicts, dict_bytes = _traced_size(lambda: [json.loads(blobs[i % len(blobs)]) for i in range(count)])
+    models, model_bytes = _traced_size(lambda: [ParsedResume.from_dict(d) for d in dicts])
+    packed, packed_bytes = _traced_size(lambda: [m.to_bytes() for m in models])
+
+    start = time.perf_counter()
+    for d in dicts:
+        json.loads(json.dumps(d))
+    json_ms = (time.perf_counter() - start) * 1000
+    binary_ms = {}
+    for compress in (True, False):
+        start = time.perf_counter()
+        for m in models:
+            ParsedResume.from_bytes(m.to_bytes(compress))
+        binary_ms[compress] = (time.perf_counter() - start) * 1000
+    assert all(m.to_dict() == d for m, d in zip(models[:len(resumes)], dicts))
+
+    return {
+        'resumes': count,
+        'dict_mb': round(dict_bytes / 1e6, 2),
+        'model_mb': round(model_bytes / 1e6, 2),
+        'bytes_mb': round(packed_bytes / 1e6, 2),
+        'model_ratio': round(model_bytes / dict_bytes, 3) if dict_bytes else 0.0,
+        'json_round_trip_ms': round(json_ms, 1),
+        'binary_round_trip_ms': round(binary_ms[True], 1),
+        'uncompressed_round_trip_ms': round(binary_ms[False], 1),
+    }
+
+
+def main():
+    import argparse
+    import contextlib
+    import io
+    import os
+
+    from utils.bulk_parse import iter_resume_files, _file_type
+
+    parser = argparse.ArgumentParser(description="Measure the memory of a batch of parsed resumes")
+    parser.add_argument('command', choices=['measure'])
+    parser.add_argument('paths', nargs='*', help="Resume files or folders (default: sample folder)")
+    parser.add_argument('--count', type=int, default=1000)
+    args = parser.parse_args()
+
+    from config import Config
+    from utils.advanced_resume_parser import parse_resume
+    Config.USE_ML_PARSER = False
+
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files = []
+    for path in args.paths or [os.path.join(base, 'Resume formatter samples')]:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in iter_resume_files(path))
+        else:
+            files.append(path)
+
+    resumes = []
+    for path in files:
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                result = parse_resume(path, _file_type(path))
+            except Exception:
+                result = None
+        if result and result.get('raw_text'):
+            resumes.append(result)
+    if not resumes:
+        print("No parseable resumes found")
+        return
+
+    row = measure_batch(resumes, args.count)
+    print(f"{row['resumes']} resumes (cycling {len(resumes)} parsed files):")
+    print(f"  dicts:         {row['dict_mb']:>8} MB")
+    print(f"  ParsedResume:  {row['model_mb']:>8} MB  ({row['model_ratio']:.0%} of dicts)")
+    print(f"  to_bytes():    {row['bytes_mb']:>8} MB")
+    print(f"  round trip:    JSON {row['json_round_trip_ms']} ms, binary {row['binary_round_trip_ms']} ms, "
+          f"uncompressed {row['uncompressed_round_trip_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
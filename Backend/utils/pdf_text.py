@@ -0,0 +1,370 @@
+"""
+PDF Text - Pluggable PDF text extraction engines
+pdfplumber's page.extract_text() is the slowest single step of parsing a multi-page
+PDF. The engine is chosen with Config.PDF_TEXT_ENGINE:
+
+- 'pdfplumber'      The original extractor (default)
+- 'pymupdf'         PyMuPDF words grouped into lines the way pdfplumber groups them
+                    (same line order and single-space joins, several times faster)
+- 'pymupdf-layout'  PyMuPDF with column detection: two-column regions (sidebars,
+                    side-by-side SKILLS / EDUCATION) are read column by column
+                    instead of interleaving their lines
+
+Documents with at least Config.PDF_PARALLEL_MIN_PAGES pages are split into page
+ranges extracted in a process pool. If PyMuPDF is not installed every engine falls
+back to pdfplumber.
+
+PyMuPDF stays opt-in until its parity has been checked on real resumes, not just
+generated PDFs. Parity and throughput against pdfplumber on sample PDFs:
+    python -m utils.pdf_text compare [files or folders...]
+    python -m utils.pdf_text benchmark [files or folders...]
+"""
+
+import atexit
+import difflib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import pymupdf as fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+PDF_ENGINES = ('pdfplumber', 'pymupdf', 'pymupdf-layout')
+
+# pdfplumber's default tolerance for putting words on the same line (points)
+LINE_TOLERANCE = 3
+# Horizontal gap between words that can separate two columns (points)
+COLUMN_GAP = 18
+# Lines whose gaps line up before a region is treated as two columns
+MIN_COLUMN_LINES = 3
+# Narrowest right column, as a fraction of the page width
+MIN_COLUMN_WIDTH = 0.15
+
+
+def _settings():
+    try:
+        from config import Config
+        return (getattr(Config, 'PDF_TEXT_ENGINE', 'pdfplumber'),
+                getattr(Config, 'PDF_PARALLEL_MIN_PAGES', 12),
+                getattr(Config, 'PDF_EXTRACT_WORKERS', 4))
+    except Exception:
+        return 'pdfplumber', 12, 4
+
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """Configured engine, or pdfplumber when PyMuPDF is not installed"""
+    engine = (engine or _settings()[0]).lower()
+    if engine not in PDF_ENGINES:
+        print(f"⚠️  Unknown PDF engine '{engine}', using pdfplumber")
+        return 'pdfplumber'
+    if engine.startswith('pymupdf') and not PYMUPDF_AVAILABLE:
+        return 'pdfplumber'
+    return engine
+
+
+# ---------------------------------------------------------------------------
+# Line building from PyMuPDF words
+# ---------------------------------------------------------------------------
+
+def _group_lines(words) -> List[list]:
+    """Cluster words into lines by their top edge (pdfplumber's cluster_objects on 'top')"""
+    lines = []
+    last_top = None
+    for word in sorted(words, key=lambda w: (w[1], w[0])):
+        if last_top is None or word[1] > last_top + LINE_TOLERANCE:
+            lines.append([])
+        lines[-1].append(word)
+        last_top = word[1]
+    return [sorted(line, key=lambda w: w[0]) for line in lines]
+
+
+def _line_text(words) -> str:
+    return ' '.join(w[4] for w in words)
+
+
+def _find_gutter(lines: List[list], width: float) -> Optional[float]:
+    """
+    x position of the gap between two columns, or None for a single-column page.
+
+    Every wide gap between neighbouring words is a candidate; the gutter is the x
+    covered by the most gaps, if enough lines agree on it and the text right of it
+    is typically column-wide (right-aligned dates and locations line up too, but are
+    narrow).
+    """
+    gaps = []
+    for line in lines:
+        for left, right in zip(line, line[1:]):
+            if right[0] - left[2] >= COLUMN_GAP:
+                gaps.append((left[2], right[0], line[-1][2]))
+    if len(gaps) < MIN_COLUMN_LINES:
+        return None
+
+    candidates = []
+    for start, end, _ in gaps:
+        x = (start + end) / 2
+        if 0.2 * width <= x <= 0.8 * width:
+            widths = sorted(line_end - e for s, e, line_end in gaps if s <= x <= e)
+            candidates.append((len(widths), widths[len(widths) // 2], x))
+    for count, right_width, x in sorted(candidates, reverse=True):
+        if count < MIN_COLUMN_LINES:
+            break
+        if right_width >= MIN_COLUMN_WIDTH * width:
+            return x
+    return None
+
+
+def _column_lines(lines: List[list], gutter: float) -> List[str]:
+    """
+    Read two-column regions column by column.
+
+    A line with a word crossing the gutter is full width and ends the current
+    region. A region with at least MIN_COLUMN_LINES lines that have text on both
+    sides is emitted left halves first, then right halves; shorter regions (a
+    contact line with a location on the right) keep their line order.
+    """
+    output = []
+    region = []
+
+    def flush():
+        halves = [([w for w in line if w[2] <= gutter], [w for w in line if w[0] >= gutter]) for line in region]
+        if sum(1 for left, right in halves if left and right) >= MIN_COLUMN_LINES:
+            output.extend(_line_text(left) for left, _ in halves if left)
+            output.extend(_line_text(right) for _, right in halves if right)
+        else:
+            output.extend(_line_text(line) for line in region)
+        region.clear()
+
+    for line in lines:
+        if any(w[0] < gutter < w[2] for w in line):
+            flush()
+            output.append(_line_text(line))
+        else:
+            region.append(line)
+    flush()
+    return output
+
+
+def _pymupdf_page_text(page, layout: bool = False) -> str:
+    words = page.get_text('words')
+    lines = _group_lines(words)
+    if layout:
+        gutter = _find_gutter(lines, page.rect.width)
+        if gutter is not None:
+            return '\n'.join(_column_lines(lines, gutter))
+    return '\n'.join(_line_text(line) for line in lines)
+
+
+# ---------------------------------------------------------------------------
+# Page ranges (run in-process or in a pool worker)
+# ---------------------------------------------------------------------------
+
+def _extract_range(path: str, engine: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) with one engine"""
+    if engine == 'pdfplumber':
+        with pdfplumber.open(path) as pdf:
+            return [page.extract_text() or '' for page in pdf.pages[start:stop]]
+    layout = engine == 'pymupdf-layout'
+    with fitz.open(path) as doc:
+        return [_pymupdf_page_text(doc[i], layout) for i in range(start, min(stop, doc.page_count))]
+
+
+def _page_count(path: str, engine: str) -> int:
+    if engine == 'pdfplumber':
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+# Singleton process pool
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    """forkserver where available (forking a worker with live model threads can deadlock,
+    see gunicorn.conf.py); the server preloads this module so pool workers start warm.
+    spawn elsewhere (Windows)"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def get_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all requests of this worker (created on first long PDF)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+                atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+
+def _shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def extract_pdf_pages(path: str, engine: Optional[str] = None,
+                      workers: Optional[int] = None) -> List[str]:
+    """
+    Text of every page of a PDF.
+
+    Args:
+        path: PDF file
+        engine: One of PDF_ENGINES (default Config.PDF_TEXT_ENGINE)
+        workers: Pool size for long documents (default Config.PDF_EXTRACT_WORKERS, 1 = serial)
+
+    Returns:
+        One string per page, lines separated by newlines
+    """
+    engine = resolve_engine(engine)
+    _, min_pages, default_workers = _settings()
+    workers = default_workers if workers is None else workers
+
+    pages = _page_count(path, engine)
+    if workers <= 1 or pages < max(2, min_pages):
+        return _extract_range(path, engine, 0, pages)
+
+    chunk = -(-pages // workers)
+    ranges = [(start, min(start + chunk, pages)) for start in range(0, pages, chunk)]
+    try:
+        pool = get_extraction_pool(workers)
+        futures = [pool.submit(_extract_range, path, engine, start, stop) for start, stop in ranges]
+        return [text for future in futures for text in future.result()]
+    except Exception as e:
+        # Broken pool (worker killed, no fork support): reset it and extract serially
+        print(f"⚠️  Parallel PDF extraction failed ({e}), extracting serially")
+        _shutdown_pool()
+        return _extract_range(path, engine, 0, pages)
+
+
+def extract_pdf_text(path: str, engine: Optional[str] = None, workers: Optional[int] = None) -> str:
+    """Text of a whole PDF, pages joined by newlines (what ResumeParser parses)"""
+    return '\n'.join(extract_pdf_pages(path, engine, workers))
+
+
+# ---------------------------------------------------------------------------
+# Parity harness and benchmark
+# ---------------------------------------------------------------------------
+
+def _pdf_files(paths: Sequence[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith('.pdf'))
+        elif path.lower().endswith('.pdf'):
+            files.append(path)
+    return files
+
+
+def _default_paths() -> List[str]:
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        from config import Config
+        resumes = Config.RESUME_FOLDER
+    except Exception:
+        resumes = os.path.join(base, 'static', 'uploads', 'resumes')
+    return [os.path.join(base, 'Resume formatter samples'), resumes]
+
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def compare(path: str, engine: str = 'pymupdf', baseline: str = 'pdfplumber') -> Dict:
+    """
+    Diff the non-empty lines (what the parser sees) of one PDF between two engines.
+
+    Returns:
+        Dict with line counts, the similarity ratio and the differing lines
+    """
+    expected = _lines(extract_pdf_text(path, baseline, workers=1))
+    actual = _lines(extract_pdf_text(path, engine, workers=1))
+    matcher = difflib.SequenceMatcher(None, expected, actual, autojunk=False)
+    diff = [line for line in difflib.unified_diff(expected, actual, baseline, engine, n=0, lineterm='')
+            if not line.startswith(('---', '+++', '@@'))]
+    return {
+        'file': path,
+        'baseline_lines': len(expected),
+        'engine_lines': len(actual),
+        'ratio': round(matcher.ratio(), 4),
+        'identical': expected == actual,
+        'diff': diff,
+    }
+
+
+def benchmark(path: str, engine: str, repeat: int = 3, workers: int = 1) -> Dict:
+    """Pages per second for one engine on one PDF (best of `repeat` runs)"""
+    pages = _page_count(path, resolve_engine(engine))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_pdf_pages(path, engine, workers)
+        best = min(best, time.perf_counter() - start)
+    return {'file': path, 'engine': engine, 'workers': workers, 'pages': pages,
+            'seconds': round(best, 4), 'pages_per_sec': round(pages / best, 1) if best else float('inf')}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare and benchmark PDF text extraction engines")
+    parser.add_argument('command', choices=['compare', 'benchmark'])
+    parser.add_argument('paths', nargs='*', help="PDF files or folders (default: sample and upload folders)")
+    parser.add_argument('--engine', default='pymupdf', choices=PDF_ENGINES)
+    parser.add_argument('--workers', type=int, default=1, help="Pool size for the benchmark")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--show', type=int, default=10, help="Differing lines to print per file")
+    args = parser.parse_args()
+
+    files = _pdf_files(args.paths or _default_paths())
+    if not files:
+        print("No PDF files found")
+        return
+
+    if args.command == 'compare':
+        identical = 0
+        for path in files:
+            result = compare(path, args.engine)
+            identical += result['identical']
+            mark = '✓' if result['identical'] else '≠'
+            print(f"{mark} {os.path.basename(path)}: {result['baseline_lines']} → {result['engine_lines']} lines, "
+                  f"ratio {result['ratio']}")
+            for line in result['diff'][:args.show]:
+                print(f"    {line}")
+        print(f"\n{identical}/{len(files)} files extract identical lines with {args.engine}")
+        return
+
+    print(f"{'file':<40} {'engine':<16} {'pages':>5} {'pages/sec':>10}")
+    for path in files:
+        for engine in ('pdfplumber', args.engine):
+            row = benchmark(path, engine, args.repeat, args.workers)
+            print(f"{os.path.basename(path)[:40]:<40} {engine:<16} {row['pages']:>5} {row['pages_per_sec']:>10}")
+
+
+if __name__ == "__main__":
+    main()
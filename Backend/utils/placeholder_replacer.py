@@ -0,0 +1,162 @@
+"""
+Placeholder Replacer - One pass over a paragraph for the whole replacement map
+WordFormatter's replacement map has a few dozen literal keys ([NAME],
+<Candidate Name>, <EMAIL>, ...). Trying them one by one meant, for every
+paragraph, one lower-cased copy of the text per key and, for every hit, a
+pattern per run plus a fallback that collapsed all runs into the first one
+when a placeholder was split across runs (losing their formatting).
+
+PlaceholderReplacer compiles the keys once into a case-insensitive trie
+pattern (regex_bank.literal_trie) and scans the concatenated run texts of a
+paragraph once, so the work per paragraph grows with its length, not with
+the number of keys:
+
+- a match inside one run is replaced in that run
+- a match spanning runs is written into the run it starts in (keeping that
+  run's formatting); only the matched characters are cut from the following
+  runs, whose remaining text and formatting stay as they were
+- highlighting is removed from the runs that received a value, as before
+- runs nested in w:hyperlink, w:ins, w:smartTag, ... are scanned too
+  (paragraph.runs only lists the direct children); runs of paragraphs inside
+  text boxes belong to those paragraphs and are left to them
+- hits counts replacements per placeholder key
+
+Per-key loop vs one scan as the map grows:
+    python -m utils.placeholder_replacer
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, List
+
+from docx.text.run import Run
+
+from utils import regex_bank
+
+
+def paragraph_runs(paragraph) -> List[Run]:
+    """All runs of a paragraph in document order, including those inside run containers"""
+    p = paragraph._p
+    return [Run(r, paragraph) for r in p.xpath('.//w:r')
+            if r.xpath('ancestor::w:p[1]')[0] is p]
+
+
+class PlaceholderReplacer:
+    """Compiled replacement map"""
+
+    def __init__(self, replacements: Dict[str, str]):
+        """
+        Args:
+            replacements: Placeholder -> value. Keys differing only in case are
+                one placeholder (the first key's value is used).
+        """
+        self.values = {}
+        for key, value in replacements.items():
+            if key:
+                self.values.setdefault(key.lower(), (key, value))
+        self.pattern = regex_bank.literal_trie(tuple(self.values)) if self.values else None
+        self.hits = Counter()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def replace_in_paragraph(self, paragraph) -> Dict[str, int]:
+        """
+        Replace every placeholder in a paragraph's runs.
+
+        Args:
+            paragraph: python-docx Paragraph
+
+        Returns:
+            Placeholder key -> replacements made in this paragraph (empty if none)
+        """
+        if self.pattern is None:
+            return {}
+        runs = paragraph_runs(paragraph)
+        texts = [run.text for run in runs]
+        matches = list(self.pattern.finditer(''.join(texts)))
+        if not matches:
+            return {}
+
+        ends, pos = [], 0
+        for text in texts:
+            pos += len(text)
+            ends.append(pos)
+
+        hits = Counter()
+        edits = {}  # run index -> [(start, end, inserted text)] in run coordinates
+        receivers = []
+        for match in matches:
+            start, end = match.span()
+            key, value = self.values[match.group(0).lower()]
+            hits[key] += 1
+            first = bisect_right(ends, start)  # run holding the first matched character
+            last = bisect_left(ends, end)      # run holding the last one
+            for idx in range(first, last + 1):
+                run_start = ends[idx] - len(texts[idx])
+                edits.setdefault(idx, []).append((max(start, run_start) - run_start,
+                                                  min(end, ends[idx]) - run_start,
+                                                  value if idx == first else ''))
+            receivers.append(first)
+
+        for idx, spans in edits.items():
+            text, pieces, cursor = texts[idx], [], 0
+            for lo, hi, inserted in spans:
+                pieces.append(text[cursor:lo])
+                pieces.append(inserted)
+                cursor = hi
+            pieces.append(text[cursor:])
+            runs[idx].text = ''.join(pieces)
+        for idx in set(receivers):
+            try:
+                runs[idx].font.highlight_color = None
+            except Exception:
+                pass
+
+        self.hits.update(hits)
+        return dict(hits)
+
+
+def benchmark_key_scaling(key_counts=(10, 50, 200, 800), paragraphs: int = 200) -> list:
+    """
+    Time replacing over a document body as the replacement map grows:
+    one lower-cased containment test per key per paragraph (before) vs one scan.
+
+    Args:
+        key_counts: Replacement map sizes to measure
+        paragraphs: Body paragraphs (each ~80 characters, every tenth with a placeholder)
+
+    Returns:
+        One row per size: {'keys', 'per_key_ms', 'single_pass_ms'}
+    """
+    import time
+    from docx import Document
+
+    rows = []
+    for count in key_counts:
+        replacements = {f'<Placeholder {i}>': f'value {i}' for i in range(count)}
+        rows.append({'keys': count})
+        for label in ('per_key_ms', 'single_pass_ms'):
+            doc = Document()
+            for i in range(paragraphs):
+                slot = f' <placeholder {i % count}>' if i % 10 == 0 else ''
+                doc.add_paragraph(f'Line {i} of the template with some instruction text in it{slot}')
+            replacer = PlaceholderReplacer(replacements)  # compiled once per map, not per paragraph
+            start = time.perf_counter()
+            if label == 'per_key_ms':
+                for paragraph in doc.paragraphs:
+                    for key, value in replacements.items():
+                        if key.lower() in paragraph.text.lower():
+                            for run in paragraph.runs:
+                                run.text = regex_bank.literal_pattern(key).sub(value, run.text)
+            else:
+                for paragraph in doc.paragraphs:
+                    replacer.replace_in_paragraph(paragraph)
+            rows[-1][label] = round((time.perf_counter() - start) * 1000, 2)
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'keys':>6} {'per key ms':>11} {'one scan ms':>12}")
+    for row in benchmark_key_scaling():
+        print(f"{row['keys']:>6} {row['per_key_ms']:>11} {row['single_pass_ms']:>12}")
@@ -0,0 +1,325 @@
+"""
+Regex Bank - Precompiled patterns shared by the parser, formatter and validator
+Hot loops used to hand raw pattern strings to re.search/re.sub (or re.compile per
+run), so every call went through re's global pattern cache. That cache is small
+and shared by the whole process: under concurrent requests patterns were evicted
+and recompiled over and over. Everything here is compiled once at import.
+
+- Date / year / connector patterns for duration cleanup
+- Bullet, location and institution patterns for education and experience lines
+- One merged alternation per keyword list (section headings) and per rewrite table
+- Bounded caches for patterns built from runtime strings (keywords, placeholders)
+
+Microbenchmarks (on-the-fly vs precompiled, per call site):
+    python -m utils.regex_bank
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Pattern, Tuple
+
+_MONTHS = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
+
+# ---------------------- Dates ----------------------
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+YEAR_ANYWHERE = re.compile(r'(?:19|20)\d{2}')
+TRAILING_YEAR = re.compile(r'((?:19|20)\d{2})$')
+RECENT_YEAR = re.compile(r'(20\d{2})')
+DASHES = re.compile(r'[–—]')
+RANGE_CONNECTOR = re.compile(r'\s*(to|–|—|-)\s*', re.IGNORECASE)
+WORD_CONNECTOR = re.compile(r'\b(to|–|—|-)\b', re.IGNORECASE)
+CURRENT_OR_PRESENT = re.compile(r'\b(current|present)\b', re.IGNORECASE)
+# "Nov 2011", "September, 2025" → (month, year)
+MONTH_YEAR = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s*(?:,\s*)?((?:19|20)\d{2})\b',
+                        re.IGNORECASE)
+MONTH_YEAR_SPACED = re.compile(rf'\b{_MONTHS}[a-zA-Z]*\s+(?:19|20)\d{{2}}\b', re.IGNORECASE)
+# Any of "2020 ... 2023", "Jan 2020", "01/2020"
+DATE_RANGE = re.compile(
+    r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b'
+    rf'|\b{_MONTHS}\w*\s+\d{{4}}'
+    r'|\d{1,2}/\d{4}',
+    re.IGNORECASE
+)
+GRADUATION_WORDS = re.compile(r'\b(class of|graduation|graduated|passed out)\b', re.IGNORECASE)
+
+# ---------------------- Lines and fragments ----------------------
+WHITESPACE_RUN = re.compile(r'\s+')
+LEADING_BULLET = re.compile(r'^[\s•\-–—*●]+')
+SKILL_LEADING_BULLET = re.compile(r'^[-•*\s]+')
+SKILL_TRAILING_BULLET = re.compile(r'\s*[-•*\s]+$')
+DASH_SPLIT = re.compile(r'\s+[-–]\s+')
+AT_SPLIT = re.compile(r'\s+at\s+', re.IGNORECASE)
+FROM_SPLIT = re.compile(r'\s+from\s+', re.IGNORECASE)
+TRAILING_LOCATION = re.compile(r',[^,]*\b(?:city|state|india|usa|uk)\b.*$', re.IGNORECASE)
+INSTITUTION_TAIL = re.compile(r'(university|college|school|institute|academy)\b.*', re.IGNORECASE)
+NAME_LINE = re.compile(r'^[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z\-\.]+){1,3}$')
+FILENAME_SEPARATORS = re.compile(r'[\W_]+')
+NUMBERED_ITEM = re.compile(r'^\d+[\).\-\s]')
+# Template guidance text ("Please list the candidate's ...", "Add or delete rows ...")
+INSTRUCTION_TEXT = re.compile(
+    r'\bplease\b'
+    r'|(use this table|add or delete rows|respond with the years|list the candidate|required/desired)',
+    re.IGNORECASE
+)
+
+# Date fragments that leak into company / role fields ("City – 08/ 06/")
+COMPANY_DATE_FRAGMENT = re.compile(r'\s*[–-]\s*\d{2}/\s*\d{2}/?\s*.*?$')
+ROLE_DATE_FRAGMENT = re.compile(r'\s*[–-]\s*\d{2}/\s*\d{2}/?/\s*.*?$')
+CITY_DATE_FRAGMENT = re.compile(r'\s*City\s*[–-]\s*\d{2}/.*?$')
+
+ACTION_VERB = re.compile(
+    r'\b(designed|managed|implemented|maintained|developed|led|created|configured|administered|'
+    r'tested|deployed|collaborated|supported|provided|responsible|oversaw|ownership|monitor|'
+    r'monitored|engineered)\b',
+    re.IGNORECASE
+)
+
+# ---------------------- Contact details ----------------------
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_STRICT = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# Tried in order: the first pattern that matches anywhere wins
+PHONE_PATTERNS = (
+    re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US formats
+    re.compile(r'(?:\+?91[-.\s]?)?\d{10}'),  # India
+    re.compile(r'\+?\d{1,3}[-.\s]?\d{2,5}[-.\s]?\d{5,10}'),  # Intl generic
+)
+# Contact-line detection (no '.' separators): any hit means "has a phone"
+PHONE_LINE = re.compile(
+    r'(?:\+?\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}'
+    r'|(?:\+?91[-\s]?)?\d{10}'
+    r'|\+?\d{1,3}[-\s]?\d{2,5}[-\s]?\d{5,10}'
+)
+PHONE_DIGITS = re.compile(r'\d{3}[-.]?\d{3}[-.]?\d{4}')
+CONTACT_HINT = re.compile(r'@|http|linkedin|\d{3}[-.\s]\d{3}', re.IGNORECASE)
+LINKEDIN = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+', re.IGNORECASE)
+DOB_PATTERNS = (
+    re.compile(r'(?:DOB|Date of Birth|Birth Date)[\s:]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})', re.IGNORECASE),
+    re.compile(r'(?:DOB|Date of Birth|Birth Date)[\s:]+(\w+ \d{1,2},? \d{4})', re.IGNORECASE),
+)
+
+# ---------------------- Bullet rewrites ----------------------
+# One pass replaces the old chain of six re.sub calls; alternatives keep the old order,
+# so at any position the parenthesised KPI form still wins over the bare phrase
+DETAIL_REWRITE = re.compile(
+    r'\b(?P<as_well_as>as well as)\b'
+    r'|\b(?P<in_order_to>in order to)\b'
+    r'|\bkey performance indicators\s*\((?P<kpi_expansion>[^\)]+)\)'
+    r'|\b(?P<kpis>key performance indicators)\b'
+    r'|\b(?P<quickbooks>quickbooks)\b'
+    r'|\b(?P<worldship>ums?\s*worldship)\b',
+    re.IGNORECASE
+)
+_DETAIL_REPLACEMENTS = {
+    'as_well_as': 'and',
+    'in_order_to': 'to',
+    'kpis': 'KPIs',
+    'quickbooks': 'QuickBooks',
+    'worldship': 'UPS WorldShip',
+}
+ACRONYM = re.compile(r'\b(kpis?|lms|qa)\b', re.IGNORECASE)
+_ACRONYMS = {'kpi': 'KPI', 'kpis': 'KPIs', 'lms': 'LMS', 'qa': 'QA'}
+
+
+def _detail_replacement(match) -> str:
+    if match.lastgroup == 'kpi_expansion':
+        # The old chain rewrote the expansion text with the remaining rules too
+        return rewrite_detail(match.group('kpi_expansion'))
+    return _DETAIL_REPLACEMENTS[match.lastgroup]
+
+
+def rewrite_detail(text: str) -> str:
+    """Normalize common bullet wording ('as well as' → 'and', 'QuickBooks', ...) in one pass"""
+    return DETAIL_REWRITE.sub(_detail_replacement, text)
+
+
+def normalize_acronyms(text: str) -> str:
+    """Normalize common acronym casing (KPI, KPIs, LMS, QA)"""
+    return ACRONYM.sub(lambda m: _ACRONYMS.get(m.group(0).lower(), m.group(0)), text)
+
+
+# ---------------------- Template placeholders ----------------------
+# Candidate name slot in a template: <Candidate Name>, <Name>, <Full Name>, <YOUR NAME>
+NAME_PLACEHOLDERS = (
+    re.compile(r'<\s*[Cc]andidate[^>]*[Nn]ame[^>]*>'),
+    re.compile(r'<\s*[Nn]ame\s*>'),
+    re.compile(r'<\s*[Ff]ull\s*[Nn]ame\s*>'),
+    re.compile(r'<\s*YOUR\s*NAME\s*>'),
+)
+# Any <...> / [...] slot the replacement map may fill
+PLACEHOLDER_TOKEN = re.compile(r'<[^<>\n]{1,80}>|\[[^\[\]\n]{1,80}\]')
+
+
+# ---------------------- Runtime-built patterns ----------------------
+@lru_cache(maxsize=1024)
+def keyword_pattern(keyword: str) -> Pattern:
+    """Whole-word pattern for one keyword"""
+    return re.compile(rf'\b{re.escape(keyword)}\b')
+
+
+@lru_cache(maxsize=256)
+def keyword_alternation(keywords: Tuple[str, ...]) -> Pattern:
+    """
+    One whole-word pattern matching any of the keywords.
+
+    Args:
+        keywords: Keywords as a tuple (hashable, so the compiled pattern is cached)
+    """
+    # Longest first so the engine settles on the specific phrase before its prefix
+    ordered = sorted(set(keywords), key=lambda k: (-len(k), k))
+    return re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in ordered) + r')\b')
+
+
+@lru_cache(maxsize=1024)
+def literal_pattern(text: str) -> Pattern:
+    """Case-insensitive pattern for a literal placeholder / search term"""
+    return re.compile(re.escape(text), re.IGNORECASE)
+
+
+def _trie_regex(node: Dict) -> str:
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A term ends here: the optional group is greedy, so the longer term still wins
+    return f'(?:{body})?' if '' in node else body
+
+
+@lru_cache(maxsize=64)
+def literal_trie(terms: Tuple[str, ...]) -> Pattern:
+    """
+    Case-insensitive pattern matching any of the literal terms, as a trie.
+
+    Branches share prefixes, so at each text position the engine follows one
+    path of at most the longest term's length instead of trying every term.
+    Matches are leftmost-longest ('<Name>' and '<Name> Surname' both present:
+    the longer one wins where it fits).
+
+    Args:
+        terms: Non-empty literals (as a tuple, so the compiled pattern is cached)
+    """
+    root: Dict = {}
+    for term in terms:
+        node = root
+        for ch in term.lower():
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return re.compile(_trie_regex(root), re.IGNORECASE)
+
+
+def compile_all(patterns: Iterable[str], flags: int = 0) -> Tuple[Pattern, ...]:
+    """Compile a list of pattern strings once (order preserved)"""
+    return tuple(re.compile(p, flags) for p in patterns)
+
+
+# ---------------------- Microbenchmarks ----------------------
+def _time(func: Callable[[], object], repeat: int) -> float:
+    import time
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def benchmark(repeat: int = 2000, thrash: bool = False) -> List[Dict]:
+    """
+    Per call site: pattern strings through the re module (before) vs the bank (after).
+
+    Args:
+        repeat: Calls per measurement
+        thrash: Purge re's pattern cache before every "before" call, as happens when
+            concurrent requests push more patterns through it than it holds
+
+    Returns:
+        One dict per call site with microseconds per call before and after
+    """
+    from utils.advanced_resume_parser import ResumeParser
+    from utils.section_content_validator import SectionContentValidator
+
+    purge = re.purge if thrash else (lambda: None)
+    parser = ResumeParser.__new__(ResumeParser)
+    validator = SectionContentValidator()
+
+    keywords = ['experience', 'work experience', 'employment history', 'professional experience',
+                'work history', 'career history', 'relevant experience', 'employment']
+    line = 'senior software engineer at acme corporation'
+    lines = [line, 'professional experience', 'work history and education', 'led migration to aws',
+             'technical skills', 'experience managing employment records']
+    duration = 'September 2019 to Present'
+    bullet = 'Tracked key performance indicators (KPIs) as well as QuickBooks reports in order to ship'
+    content = 'Senior Engineer, Acme Corp Inc. 2018 - 2023. Managed a team of engineers.'
+
+    def keywords_before():
+        purge()
+        return [any(k in l and re.search(rf'\b{re.escape(k)}\b', l) for k in keywords) for l in lines]
+
+    def duration_before():
+        purge()
+        t = re.sub(r'[–—]', '-', duration)
+        t = re.sub(r'\s*(to|–|—|-)\s*', '-', t, flags=re.IGNORECASE)
+        re.search(r'\b(current|present)\b', t, re.IGNORECASE)
+        return list(re.finditer(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s*(?:,\s*)?'
+                                r'((?:19|20)\d{2})\b', t, flags=re.IGNORECASE))
+
+    def duration_after():
+        t = RANGE_CONNECTOR.sub('-', DASHES.sub('-', duration))
+        CURRENT_OR_PRESENT.search(t)
+        return list(MONTH_YEAR.finditer(t))
+
+    def rewrite_before():
+        purge()
+        t = bullet
+        for pattern, repl_to in [(r'\bas well as\b', 'and'), (r'\bin order to\b', 'to'),
+                                 (r'\bkey performance indicators\s*\(([^\)]+)\)', r'\1'),
+                                 (r'\bkey performance indicators\b', 'KPIs'),
+                                 (r'\bquickbooks\b', 'QuickBooks'), (r'\bums?\s*worldship\b', 'UPS WorldShip')]:
+            t = re.sub(pattern, repl_to, t, flags=re.IGNORECASE)
+        return t
+
+    def replace_before():
+        purge()
+        return re.compile(re.escape('[CANDIDATE NAME]'), re.IGNORECASE).sub('Jane Smith', 'Name: [Candidate Name]')
+
+    def validate_before():
+        purge()
+        patterns = validator.SECTION_INDICATORS['EMPLOYMENT']['patterns']
+        return sum(1 for p in patterns if re.search(p, content.lower(), re.IGNORECASE))
+
+    def date_range_before():
+        purge()
+        patterns = [r'\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b', rf'\b{_MONTHS}\w*\s+\d{{4}}', r'\d{1,2}/\d{4}']
+        return any(re.search(p, line, re.IGNORECASE) for p in patterns)
+
+    employment = validator._patterns('EMPLOYMENT')
+    merged = keyword_alternation(tuple(keywords))  # built once per section group in _segment_sections
+    cases = [
+        ('section keyword match', keywords_before, lambda: [bool(merged.search(l)) for l in lines]),
+        ('duration cleanup', duration_before, duration_after),
+        ('bullet rewrite', rewrite_before, lambda: rewrite_detail(bullet)),
+        ('placeholder replace', replace_before,
+         lambda: literal_pattern('[CANDIDATE NAME]').sub('Jane Smith', 'Name: [Candidate Name]')),
+        ('content validation', validate_before,
+         lambda: sum(1 for p in employment if p.search(content.lower()))),
+        ('date range check', date_range_before, lambda: parser._contains_date_range(line)),
+    ]
+    return [{'call_site': name,
+             'before_us': round(_time(before, repeat), 2),
+             'after_us': round(_time(after, repeat), 2)}
+            for name, before, after in cases]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Microbenchmark precompiled regex call sites")
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--thrash', action='store_true', help="Purge re's cache before every 'before' call")
+    args = parser.parse_args()
+
+    print(f"{'call site':<24} {'before µs':>10} {'after µs':>9} {'speedup':>8}")
+    for row in benchmark(args.repeat, args.thrash):
+        speedup = row['before_us'] / row['after_us'] if row['after_us'] else float('inf')
+        print(f"{row['call_site']:<24} {row['before_us']:>10} {row['after_us']:>9} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import pdfplumber
 import re
-from docx import Document
 from collections import defaultdict
 
+from utils.candidate_document import load_candidate_document
+
 def parse_resume(file_path, file_type):
     """Extract content from resume"""
     try:
@@ -24,8 +25,7 @@ def parse_pdf_resume(file_path):
 
 def parse_word_resume(file_path):
     try:
-        doc = Document(file_path)
-        text = '\n'.join([p.text for p in doc.paragraphs])
+        text = load_candidate_document(file_path).text
         return extract_resume_content(text)
     except:
         return None
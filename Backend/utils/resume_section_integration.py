@@ -4,10 +4,12 @@ Integrates enhanced section classifier with ordered renderer
 Provides a simple API for the main application
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from docx import Document
 import os
 
+from utils.candidate_document import CandidateDocument, load_candidate_document
+
 try:
     from utils.enhanced_section_classifier import get_section_classifier
     CLASSIFIER_AVAILABLE = True
@@ -41,22 +43,22 @@ class ResumeFormatter:
         if CLASSIFIER_AVAILABLE:
             self.classifier = get_section_classifier(confidence_threshold)
     
-    def extract_sections_from_docx(self, docx_path: str) -> List[Dict]:
+    def extract_sections_from_docx(self, docx_path: Union[str, CandidateDocument]) -> List[Dict]:
         """
-        Extract sections from a DOCX resume
+        Extract sections from a DOCX resume (body paragraphs, tables and text boxes
+        in document order)
         
         Args:
-            docx_path: Path to candidate's resume DOCX
+            docx_path: Path to candidate's resume DOCX, or the upload's shared CandidateDocument
             
         Returns:
             List of dicts with 'heading', 'content', 'position'
         """
-        doc = Document(docx_path)
         sections = []
         current_section = None
         position_index = 0
         
-        for para in doc.paragraphs:
+        for para in load_candidate_document(docx_path).body_paragraphs:
             text = para.text.strip()
             if not text:
                 continue
@@ -111,25 +113,15 @@ class ResumeFormatter:
         Detect if paragraph is a heading
         
         Args:
-            para: Paragraph object
+            para: DocxParagraph from the candidate document
             
         Returns:
             True if heading, False otherwise
         """
         text = para.text.strip()
         
-        # Check style
-        if para.style.name.startswith('Heading'):
-            return True
-        
-        # Check formatting
-        if para.runs:
-            first_run = para.runs[0]
-            if first_run.bold and len(text.split()) <= 5:
-                return True
-        
-        # Check ALL CAPS short phrases
-        if text.isupper() and len(text.split()) <= 4:
+        # Heading style, bold first run or ALL CAPS short phrase
+        if para.looks_like_heading:
             return True
         
         # Check common section keywords
@@ -175,13 +167,13 @@ class ResumeFormatter:
         
         return sections
     
-    def format_resume(self, candidate_docx: str, template_docx: str, 
+    def format_resume(self, candidate_docx: Union[str, CandidateDocument], template_docx: str, 
                      output_path: str, contact_info: Optional[Dict] = None) -> Dict:
         """
         Main method: Format a resume using intelligent section mapping
         
         Args:
-            candidate_docx: Path to candidate's resume DOCX
+            candidate_docx: Path to candidate's resume DOCX (or its CandidateDocument)
             template_docx: Path to template DOCX
             output_path: Path to save formatted resume
             contact_info: Optional dict with name, email, phone, address
@@ -6,6 +6,9 @@ Ensures employment points stay in employment, certifications in certifications,
 import re
 from typing import Dict, List, Tuple, Optional
 
+from utils.keyword_matcher import KeywordMatcher
+from utils.regex_bank import compile_all
+
 
 class SectionContentValidator:
     """
@@ -94,6 +97,14 @@ class SectionContentValidator:
         }
     }
     
+    # Indicator patterns compiled once per section type
+    _COMPILED_PATTERNS = {section: compile_all(indicators.get('patterns', []), re.IGNORECASE)
+                          for section, indicators in SECTION_INDICATORS.items()}
+    # Strong and anti keywords of a section type scored in one scan
+    _KEYWORD_MATCHERS = {section: KeywordMatcher({'strong': indicators.get('strong_keywords', []),
+                                                  'anti': indicators.get('anti_keywords', [])})
+                         for section, indicators in SECTION_INDICATORS.items()}
+    
     def __init__(self, confidence_threshold: float = 0.6):
         """
         Initialize validator
@@ -103,6 +114,10 @@ class SectionContentValidator:
         """
         self.confidence_threshold = confidence_threshold
     
+    def _patterns(self, section_type: str) -> Tuple:
+        """Precompiled indicator patterns for a section type"""
+        return self._COMPILED_PATTERNS.get(section_type.upper(), ())
+    
     def validate_content(self, content: str, section_type: str) -> Tuple[bool, float, str]:
         """
         Validate if content belongs to the specified section type
@@ -128,28 +143,19 @@ class SectionContentValidator:
         
         strong_keywords = indicators.get('strong_keywords', [])
         patterns = indicators.get('patterns', [])
-        anti_keywords = indicators.get('anti_keywords', [])
         
         # Calculate scores
-        keyword_score = 0
-        pattern_score = 0
-        anti_score = 0
-        
-        # Check strong keywords
-        for keyword in strong_keywords:
-            if keyword in content_lower:
-                keyword_score += 1
+        # Check strong keywords and anti-keywords (indicators of WRONG section)
+        hits = self._KEYWORD_MATCHERS[section_upper].scan(content_lower)
+        keyword_score = hits.count('strong')
+        anti_score = hits.count('anti')
         
         # Check patterns
-        for pattern in patterns:
-            if re.search(pattern, content_lower, re.IGNORECASE):
+        pattern_score = 0
+        for pattern in self._patterns(section_upper):
+            if pattern.search(content_lower):
                 pattern_score += 1
         
-        # Check anti-keywords (indicators of WRONG section)
-        for anti_kw in anti_keywords:
-            if anti_kw in content_lower:
-                anti_score += 1
-        
         # Calculate confidence
         positive_score = keyword_score + (pattern_score * 2)  # Patterns are stronger
         negative_score = anti_score * 3  # Anti-keywords are strong negative signals
@@ -5,6 +5,8 @@ Combines rule-based and ML-based approaches for accurate section detection
 import re
 from typing import Dict, List, Tuple
 
+from utils.keyword_matcher import KeywordMatcher
+
 class SectionDetector:
     """
     Multi-layer section detection system
@@ -85,22 +87,28 @@ class SectionDetector:
             'certificate', 'course completion'
         ]
     }
+    _CONTENT_MATCHER = KeywordMatcher(CONTENT_KEYWORDS)  # All section types in one scan
     
     def __init__(self, use_ml=False):
         self.use_ml = use_ml
         # Use singleton cached model for performance
         self.ml_model = None
+        if use_ml:
+            from utils.model_cache import models_loading
+            if models_loading():
+                # Background warm-up still running - rule-based detection until it finishes
+                self.use_ml = use_ml = False
         if use_ml:
             try:
-                from sentence_transformers import SentenceTransformer
-                # Check if model is already cached
+                from utils.model_registry import acquire_sentence_model, sentence_encoder_available
+                if not sentence_encoder_available():
+                    raise ImportError("sentence-transformers not installed")
+                # Shared model from the process-wide registry
                 if not hasattr(SectionDetector, '_cached_model'):
-                    print("  ⚡ Loading OPTIMIZED ML section detector (all-MiniLM-L6-v2)...")
-                    import time
-                    start = time.time()
-                    SectionDetector._cached_model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
-                    print(f"  ✅ ML section detector loaded in {time.time()-start:.2f}s (cached)")
+                    SectionDetector._cached_model = acquire_sentence_model()
                 self.ml_model = SectionDetector._cached_model
+                if self.ml_model is None:
+                    raise RuntimeError("shared sentence model failed to load")
             except Exception as e:
                 print(f"  ⚠️  ML model not available: {e}, using rule-based only")
                 self.use_ml = False
@@ -193,13 +201,8 @@ class SectionDetector:
         Layer 2: Guess section type based on content keywords
         Used when section header is ambiguous or missing
         """
-        text_lower = text.lower()
-        
         # Score each section type
-        scores = {}
-        for section, keywords in self.CONTENT_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            scores[section] = score
+        scores = self._CONTENT_MATCHER.scan(text.lower()).counts
         
         # Return section with highest score
         if scores:
@@ -219,8 +222,9 @@ class SectionDetector:
         
         try:
             # Create embeddings for text and section names
-            text_embedding = self.ml_model.encode(text)
-            section_embeddings = self.ml_model.encode(candidate_sections)
+            from utils.embedding_cache import encode_cached
+            text_embedding = encode_cached(self.ml_model, [text])[0]
+            section_embeddings = encode_cached(self.ml_model, candidate_sections)
             
             # Calculate similarity scores
             from sklearn.metrics.pairwise import cosine_similarity
@@ -321,5 +325,6 @@ class SectionDetector:
         skill_keywords = ['python', 'java', 'sql', 'aws', 'proficient', 'experienced']
         return any(kw in text_lower for kw in skill_keywords)
 
-# Global instance
-section_detector = SectionDetector(use_ml=True)
+# Global instance (rule-based: importing this module must not load the sentence model;
+# ML detectors are created per formatter once the warm-up has loaded it)
+section_detector = SectionDetector(use_ml=False)
@@ -3,16 +3,15 @@ Smart Section Mapper - Intelligent section name matching using ML
 Uses Sentence Transformers + FuzzyWuzzy for fast and accurate section mapping
 """
 
-import numpy as np
+import importlib.util
 from typing import List, Optional, Dict, Tuple
 import re
 
-# Try to import ML libraries (graceful fallback if not installed)
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from utils.model_registry import acquire_sentence_model, sentence_encoder_available
+from utils.entity_signals import acquire_entity_pipeline, get_entity_detector
+
+SENTENCE_TRANSFORMERS_AVAILABLE = sentence_encoder_available()
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     print("⚠️  sentence-transformers not installed. Run: pip install sentence-transformers")
 
 try:
@@ -22,94 +21,78 @@ except ImportError:
     FUZZYWUZZY_AVAILABLE = False
     print("⚠️  fuzzywuzzy not installed. Run: pip install fuzzywuzzy python-Levenshtein")
 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
+SPACY_AVAILABLE = importlib.util.find_spec('spacy') is not None
+if not SPACY_AVAILABLE:
     print("⚠️  spacy not installed. Run: pip install spacy && python -m spacy download en_core_web_sm")
 
+from utils.embedding_cache import encode_cached
+from utils.heading_classifier import match_heading
+from utils.template_section_index import get_section_index
+
 
 class SmartSectionMapper:
     """
     Intelligent section name mapper using hybrid approach:
     1. Fuzzy matching (fast, catches typos and minor variations)
-    2. Semantic similarity (accurate, handles synonyms)
-    3. Rule-based fallback (reliable baseline)
+    2. Fast heading classifier (char n-grams, no torch)
+    3. Semantic similarity (accurate, handles synonyms)
+    4. Rule-based fallback (reliable baseline)
     """
     
+    # Standard section name mappings (for rule-based fallback)
+    section_synonyms = {
+        'EMPLOYMENT': [
+            'employment history', 'work experience', 'professional experience',
+            'work history', 'career history', 'experience', 'professional background',
+            'employment', 'career experience', 'relevant employment history'
+        ],
+        'EDUCATION': [
+            'education', 'educational background', 'academic background',
+            'academic qualifications', 'qualifications', 'education background',
+            'certificates', 'certifications', 'credentials', 'academics',
+            'education/certificates', 'education / certificates'
+        ],
+        'SKILLS': [
+            'skills', 'technical skills', 'core competencies', 'key skills',
+            'professional skills', 'areas of expertise', 'competencies',
+            'technical competencies', 'skill set', 'expertise'
+        ],
+        'SUMMARY': [
+            'summary', 'professional summary', 'career summary', 'profile',
+            'professional profile', 'career objective', 'objective',
+            'executive summary', 'career overview', 'professional overview'
+        ],
+        'PROJECTS': [
+            'projects', 'key projects', 'project experience', 'notable projects',
+            'project highlights', 'relevant projects'
+        ],
+        'CERTIFICATIONS': [
+            'certifications', 'certificates', 'professional certifications',
+            'licenses', 'credentials', 'professional credentials'
+        ],
+        'AWARDS': [
+            'awards', 'honors', 'achievements', 'recognition',
+            'awards and honors', 'honors and awards'
+        ],
+        'LANGUAGES': [
+            'languages', 'language skills', 'language proficiency'
+        ]
+    }
+    
     def __init__(self):
         """Initialize the mapper with ML models"""
         self.model = None
         self.nlp = None
+        self.entities = None
         
-        # Load sentence transformer model (lightweight, fast)
+        # Shared models from the process-wide registry (loaded once per process)
         if SENTENCE_TRANSFORMERS_AVAILABLE:
-            try:
-                print("📦 Loading sentence transformer model (all-MiniLM-L6-v2)...")
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
-                print("✅ Sentence transformer loaded successfully")
-            except Exception as e:
-                print(f"⚠️  Failed to load sentence transformer: {e}")
-                self.model = None
+            self.model = acquire_sentence_model()
         
-        # Load spaCy model for content classification
         if SPACY_AVAILABLE:
-            try:
-                print("📦 Loading spaCy model (en_core_web_sm)...")
-                self.nlp = spacy.load("en_core_web_sm")
-                print("✅ spaCy loaded successfully")
-            except Exception as e:
-                print(f"⚠️  Failed to load spaCy: {e}")
-                try:
-                    print("📥 Downloading spaCy model...")
-                    import subprocess
-                    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=True)
-                    self.nlp = spacy.load("en_core_web_sm")
-                    print("✅ spaCy model downloaded and loaded")
-                except Exception as e2:
-                    print(f"⚠️  Failed to download spaCy model: {e2}")
-                    self.nlp = None
-        
-        # Standard section name mappings (for rule-based fallback)
-        self.section_synonyms = {
-            'EMPLOYMENT': [
-                'employment history', 'work experience', 'professional experience',
-                'work history', 'career history', 'experience', 'professional background',
-                'employment', 'career experience', 'relevant employment history'
-            ],
-            'EDUCATION': [
-                'education', 'educational background', 'academic background',
-                'academic qualifications', 'qualifications', 'education background',
-                'certificates', 'certifications', 'credentials', 'academics',
-                'education/certificates', 'education / certificates'
-            ],
-            'SKILLS': [
-                'skills', 'technical skills', 'core competencies', 'key skills',
-                'professional skills', 'areas of expertise', 'competencies',
-                'technical competencies', 'skill set', 'expertise'
-            ],
-            'SUMMARY': [
-                'summary', 'professional summary', 'career summary', 'profile',
-                'professional profile', 'career objective', 'objective',
-                'executive summary', 'career overview', 'professional overview'
-            ],
-            'PROJECTS': [
-                'projects', 'key projects', 'project experience', 'notable projects',
-                'project highlights', 'relevant projects'
-            ],
-            'CERTIFICATIONS': [
-                'certifications', 'certificates', 'professional certifications',
-                'licenses', 'credentials', 'professional credentials'
-            ],
-            'AWARDS': [
-                'awards', 'honors', 'achievements', 'recognition',
-                'awards and honors', 'honors and awards'
-            ],
-            'LANGUAGES': [
-                'languages', 'language skills', 'language proficiency'
-            ]
-        }
+            self.nlp = acquire_entity_pipeline()
+            if self.nlp is not None:
+                self.entities = get_entity_detector(self.nlp)
     
     def map_section(self, candidate_heading: str, template_sections: List[str], 
                    confidence_threshold: float = 0.6) -> Optional[str]:
@@ -148,15 +131,18 @@ class SmartSectionMapper:
                 print(f"  🔍 Fuzzy match: '{candidate_heading}' → '{template_sections[idx]}' (score: {fuzzy_result[1]})")
                 return template_sections[idx]
         
-        # Step 3: Semantic similarity (accurate, handles synonyms)
+        # Step 3: Fast heading classifier (no torch); transformer only below its threshold
+        fast_match, fast_confidence = match_heading(candidate_heading, template_sections)
+        if fast_match:
+            print(f"  ⚡ Fast classifier match: '{candidate_heading}' → '{fast_match}' (confidence: {fast_confidence:.2f})")
+            return fast_match
+        
+        # Step 4: Semantic similarity (accurate, handles synonyms)
         if self.model is not None:
             try:
-                candidate_emb = self.model.encode([candidate_clean])
-                template_embs = self.model.encode(template_clean)
-                
-                similarities = np.dot(candidate_emb, template_embs.T)[0]
-                best_idx = np.argmax(similarities)
-                best_score = similarities[best_idx]
+                index = get_section_index(template_sections, self.model)
+                candidate_emb = encode_cached(self.model, [candidate_clean])
+                best_idx, best_score = index.best_match(candidate_emb[0])
                 
                 if best_score > confidence_threshold:
                     print(f"  🧠 Semantic match: '{candidate_heading}' → '{template_sections[best_idx]}' (score: {best_score:.2f})")
@@ -164,7 +150,7 @@ class SmartSectionMapper:
             except Exception as e:
                 print(f"  ⚠️  Semantic matching failed: {e}")
         
-        # Step 4: Rule-based synonym matching (fallback)
+        # Step 5: Rule-based synonym matching (fallback)
         for template_section, synonyms in self.section_synonyms.items():
             if candidate_clean in synonyms:
                 # Find the matching template section
@@ -199,16 +185,12 @@ class SmartSectionMapper:
             if any(word in text_lower for word in ['seeking', 'professional', 'experienced', 'motivated']):
                 return 'SUMMARY'
         
-        # Rule 2: Entity-based classification using spaCy
-        if self.nlp is not None:
+        # Rule 2: Entity-based classification using spaCy (batched and cached)
+        if self.entities is not None:
             try:
-                doc = self.nlp(text[:500])  # Limit to first 500 chars for speed
+                signals = self.entities.signals(text)  # First 500 chars
                 
-                has_dates = any(ent.label_ == "DATE" for ent in doc.ents)
-                has_orgs = any(ent.label_ == "ORG" for ent in doc.ents)
-                has_gpe = any(ent.label_ == "GPE" for ent in doc.ents)  # Geo-political entities
-                
-                if has_dates and has_orgs:
+                if signals.has_dates and signals.has_orgs:
                     return 'EMPLOYMENT'
                 elif any(word in text_lower for word in ['university', 'degree', 'graduated', 'gpa', 'bachelor', 'master']):
                     return 'EDUCATION'
@@ -252,6 +234,10 @@ class SmartSectionMapper:
         """
         mapped = {}
         
+        # Unheaded content is always classified by content: run its NER in one batch
+        if self.entities is not None:
+            self.entities.prefetch([content for heading, content in candidate_sections.items() if not heading])
+        
         for heading, content in candidate_sections.items():
             if heading:
                 # Has heading - use intelligent mapping
@@ -0,0 +1,302 @@
+"""
+Template Cache - Parsed templates kept in memory and cloned per job
+Every WordFormatter run used to start with Document(template_path): unzip the
+package and parse every XML part (document, styles, numbering, theme, settings,
+fonts, ...) only to edit the main document and its headers / footers.
+
+The cache parses a template once and hands each job a clone:
+
+- only the parts the formatter edits (main document part plus the header and
+  footer parts it references) are deep-copied; styles, numbering, theme,
+  settings, media and the other parts are shared read-only between the clones
+  and the cached template (deepcopy with those parts pre-seeded in the memo)
+- a small pool of ready clones per template is refilled by a background thread,
+  so a batch takes a clone off the pool instead of copying on the request path
+- entries are keyed by (path, mtime, size), so a re-uploaded template is parsed
+  again, and evicted least-recently-used once their parsed size passes
+  Config.TEMPLATE_CACHE_MB
+
+A clone saves to the same package Document(template_path) would. Code that
+changes a shared part (assigning new styles, numbering definitions, images)
+must not run on a clone; WordFormatter only edits document text and layout.
+
+Per-resume load cost, Document() vs cache:
+    python -m utils.template_cache bench <template.docx> [--count 50]
+"""
+
+import copy
+import os
+import queue
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+
+class _Entry:
+    """One parsed template and its pool of ready clones"""
+
+    def __init__(self, path: str):
+        self.master = Document(path)
+        main = self.master.part
+        mutable = {main}
+        for rel in main.rels.values():
+            if not rel.is_external and rel.reltype in (RT.HEADER, RT.FOOTER):
+                mutable.add(rel.target_part)
+        self.shared = [part for part in main.package.iter_parts() if part not in mutable]
+        self.pool = deque()
+
+        # Parsed size ~ uncompressed package; every pooled clone adds the mutable parts again
+        with zipfile.ZipFile(path) as z:
+            sizes = {'/' + info.filename: info.file_size for info in z.infolist()}
+        self.package_bytes = sum(sizes.values())
+        self.clone_bytes = sum(sizes.get(str(part.partname), 0) for part in mutable)
+
+    def clone(self):
+        return copy.deepcopy(self.master, {id(part): part for part in self.shared})
+
+    def size(self, pool_size: int) -> int:
+        return self.package_bytes + pool_size * self.clone_bytes
+
+
+class TemplateCache:
+    """LRU cache of parsed templates handing out per-job clones"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, pool_size: int = 2):
+        """
+        Args:
+            max_bytes: Parsed-size budget (uncompressed package bytes, pooled clones included)
+            pool_size: Ready clones kept per template (0 disables background cloning)
+        """
+        self.max_bytes = max_bytes
+        self.pool_size = max(0, pool_size)
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._refills = queue.Queue()
+        self._worker = None
+        self.stats = {'loads': 0, 'clones': 0, 'pool_hits': 0, 'evictions': 0, 'uncached': 0}
+
+    @staticmethod
+    def _key(path: str) -> tuple:
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+    def _entry(self, key: tuple) -> Optional[_Entry]:
+        """Cached entry for key, parsing the template on a miss (None if it does not fit)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = _Entry(key[0])
+        with self._lock:
+            self.stats['loads'] += 1
+            if entry.size(self.pool_size) > self.max_bytes:
+                self.stats['uncached'] += 1
+                return None
+            # Drop older versions of the same file, then least recently used templates
+            for old in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[old]
+            self._entries[key] = self._entries.get(key, entry)
+            self._entries.move_to_end(key)
+            while self._total() > self.max_bytes and len(self._entries) > 1:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+            return self._entries.get(key)
+
+    def _total(self) -> int:
+        return sum(entry.size(self.pool_size) for entry in self._entries.values())
+
+    def checkout(self, template_path: str):
+        """
+        A Document of the template that the caller owns and may edit.
+
+        Args:
+            template_path: .docx template
+
+        Returns:
+            python-docx Document (a pooled or fresh clone, or a plain
+            Document(template_path) if the template is too large to cache)
+        """
+        key = self._key(template_path)
+        entry = self._entry(key)
+        if entry is None:
+            return Document(template_path)
+
+        with self._lock:
+            doc = entry.pool.popleft() if entry.pool else None
+            if doc is not None:
+                self.stats['pool_hits'] += 1
+        if doc is None:
+            doc = entry.clone()
+            with self._lock:
+                self.stats['clones'] += 1
+        self._schedule_refill(key)
+        return doc
+
+    def prefetch(self, template_path: str):
+        """Parse a template and fill its clone pool in the background (e.g. before a batch)"""
+        try:
+            key = self._key(template_path)
+        except OSError:
+            return
+        if self._entry(key) is not None:
+            self._schedule_refill(key)
+
+    def evict(self, template_path: str):
+        """Forget every cached version of a template (deleted or replaced)"""
+        path = os.path.abspath(template_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
+
+    # ------------------------------------------------------------------
+    # Background pool refill
+    # ------------------------------------------------------------------
+
+    def _schedule_refill(self, key: tuple):
+        if not self.pool_size:
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._refill_loop, name='template-clone-pool', daemon=True)
+                self._worker.start()
+        self._refills.put(key)
+
+    def _refill_loop(self):
+        while True:
+            key = self._refills.get()
+            try:
+                while True:
+                    with self._lock:
+                        entry = self._entries.get(key)
+                        if entry is None or len(entry.pool) >= self.pool_size:
+                            break
+                    doc = entry.clone()
+                    with self._lock:
+                        if len(entry.pool) < self.pool_size:
+                            entry.pool.append(doc)
+                            self.stats['clones'] += 1
+            except Exception as e:
+                print(f"⚠️  Template clone refill failed: {e}")
+            finally:
+                self._refills.task_done()
+
+    def wait_for_refills(self):
+        """Block until queued pool refills are done (tests, benchmarks)"""
+        self._refills.join()
+
+    def info(self) -> Dict:
+        with self._lock:
+            return dict(self.stats, templates=len(self._entries), cached_mb=round(self._total() / 1e6, 2),
+                        pooled=sum(len(entry.pool) for entry in self._entries.values()))
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_template_cache() -> TemplateCache:
+    """Get or create the process-wide template cache (configured from Config)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                try:
+                    from config import Config
+                    _cache_instance = TemplateCache(
+                        max_bytes=int(Config.TEMPLATE_CACHE_MB * 1024 * 1024),
+                        pool_size=Config.TEMPLATE_CLONE_POOL,
+                    )
+                except Exception:
+                    _cache_instance = TemplateCache()
+    return _cache_instance
+
+
+def _enabled() -> bool:
+    try:
+        from config import Config
+        return getattr(Config, 'USE_TEMPLATE_CACHE', True)
+    except ImportError:
+        return True
+
+
+def open_template(template_path: str):
+    """Editable Document of a template: a cached clone, or Document(template_path) with the cache off"""
+    if not _enabled():
+        return Document(template_path)
+    return get_template_cache().checkout(template_path)
+
+
+def prefetch_template(template_path: str):
+    if _enabled() and template_path and template_path.lower().endswith('.docx'):
+        get_template_cache().prefetch(template_path)
+
+
+def evict_template(template_path: str):
+    if _cache_instance is not None:
+        _cache_instance.evict(template_path)
+
+
+def benchmark_template_load(template_path: str, count: int = 50) -> Dict:
+    """
+    Per-resume template load cost: Document(path) vs a fresh clone vs a pooled clone.
+
+    Args:
+        template_path: .docx template
+        count: Documents loaded per method
+
+    Returns:
+        Milliseconds per document for each method
+    """
+    import time
+
+    start = time.perf_counter()
+    for _ in range(count):
+        Document(template_path)
+    parse_ms = (time.perf_counter() - start) * 1000 / count
+
+    cache = TemplateCache(pool_size=0)
+    cache.checkout(template_path)
+    start = time.perf_counter()
+    for _ in range(count):
+        cache.checkout(template_path)
+    clone_ms = (time.perf_counter() - start) * 1000 / count
+
+    # Pooled: the pool is refilled between jobs, as it is while a formatter runs
+    pooled = TemplateCache(pool_size=2)
+    pooled.prefetch(template_path)
+    total = 0.0
+    for _ in range(count):
+        pooled.wait_for_refills()
+        start = time.perf_counter()
+        pooled.checkout(template_path)
+        total += time.perf_counter() - start
+    pooled_ms = total * 1000 / count
+
+    return {
+        'parse_ms': round(parse_ms, 3),
+        'clone_ms': round(clone_ms, 3),
+        'pooled_ms': round(pooled_ms, 3),
+        'pool_hits': pooled.stats['pool_hits'],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the per-resume template load cost")
+    parser.add_argument('command', choices=['bench'])
+    parser.add_argument('template')
+    parser.add_argument('--count', type=int, default=50)
+    args = parser.parse_args()
+
+    row = benchmark_template_load(args.template, args.count)
+    print(f"Document():    {row['parse_ms']:>8} ms per resume")
+    print(f"cached clone:  {row['clone_ms']:>8} ms per resume")
+    print(f"pooled clone:  {row['pooled_ms']:>8} ms per resume  ({row['pool_hits']}/{args.count} from the pool)")
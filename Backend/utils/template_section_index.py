@@ -0,0 +1,230 @@
+"""
+Template Section Index - Precomputed section-embedding matrices per template
+A template's section list never changes after upload, so its embeddings are
+computed once (at upload time, or lazily for older templates), persisted in a
+sidecar .npz next to the template file, and reused for every resume.
+
+Each heading lookup then costs one encode plus one matrix-vector product.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, model_identity, sentence_model_identity
+from utils.embedding_cache import encode_cached, normalize_text
+
+SIDECAR_SUFFIX = '.sections.npz'
+MAX_CACHED_INDEXES = 256
+
+
+def section_fingerprint(sections: Sequence[str], model_name: str = DEFAULT_SENTENCE_MODEL) -> str:
+    """Stable identity for a (model, section list) pair"""
+    payload = model_name + '\0' + '\0'.join(normalize_text(s) for s in sections)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def template_section_names(template_analysis: Dict) -> List[str]:
+    """Section names from a template analysis (handles both dict and string entries)"""
+    names = []
+    for section in template_analysis.get('sections', []) or []:
+        if isinstance(section, dict):
+            name = section.get('name') or section.get('heading') or section.get('title')
+            if name:
+                names.append(name)
+        elif isinstance(section, str):
+            names.append(section)
+    return names
+
+
+class TemplateSectionIndex:
+    """L2-normalized embedding matrix for one template's section list"""
+
+    def __init__(self, sections: Sequence[str], matrix: np.ndarray,
+                 model_name: str = DEFAULT_SENTENCE_MODEL):
+        self.sections = list(sections)
+        self.model_name = model_name
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.fingerprint = section_fingerprint(self.sections, model_name)
+
+    @classmethod
+    def build(cls, sections: Sequence[str], model,
+              model_name: Optional[str] = None) -> 'TemplateSectionIndex':
+        """Encode all sections in one batch (through the shared embedding cache)"""
+        model_name = model_name or model_identity(model)
+        embeddings = encode_cached(model, [s.strip().lower() for s in sections], model_name)
+        return cls(sections, embeddings, model_name)
+
+    def scores(self, vectors: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each query vector against every section: shape (n, sections)"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms) @ self.matrix.T
+
+    def best_match(self, vector: np.ndarray) -> Tuple[int, float]:
+        """Index and score of the most similar section for one query vector"""
+        similarities = self.scores(vector)[0]
+        best_idx = int(np.argmax(similarities))
+        return best_idx, float(similarities[best_idx])
+
+    def save(self, path: str):
+        np.savez(path, matrix=self.matrix, sections=np.array(self.sections, dtype=str),
+                 model_name=np.array(self.model_name, dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> 'TemplateSectionIndex':
+        """Load a sidecar; never unpickles, and rejects a matrix that doesn't fit its sections"""
+        with np.load(path, allow_pickle=False) as data:
+            sections = [str(s) for s in data['sections']]
+            matrix = data['matrix']
+            model_name = str(data['model_name'])
+        if matrix.ndim != 2 or matrix.shape[0] != len(sections):
+            raise ValueError(f"sidecar matrix shape {matrix.shape} does not match "
+                             f"{len(sections)} sections")
+        return cls(sections, matrix, model_name)
+
+
+_indexes: "OrderedDict[str, TemplateSectionIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def register_section_index(index: TemplateSectionIndex):
+    with _indexes_lock:
+        _indexes[index.fingerprint] = index
+        _indexes.move_to_end(index.fingerprint)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+
+
+def get_section_index(sections: Sequence[str], model,
+                      model_name: Optional[str] = None) -> TemplateSectionIndex:
+    """
+    Section index for a section list, built once per process and reused.
+
+    Args:
+        sections: Template section names
+        model: Shared sentence model (used only on first build)
+        model_name: Model identity for fingerprints and cache keys (default: the model's own)
+    """
+    model_name = model_name or model_identity(model)
+    fingerprint = section_fingerprint(sections, model_name)
+    with _indexes_lock:
+        index = _indexes.get(fingerprint)
+        if index is not None:
+            _indexes.move_to_end(fingerprint)
+            return index
+    index = TemplateSectionIndex.build(sections, model, model_name)
+    register_section_index(index)
+    return index
+
+
+def _shared_sentence_model():
+    """Shared sentence model when ML parsing is enabled, else None"""
+    try:
+        from config import Config
+        if not Config.USE_ML_PARSER:
+            return None
+        from utils.model_cache import models_loading
+        if models_loading():
+            return None  # Built lazily on a later request once the warm-up finished
+        from utils.model_registry import acquire_sentence_model, sentence_encoder_available
+        if not sentence_encoder_available():
+            return None
+        return acquire_sentence_model()
+    except Exception:
+        return None
+
+
+def sidecar_path(template_path: str) -> str:
+    return template_path + SIDECAR_SUFFIX
+
+
+def build_template_section_index(template_analysis: Dict, template_path: str) -> Optional[Dict]:
+    """
+    Compute and persist the section-embedding matrix for a template (upload time).
+
+    Returns:
+        Metadata to store in format_data['section_index'], or None if ML is unavailable
+    """
+    sections = template_section_names(template_analysis)
+    if not sections:
+        return None
+    model = _shared_sentence_model()
+    if model is None:
+        return None
+
+    try:
+        index = TemplateSectionIndex.build(sections, model)
+        path = sidecar_path(template_path)
+        index.save(path)
+        register_section_index(index)
+        print(f"🧮 Precomputed embeddings for {len(sections)} template sections → {os.path.basename(path)}")
+        return {
+            'file': os.path.basename(path),
+            'fingerprint': index.fingerprint,
+            'model': index.model_name,
+            'sections': index.sections,
+        }
+    except Exception as e:
+        print(f"⚠️  Failed to precompute template section embeddings: {e}")
+        return None
+
+
+def load_template_section_index(template_analysis: Dict) -> Optional[TemplateSectionIndex]:
+    """
+    Make a template's section index available to the classifiers before formatting.
+    Loads the sidecar written at upload time; older templates are built lazily
+    and the sidecar is written so the next session loads it directly.
+    """
+    template_path = template_analysis.get('template_path')
+    meta = template_analysis.get('section_index')
+    sections = template_section_names(template_analysis)
+    if not sections:
+        return None
+
+    # Sidecars built with another encoder backend are rebuilt for the active one. The
+    # loaded encoder names the backend it really runs (a failed ONNX/int8 load falls back
+    # to torch, an embedding server may use its own), which can differ from the config
+    model = _shared_sentence_model()
+    identity = model_identity(model) if model is not None else sentence_model_identity()
+    fingerprint = section_fingerprint(sections, identity)
+    with _indexes_lock:
+        if fingerprint in _indexes:
+            return _indexes[fingerprint]
+
+    if meta and template_path:
+        path = os.path.join(os.path.dirname(template_path), meta.get('file', ''))
+        if os.path.exists(path):
+            try:
+                index = TemplateSectionIndex.load(path)
+                if index.fingerprint == meta.get('fingerprint') == fingerprint:
+                    register_section_index(index)
+                    return index
+                print("⚠️  Template section index is stale, rebuilding")
+            except Exception as e:
+                print(f"⚠️  Could not load template section index, rebuilding: {e}")
+
+    if template_path:
+        new_meta = build_template_section_index(template_analysis, template_path)
+        if new_meta:
+            template_analysis['section_index'] = new_meta
+            with _indexes_lock:
+                return _indexes.get(new_meta['fingerprint'])
+    return None
+
+
+def delete_template_section_index(template_path: str):
+    try:
+        path = sidecar_path(template_path)
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
@@ -4,7 +4,6 @@ Handles both .doc and .docx templates
 Preserves all formatting, images, headers, footers
 """
 
-from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
@@ -16,6 +15,14 @@ import shutil
 import traceback
 import json
 
+from utils import regex_bank
+from utils.body_edits import BodyEdits
+from utils.body_index import BodyIndex
+from utils.fill_plan import load_fill_plan
+from utils.keyword_matcher import KeywordMatcher, keyword_matcher
+from utils.placeholder_replacer import PlaceholderReplacer
+from utils.template_cache import open_template
+
 # Import style manager and section detector
 try:
     from utils.style_manager import StyleManager
@@ -34,6 +41,56 @@ except ImportError:
     HAS_WIN32 = False
     print("⚠️  win32com not available - .doc files will have limited support")
 
+# Table header indicators, each table scored in one scan of the header text
+TABLE_TYPE_INDICATORS = KeywordMatcher({
+    'skills': ['skill', 'technology', 'competency', 'expertise', 'proficiency',
+               'years used', 'last used', 'technical'],
+    'experience': ['employment', 'company', 'employer', 'position', 'role',
+                   'job title', 'work history', 'experience', 'responsibilities'],
+    'education': ['education', 'degree', 'institution', 'university', 'college',
+                  'school', 'graduation', 'qualification'],
+})
+SKILLS_TABLE_HEADERS = KeywordMatcher({
+    'skill': ['skill', 'skills', 'technology', 'technologies', 'competency', 'competencies',
+              'technical', 'proficiency', 'expertise', 'tool', 'tools', 'qualification'],
+    'years': ['years', 'experience', 'years used', 'years of experience', 'exp', 'yrs',
+              'year', 'duration'],
+    'last_used': ['last used', 'last', 'recent', 'most recent', 'latest', 'when', 'current'],
+})
+
+# Section heading patterns of a template (a paragraph belongs to the first matching section)
+TEMPLATE_SECTION_PATTERNS = {
+    'SUMMARY': ['SUMMARY', 'PROFESSIONAL SUMMARY', 'PROFILE', 'OBJECTIVE', 'CAREER SUMMARY', 'OVERVIEW'],
+    'EMPLOYMENT': ['EMPLOYMENT HISTORY', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 'CAREER HISTORY', 'EMPLOYMENT', 'EXPERIENCE'],
+    'EDUCATION': ['EDUCATION', 'ACADEMIC BACKGROUND', 'EDUCATIONAL BACKGROUND', 'ACADEMIC QUALIFICATIONS', 'QUALIFICATIONS', 'EDUCATION BACKGROUND', 'CERTIFICATES', 'CERTIFICATIONS', 'CREDENTIALS', 'ACADEMICS', 'EDUCATION/CERTIFICATES', 'EDUCATION / CERTIFICATES'],
+    'SKILLS': ['SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES', 'EXPERTISE', 'ABILITIES'],
+    'PROJECTS': ['PROJECTS', 'PORTFOLIO', 'PERSONAL PROJECTS', 'KEY PROJECTS'],
+    'CERTIFICATIONS': ['CERTIFICATIONS', 'CERTIFICATES', 'LICENSES', 'PROFESSIONAL CERTIFICATIONS'],
+    'AWARDS': ['AWARDS', 'ACHIEVEMENTS', 'HONORS', 'RECOGNITION', 'ACCOMPLISHMENTS'],
+    'PUBLICATIONS': ['PUBLICATIONS', 'PAPERS', 'ARTICLES', 'RESEARCH'],
+    'LANGUAGES': ['LANGUAGES', 'LANGUAGE SKILLS'],
+    'REFERENCES': ['REFERENCES', 'RECOMMENDATIONS']
+}
+
+# Synonyms used when matching skill keywords against job descriptions
+SKILL_SYNONYMS = {
+    'network': ['network', 'networking', 'lan', 'wan', 'infrastructure'],
+    'router': ['router', 'routers', 'routing'],
+    'switch': ['switch', 'switches', 'switching'],
+    'firewall': ['firewall', 'firewalls', 'security'],
+    'configure': ['configure', 'configuration', 'configuring', 'setup', 'set up'],
+    'troubleshoot': ['troubleshoot', 'troubleshooting', 'debug', 'diagnose', 'fix', 'resolve'],
+    'maintain': ['maintain', 'maintenance', 'maintaining', 'support'],
+    'monitor': ['monitor', 'monitoring', 'track', 'tracking', 'observe'],
+    'design': ['design', 'designing', 'architect', 'architecture', 'plan', 'planning'],
+    'install': ['install', 'installation', 'installing', 'deploy', 'deployment'],
+    'fiber': ['fiber', 'fibre', 'optical', 'optic'],
+    'splicing': ['splicing', 'splice', 'fusion'],
+    'document': ['document', 'documentation', 'documenting', 'record', 'recording'],
+    'manage': ['manage', 'managing', 'management', 'administer', 'administering'],
+    'upgrade': ['upgrade', 'upgrading', 'update', 'updating']
+}
+
 class WordFormatter:
     """Enhanced Word document formatting"""
     
@@ -43,6 +100,8 @@ class WordFormatter:
         self.output_path = output_path
         self.template_path = template_analysis.get('template_path')
         self.template_type = template_analysis.get('template_type')
+        # Placeholder key -> replacements made (filled in by _format_docx_file)
+        self.placeholder_hits = {}
         
         # Initialize style manager and section detector
         if STYLE_PRESERVATION_ENABLED:
@@ -319,12 +378,109 @@ class WordFormatter:
             except:
                 pass
 
+    @classmethod
+    def discover_template(cls, doc):
+        """
+        Candidate-independent facts about an untouched template, compiled into a
+        fill plan by utils.fill_plan. Uses the same scans _format_docx_file runs
+        when there is no plan.
+        
+        Args:
+            doc: Template Document, before any edit
+        
+        Returns:
+            FillPlan fields (positions are indices into doc.paragraphs / doc.tables)
+        """
+        scanner = cls.__new__(cls)
+        scanner.resume_data = {}
+        body = scanner._index(doc)
+        paragraphs = body.paragraphs
+        
+        primary, all_anchors = scanner._scan_primary_anchors(doc)
+        scanner._build_template_order_map(doc)
+        
+        # Every heading that _scan_existing_template_sections could pick, per section
+        section_candidates = {}
+        for para_idx, paragraph in enumerate(paragraphs):
+            para_text = paragraph.text.strip().upper()
+            if para_text and len(para_text) <= 100:
+                section_key = scanner._template_section_key(para_text)
+                if section_key:
+                    section_candidates.setdefault(section_key, []).append(para_idx)
+        
+        cai_heading = body.find(lambda p: 'CAI CONTACT' in (p.text or '').strip().upper())
+        texts = [(p.text or '').strip() for p in paragraphs]
+        return {
+            'paragraph_count': len(paragraphs),
+            'table_count': len(doc.tables),
+            'primary_anchors': primary,
+            'all_anchors': all_anchors,
+            'section_order': scanner._template_section_order,
+            'section_positions': scanner._template_section_positions,
+            'section_headings': scanner._existing_template_sections,
+            'last_section_position': scanner._last_known_section_position,
+            'section_candidates': section_candidates,
+            'table_roles': ['skills' if scanner._is_skills_table(t) else None for t in doc.tables],
+            'cai_in_header_area': any('CAI CONTACT' in t.upper() for t in texts[:20]),
+            'cai_heading': cai_heading,
+            'cai_structure': scanner._analyze_cai_template_structure(doc, cai_heading) if cai_heading is not None else None,
+            'name_placeholders': [idx for idx, t in enumerate(texts)
+                                  if any(pat.search(t) for pat in regex_bank.NAME_PLACEHOLDERS)],
+            'placeholders': {idx: regex_bank.PLACEHOLDER_TOKEN.findall(t) for idx, t in enumerate(texts)
+                             if regex_bank.PLACEHOLDER_TOKEN.search(t)},
+        }
+    
+    def _load_fill_plan(self, doc):
+        """Compiled fill plan of the template, bound to the freshly loaded doc (None: discover)"""
+        self._plan = None
+        self._plan_tables = {}
+        try:
+            plan = load_fill_plan(self.template_path)
+        except Exception as e:
+            print(f"  ⚠️  Fill plan unavailable: {e}")
+            return None
+        if plan is None or not plan.matches(doc):
+            return None
+        
+        # Bind plan positions to elements: later lookups go through the body index,
+        # so they stay right after paragraphs are inserted or removed
+        paragraphs = self._index(doc).paragraphs
+        self._plan = plan
+        self._plan_tables = {table._tbl: role for table, role in zip(doc.tables, plan.table_roles)}
+        self._plan_section_candidates = {key: [paragraphs[i]._p for i in positions]
+                                         for key, positions in plan.section_candidates.items()}
+        self._plan_paragraphs = {p._p for p in paragraphs}
+        self._plan_name_slots = {paragraphs[i]._p for i in plan.name_placeholders}
+        
+        self._primary_anchors = dict(plan.primary_anchors)
+        self._all_anchors = {k: list(v) for k, v in plan.all_anchors.items()}
+        self._template_section_order = list(plan.section_order)
+        self._template_section_positions = dict(plan.section_positions)
+        self._existing_template_sections = dict(plan.section_headings)
+        self._last_known_section_position = plan.last_section_position
+        print(f"🗺️  Using compiled fill plan: {' → '.join(plan.section_order)}")
+        return plan
+    
+    def _table_is_skills(self, table):
+        """Skills-table check, from the fill plan for the template's own tables"""
+        role = getattr(self, '_plan_tables', {}).get(table._tbl, False)
+        if role is False:
+            return self._is_skills_table(table)
+        return role == 'skills'
+    
+    def _is_name_placeholder(self, paragraph, text):
+        """Name placeholder check, from the fill plan for the template's own paragraphs"""
+        if getattr(self, '_plan', None) is not None and paragraph._p in self._plan_paragraphs:
+            return paragraph._p in self._plan_name_slots
+        return any(pat.search(text) for pat in regex_bank.NAME_PLACEHOLDERS)
+    
     def _scan_primary_anchors(self, doc):
         """Scan the template once to locate primary anchors for SUMMARY, SKILLS, EMPLOYMENT, EDUCATION.
         If multiple EDUCATION headings exist and one is embedded immediately after EMPLOYMENT
         (likely sample content), pick the later EDUCATION heading as the primary.
         Returns (primary_anchors, all_anchors).
         """
+        body = self._index(doc)
         def is_heading_text(t):
             if not t:
                 return False
@@ -343,7 +499,7 @@ class WordFormatter:
             'REFERENCES': ['REFERENCES', 'RECOMMENDATIONS']
         }
         all_anchors = {k: [] for k in keys}
-        for idx, p in enumerate(doc.paragraphs):
+        for idx, p in enumerate(body.paragraphs):
             txt = (p.text or '').strip().upper()
             if not is_heading_text(txt):
                 continue
@@ -374,6 +530,7 @@ class WordFormatter:
     
     def _build_template_order_map(self, doc):
         """Build a map of template section order to respect original template structure"""
+        body = self._index(doc)
         print("\n📋 Building template section order map...")
         
         # Initialize tracking variables
@@ -393,18 +550,16 @@ class WordFormatter:
             'REFERENCES': ['REFERENCES']
         }
         
-        for para_idx, para in enumerate(doc.paragraphs):
-            text = para.text.strip().upper()
-            if len(text) < 50 and len(text) > 0:  # Likely a heading
-                for section_name, keywords in section_keywords.items():
-                    if any(kw in text for kw in keywords):
-                        if section_name not in self._template_section_positions:
-                            self._template_section_positions[section_name] = para_idx
-                            self._template_section_order.append(section_name)
-                            self._existing_template_sections[section_name] = text
-                            print(f"  ✓ Found {section_name} at paragraph {para_idx}: '{text}'")
-                            self._last_known_section_position = para_idx
-                        break
+        for para_idx, text in body.headings(max_len=50):  # Short non-empty paragraphs: likely headings
+            for section_name, keywords in section_keywords.items():
+                if any(kw in text for kw in keywords):
+                    if section_name not in self._template_section_positions:
+                        self._template_section_positions[section_name] = para_idx
+                        self._template_section_order.append(section_name)
+                        self._existing_template_sections[section_name] = text
+                        print(f"  ✓ Found {section_name} at paragraph {para_idx}: '{text}'")
+                        self._last_known_section_position = para_idx
+                    break
         
         print(f"  📊 Template order: {' → '.join(self._template_section_order)}")
         print(f"  📍 Last section position: {self._last_known_section_position}")
@@ -415,6 +570,7 @@ class WordFormatter:
         This handles custom sections like hobbies, volunteer work, publications, etc.
         Sections are added AFTER all template sections in template's formatting style.
         """
+        body = self._index(doc)
         added_count = 0
         
         # Get all section names from candidate resume
@@ -457,8 +613,8 @@ class WordFormatter:
         
         # Find insertion point: after last template section
         insertion_point = self._last_known_section_position + 10
-        if insertion_point >= len(doc.paragraphs):
-            insertion_point = len(doc.paragraphs) - 1
+        if insertion_point >= len(body):
+            insertion_point = len(body) - 1
         
         print(f"  📍 Will insert dynamic sections after paragraph {insertion_point}")
         
@@ -469,8 +625,8 @@ class WordFormatter:
                 display_name = section_name.replace('_', ' ').replace('-', ' ').title()
                 
                 # Insert section heading
-                if insertion_point < len(doc.paragraphs):
-                    anchor_para = doc.paragraphs[insertion_point]
+                if insertion_point < len(body):
+                    anchor_para = body.paragraphs[insertion_point]
                     heading_para = self._insert_paragraph_after(anchor_para, display_name.upper())
                 else:
                     heading_para = doc.add_paragraph(display_name.upper())
@@ -511,15 +667,20 @@ class WordFormatter:
         print("📋 Processing .docx file...")
         
         # Open template
-        doc = Document(self.template_path)
-        
-        print(f"✓ Template loaded: {len(doc.paragraphs)} paragraphs, {len(doc.tables)} tables")
+        doc = open_template(self.template_path)
+        # Paragraph list built once and kept current by the insert / delete helpers
+        body = self._body = BodyIndex(doc)
         
-        # Pre-scan anchors so we always insert into the correct template sections
-        self._primary_anchors, self._all_anchors = self._scan_primary_anchors(doc)
+        print(f"✓ Template loaded: {len(body)} paragraphs, {len(doc.tables)} tables")
         
-        # Build template section order map
-        self._build_template_order_map(doc)
+        # Template discovery is compiled once per template; fall back to scanning
+        plan = self._load_fill_plan(doc)
+        if plan is None:
+            # Pre-scan anchors so we always insert into the correct template sections
+            self._primary_anchors, self._all_anchors = self._scan_primary_anchors(doc)
+            
+            # Build template section order map
+            self._build_template_order_map(doc)
         
         # Initialize section tracking flags
         self._summary_inserted = False
@@ -539,10 +700,13 @@ class WordFormatter:
         try:
             # Check if template has CAI CONTACT section
             has_cai_contact = False
-            for p in doc.paragraphs[:20]:  # Check first 20 paragraphs
-                if 'CAI CONTACT' in (p.text or '').upper():
-                    has_cai_contact = True
-                    break
+            if plan is not None:
+                has_cai_contact = plan.cai_in_header_area
+            else:
+                for p in body.paragraphs[:20]:  # Check first 20 paragraphs
+                    if 'CAI CONTACT' in (p.text or '').upper():
+                        has_cai_contact = True
+                        break
             
             if has_cai_contact:
                 print(f"  ✓ Template has CAI CONTACT section, will process it")
@@ -566,7 +730,10 @@ class WordFormatter:
         print(f"\n🔍 PHASE 1: Template Structure Analysis...")
         
         # First, do a comprehensive scan of existing template sections and their positions
-        self._existing_template_sections = self._scan_existing_template_sections(doc)
+        if plan is not None:
+            self._existing_template_sections = self._existing_sections_from_plan(doc)
+        else:
+            self._existing_template_sections = self._scan_existing_template_sections(doc)
         self._candidate_sections = self._extract_all_candidate_sections()
         
         print(f"  📋 Template existing sections: {list(self._existing_template_sections.keys())}")
@@ -593,6 +760,7 @@ class WordFormatter:
         
         # Create comprehensive replacement map
         replacements = self._create_replacement_map()
+        replacer = PlaceholderReplacer(replacements)
         print(f"\n📝 Created {len(replacements)} replacement mappings")
         
         # CRITICAL: Process skills tables in-place based on table headers (respect template order)
@@ -600,7 +768,7 @@ class WordFormatter:
         print(f"\n🔍 STEP 1: Scanning {len(doc.tables)} tables...")
         for table_idx, table in enumerate(doc.tables):
             # Check if this is a skills table
-            if self._is_skills_table(table):
+            if self._table_is_skills(table):
                 print(f"  📊 Found skills table at index {table_idx}")
                 skills_filled = self._fill_skills_table(table)
                 print(f"  ✅ Filled {skills_filled} skill rows")
@@ -613,7 +781,7 @@ class WordFormatter:
         
         # STEP 2: Replace in all paragraphs
         replaced_count = 0
-        print(f"\n🔍 STEP 2: Scanning {len(doc.paragraphs)} paragraphs for placeholders...")
+        print(f"\n🔍 STEP 2: Scanning {len(body)} paragraphs for placeholders...")
         
         # Prepare bracketed name and compute name anchor index
         candidate_name = self.resume_data.get('name', '').strip()
@@ -644,13 +812,7 @@ class WordFormatter:
         self._name_anchor_idx = None
         try:
             # Look for name or name placeholder in main content area (skip early CAI CONTACT section)
-            name_placeholder_patterns = [
-                r'<\s*[Cc]andidate[^>]*[Nn]ame[^>]*>',
-                r'<\s*[Nn]ame\s*>',
-                r'<\s*[Ff]ull\s*[Nn]ame\s*>',
-                r'<\s*YOUR\s*NAME\s*>',
-            ]
-            for idx, p in enumerate(doc.paragraphs[:40]):
+            for idx, p in enumerate(body.paragraphs[:40]):
                 t = (p.text or '').strip()
                 # Skip very early paragraphs (likely CAI CONTACT) - increased from 5 to 10
                 if idx < 10:
@@ -664,12 +826,9 @@ class WordFormatter:
                     print(f"  📍 Name anchor found at paragraph {idx}: '{t}'")
                     break
                 # Check for name placeholder patterns
-                for pat in name_placeholder_patterns:
-                    if re.search(pat, t):
-                        self._name_anchor_idx = idx
-                        print(f"  📍 Name placeholder anchor found at paragraph {idx}: '{t[:50]}'")
-                        break
-                if self._name_anchor_idx is not None:
+                if self._is_name_placeholder(p, t):
+                    self._name_anchor_idx = idx
+                    print(f"  📍 Name placeholder anchor found at paragraph {idx}: '{t[:50]}'")
                     break
         except Exception as e:
             print(f"  ⚠️  Name anchor detection error: {e}")
@@ -686,52 +845,45 @@ class WordFormatter:
             # Determine scan limit: before EMPLOYMENT but never beyond the left boundary
             scan_limit = min(emp_idx, left_boundary) if emp_idx is not None else left_boundary
             if scan_limit and scan_limit > 0:
-                for idx in range(scan_limit - 1, -1, -1):
-                    if idx >= len(doc.paragraphs):
-                        continue
-                    para = doc.paragraphs[idx]
-                    t = (para.text or '').strip().upper()
-                    if t in ('SKILLS', 'TECHNICAL SKILLS') or ('SKILLS' in t and len(t) < 30):
-                        print(f"  🗑️  Removing SKILLS heading at para {idx} (CAI CONTACT area)")
-                        # Clear content after this heading until next section or for ~20 lines
-                        j = idx + 1
-                        cleared = 0
-                        while j < len(doc.paragraphs) and cleared < 20:
-                            para_j = doc.paragraphs[j]
-                            txt = (para_j.text or '').strip().upper()
-                            # Stop at next major section
-                            if len(txt) < 50 and any(h in txt for h in ['EMPLOYMENT', 'WORK HISTORY', 'EDUCATION', 'SUMMARY', 'CAI CONTACT', 'CERTIFICATIONS']):
-                                break
-                            try:
-                                for r in para_j.runs:
-                                    r.text = ''
-                            except Exception:
-                                pass
-                            j += 1
-                            cleared += 1
-                        # Delete the SKILLS heading itself
-                        try:
-                            self._delete_paragraph(para)
+                # Edits are applied after the scan; headings already marked for
+                # deletion are skipped, as if they were gone
+                with BodyEdits(body) as edits:
+                    paragraphs = body.paragraphs
+                    for idx in range(scan_limit - 1, -1, -1):
+                        if idx >= len(paragraphs):
+                            continue
+                        para = paragraphs[idx]
+                        t = (para.text or '').strip().upper()
+                        if t in ('SKILLS', 'TECHNICAL SKILLS') or ('SKILLS' in t and len(t) < 30):
+                            print(f"  🗑️  Removing SKILLS heading at para {idx} (CAI CONTACT area)")
+                            # Clear content after this heading until next section or for ~20 lines
+                            j = idx + 1
+                            cleared = 0
+                            while j < len(paragraphs) and cleared < 20:
+                                para_j = paragraphs[j]
+                                j += 1
+                                if edits.is_deleted(para_j):
+                                    continue
+                                txt = (para_j.text or '').strip().upper()
+                                # Stop at next major section
+                                if len(txt) < 50 and any(h in txt for h in ['EMPLOYMENT', 'WORK HISTORY', 'EDUCATION', 'SUMMARY', 'CAI CONTACT', 'CERTIFICATIONS']):
+                                    break
+                                edits.replace_text(para_j, '')
+                                cleared += 1
+                            # Delete the SKILLS heading itself
+                            self._delete_paragraph(para, edits=edits)
                             skills_removed += 1
-                        except Exception:
-                            pass
             print(f"  ✅ Removed {skills_removed} SKILLS section(s) from CAI CONTACT area")
         except Exception as e:
             print(f"  ⚠️  Pre-pass error: {e}")
         
-        for para_idx, paragraph in enumerate(doc.paragraphs):
+        for para_idx, paragraph in enumerate(body.paragraphs):
             if not paragraph.text.strip():
                 continue
                 
-            # Check each replacement
-            for key, value in replacements.items():
-                if self._text_contains(paragraph.text, key):
-                    print(f"  📍 Found '{key}' in paragraph {para_idx}: '{paragraph.text[:50]}...'")
-                    count = self._replace_in_paragraph(paragraph, key, value)
-                    if count > 0:
-                        print(f"  ✅ Replaced with: '{value[:50]}...'")
-                    else:
-                        print(f"  ⚠️  Found but couldn't replace (might be in multiple runs)")
+            # All replacement keys in one scan of the paragraph's runs
+            for key, count in replacer.replace_in_paragraph(paragraph).items():
+                print(f"  📍 Replaced '{key}' x{count} in paragraph {para_idx} with: '{replacements[key][:50]}...'")
 
             # Regex-driven fallback for angle bracket placeholders with variations
             # Candidate name generic patterns - very flexible to catch all variations
@@ -813,8 +965,8 @@ class WordFormatter:
                         ]
                         
                         # Scan ahead and collect paragraphs to clear
-                        for check_idx in range(para_idx + 1, min(para_idx + 150, len(doc.paragraphs))):
-                            check_para = doc.paragraphs[check_idx]
+                        for check_idx in range(para_idx + 1, min(para_idx + 150, len(body))):
+                            check_para = body.paragraphs[check_idx]
                             check_text = check_para.text.strip().upper()
                             check_text_full = check_para.text.strip()
                             
@@ -886,8 +1038,8 @@ class WordFormatter:
                         next_para = None
                         is_instruction = False
                         
-                        if para_idx + 1 < len(doc.paragraphs):
-                            next_para = doc.paragraphs[para_idx + 1]
+                        if para_idx + 1 < len(body):
+                            next_para = body.paragraphs[para_idx + 1]
                             next_text = next_para.text.strip().lower()
                             
                             # Check if next paragraph is instructional text
@@ -909,8 +1061,8 @@ class WordFormatter:
                                 
                                 # CRITICAL: Clear any existing employment content after instructional text
                                 paras_to_clear = []
-                                for check_idx in range(para_idx + 2, min(para_idx + 50, len(doc.paragraphs))):
-                                    check_para = doc.paragraphs[check_idx]
+                                for check_idx in range(para_idx + 2, min(para_idx + 50, len(body))):
+                                    check_para = body.paragraphs[check_idx]
                                     check_text = check_para.text.strip().upper()
                                     
                                     # Stop if we hit another section heading
@@ -954,8 +1106,8 @@ class WordFormatter:
                             print(f"     → No instructional text found, clearing existing employment content")
                             
                             paras_to_clear = []
-                            for check_idx in range(para_idx + 1, min(para_idx + 50, len(doc.paragraphs))):
-                                check_para = doc.paragraphs[check_idx]
+                            for check_idx in range(para_idx + 1, min(para_idx + 50, len(body))):
+                                check_para = body.paragraphs[check_idx]
                                 check_text = check_para.text.strip().upper()
                                 
                                 # Stop if we hit another section heading or end of document
@@ -1093,8 +1245,8 @@ class WordFormatter:
                         stop_headings = ['EMPLOYMENT', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 
                                         'EDUCATION', 'SKILLS', 'TECHNICAL SKILLS', 'CERTIFICATIONS']
                         
-                        for check_idx in range(para_idx + 1, min(para_idx + 30, len(doc.paragraphs))):
-                            check_para = doc.paragraphs[check_idx]
+                        for check_idx in range(para_idx + 1, min(para_idx + 30, len(body))):
+                            check_para = body.paragraphs[check_idx]
                             check_text = check_para.text.strip().upper()
                             
                             # Stop at next major section
@@ -1193,8 +1345,8 @@ class WordFormatter:
                     if skills_list:
                         paras_to_clear = []
                         stop_headings = ['EMPLOYMENT', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 'CAREER HISTORY', 'EDUCATION', 'SUMMARY', 'CERTIFICATIONS', 'PROJECTS']
-                        for check_idx in range(para_idx + 1, min(para_idx + 30, len(doc.paragraphs))):
-                            check_para = doc.paragraphs[check_idx]
+                        for check_idx in range(para_idx + 1, min(para_idx + 30, len(body))):
+                            check_para = body.paragraphs[check_idx]
                             check_text = check_para.text.strip().upper()
                             if any(h in check_text for h in stop_headings) and len(check_text) < 50:
                                 break
@@ -1278,8 +1430,8 @@ class WordFormatter:
                         next_para = None
                         is_instruction = False
                         
-                        if para_idx + 1 < len(doc.paragraphs):
-                            next_para = doc.paragraphs[para_idx + 1]
+                        if para_idx + 1 < len(body):
+                            next_para = body.paragraphs[para_idx + 1]
                             next_text = next_para.text.strip().lower()
                             
                             # Check if next paragraph is instructional text
@@ -1302,8 +1454,8 @@ class WordFormatter:
                                 
                                 # CRITICAL: Clear any existing education content after instructional text
                                 paras_to_clear = []
-                                for check_idx in range(para_idx + 2, min(para_idx + 50, len(doc.paragraphs))):
-                                    check_para = doc.paragraphs[check_idx]
+                                for check_idx in range(para_idx + 2, min(para_idx + 50, len(body))):
+                                    check_para = body.paragraphs[check_idx]
                                     check_text = check_para.text.strip().upper()
                                     
                                     # Stop if we hit another section heading
@@ -1344,8 +1496,8 @@ class WordFormatter:
                             paras_to_clear = []
                             # CRITICAL: Only clear template placeholder text, not actual content
                             # Limit scan range to max 10 paragraphs to prevent clearing employment entries
-                            for check_idx in range(para_idx + 1, min(para_idx + 10, len(doc.paragraphs))):
-                                check_para = doc.paragraphs[check_idx]
+                            for check_idx in range(para_idx + 1, min(para_idx + 10, len(body))):
+                                check_para = body.paragraphs[check_idx]
                                 check_text = check_para.text.strip()
                                 check_text_upper = check_text.upper()
                                 
@@ -1496,7 +1648,7 @@ class WordFormatter:
                             r'<[^>]*LAWSON[^>]*>',
                             r'<[^>]*PAULA[^>]*>',
                         ]
-                        for idx, p in enumerate(doc.paragraphs):
+                        for idx, p in enumerate(body.paragraphs):
                             if idx < 10:  # Skip CAI CONTACT area - increased from 5 to 10
                                 continue
                             # Also skip if in CAI CONTACT section
@@ -1512,15 +1664,15 @@ class WordFormatter:
                                 break
                 
                     # Strategy: Place SUMMARY right after the candidate name placeholder
-                    if anchor_idx is not None and anchor_idx >= 10 and anchor_idx < len(doc.paragraphs):
+                    if anchor_idx is not None and anchor_idx >= 10 and anchor_idx < len(body):
                         # Name anchor found in main content area (not CAI CONTACT) - increased from 5 to 10
-                        anchor_para = doc.paragraphs[anchor_idx]
+                        anchor_para = body.paragraphs[anchor_idx]
                         print(f"  Inserting SUMMARY after candidate name at paragraph {anchor_idx}")
                     else:
                         # Fallback: use paragraph before EMPLOYMENT if name not found
                         emp_idx = self._primary_anchors.get('EMPLOYMENT')
                         if emp_idx is not None and emp_idx > 0:
-                            anchor_para = doc.paragraphs[emp_idx - 1]
+                            anchor_para = body.paragraphs[emp_idx - 1]
                             print(f"  Fallback: Inserting SUMMARY before EMPLOYMENT at paragraph {emp_idx - 1}")
                         else:
                             # Skip SUMMARY insertion if no safe anchor found
@@ -1588,21 +1740,21 @@ class WordFormatter:
                 if hasattr(self, '_employment_tail_para') and self._employment_tail_para is not None:
                     anchor_para = self._employment_tail_para
                 elif self._primary_anchors.get('EMPLOYMENT') is not None:
-                    anchor_para = doc.paragraphs[self._primary_anchors.get('EMPLOYMENT')]
+                    anchor_para = body.paragraphs[self._primary_anchors.get('EMPLOYMENT')]
                 else:
-                    anchor_para = doc.paragraphs[-1] if doc.paragraphs else doc.add_paragraph('')
+                    anchor_para = body.paragraphs[-1] if body.paragraphs else doc.add_paragraph('')
                 # Clean up any stray SKILLS headings that occur before anchor
                 try:
                     anchor_idx = None
-                    for idx, p in enumerate(doc.paragraphs):
+                    for idx, p in enumerate(body.paragraphs):
                         if p is anchor_para:
                             anchor_idx = idx
                             break
                     if anchor_idx is not None:
                         for idx in range(anchor_idx - 1, -1, -1):
-                            t = (doc.paragraphs[idx].text or '').strip().upper()
+                            t = (body.paragraphs[idx].text or '').strip().upper()
                             if t in ('SKILLS', 'TECHNICAL SKILLS'):
-                                self._delete_paragraph(doc.paragraphs[idx])
+                                self._delete_paragraph(body.paragraphs[idx])
                 except Exception:
                     pass
                 heading = self._insert_paragraph_after(anchor_para, 'SKILLS')
@@ -1619,7 +1771,7 @@ class WordFormatter:
         # This handles cases where resume parsing left stray content
         print(f"\n🧹 Final cleanup: Removing orphaned content...")
         sections_found = {}
-        for para_idx, paragraph in enumerate(doc.paragraphs):
+        for para_idx, paragraph in enumerate(body.paragraphs):
             para_text = paragraph.text.strip().upper()
             
             # Track section positions
@@ -1646,9 +1798,7 @@ class WordFormatter:
                     for cell in row.cells:
                         for paragraph in cell.paragraphs:
                             # 1) Simple replacements
-                            for key, value in replacements.items():
-                                if self._text_contains(paragraph.text, key):
-                                    other_table_replaced += self._replace_in_paragraph(paragraph, key, value)
+                            other_table_replaced += sum(replacer.replace_in_paragraph(paragraph).values())
 
                             # 1.5) EDUCATION heading inside table (check if heading OR placeholder exists)
                             if not self._education_inserted:
@@ -1684,8 +1834,7 @@ class WordFormatter:
                                             paragraph.runs[0].font.size = Pt(11)
                                         
                                         # Clear any following raw content within the cell
-                                        self._delete_following_bullets(paragraph, max_scan=80)
-                                        self._delete_next_table(paragraph)
+                                        self._clear_section(paragraph, max_scan=80)
                                         
                                         # Insert content - ALL education entries
                                         simple_entries = [e for e in education_data if not (e.get('institution') or (e.get('details') or []))]
@@ -1798,18 +1947,17 @@ class WordFormatter:
         for section in doc.sections:
             # Header
             for paragraph in section.header.paragraphs:
-                for key, value in replacements.items():
-                    if self._text_contains(paragraph.text, key):
-                        header_footer_replaced += self._replace_in_paragraph(paragraph, key, value)
+                header_footer_replaced += sum(replacer.replace_in_paragraph(paragraph).values())
             
             # Footer
             for paragraph in section.footer.paragraphs:
-                for key, value in replacements.items():
-                    if self._text_contains(paragraph.text, key):
-                        header_footer_replaced += self._replace_in_paragraph(paragraph, key, value)
+                header_footer_replaced += sum(replacer.replace_in_paragraph(paragraph).values())
         
         if header_footer_replaced > 0:
             print(f"✓ Replaced {header_footer_replaced} placeholders in headers/footers")
+        if replacer.hits:
+            print(f"  • Placeholder hits: {dict(replacer.hits)}")
+        self.placeholder_hits = dict(replacer.hits)
         
         # CLEANUP: Remove excessive empty paragraphs and fix spacing
         print(f"\n🧹 Cleaning up empty paragraphs and fixing spacing...")
@@ -1860,7 +2008,7 @@ class WordFormatter:
         output_docx = self.output_path.replace('.pdf', '.docx')
         # Enforce justified alignment across all paragraphs before saving
         try:
-            for para in doc.paragraphs:
+            for para in body.paragraphs:
                 if para is not None and para.text is not None:
                     para.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
         except Exception:
@@ -1869,7 +2017,7 @@ class WordFormatter:
         # CRITICAL: Verify EDUCATION section is still present before saving
         if self._education_inserted:
             education_found = False
-            for para in doc.paragraphs:
+            for para in body.paragraphs:
                 if 'EDUCATION' in para.text.upper() and len(para.text.strip()) < 50:
                     education_found = True
                     print(f"✅ EDUCATION section verified in document before save: '{para.text}'")
@@ -1899,12 +2047,21 @@ class WordFormatter:
         
         return True
 
+    def _index(self, doc):
+        """Body index of doc (the one built for the template being formatted, if it is doc)"""
+        index = getattr(self, '_body', None)
+        if index is None or index.doc is not doc:
+            index = self._body = BodyIndex(doc)
+        return index
+
     # Helper: insert a new paragraph directly after a given paragraph
     def _insert_paragraph_after(self, paragraph, text):
         try:
             new_p = OxmlElement('w:p')
             paragraph._p.addnext(new_p)
             new_para = Paragraph(new_p, paragraph._parent)
+            if getattr(self, '_body', None) is not None:
+                self._body.inserted_after(paragraph, new_para)
             new_para.add_run(text)
             # Ensure justified alignment for any new paragraph inserted
             try:
@@ -1937,12 +2094,17 @@ class WordFormatter:
             # If this fails, the text will still render; right text just won't align via tab stop
             pass
 
-    def _delete_paragraph(self, paragraph):
-        """Safely delete a paragraph from the document body."""
+    def _delete_paragraph(self, paragraph, edits=None):
+        """Safely delete a paragraph from the document body (on commit, when edits is given)."""
+        if edits is not None:
+            edits.delete(paragraph)
+            return
         try:
             p = paragraph._element
             parent = p.getparent()
             parent.remove(p)
+            if getattr(self, '_body', None) is not None:
+                self._body.removed(p)
         except Exception:
             pass
 
@@ -2069,6 +2231,7 @@ class WordFormatter:
         SMART REPLACEMENT: Preserves template formatting, spacing, and "or" separators
         Supports multiple contacts
         """
+        body = self._index(doc)
         # Get all selected CAI contacts (can be multiple)
         cai_contacts = self.resume_data.get('cai_contacts', [])
         
@@ -2082,23 +2245,26 @@ class WordFormatter:
             print("  ⏭️  No CAI contacts provided; skipping CAI contact insertion")
             return
 
-        # Find existing CAI CONTACT heading
-        heading_idx = None
-        for idx, p in enumerate(doc.paragraphs):
-            if 'CAI CONTACT' in (p.text or '').strip().upper():
-                heading_idx = idx
-                break
+        # Find existing CAI CONTACT heading (the template is still untouched here)
+        plan = getattr(self, '_plan', None)
+        if plan is not None:
+            heading_idx = plan.cai_heading
+        else:
+            heading_idx = body.find(lambda p: 'CAI CONTACT' in (p.text or '').strip().upper())
 
         if heading_idx is None:
             print("  ⏭️  No 'CAI CONTACT' heading in template; skipping CAI contact insertion")
             return
         
         # CAI CONTACT heading exists - analyze template structure
-        heading = doc.paragraphs[heading_idx]
+        heading = body.paragraphs[heading_idx]
         print(f"  📋 Found CAI CONTACT at paragraph {heading_idx}")
         
         # Analyze template structure
-        template_structure = self._analyze_cai_template_structure(doc, heading_idx)
+        if plan is not None:
+            template_structure = plan.cai_structure
+        else:
+            template_structure = self._analyze_cai_template_structure(doc, heading_idx)
         
         # Replace contact info while preserving template formatting
         # Pass all contacts (list)
@@ -2109,6 +2275,7 @@ class WordFormatter:
         Analyze CAI CONTACT template structure
         Returns dict with: has_or_separator, num_contacts, paragraph_indices
         """
+        body = self._index(doc)
         structure = {
             'has_or_separator': False,
             'num_template_contacts': 0,
@@ -2119,10 +2286,10 @@ class WordFormatter:
         # Scan paragraphs after CAI CONTACT heading
         for j in range(1, 20):
             k = heading_idx + j
-            if k >= len(doc.paragraphs):
+            if k >= len(body):
                 break
             
-            para = doc.paragraphs[k]
+            para = body.paragraphs[k]
             txt = (para.text or '').strip()
             txt_upper = txt.upper()
             
@@ -2151,7 +2318,7 @@ class WordFormatter:
             # Heuristic: count name-like paragraphs (bold, short, no colons)
             name_count = 0
             for idx in structure['paragraph_indices']:
-                para = doc.paragraphs[idx]
+                para = body.paragraphs[idx]
                 txt = para.text.strip()
                 # Name is usually bold, short, and doesn't have "Phone:" or "Email:"
                 if txt and len(txt) < 50 and ':' not in txt:
@@ -2167,6 +2334,7 @@ class WordFormatter:
         Smart replacement of CAI CONTACT preserving template formatting
         Supports multiple contacts with "or" separator
         """
+        body = self._index(doc)
         # cai_contacts can be a single dict or a list of dicts
         if isinstance(cai_contacts, dict):
             cai_contacts = [cai_contacts]
@@ -2181,10 +2349,10 @@ class WordFormatter:
         paragraphs_to_delete = []
         for j in range(1, 30):
             k = heading_idx + j
-            if k >= len(doc.paragraphs):
+            if k >= len(body):
                 break
             
-            para = doc.paragraphs[k]
+            para = body.paragraphs[k]
             txt = (para.text or '').strip()
             txt_upper = txt.upper()
             
@@ -2205,13 +2373,14 @@ class WordFormatter:
                 # Get the paragraph's parent element and remove it
                 p_element = para._element
                 p_element.getparent().remove(p_element)
+                body.removed(p_element)
             except Exception as e:
                 print(f"      ⚠️  Could not delete paragraph: {e}")
         
         print(f"      🗑️  Deleted {len(paragraphs_to_delete)} template paragraphs")
         
         # Now insert all selected CAI contacts
-        last_para = doc.paragraphs[heading_idx]
+        last_para = body.paragraphs[heading_idx]
         
         for contact_idx, contact in enumerate(cai_contacts):
             name = (contact.get('name') or '').strip()
@@ -2316,16 +2485,15 @@ class WordFormatter:
             
             # CRITICAL: Remove date fragments from company/role
             # Sometimes dates like "City – 08/ 06/" end up in company field
-            import re
             if company:
                 # Remove patterns like "City – 08/ 06/" or "– 04/" etc
-                company = re.sub(r'\s*[–-]\s*\d{2}/\s*\d{2}/?\s*.*?$', '', company)
-                company = re.sub(r'\s*City\s*[–-]\s*\d{2}/.*?$', '', company)
+                company = regex_bank.COMPANY_DATE_FRAGMENT.sub('', company)
+                company = regex_bank.CITY_DATE_FRAGMENT.sub('', company)
                 company = company.strip(' ,–-')
             
             if role:
-                role = re.sub(r'\s*[–-]\s*\d{2}/\s*\d{2}/?/\s*.*?$', '', role)
-                role = re.sub(r'\s*City\s*[–-]\s*\d{2}/.*?$', '', role)
+                role = regex_bank.ROLE_DATE_FRAGMENT.sub('', role)
+                role = regex_bank.CITY_DATE_FRAGMENT.sub('', role)
                 role = role.strip(' ,–-')
             
             # Clean up duration format
@@ -2626,10 +2794,10 @@ class WordFormatter:
             return ''
 
         # Normalize connectors
-        t = re.sub(r'[–—]', '-', t)
-        t = re.sub(r'\s*(to|–|—|-)\s*', '-', t, flags=re.IGNORECASE)
+        t = regex_bank.DASHES.sub('-', t)
+        t = regex_bank.RANGE_CONNECTOR.sub('-', t)
 
-        present = bool(re.search(r'\b(current|present)\b', t, re.IGNORECASE))
+        present = bool(regex_bank.CURRENT_OR_PRESENT.search(t))
 
         # Month map with 'Sept' spelling
         month_map = {
@@ -2651,7 +2819,7 @@ class WordFormatter:
             return month_map.get(m.lower(), m[:3].title())
 
         # Find month-year tokens
-        my = [m.groups() for m in re.finditer(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s*(?:,\s*)?((?:19|20)\d{2})\b', t, flags=re.IGNORECASE)]
+        my = [m.groups() for m in regex_bank.MONTH_YEAR.finditer(t)]
         if my:
             start_m, start_y = my[0]
             start_m = abbr(start_m)
@@ -2662,13 +2830,13 @@ class WordFormatter:
             # Single month-year; attach Present or end year if available
             if present:
                 return f"{start_m} {start_y}-Present"
-            end_years = re.findall(r'\b((?:19|20)\d{2})\b', t)
+            end_years = regex_bank.YEAR.findall(t)
             if len(end_years) >= 2:
                 return f"{start_m} {end_years[0]}-{end_years[-1]}"
             return f"{start_m} {start_y}"
 
         # Fallback to years-only
-        years = re.findall(r'\b(?:19|20)\d{2}\b', t)
+        years = regex_bank.YEAR.findall(t)
         if len(years) >= 2:
             return f"{years[0]}-{years[-1]}"
         if len(years) == 1:
@@ -2684,7 +2852,7 @@ class WordFormatter:
                 return parts[0].strip(), parts[1].strip()
             return parts[0].strip() if parts else '', ''
         elif ' at ' in title.lower():
-            parts = re.split(r'\s+at\s+', title, flags=re.IGNORECASE)
+            parts = regex_bank.AT_SPLIT.split(title)
             return parts[1].strip() if len(parts) > 1 else '', parts[0].strip() if parts else ''
         elif ', ' in title:
             parts = title.split(', ', 1)
@@ -2760,15 +2928,12 @@ class WordFormatter:
         and delete ANY remaining bullet points between this section and next section.
         This ensures NO duplication of raw content.
         """
+        body = self._index(doc)
         try:
             print(f"    🧹 AGGRESSIVE cleanup: Removing ALL raw content until '{next_section_name}'...")
             
             # Find the section heading paragraph index
-            heading_idx = None
-            for idx, para in enumerate(doc.paragraphs):
-                if para._element == section_heading_para._element:
-                    heading_idx = idx
-                    break
+            heading_idx = body.position(section_heading_para)
             
             if heading_idx is None:
                 return
@@ -2783,8 +2948,8 @@ class WordFormatter:
                               'PROFESSIONAL EXPERIENCE', 'CAREER HISTORY', 'QUALIFICATIONS',
                               'ACHIEVEMENTS', 'AWARDS', 'LANGUAGES']
             
-            for idx in range(heading_idx + 1, len(doc.paragraphs)):
-                para = doc.paragraphs[idx]
+            for idx in range(heading_idx + 1, len(body)):
+                para = body.paragraphs[idx]
                 text = para.text.strip().upper()
                 
                 # Stop at next section
@@ -2812,17 +2977,24 @@ class WordFormatter:
             for para in paras_to_delete:
                 p_element = para._element
                 p_element.getparent().remove(p_element)
+                body.removed(p_element)
             
             print(f"    🧹 Cleanup complete: Removed {deleted} duplicate paragraphs")
             
         except Exception as e:
             print(f"    ⚠️  Cleanup error: {e}")
     
-    def _delete_following_bullets(self, paragraph, max_scan=200):
-        """Delete ALL content after a heading until next section - includes TABLES and paragraphs."""
+    def _delete_following_bullets(self, paragraph, max_scan=200, edits=None):
+        """Delete ALL content after a heading until next section - includes TABLES and paragraphs.
+
+        The scan only records deletions; they are applied when it is done, or
+        left in edits for the caller to commit.
+        """
+        own_edits = edits is None
+        if own_edits:
+            edits = BodyEdits(getattr(self, '_body', None))
         try:
-            body = paragraph._element.getparent()
-            node = paragraph._element.getnext()
+            node = edits.next_sibling(paragraph)
             deleted_paras = 0
             deleted_tables = 0
             scanned = 0
@@ -2831,12 +3003,12 @@ class WordFormatter:
             
             while node is not None and scanned < max_scan:
                 scanned += 1
-                next_node = node.getnext()
+                next_node = edits.next_sibling(node)
                 
                 # DELETE TABLES (raw content might be in tables)
                 if node.tag.endswith('tbl'):
                     print(f"       Deleting table #{deleted_tables + 1}")
-                    body.remove(node)
+                    edits.delete(node)
                     deleted_tables += 1
                     node = next_node
                     continue
@@ -2862,7 +3034,7 @@ class WordFormatter:
                     # DELETE THIS PARAGRAPH (raw content)
                     if deleted_paras < 5:  # Log first 5 deletions
                         print(f"       Deleting para: '{txt[:60]}'...")
-                    body.remove(node)
+                    edits.delete(node)
                     deleted_paras += 1
                 
                 node = next_node
@@ -2876,6 +3048,10 @@ class WordFormatter:
             print(f"    ⚠️  Error deleting content: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            # Deletions recorded before an error are still applied
+            if own_edits:
+                edits.commit()
     
     def _collect_bullets_after_heading(self, paragraph, max_scan=50):
         """Collect consecutive bullet-like paragraphs immediately after a heading/placeholder."""
@@ -2901,7 +3077,7 @@ class WordFormatter:
                     norm = txt.upper()
                     if any(k in norm for k in ['EDUCATION', 'SKILLS', 'SUMMARY', 'PROJECT', 'CERTIFICATION', 'EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT HISTORY']):
                         break
-                    if txt.startswith(('•', '-', '–', '—', '*', '●')) or re.match(r'^\d+[\).\-\s]', txt):
+                    if txt.startswith(('•', '-', '–', '—', '*', '●')) or regex_bank.NUMBERED_ITEM.match(txt):
                         bullets.append(txt.lstrip(' •–—-*●'))
                     else:
                         break
@@ -2910,22 +3086,26 @@ class WordFormatter:
             pass
         return bullets
 
-    def _delete_next_table(self, paragraph):
+    def _delete_next_table(self, paragraph, edits=None):
         """Delete the immediate next table after a heading/placeholder (used when raw content is a table)."""
+        own_edits = edits is None
+        if own_edits:
+            edits = BodyEdits(getattr(self, '_body', None))
         try:
-            node = paragraph._element.getnext()
+            node = edits.next_sibling(paragraph)
             deleted = 0
             # Delete multiple tables if they exist
             while node is not None and node.tag.endswith('tbl'):
-                next_node = node.getnext()
-                parent = node.getparent()
-                parent.remove(node)
+                edits.delete(node)
                 deleted += 1
-                node = next_node
+                node = edits.next_sibling(node)
             if deleted > 0:
                 print(f"    🗑️  Deleted {deleted} old table(s)")
         except Exception as e:
             print(f"    ⚠️  Error deleting tables: {e}")
+        finally:
+            if own_edits:
+                edits.commit()
     
     def _paragraph_in_table(self, paragraph):
         try:
@@ -2939,6 +3119,7 @@ class WordFormatter:
         return False
     
     def _remove_instructional_until_table(self, paragraph, max_scan=40):
+        edits = BodyEdits(getattr(self, '_body', None))
         try:
             node = paragraph._element.getnext()
             scanned = 0
@@ -2952,21 +3133,29 @@ class WordFormatter:
                     upper = txt.upper()
                     if any(h in upper for h in ['EMPLOYMENT', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 'CAREER HISTORY', 'EDUCATION', 'SUMMARY', 'CERTIFICATIONS', 'PROJECTS']) and len(txt) < 50:
                         break
-                    is_instr = bool(re.search(r'\bplease\b', txt, re.IGNORECASE)) or \
-                              bool(re.search(r'(use this table|add or delete rows|respond with the years|list the candidate|required/desired)', txt, re.IGNORECASE))
+                    is_instr = bool(regex_bank.INSTRUCTION_TEXT.search(txt))
                     if is_instr or not txt:
-                        parent = node.getparent()
-                        parent.remove(node)
-                        node = paragraph._element.getnext()
-                        continue
+                        edits.delete(node)
                     else:
                         break
                 node = node.getnext()
         except Exception:
             pass
+        finally:
+            edits.commit()
+
+    def _clear_section(self, paragraph, max_scan=200, remove_heading=False):
+        """Delete the content under a heading and the tables right after it (and the
+        heading itself with remove_heading) as one batch of edits."""
+        with BodyEdits(getattr(self, '_body', None)) as edits:
+            self._delete_following_bullets(paragraph, max_scan=max_scan, edits=edits)
+            self._delete_next_table(paragraph, edits=edits)
+            if remove_heading:
+                self._delete_paragraph(paragraph, edits=edits)
 
     def _clear_instruction_phrases(self, doc):
         """Remove all instructional text from the template"""
+        body = self._index(doc)
         try:
             phrases = [
                 'PLEASE USE THIS TABLE TO LIST THE SKILLS',
@@ -2985,7 +3174,7 @@ class WordFormatter:
             removed_count = 0
             paragraphs_to_clear = []
             
-            for p in doc.paragraphs:
+            for p in body.paragraphs:
                 t = (p.text or '').strip().upper()
                 # Also check for angle bracket patterns
                 if '<' in t and '>' in t:
@@ -3022,11 +3211,11 @@ class WordFormatter:
         while i < len(bullets):
             line = bullets[i]
             # Case: role + dates on this line
-            if re.search(r'(?:19|20)\d{2}', line):
+            if regex_bank.YEAR_ANYWHERE.search(line):
                 duration = self._clean_duration(line)
-                role = re.sub(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-zA-Z]*\s+(?:19|20)\d{2}\b', '', line, flags=re.IGNORECASE)
-                role = re.sub(r'\b(?:19|20)\d{2}\b', '', role)
-                role = re.sub(r'\b(to|–|—|-)\b', '', role, flags=re.IGNORECASE).strip(' ,;:-')
+                role = regex_bank.MONTH_YEAR_SPACED.sub('', line)
+                role = regex_bank.YEAR.sub('', role)
+                role = regex_bank.WORD_CONNECTOR.sub('', role).strip(' ,;:-')
                 company = ''
                 j = i + 1
                 if i + 1 < len(bullets):
@@ -3038,17 +3227,17 @@ class WordFormatter:
                             return False
                         if text.endswith('.'):
                             return False
-                        if re.search(r'\b(designed|managed|implemented|maintained|developed|led|created|configured|administered|tested|deployed|collaborated|supported|provided|responsible|oversaw|ownership|monitor|monitored|engineered)\b', text, re.IGNORECASE):
+                        if regex_bank.ACTION_VERB.search(text):
                             return False
                         if text[0].islower():
                             return False
                         return True
                     if _prob_company(maybe_company):
-                        company = re.sub(r',[^,]*\b(?:city|state|india|usa|uk)\b.*$', '', maybe_company, flags=re.IGNORECASE).strip()
+                        company = regex_bank.TRAILING_LOCATION.sub('', maybe_company).strip()
                         j = i + 2
                 details = []
                 while j < len(bullets):
-                    if re.search(r'(?:19|20)\d{2}', bullets[j]):
+                    if regex_bank.YEAR_ANYWHERE.search(bullets[j]):
                         break
                     details.append(bullets[j])
                     j += 1
@@ -3068,14 +3257,14 @@ class WordFormatter:
             institution = ''
             year = ''
             # Try to split by institution keyword
-            m = re.search(r'(university|college|school|institute|academy)\b.*', line, flags=re.IGNORECASE)
+            m = regex_bank.INSTITUTION_TAIL.search(line)
             if m:
                 degree = line[:m.start()].strip(' ,;:-')
                 institution = line[m.start():].strip()
                 year = self._clean_duration(line)
             else:
                 # If next line is year, treat current as degree+institution
-                if i + 1 < len(bullets) and re.search(r'(?:19|20)\d{2}', bullets[i+1]):
+                if i + 1 < len(bullets) and regex_bank.YEAR_ANYWHERE.search(bullets[i+1]):
                     degree = line
                     year = self._clean_duration(bullets[i+1])
                     i += 1
@@ -3084,7 +3273,7 @@ class WordFormatter:
                     year = self._clean_duration(line)
             # Cleanup
             degree = degree.strip()
-            institution = re.sub(r',[^,]*\b(?:city|state|india|usa|uk)\b.*$', '', institution, flags=re.IGNORECASE).strip()
+            institution = regex_bank.TRAILING_LOCATION.sub('', institution).strip()
             edus.append({'degree': degree, 'institution': institution, 'year': year, 'details': []})
             i += 1
         return edus
@@ -3104,17 +3293,8 @@ class WordFormatter:
                 continue
             # Remove leading bullet chars
             t = t.lstrip('•–—-*● \t-').strip()
-            # Normalize common wording
-            repl = [
-                (r'\bas well as\b', 'and'),
-                (r'\bin order to\b', 'to'),
-                (r'\bkey performance indicators\s*\(([^\)]+)\)', r'\1'),
-                (r'\bkey performance indicators\b', 'KPIs'),
-                (r'\bquickbooks\b', 'QuickBooks'),
-                (r'\bums?\s*worldship\b', 'UPS WorldShip'),
-            ]
-            for pattern, repl_to in repl:
-                t = re.sub(pattern, repl_to, t, flags=re.IGNORECASE)
+            # Normalize common wording (one merged pass)
+            t = regex_bank.rewrite_detail(t)
 
             t = self._shorten_text(t, max_words=max_words, max_chars=max_chars)
             t = self._normalize_acronyms(t)
@@ -3130,18 +3310,11 @@ class WordFormatter:
 
     def _normalize_acronyms(self, text):
         """Normalize common acronyms casing."""
-        mapping = {
-            'kpi': 'KPI', 'kpis': 'KPIs',
-            'lms': 'LMS',
-            'qa': 'QA',
-        }
-        def repl(m):
-            return mapping.get(m.group(0).lower(), m.group(0))
-        return re.sub(r'\b(kpis?|lms|qa)\b', repl, text, flags=re.IGNORECASE)
+        return regex_bank.normalize_acronyms(text)
 
     def _shorten_text(self, text, max_words=22, max_chars=160):
         """Heuristic shortening: prefer cutting at clause boundaries, then word limit."""
-        t = re.sub(r'\s+', ' ', text).strip()
+        t = regex_bank.WHITESPACE_RUN.sub(' ', text).strip()
         # Prefer to cut at clause markers if too long
         if len(t) > max_chars:
             for marker in ['; ', '. ', ' which ', ' that ', ' ensuring ', ' including ', ' while ', ' whereas ', ' whereby ']:
@@ -3215,68 +3388,6 @@ class WordFormatter:
         
         return replacements
     
-    def _text_contains(self, text, search_term):
-        """Case-insensitive text search"""
-        return search_term.lower() in text.lower()
-    
-    def _replace_in_paragraph(self, paragraph, search_term, replacement):
-        """Replace text in paragraph while preserving formatting AND alignment, remove highlighting"""
-        replaced = 0
-        
-        # PRESERVE ALIGNMENT: Store original alignment before modification
-        original_alignment = paragraph.alignment
-        
-        # First try: Replace in individual runs
-        for run in paragraph.runs:
-            if self._text_contains(run.text, search_term):
-                # Case-insensitive replacement
-                pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-                run.text = pattern.sub(replacement, run.text)
-                # Remove highlighting
-                try:
-                    run.font.highlight_color = None
-                except:
-                    pass
-                replaced += 1
-        
-        # Second try: If not found in individual runs, text might be split
-        # Combine all runs and check
-        if replaced == 0 and self._text_contains(paragraph.text, search_term):
-            # Text is split across runs - need to handle differently
-            full_text = paragraph.text
-            pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-            new_text = pattern.sub(replacement, full_text)
-            
-            if new_text != full_text:
-                # Clear all runs and add new text
-                for run in paragraph.runs:
-                    run.text = ''
-                
-                # Add replacement text to first run
-                if paragraph.runs:
-                    paragraph.runs[0].text = new_text
-                    # Remove highlighting
-                    try:
-                        paragraph.runs[0].font.highlight_color = None
-                    except:
-                        pass
-                    replaced += 1
-                else:
-                    # No runs, add new run
-                    new_run = paragraph.add_run(new_text)
-                    # Remove highlighting
-                    try:
-                        new_run.font.highlight_color = None
-                    except:
-                        pass
-                    replaced += 1
-        
-        # RESTORE ALIGNMENT: Apply original alignment after replacement
-        if original_alignment is not None:
-            paragraph.alignment = original_alignment
-        
-        return replaced
-
     def _replace_text_preserve_style(self, paragraph, new_text):
         """
         Replace paragraph text while preserving ALL formatting
@@ -3336,6 +3447,7 @@ class WordFormatter:
     
     def _add_sections_content(self, doc):
         """Add resume sections to document and replace placeholders - SIMPLIFIED to prevent duplication"""
+        body = self._index(doc)
         sections_added = 0
         
         # Flags are initialized in _format_docx_file()
@@ -3345,7 +3457,7 @@ class WordFormatter:
         print(f"  📊 Section status: Summary={self._summary_inserted}, Experience={self._experience_inserted}, Education={self._education_inserted}")
         
         # SINGLE PASS: Look for headings only (ignore placeholders to avoid duplication)
-        for para_idx, paragraph in enumerate(doc.paragraphs):
+        for para_idx, paragraph in enumerate(body.paragraphs):
             para_text = paragraph.text.upper().strip()
             
             # SUMMARY SECTION
@@ -3401,9 +3513,7 @@ class WordFormatter:
                 else:
                     # No summary data: remove heading and any following content until next section
                     print(f"  ⚠️  SUMMARY heading found but no data; removing section")
-                    self._delete_following_bullets(paragraph, max_scan=80)
-                    self._delete_next_table(paragraph)
-                    self._delete_paragraph(paragraph)
+                    self._clear_section(paragraph, max_scan=80, remove_heading=True)
                     continue
             
             # EXPERIENCE SECTION - Check if it hasn't been inserted yet
@@ -3434,8 +3544,7 @@ class WordFormatter:
                     # (Don't delete if we have structured experience from resume parser)
                     if not self.resume_data.get('experience'):
                         # Only clear template placeholders/raw bullets when using fallback
-                        self._delete_following_bullets(paragraph, max_scan=800)
-                        self._delete_next_table(paragraph)
+                        self._clear_section(paragraph, max_scan=800)
                     
                     # STEP 3: Insert clean structured blocks - ALL entries
                     last_element = paragraph
@@ -3490,9 +3599,7 @@ class WordFormatter:
                 else:
                     # No skills: remove section heading and trailing content
                     print(f"  ⚠️  SKILLS heading found but resume has no skills; removing section")
-                    self._delete_following_bullets(paragraph, max_scan=50)
-                    self._delete_next_table(paragraph)
-                    self._delete_paragraph(paragraph)
+                    self._clear_section(paragraph, max_scan=50, remove_heading=True)
                     continue
             
             # EDUCATION SECTION - Check multiple variations and handle fallback
@@ -3552,8 +3659,7 @@ class WordFormatter:
                     print(f"    ✅ Created EDUCATION heading: BOLD, UNDERLINED, CAPITAL")
                     
                     # STEP 2: Delete ALL following content (tables + paragraphs)
-                    self._delete_following_bullets(paragraph)
-                    self._delete_next_table(paragraph)
+                    self._clear_section(paragraph)
                     
                     # STEP 3: Insert clean structured blocks (or bullets for simple entries) - ALL entries
                     simple_entries = [e for e in education if not (e.get('institution') or (e.get('details') or []))]
@@ -3580,9 +3686,7 @@ class WordFormatter:
                     # No education data but heading exists - REMOVE heading and DON'T mark as processed
                     # This allows education to be added later when data is available
                     print(f"  ⚠️  EDUCATION heading found but no data available - removing heading to add later")
-                    self._delete_following_bullets(paragraph, max_scan=50)
-                    self._delete_next_table(paragraph)
-                    self._delete_paragraph(paragraph)
+                    self._clear_section(paragraph, max_scan=50, remove_heading=True)
                     # DO NOT set self._education_inserted = True here!
                     continue
         
@@ -3610,7 +3714,7 @@ class WordFormatter:
                 
                 # Find Employment History section and insert after it
                 employment_idx = None
-                for idx, para in enumerate(doc.paragraphs):
+                for idx, para in enumerate(body.paragraphs):
                     text = para.text.strip().upper()
                     if any(kw in text for kw in ['EMPLOYMENT HISTORY', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'EMPLOYMENT']):
                         if len(text) < 50:
@@ -3622,17 +3726,17 @@ class WordFormatter:
                 if employment_idx is not None:
                     # Scan forward to find end of employment section
                     insertion_idx = employment_idx + 20  # Default
-                    for j in range(employment_idx + 1, min(employment_idx + 100, len(doc.paragraphs))):
-                        next_text = doc.paragraphs[j].text.strip().upper()
+                    for j in range(employment_idx + 1, min(employment_idx + 100, len(body))):
+                        next_text = body.paragraphs[j].text.strip().upper()
                         if any(kw in next_text for kw in ['SKILLS', 'SUMMARY', 'PROJECTS', 'CERTIFICATIONS']) and len(next_text) < 50:
                             insertion_idx = j
                             print(f"   📍 Will insert EDUCATION at paragraph {j}")
                             break
                     
-                    anchor_para = doc.paragraphs[insertion_idx] if insertion_idx < len(doc.paragraphs) else doc.paragraphs[-1]
+                    anchor_para = body.paragraphs[insertion_idx] if insertion_idx < len(body) else body.paragraphs[-1]
                 else:
                     # No employment found, use end of document
-                    anchor_para = doc.paragraphs[-1]
+                    anchor_para = body.paragraphs[-1]
                     print(f"   📍 No Employment found, inserting at end")
                 
                 # Add EDUCATION heading with proper formatting (BOLD, UNDERLINED, CAPITAL)
@@ -3673,6 +3777,7 @@ class WordFormatter:
         """Add any missing sections from candidate resume that aren't in template.
         Adds them in order after Education: Skills → Certificates → Projects → Languages
         """
+        body = self._index(doc)
         added_count = 0
         
         print(f"\n🔍 Checking for missing sections to add...")
@@ -3682,15 +3787,15 @@ class WordFormatter:
         anchor_idx = None
         
         # Try to find Education section end
-        for idx, p in enumerate(doc.paragraphs):
+        for idx, p in enumerate(body.paragraphs):
             if 'EDUCATION' in (p.text or '').upper() and len(p.text.strip()) < 50:
                 # Found education heading, scan forward to find end of section
-                for j in range(idx + 1, min(idx + 50, len(doc.paragraphs))):
-                    next_p = doc.paragraphs[j]
+                for j in range(idx + 1, min(idx + 50, len(body))):
+                    next_p = body.paragraphs[j]
                     next_text = (next_p.text or '').strip().upper()
                     # Stop at next major section
                     if any(h in next_text for h in ['SKILLS', 'CERTIFICATES', 'PROJECTS', 'LANGUAGES', 'REFERENCES']) and len(next_text) < 50:
-                        anchor_para = doc.paragraphs[j - 1]
+                        anchor_para = body.paragraphs[j - 1]
                         anchor_idx = j - 1
                         break
                 if anchor_para:
@@ -3702,8 +3807,8 @@ class WordFormatter:
             print(f"  Using Employment History tail as anchor")
         
         # Fallback: use last paragraph
-        if not anchor_para and doc.paragraphs:
-            anchor_para = doc.paragraphs[-1]
+        if not anchor_para and body.paragraphs:
+            anchor_para = body.paragraphs[-1]
             print(f"  Using last paragraph as anchor")
         
         if not anchor_para:
@@ -3831,22 +3936,11 @@ class WordFormatter:
             for cell in table.rows[row_idx].cells:
                 header_text += ' ' + cell.text.lower()
         
-        # Skills table indicators
-        skills_indicators = ['skill', 'technology', 'competency', 'expertise', 'proficiency', 
-                           'years used', 'last used', 'technical']
-        
-        # Experience/Employment table indicators  
-        experience_indicators = ['employment', 'company', 'employer', 'position', 'role', 
-                                'job title', 'work history', 'experience', 'responsibilities']
-        
-        # Education table indicators
-        education_indicators = ['education', 'degree', 'institution', 'university', 'college', 
-                              'school', 'graduation', 'qualification']
-        
-        # Count matches for each type
-        skills_score = sum(1 for ind in skills_indicators if ind in header_text)
-        exp_score = sum(1 for ind in experience_indicators if ind in header_text)
-        edu_score = sum(1 for ind in education_indicators if ind in header_text)
+        # Count skills / experience / education indicator matches
+        hits = TABLE_TYPE_INDICATORS.scan(header_text)
+        skills_score = hits.count('skills')
+        exp_score = hits.count('experience')
+        edu_score = hits.count('education')
         
         # Return type with highest score
         if skills_score > 0 and skills_score >= exp_score and skills_score >= edu_score:
@@ -4031,15 +4125,10 @@ class WordFormatter:
         print(f"       🔍 Combined text: '{all_headers[:100]}'")  # First 100 chars
         
         # Check for skills table indicators - VERY FLEXIBLE
-        skills_keywords = ['skill', 'skills', 'technology', 'technologies', 'competency', 'competencies', 
-                          'technical', 'proficiency', 'expertise', 'tool', 'tools', 'qualification']
-        years_keywords = ['years', 'experience', 'years used', 'years of experience', 'exp', 'yrs', 
-                         'year', 'duration']
-        last_used_keywords = ['last used', 'last', 'recent', 'most recent', 'latest', 'when', 'current']
-        
-        has_skill_col = any(kw in all_headers for kw in skills_keywords)
-        has_years_col = any(kw in all_headers for kw in years_keywords)
-        has_last_used_col = any(kw in all_headers for kw in last_used_keywords)
+        hits = SKILLS_TABLE_HEADERS.scan(all_headers)
+        has_skill_col = hits.any('skill')
+        has_years_col = hits.any('years')
+        has_last_used_col = hits.any('last_used')
         
         # Also check if table has exactly 3 columns (Skill, Years, Last Used pattern)
         has_three_cols = len(table.columns) == 3
@@ -4521,10 +4610,9 @@ class WordFormatter:
         earliest_year = current_year
         latest_year = 0
         
-        import re
         for exp in experience:
             duration = exp.get('duration', '') if isinstance(exp, dict) else ''
-            year_matches = re.findall(r'(20\d{2})', str(duration))
+            year_matches = regex_bank.RECENT_YEAR.findall(str(duration))
             
             if year_matches:
                 start_year = int(year_matches[0])
@@ -4988,45 +5076,13 @@ class WordFormatter:
         job_text = f"{role} {company} " + ' '.join([str(d) for d in details])
         job_text_lower = job_text.lower()
         
-        # Synonym mapping for better semantic matching
-        synonyms = {
-            'network': ['network', 'networking', 'lan', 'wan', 'infrastructure'],
-            'router': ['router', 'routers', 'routing'],
-            'switch': ['switch', 'switches', 'switching'],
-            'firewall': ['firewall', 'firewalls', 'security'],
-            'configure': ['configure', 'configuration', 'configuring', 'setup', 'set up'],
-            'troubleshoot': ['troubleshoot', 'troubleshooting', 'debug', 'diagnose', 'fix', 'resolve'],
-            'maintain': ['maintain', 'maintenance', 'maintaining', 'support'],
-            'monitor': ['monitor', 'monitoring', 'track', 'tracking', 'observe'],
-            'design': ['design', 'designing', 'architect', 'architecture', 'plan', 'planning'],
-            'install': ['install', 'installation', 'installing', 'deploy', 'deployment'],
-            'fiber': ['fiber', 'fibre', 'optical', 'optic'],
-            'splicing': ['splicing', 'splice', 'fusion'],
-            'document': ['document', 'documentation', 'documenting', 'record', 'recording'],
-            'manage': ['manage', 'managing', 'management', 'administer', 'administering'],
-            'upgrade': ['upgrade', 'upgrading', 'update', 'updating']
-        }
-        
-        # Check if any keyword or its synonyms appear in job text
-        matches = 0
-        matched_keywords = []
-        
-        for keyword in skill_keywords:
-            keyword_lower = keyword.lower()
-            
-            # Direct match
-            if keyword_lower in job_text_lower:
-                matches += 1
-                matched_keywords.append(keyword)
-                continue
-            
-            # Check synonyms
-            if keyword_lower in synonyms:
-                for syn in synonyms[keyword_lower]:
-                    if syn in job_text_lower:
-                        matches += 1
-                        matched_keywords.append(keyword)
-                        break
+        # A keyword matches if it or one of its synonyms appears in the job text
+        # (one scan per job; the matcher is compiled once per skill)
+        matcher = keyword_matcher((i, [keyword.lower()] + SKILL_SYNONYMS.get(keyword.lower(), []))
+                                  for i, keyword in enumerate(skill_keywords))
+        hits = matcher.scan(job_text_lower)
+        matched_keywords = [keyword for i, keyword in enumerate(skill_keywords) if hits.any(i)]
+        matches = len(matched_keywords)
         
         # Matching criteria:
         # - 2+ keyword matches = strong confidence
@@ -5378,7 +5434,7 @@ class WordFormatter:
             return None, None
             
         # Common patterns: "2020-2023", "Jan 2020 - Present", "2020-Current"
-        year_matches = re.findall(r'(20\d{2})', str(duration))
+        year_matches = regex_bank.RECENT_YEAR.findall(str(duration))
         
         if len(year_matches) >= 2:
             start_year = int(year_matches[0])
@@ -5496,28 +5552,29 @@ class WordFormatter:
         
     def _insert_additional_sections(self, doc, candidate_sections):
         """Insert additional sections from candidate resume that are not in template"""
+        body = self._index(doc)
         additional_inserted = 0
         
         # Get sections that exist in template
         template_sections = set(k.lower() for k in self._primary_anchors.keys() if self._primary_anchors[k] is not None)
         
         # Find insertion point (after last major section or at end)
-        insertion_point = len(doc.paragraphs) - 1
+        insertion_point = len(body) - 1
         
         # Look for better insertion point (after EDUCATION if exists, or after EMPLOYMENT)
         if self._primary_anchors.get('EDUCATION'):
             edu_idx = self._primary_anchors['EDUCATION']
             # Find end of education section
-            for i in range(edu_idx + 1, len(doc.paragraphs)):
-                para_text = doc.paragraphs[i].text.strip().upper()
+            for i in range(edu_idx + 1, len(body)):
+                para_text = body.paragraphs[i].text.strip().upper()
                 if len(para_text) < 50 and any(h in para_text for h in ['CERTIFICATIONS', 'PROJECTS', 'AWARDS', 'REFERENCES']):
                     insertion_point = i
                     break
         elif self._primary_anchors.get('EMPLOYMENT'):
             emp_idx = self._primary_anchors['EMPLOYMENT']
             # Find end of employment section
-            for i in range(emp_idx + 1, len(doc.paragraphs)):
-                para_text = doc.paragraphs[i].text.strip().upper()
+            for i in range(emp_idx + 1, len(body)):
+                para_text = body.paragraphs[i].text.strip().upper()
                 if len(para_text) < 50 and any(h in para_text for h in ['EDUCATION', 'SKILLS', 'CERTIFICATIONS']):
                     insertion_point = i
                     break
@@ -5534,7 +5591,7 @@ class WordFormatter:
                     print(f"  📄 Adding section: {title} ({len(content)} items)")
                     
                     # Insert section heading
-                    heading_para = doc.paragraphs[insertion_point]._element
+                    heading_para = body.paragraphs[insertion_point]._element
                     new_heading = self._create_paragraph_after(heading_para)
                     new_heading.text = title.upper()
                     
@@ -5586,13 +5643,21 @@ class WordFormatter:
         
         return education_data
     
+    def _template_section_key(self, para_text):
+        """Section named by an upper-cased paragraph text (first matching pattern list), or None"""
+        for section_key, patterns in TEMPLATE_SECTION_PATTERNS.items():
+            if any(pattern in para_text for pattern in patterns):
+                return section_key
+        return None
+    
     def _scan_existing_template_sections(self, doc):
         """Comprehensively scan template for existing sections and their exact positions"""
+        body = self._index(doc)
         existing_sections = {}
         
         # Scan all paragraphs for section headings
-        print(f"    🔍 Scanning {len(doc.paragraphs)} paragraphs for existing sections...")
-        for para_idx, paragraph in enumerate(doc.paragraphs):
+        print(f"    🔍 Scanning {len(body)} paragraphs for existing sections...")
+        for para_idx, paragraph in enumerate(body.paragraphs):
             para_text = paragraph.text.strip().upper()
             
             # Skip empty or very long paragraphs (likely content, not headings)
@@ -5603,32 +5668,39 @@ class WordFormatter:
                     print(f"       Para {para_idx}: Too long ({len(para_text)} chars): '{para_text[:50]}...'")
                 continue
             
-            # Check for section headings with various patterns
-            section_patterns = {
-                'SUMMARY': ['SUMMARY', 'PROFESSIONAL SUMMARY', 'PROFILE', 'OBJECTIVE', 'CAREER SUMMARY', 'OVERVIEW'],
-                'EMPLOYMENT': ['EMPLOYMENT HISTORY', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 'CAREER HISTORY', 'EMPLOYMENT', 'EXPERIENCE'],
-                'EDUCATION': ['EDUCATION', 'ACADEMIC BACKGROUND', 'EDUCATIONAL BACKGROUND', 'ACADEMIC QUALIFICATIONS', 'QUALIFICATIONS', 'EDUCATION BACKGROUND', 'CERTIFICATES', 'CERTIFICATIONS', 'CREDENTIALS', 'ACADEMICS', 'EDUCATION/CERTIFICATES', 'EDUCATION / CERTIFICATES'],
-                'SKILLS': ['SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES', 'EXPERTISE', 'ABILITIES'],
-                'PROJECTS': ['PROJECTS', 'PORTFOLIO', 'PERSONAL PROJECTS', 'KEY PROJECTS'],
-                'CERTIFICATIONS': ['CERTIFICATIONS', 'CERTIFICATES', 'LICENSES', 'PROFESSIONAL CERTIFICATIONS'],
-                'AWARDS': ['AWARDS', 'ACHIEVEMENTS', 'HONORS', 'RECOGNITION', 'ACCOMPLISHMENTS'],
-                'PUBLICATIONS': ['PUBLICATIONS', 'PAPERS', 'ARTICLES', 'RESEARCH'],
-                'LANGUAGES': ['LANGUAGES', 'LANGUAGE SKILLS'],
-                'REFERENCES': ['REFERENCES', 'RECOMMENDATIONS']
-            }
-            
             # Check if this paragraph matches any section pattern
-            for section_key, patterns in section_patterns.items():
-                if any(pattern in para_text for pattern in patterns):
-                    # Don't overwrite if we already found this section (take first occurrence)
-                    if section_key not in existing_sections:
-                        existing_sections[section_key] = para_idx
-                        print(f"    🔍 Found {section_key} section at paragraph {para_idx}: '{para_text[:50]}'")
+            section_key = self._template_section_key(para_text)
+            # Don't overwrite if we already found this section (take first occurrence)
+            if section_key and section_key not in existing_sections:
+                existing_sections[section_key] = para_idx
+                print(f"    🔍 Found {section_key} section at paragraph {para_idx}: '{para_text[:50]}'")
+        
+        self._add_table_and_embedded_sections(doc, existing_sections)
+        return existing_sections
+    
+    def _existing_sections_from_plan(self, doc):
+        """_scan_existing_template_sections answered from the fill plan's heading candidates"""
+        body = self._index(doc)
+        found = []
+        for section_key, elements in self._plan_section_candidates.items():
+            # First candidate still in the document (CAI CONTACT rewrites may have removed some)
+            for element in elements:
+                para_idx = body.position(element)
+                if para_idx is not None:
+                    found.append((para_idx, section_key))
                     break
+        existing_sections = {section_key: para_idx for para_idx, section_key in sorted(found)}
+        print(f"    🗺️  Template sections from fill plan: {existing_sections}")
+        self._add_table_and_embedded_sections(doc, existing_sections)
+        return existing_sections
+    
+    def _add_table_and_embedded_sections(self, doc, existing_sections):
+        """Add the SKILLS_TABLE entry and an EDUCATION heading embedded right after EMPLOYMENT"""
+        body = self._index(doc)
         
         # Also scan tables for skills tables (special case)
         for table_idx, table in enumerate(doc.tables):
-            if self._is_skills_table(table):
+            if self._table_is_skills(table):
                 # Find the paragraph position of this table
                 table_position = self._find_table_paragraph_position(doc, table)
                 if 'SKILLS_TABLE' not in existing_sections:
@@ -5641,17 +5713,16 @@ class WordFormatter:
             # Check 5 paragraphs after EMPLOYMENT for EDUCATION heading
             for offset in range(1, 6):
                 check_idx = employment_idx + offset
-                if check_idx < len(doc.paragraphs):
-                    check_text = doc.paragraphs[check_idx].text.strip().upper()
+                if check_idx < len(body):
+                    check_text = body.paragraphs[check_idx].text.strip().upper()
                     if 'EDUCATION' in check_text and len(check_text) < 300:  # Allow longer text for templates
                         existing_sections['EDUCATION'] = check_idx
                         print(f"    🔍 Found EDUCATION section at paragraph {check_idx}: '{check_text[:50]}' (detected after EMPLOYMENT)")
                         break
-        
-        return existing_sections
     
     def _find_table_paragraph_position(self, doc, target_table):
         """Find the approximate paragraph position of a table"""
+        body = self._index(doc)
         # This is a best-effort approach since tables don't have direct paragraph indices
         # We'll estimate based on document structure
         total_tables = len(doc.tables)
@@ -5664,7 +5735,7 @@ class WordFormatter:
         
         if table_idx is not None:
             # Estimate position based on table index and total paragraphs
-            estimated_position = int((table_idx / max(total_tables, 1)) * len(doc.paragraphs))
+            estimated_position = int((table_idx / max(total_tables, 1)) * len(body))
             return estimated_position
         
         return 0
@@ -5791,15 +5862,16 @@ class WordFormatter:
     
     def _find_optimal_insertion_point(self, doc):
         """Find the best place to insert missing sections - AFTER Employment History"""
+        body = self._index(doc)
         # PRIORITY 1: Find EMPLOYMENT HISTORY section and insert after it
         employment_end = None
-        for para_idx, para in enumerate(doc.paragraphs):
+        for para_idx, para in enumerate(body.paragraphs):
             text = para.text.strip().upper()
             if any(keyword in text for keyword in ['EMPLOYMENT HISTORY', 'WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT']):
                 if len(text) < 50:  # Likely a heading
                     # Scan forward to find the end of employment section
-                    for j in range(para_idx + 1, min(para_idx + 100, len(doc.paragraphs))):
-                        next_text = doc.paragraphs[j].text.strip().upper()
+                    for j in range(para_idx + 1, min(para_idx + 100, len(body))):
+                        next_text = body.paragraphs[j].text.strip().upper()
                         # Stop at next major section
                         if any(kw in next_text for kw in ['EDUCATION', 'SKILLS', 'SUMMARY', 'PROJECTS', 'CERTIFICATIONS']) and len(next_text) < 50:
                             employment_end = j
@@ -5816,9 +5888,9 @@ class WordFormatter:
         # PRIORITY 2: Look for skills tables
         skills_table_end = None
         for table_idx, table in enumerate(doc.tables):
-            if self._is_skills_table(table):
+            if self._table_is_skills(table):
                 # Find the paragraph after this table
-                for para_idx, para in enumerate(doc.paragraphs):
+                for para_idx, para in enumerate(body.paragraphs):
                     if para._element.getparent() == table._element.getparent():
                         skills_table_end = para_idx + 1
                         break
@@ -5828,7 +5900,7 @@ class WordFormatter:
         
         # PRIORITY 3: Find after the last major section
         last_major_section = 0
-        for para_idx, para in enumerate(doc.paragraphs):
+        for para_idx, para in enumerate(body.paragraphs):
             text = para.text.strip().upper()
             if any(keyword in text for keyword in ['EMPLOYMENT', 'EXPERIENCE', 'EDUCATION', 'SKILLS', 'SUMMARY']):
                 if len(text) < 50:  # Likely a heading
@@ -5838,10 +5910,11 @@ class WordFormatter:
     
     def _insert_education_section_at_point(self, doc, insertion_point):
         """Insert education section at specific point in document"""
+        body = self._index(doc)
         try:
             # Insert EDUCATION heading
-            if insertion_point < len(doc.paragraphs):
-                anchor_para = doc.paragraphs[insertion_point]
+            if insertion_point < len(body):
+                anchor_para = body.paragraphs[insertion_point]
                 heading = self._insert_paragraph_after(anchor_para, '')
             else:
                 heading = doc.add_paragraph('')
@@ -5873,7 +5946,7 @@ class WordFormatter:
                 
                 print(f"    ✅ Added EDUCATION section with {len(education_data)} entries at paragraph {insertion_point}")
                 print(f"    📍 EDUCATION heading text: '{heading.text if heading else 'NO HEADING'}'")
-                print(f"    📍 Total paragraphs in document now: {len(doc.paragraphs)}")
+                print(f"    📍 Total paragraphs in document now: {len(body)}")
             
             # Update anchors to reflect new section
             self._primary_anchors['EDUCATION'] = insertion_point
@@ -5893,23 +5966,23 @@ class WordFormatter:
             # CRITICAL FIX: Get actual paragraph indices AFTER insertion
             # Find the EDUCATION heading we just inserted (use LAST occurrence if multiple)
             education_start_idx = None
-            print(f"    🔍 Searching for EDUCATION heading in {len(doc.paragraphs)} paragraphs...")
+            print(f"    🔍 Searching for EDUCATION heading in {len(body)} paragraphs...")
             
-            for idx, para in enumerate(doc.paragraphs):
+            for idx, para in enumerate(body.paragraphs):
                 text = (para.text or '').strip().upper()
                 if 'EDUCATION' == text or (text.startswith('EDUCATION') and len(text) < 50):
                     education_start_idx = idx  # Keep updating to get LAST occurrence
                     print(f"    📍 Found EDUCATION at paragraph {idx}: '{para.text[:50]}'")
             
             if education_start_idx is not None:
-                education_end_idx = min(education_start_idx + 15, len(doc.paragraphs))
+                education_end_idx = min(education_start_idx + 15, len(body))
                 self._protected_ranges.append((education_start_idx, education_end_idx))
                 print(f"    🔒 EDUCATION section locked and protected (paras {education_start_idx}-{education_end_idx})")
             else:
                 print(f"    ⚠️  Could not find EDUCATION heading to protect!")
                 print(f"    🔍 Paragraph texts:")
-                for idx, para in enumerate(doc.paragraphs[-10:]):  # Show last 10
-                    print(f"        Para {len(doc.paragraphs) - 10 + idx}: '{para.text[:60]}'")
+                for idx, para in enumerate(body.paragraphs[-10:]):  # Show last 10
+                    print(f"        Para {len(body) - 10 + idx}: '{para.text[:60]}'")
             
         except Exception as e:
             print(f"    ⚠️  Error adding EDUCATION section: {e}")
@@ -5918,10 +5991,11 @@ class WordFormatter:
     
     def _insert_skills_section_at_point(self, doc, insertion_point):
         """Insert skills section at specific point in document"""
+        body = self._index(doc)
         try:
             # Insert SKILLS heading
-            if insertion_point < len(doc.paragraphs):
-                anchor_para = doc.paragraphs[insertion_point]
+            if insertion_point < len(body):
+                anchor_para = body.paragraphs[insertion_point]
                 heading = self._insert_paragraph_after(anchor_para, 'SKILLS')
             else:
                 heading = doc.add_paragraph('SKILLS')
@@ -5949,10 +6023,11 @@ class WordFormatter:
     
     def _insert_experience_section_at_point(self, doc, insertion_point):
         """Insert experience section at specific point in document"""
+        body = self._index(doc)
         try:
             # Insert EXPERIENCE heading
-            if insertion_point < len(doc.paragraphs):
-                anchor_para = doc.paragraphs[insertion_point]
+            if insertion_point < len(body):
+                anchor_para = body.paragraphs[insertion_point]
                 heading = self._insert_paragraph_after(anchor_para, 'EMPLOYMENT HISTORY')
             else:
                 heading = doc.add_paragraph('EMPLOYMENT HISTORY')
@@ -6039,18 +6114,19 @@ class WordFormatter:
     
     def _insert_comprehensive_additional_sections(self, doc, uncovered_sections):
         """Insert all uncovered candidate sections in template format"""
+        body = self._index(doc)
         sections_added = 0
         
         # Find insertion point after all main content
-        insertion_point = len(doc.paragraphs) - 1
+        insertion_point = len(body) - 1
         
         # Look for better insertion point (after education or skills if they exist)
         for section_name in ['EDUCATION', 'SKILLS', 'EMPLOYMENT']:
             section_idx = self._primary_anchors.get(section_name)
             if section_idx is not None:
                 # Find end of this section's content
-                for i in range(section_idx + 1, len(doc.paragraphs)):
-                    para_text = doc.paragraphs[i].text.strip().upper()
+                for i in range(section_idx + 1, len(body)):
+                    para_text = body.paragraphs[i].text.strip().upper()
                     if len(para_text) < 50 and any(h in para_text for h in ['CERTIFICATIONS', 'PROJECTS', 'AWARDS']):
                         insertion_point = i
                         break
@@ -6068,8 +6144,8 @@ class WordFormatter:
             
             if actual_content and len(actual_content) > 0:
                 # Insert section heading
-                if insertion_point < len(doc.paragraphs):
-                    anchor_para = doc.paragraphs[insertion_point]
+                if insertion_point < len(body):
+                    anchor_para = body.paragraphs[insertion_point]
                     heading_para = self._insert_paragraph_after(anchor_para, section_name.upper())
                 else:
                     heading_para = doc.add_paragraph(section_name.upper())
@@ -6274,14 +6350,15 @@ class WordFormatter:
     
     def _find_post_template_insertion_point(self, doc):
         """Find the best point to insert additional sections after all template sections"""
+        body = self._index(doc)
         # Scan document BACKWARDS to find the last non-empty paragraph
         # This ensures we insert AFTER all existing content, not in the middle
         
-        last_content_idx = len(doc.paragraphs) - 1
+        last_content_idx = len(body) - 1
         
         # Scan backwards to find last paragraph with actual content
-        for idx in range(len(doc.paragraphs) - 1, -1, -1):
-            para = doc.paragraphs[idx]
+        for idx in range(len(body) - 1, -1, -1):
+            para = body.paragraphs[idx]
             text = para.text.strip()
             
             # Skip empty paragraphs
@@ -6301,6 +6378,7 @@ class WordFormatter:
     
     def _section_already_exists_in_template(self, section_name, doc):
         """Check if a section with this name already exists in the template"""
+        body = self._index(doc)
         section_upper = section_name.upper()
         
         # Check existing template sections
@@ -6309,7 +6387,7 @@ class WordFormatter:
                 return True
         
         # Also scan document paragraphs for similar headings
-        for paragraph in doc.paragraphs:
+        for paragraph in body.paragraphs:
             para_text = paragraph.text.strip().upper()
             if len(para_text) < 100 and para_text:  # Likely a heading
                 if section_upper in para_text or para_text in section_upper:
@@ -6319,6 +6397,7 @@ class WordFormatter:
     
     def _cleanup_empty_paragraphs(self, doc):
         """Remove excessive empty paragraphs between sections and normalize spacing"""
+        body = self._index(doc)
         removed_count = 0
         section_headings = ['SUMMARY', 'EMPLOYMENT', 'WORK HISTORY', 'EXPERIENCE', 'EDUCATION', 
                           'SKILLS', 'TECHNICAL SKILLS', 'CERTIFICATIONS', 'PROJECTS', 'LANGUAGES']
@@ -6329,26 +6408,26 @@ class WordFormatter:
             
             # Protect sections by name
             if hasattr(self, '_protected_sections'):
-                for idx, para in enumerate(doc.paragraphs):
+                for idx, para in enumerate(body.paragraphs):
                     text = (para.text or '').strip().upper()
                     for section in self._protected_sections:
                         if section.upper() in text and len(text) < 50:
                             # Protect this paragraph and next 10
-                            for j in range(idx, min(idx + 10, len(doc.paragraphs))):
+                            for j in range(idx, min(idx + 10, len(body))):
                                 protected_indices.add(j)
                             break
             
             # Protect specific ranges
             if hasattr(self, '_protected_ranges'):
                 for start, end in self._protected_ranges:
-                    for j in range(start, min(end, len(doc.paragraphs))):
+                    for j in range(start, min(end, len(body))):
                         protected_indices.add(j)
             
             paragraphs_to_remove = []
             prev_was_empty = False
             prev_was_section = False
             
-            for idx, para in enumerate(doc.paragraphs):
+            for idx, para in enumerate(body.paragraphs):
                 # Skip protected paragraphs
                 if idx in protected_indices:
                     prev_was_empty = False
@@ -6377,9 +6456,10 @@ class WordFormatter:
                 else:
                     prev_was_section = False
             
-            # Remove marked paragraphs
-            for para in paragraphs_to_remove:
-                self._delete_paragraph(para)
+            # Remove marked paragraphs (one commit, one index rebuild)
+            with BodyEdits(body) as edits:
+                for para in paragraphs_to_remove:
+                    self._delete_paragraph(para, edits=edits)
             
             if protected_indices:
                 print(f"  Protected {len(protected_indices)} paragraphs from cleanup")